@@ -24,6 +24,8 @@ CONF = config.CONF
 class FlavorsV2TestJSON(base.BaseV2ComputeTest):
     """Tests Flavors"""
 
+    use_credentials_pool = True
+
     @classmethod
     def setup_clients(cls):
         super(FlavorsV2TestJSON, cls).setup_clients()
@@ -28,6 +28,8 @@ LOG = logging.getLogger(__name__)
 class ExtensionsTest(base.BaseV2ComputeTest):
     """Tests Compute Extensions API"""
 
+    use_credentials_pool = True
+
     @decorators.idempotent_id('3bb27738-b759-4e0d-a5fa-37d7a6df07d1')
     def test_list_extensions(self):
         """Test listing compute extensions"""
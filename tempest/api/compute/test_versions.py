@@ -18,6 +18,8 @@ from tempest.lib import decorators
 
 class TestVersions(base.BaseV2ComputeTest):
 
+    use_credentials_pool = True
+
     @decorators.idempotent_id('6c0a0990-43b6-4529-9b61-5fd8daf7c55c')
     @decorators.attr(type='smoke')
     def test_list_api_versions(self):
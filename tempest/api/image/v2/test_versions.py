@@ -22,6 +22,8 @@ CONF = config.CONF
 class VersionsTest(base.BaseV2ImageTest):
     """Test image versions"""
 
+    use_credentials_pool = True
+
     credentials = ['primary', 'project_reader']
 
     @classmethod
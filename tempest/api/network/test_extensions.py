@@ -32,6 +32,8 @@ class ExtensionsTestJSON(base.BaseNetworkTest):
     etc/tempest.conf.
     """
 
+    use_credentials_pool = True
+
     credentials = ['primary', 'project_reader']
 
     @classmethod
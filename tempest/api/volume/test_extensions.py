@@ -28,6 +28,8 @@ LOG = logging.getLogger(__name__)
 class ExtensionsTestJSON(base.BaseVolumeTest):
     """Test volume extensions"""
 
+    use_credentials_pool = True
+
     @decorators.idempotent_id('94607eb0-43a5-47ca-82aa-736b41bd2e2c')
     def test_list_extensions(self):
         """Test listing volume extensions"""
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import os
 
 from oslo_concurrency import lockutils
@@ -33,13 +34,17 @@ class Manager(clients.ServiceClients):
         """Initialization of Manager class.
 
         Setup all services clients and make them available for tests cases.
+        Service clients are built the first time they are accessed, so that
+        tests only pay for the clients they actually use.
         :param credentials: type Credentials or TestResources
         :param scope: default scope for tokens produced by the auth provider
         """
+        self._lazy_clients = {}
         _, identity_uri = get_auth_provider_class(credentials)
         super(Manager, self).__init__(
             credentials=credentials, identity_uri=identity_uri, scope=scope,
-            region=CONF.identity.region)
+            region=CONF.identity.region,
+            token_cache=CONF.identity.token_cache)
         if CONF.record_resources:
             RestClient.lock_dir = os.path.join(
                 lockutils.get_lock_path(CONF),
@@ -60,57 +65,118 @@ class Manager(clients.ServiceClients):
         # never a stable interface and it's not useful anyways
         self.default_params = config.service_client_config()
 
+    def __getattr__(self, name):
+        # Only invoked when the attribute is not found the usual way, i.e.
+        # for service clients which have not been accessed yet.
+        lazy_clients = self.__dict__.get('_lazy_clients', {})
+        build_client = lazy_clients.get(name)
+        if build_client is None:
+            # The client may have been built by another thread meanwhile
+            if name in self.__dict__:
+                return self.__dict__[name]
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.__class__.__name__, name))
+        client = build_client()
+        # Cache the client as a regular attribute, so that __getattr__ is
+        # not invoked anymore for it.
+        setattr(self, name, client)
+        lazy_clients.pop(name, None)
+        return client
+
+    def __dir__(self):
+        return sorted(set(super(Manager, self).__dir__()) |
+                      set(self.__dict__.get('_lazy_clients', {})))
+
+    def _set_lazy_client(self, name, client_class, **kwargs):
+        """Register a service client built on first access
+
+        :param name: name of the Manager attribute for the client
+        :param client_class: a ClientsFactory callable which builds the client
+        :param kwargs: parameters passed to `client_class`
+        """
+        self._lazy_clients[name] = functools.partial(client_class, **kwargs)
+        # Drop a client built or set before, e.g. by a previous call to
+        # the _set_*_clients methods.
+        self.__dict__.pop(name, None)
+
     def _set_network_clients(self):
-        self.network_agents_client = self.network.AgentsClient()
-        self.network_extensions_client = self.network.ExtensionsClient()
-        self.networks_client = self.network.NetworksClient()
-        self.subnetpools_client = self.network.SubnetpoolsClient()
-        self.subnets_client = self.network.SubnetsClient()
-        self.ports_client = self.network.PortsClient()
-        self.network_quotas_client = self.network.QuotasClient()
-        self.floating_ips_client = self.network.FloatingIPsClient()
-        self.floating_ips_port_forwarding_client =\
-            self.network.FloatingIpsPortForwardingClient()
-        self.metering_labels_client = self.network.MeteringLabelsClient()
-        self.metering_label_rules_client = (
-            self.network.MeteringLabelRulesClient())
-        self.routers_client = self.network.RoutersClient()
-        self.security_group_rules_client = (
-            self.network.SecurityGroupRulesClient())
-        self.security_groups_client = self.network.SecurityGroupsClient()
-        self.network_versions_client = self.network.NetworkVersionsClient()
-        self.service_providers_client = self.network.ServiceProvidersClient()
-        self.tags_client = self.network.TagsClient()
-        self.qos_client = self.network.QosClient()
-        self.qos_min_bw_client = self.network.QosMinimumBandwidthRulesClient()
-        self.qos_limit_bw_client = self.network.QosLimitBandwidthRulesClient()
-        self.qos_min_pps_client = (
-            self.network.QosMinimumPacketRateRulesClient())
-        self.segments_client = self.network.SegmentsClient()
-        self.trunks_client = self.network.TrunksClient()
-        self.log_resource_client = self.network.LogResourceClient()
-        self.loggable_resource_client = self.network.LoggableResourceClient()
+        self._set_lazy_client(
+            'network_agents_client', self.network.AgentsClient)
+        self._set_lazy_client(
+            'network_extensions_client', self.network.ExtensionsClient)
+        self._set_lazy_client('networks_client', self.network.NetworksClient)
+        self._set_lazy_client(
+            'subnetpools_client', self.network.SubnetpoolsClient)
+        self._set_lazy_client('subnets_client', self.network.SubnetsClient)
+        self._set_lazy_client('ports_client', self.network.PortsClient)
+        self._set_lazy_client(
+            'network_quotas_client', self.network.QuotasClient)
+        self._set_lazy_client(
+            'floating_ips_client', self.network.FloatingIPsClient)
+        self._set_lazy_client(
+            'floating_ips_port_forwarding_client',
+            self.network.FloatingIpsPortForwardingClient)
+        self._set_lazy_client(
+            'metering_labels_client', self.network.MeteringLabelsClient)
+        self._set_lazy_client(
+            'metering_label_rules_client',
+            self.network.MeteringLabelRulesClient)
+        self._set_lazy_client('routers_client', self.network.RoutersClient)
+        self._set_lazy_client(
+            'security_group_rules_client',
+            self.network.SecurityGroupRulesClient)
+        self._set_lazy_client(
+            'security_groups_client', self.network.SecurityGroupsClient)
+        self._set_lazy_client(
+            'network_versions_client', self.network.NetworkVersionsClient)
+        self._set_lazy_client(
+            'service_providers_client', self.network.ServiceProvidersClient)
+        self._set_lazy_client('tags_client', self.network.TagsClient)
+        self._set_lazy_client('qos_client', self.network.QosClient)
+        self._set_lazy_client(
+            'qos_min_bw_client', self.network.QosMinimumBandwidthRulesClient)
+        self._set_lazy_client(
+            'qos_limit_bw_client', self.network.QosLimitBandwidthRulesClient)
+        self._set_lazy_client(
+            'qos_min_pps_client', self.network.QosMinimumPacketRateRulesClient)
+        self._set_lazy_client('segments_client', self.network.SegmentsClient)
+        self._set_lazy_client('trunks_client', self.network.TrunksClient)
+        self._set_lazy_client(
+            'log_resource_client', self.network.LogResourceClient)
+        self._set_lazy_client(
+            'loggable_resource_client', self.network.LoggableResourceClient)
 
     def _set_image_clients(self):
         if CONF.service_available.glance:
-            self.image_client_v2 = self.image_v2.ImagesClient()
-            self.image_member_client_v2 = self.image_v2.ImageMembersClient()
-            self.image_cache_client = self.image_v2.ImageCacheClient()
-            self.namespaces_client = self.image_v2.NamespacesClient()
-            self.resource_types_client = self.image_v2.ResourceTypesClient()
-            self.namespace_objects_client = \
-                self.image_v2.NamespaceObjectsClient()
-            self.schemas_client = self.image_v2.SchemasClient()
-            self.namespace_properties_client = \
-                self.image_v2.NamespacePropertiesClient()
-            self.namespace_tags_client = self.image_v2.NamespaceTagsClient()
-            self.image_versions_client = self.image_v2.VersionsClient()
-            self.tasks_client = self.image_v2.TaskClient()
+            self._set_lazy_client(
+                'image_client_v2', self.image_v2.ImagesClient)
+            self._set_lazy_client(
+                'image_member_client_v2', self.image_v2.ImageMembersClient)
+            self._set_lazy_client(
+                'image_cache_client', self.image_v2.ImageCacheClient)
+            self._set_lazy_client(
+                'namespaces_client', self.image_v2.NamespacesClient)
+            self._set_lazy_client(
+                'resource_types_client', self.image_v2.ResourceTypesClient)
+            self._set_lazy_client(
+                'namespace_objects_client',
+                self.image_v2.NamespaceObjectsClient)
+            self._set_lazy_client(
+                'schemas_client', self.image_v2.SchemasClient)
+            self._set_lazy_client(
+                'namespace_properties_client',
+                self.image_v2.NamespacePropertiesClient)
+            self._set_lazy_client(
+                'namespace_tags_client', self.image_v2.NamespaceTagsClient)
+            self._set_lazy_client(
+                'image_versions_client', self.image_v2.VersionsClient)
+            self._set_lazy_client('tasks_client', self.image_v2.TaskClient)
             # NOTE(danms): If no alternate endpoint is configured,
             # this client will work the same as the base self.images_client.
             # If your test needs to know if these are different, check the
             # config option to see if the alternate_image_endpoint is set.
-            self.image_client_remote = self.image_v2.ImagesClient(
+            self._set_lazy_client(
+                'image_client_remote', self.image_v2.ImagesClient,
                 service=CONF.image.alternate_image_endpoint,
                 endpoint_type=CONF.image.alternate_image_endpoint_type,
                 region=CONF.image.region)
@@ -119,48 +185,70 @@ class Manager(clients.ServiceClients):
             # self.image_cache_client. If your test needs to know if
             # these are different, check the config option to see if
             # the alternate_image_endpoint is set.
-            self.cache_client_remote = self.image_v2.ImageCacheClient(
+            self._set_lazy_client(
+                'cache_client_remote', self.image_v2.ImageCacheClient,
                 service=CONF.image.alternate_image_endpoint,
                 endpoint_type=CONF.image.alternate_image_endpoint_type,
                 region=CONF.image.region)
 
     def _set_compute_clients(self):
-        self.agents_client = self.compute.AgentsClient()
-        self.compute_networks_client = self.compute.NetworksClient()
-        self.migrations_client = self.compute.MigrationsClient()
-        self.security_group_default_rules_client = (
-            self.compute.SecurityGroupDefaultRulesClient())
-        self.certificates_client = self.compute.CertificatesClient()
+        self._set_lazy_client('agents_client', self.compute.AgentsClient)
+        self._set_lazy_client(
+            'compute_networks_client', self.compute.NetworksClient)
+        self._set_lazy_client(
+            'migrations_client', self.compute.MigrationsClient)
+        self._set_lazy_client(
+            'security_group_default_rules_client',
+            self.compute.SecurityGroupDefaultRulesClient)
+        self._set_lazy_client(
+            'certificates_client', self.compute.CertificatesClient)
         eip = CONF.compute_feature_enabled.enable_instance_password
-        self.servers_client = self.compute.ServersClient(
+        self._set_lazy_client(
+            'servers_client', self.compute.ServersClient,
             enable_instance_password=eip)
-        self.server_groups_client = self.compute.ServerGroupsClient()
-        self.limits_client = self.compute.LimitsClient()
-        self.keypairs_client = self.compute.KeyPairsClient(
+        self._set_lazy_client(
+            'server_groups_client', self.compute.ServerGroupsClient)
+        self._set_lazy_client('limits_client', self.compute.LimitsClient)
+        self._set_lazy_client(
+            'keypairs_client', self.compute.KeyPairsClient,
             ssh_key_type=CONF.validation.ssh_key_type)
-        self.quotas_client = self.compute.QuotasClient()
-        self.quota_classes_client = self.compute.QuotaClassesClient()
-        self.flavors_client = self.compute.FlavorsClient()
-        self.extensions_client = self.compute.ExtensionsClient()
-        self.compute_floating_ips_client = self.compute.FloatingIPsClient()
-        self.compute_security_group_rules_client = (
-            self.compute.SecurityGroupRulesClient())
-        self.compute_security_groups_client = (
-            self.compute.SecurityGroupsClient())
-        self.interfaces_client = self.compute.InterfacesClient()
-        self.availability_zone_client = self.compute.AvailabilityZoneClient()
-        self.aggregates_client = self.compute.AggregatesClient()
-        self.services_client = self.compute.ServicesClient()
-        self.tenant_usages_client = self.compute.TenantUsagesClient()
-        self.hosts_client = self.compute.HostsClient()
-        self.hypervisor_client = self.compute.HypervisorClient()
-        self.instance_usages_audit_log_client = (
-            self.compute.InstanceUsagesAuditLogClient())
-        self.tenant_networks_client = self.compute.TenantNetworksClient()
-        self.assisted_volume_snapshots_client = (
-            self.compute.AssistedVolumeSnapshotsClient())
-        self.server_external_events_client = (
-            self.compute.ServerExternalEventsClient())
+        self._set_lazy_client('quotas_client', self.compute.QuotasClient)
+        self._set_lazy_client(
+            'quota_classes_client', self.compute.QuotaClassesClient)
+        self._set_lazy_client('flavors_client', self.compute.FlavorsClient)
+        self._set_lazy_client(
+            'extensions_client', self.compute.ExtensionsClient)
+        self._set_lazy_client(
+            'compute_floating_ips_client', self.compute.FloatingIPsClient)
+        self._set_lazy_client(
+            'compute_security_group_rules_client',
+            self.compute.SecurityGroupRulesClient)
+        self._set_lazy_client(
+            'compute_security_groups_client',
+            self.compute.SecurityGroupsClient)
+        self._set_lazy_client(
+            'interfaces_client', self.compute.InterfacesClient)
+        self._set_lazy_client(
+            'availability_zone_client', self.compute.AvailabilityZoneClient)
+        self._set_lazy_client(
+            'aggregates_client', self.compute.AggregatesClient)
+        self._set_lazy_client('services_client', self.compute.ServicesClient)
+        self._set_lazy_client(
+            'tenant_usages_client', self.compute.TenantUsagesClient)
+        self._set_lazy_client('hosts_client', self.compute.HostsClient)
+        self._set_lazy_client(
+            'hypervisor_client', self.compute.HypervisorClient)
+        self._set_lazy_client(
+            'instance_usages_audit_log_client',
+            self.compute.InstanceUsagesAuditLogClient)
+        self._set_lazy_client(
+            'tenant_networks_client', self.compute.TenantNetworksClient)
+        self._set_lazy_client(
+            'assisted_volume_snapshots_client',
+            self.compute.AssistedVolumeSnapshotsClient)
+        self._set_lazy_client(
+            'server_external_events_client',
+            self.compute.ServerExternalEventsClient)
 
         # NOTE: The following client needs special timeout values because
         # the API is a proxy for the other component.
@@ -168,68 +256,100 @@ class Manager(clients.ServiceClients):
             'build_interval': CONF.volume.build_interval,
             'build_timeout': CONF.volume.build_timeout
         }
-        self.volumes_extensions_client = self.compute.VolumesClient(
+        self._set_lazy_client(
+            'volumes_extensions_client', self.compute.VolumesClient,
             **params_volume)
-        self.compute_versions_client = self.compute.VersionsClient(
+        self._set_lazy_client(
+            'compute_versions_client', self.compute.VersionsClient,
             **params_volume)
-        self.snapshots_extensions_client = self.compute.SnapshotsClient(
+        self._set_lazy_client(
+            'snapshots_extensions_client', self.compute.SnapshotsClient,
             **params_volume)
-        self.compute_images_client = self.compute.ImagesClient(
+        self._set_lazy_client(
+            'compute_images_client', self.compute.ImagesClient,
             build_timeout=CONF.image.build_timeout)
 
     def _set_placement_clients(self):
-        self.placement_client = self.placement.PlacementClient()
-        self.resource_providers_client = \
-            self.placement.ResourceProvidersClient()
+        self._set_lazy_client(
+            'placement_client', self.placement.PlacementClient)
+        self._set_lazy_client(
+            'resource_providers_client',
+            self.placement.ResourceProvidersClient)
 
     def _set_identity_clients(self):
         # Clients below use the endpoint type of Keystone API v3, which is set
         # in endpoint_type
         params_v3 = {'endpoint_type': CONF.identity.v3_endpoint_type}
-        self.domains_client = self.identity_v3.DomainsClient(**params_v3)
-        self.identity_v3_client = self.identity_v3.IdentityClient(**params_v3)
-        self.trusts_client = self.identity_v3.TrustsClient(**params_v3)
-        self.users_v3_client = self.identity_v3.UsersClient(**params_v3)
-        self.endpoints_v3_client = self.identity_v3.EndPointsClient(
+        self._set_lazy_client(
+            'domains_client', self.identity_v3.DomainsClient, **params_v3)
+        self._set_lazy_client(
+            'identity_v3_client', self.identity_v3.IdentityClient, **params_v3)
+        self._set_lazy_client(
+            'trusts_client', self.identity_v3.TrustsClient, **params_v3)
+        self._set_lazy_client(
+            'users_v3_client', self.identity_v3.UsersClient, **params_v3)
+        self._set_lazy_client(
+            'endpoints_v3_client', self.identity_v3.EndPointsClient,
+            **params_v3)
+        self._set_lazy_client(
+            'roles_v3_client', self.identity_v3.RolesClient, **params_v3)
+        self._set_lazy_client(
+            'inherited_roles_client', self.identity_v3.InheritedRolesClient,
+            **params_v3)
+        self._set_lazy_client(
+            'role_assignments_client', self.identity_v3.RoleAssignmentsClient,
+            **params_v3)
+        self._set_lazy_client(
+            'identity_services_v3_client', self.identity_v3.ServicesClient,
             **params_v3)
-        self.roles_v3_client = self.identity_v3.RolesClient(**params_v3)
-        self.inherited_roles_client = self.identity_v3.InheritedRolesClient(
+        self._set_lazy_client(
+            'policies_client', self.identity_v3.PoliciesClient, **params_v3)
+        self._set_lazy_client(
+            'projects_client', self.identity_v3.ProjectsClient, **params_v3)
+        self._set_lazy_client(
+            'regions_client', self.identity_v3.RegionsClient, **params_v3)
+        self._set_lazy_client(
+            'credentials_client', self.identity_v3.CredentialsClient,
             **params_v3)
-        self.role_assignments_client = self.identity_v3.RoleAssignmentsClient(
+        self._set_lazy_client(
+            'groups_client', self.identity_v3.GroupsClient, **params_v3)
+        self._set_lazy_client(
+            'identity_versions_v3_client', self.identity_v3.VersionsClient,
             **params_v3)
-        self.identity_services_v3_client = self.identity_v3.ServicesClient(
+        self._set_lazy_client(
+            'oauth_consumers_client', self.identity_v3.OAUTHConsumerClient,
             **params_v3)
-        self.policies_client = self.identity_v3.PoliciesClient(**params_v3)
-        self.projects_client = self.identity_v3.ProjectsClient(**params_v3)
-        self.regions_client = self.identity_v3.RegionsClient(**params_v3)
-        self.credentials_client = self.identity_v3.CredentialsClient(
+        self._set_lazy_client(
+            'oauth_token_client', self.identity_v3.OAUTHTokenClient,
             **params_v3)
-        self.groups_client = self.identity_v3.GroupsClient(**params_v3)
-        self.identity_versions_v3_client = self.identity_v3.VersionsClient(
+        self._set_lazy_client(
+            'domain_config_client', self.identity_v3.DomainConfigurationClient,
             **params_v3)
-        self.oauth_consumers_client = self.identity_v3.OAUTHConsumerClient(
+        self._set_lazy_client(
+            'endpoint_filter_client', self.identity_v3.EndPointsFilterClient,
             **params_v3)
-        self.oauth_token_client = self.identity_v3.OAUTHTokenClient(
+        self._set_lazy_client(
+            'endpoint_groups_client', self.identity_v3.EndPointGroupsClient,
             **params_v3)
-        self.domain_config_client = self.identity_v3.DomainConfigurationClient(
+        self._set_lazy_client(
+            'catalog_client', self.identity_v3.CatalogClient, **params_v3)
+        self._set_lazy_client(
+            'project_tags_client', self.identity_v3.ProjectTagsClient,
             **params_v3)
-        self.endpoint_filter_client = \
-            self.identity_v3.EndPointsFilterClient(**params_v3)
-        self.endpoint_groups_client = self.identity_v3.EndPointGroupsClient(
+        self._set_lazy_client(
+            'application_credentials_client',
+            self.identity_v3.ApplicationCredentialsClient, **params_v3)
+        self._set_lazy_client(
+            'access_rules_client', self.identity_v3.AccessRulesClient,
             **params_v3)
-        self.catalog_client = self.identity_v3.CatalogClient(**params_v3)
-        self.project_tags_client = self.identity_v3.ProjectTagsClient(
+        self._set_lazy_client(
+            'identity_limits_client', self.identity_v3.LimitsClient,
             **params_v3)
-        self.application_credentials_client = \
-            self.identity_v3.ApplicationCredentialsClient(**params_v3)
-        self.access_rules_client = \
-            self.identity_v3.AccessRulesClient(**params_v3)
-        self.identity_limits_client = \
-            self.identity_v3.LimitsClient(**params_v3)
 
         if CONF.identity_feature_enabled.api_v3:
             if CONF.identity.uri_v3:
-                self.token_v3_client = self.identity_v3.V3TokenClient(
+                self._set_lazy_client(
+                    'token_v3_client', self.identity_v3.V3TokenClient,
                     auth_url=CONF.identity.uri_v3)
             else:
                 msg = 'Identity v3 API enabled, but no identity.uri_v3 set'
@@ -237,94 +357,137 @@ class Manager(clients.ServiceClients):
 
     def _set_volume_clients(self):
 
-        self.backups_client_latest = self.volume_v3.BackupsClient()
-        self.encryption_types_client_latest = \
-            self.volume_v3.EncryptionTypesClient()
-        self.snapshot_manage_client_latest = \
-            self.volume_v3.SnapshotManageClient()
-        self.snapshots_client_latest = self.volume_v3.SnapshotsClient()
-        self.volume_capabilities_client_latest = \
-            self.volume_v3.CapabilitiesClient()
-        self.volume_manage_client_latest = (
-            self.volume_v3.VolumeManageClient())
-        self.volume_qos_client_latest = self.volume_v3.QosSpecsClient()
-        self.volume_services_client_latest = (
-            self.volume_v3.ServicesClient())
-        self.volume_types_client_latest = self.volume_v3.TypesClient()
-        self.volume_hosts_client_latest = self.volume_v3.HostsClient()
-        self.volume_quotas_client_latest = self.volume_v3.QuotasClient()
-        self.volume_quota_classes_client_latest = \
-            self.volume_v3.QuotaClassesClient()
-        self.volume_scheduler_stats_client_latest = \
-            self.volume_v3.SchedulerStatsClient()
-        self.volume_transfers_client_latest = \
-            self.volume_v3.TransfersClient()
-        self.volume_transfers_mv355_client_latest = \
-            self.volume_v3.TransfersV355Client()
-        self.volume_availability_zone_client_latest = \
-            self.volume_v3.AvailabilityZoneClient()
-        self.volume_limits_client_latest = self.volume_v3.LimitsClient()
-        self.volumes_client_latest = self.volume_v3.VolumesClient()
-        self.volumes_extension_client_latest = \
-            self.volume_v3.ExtensionsClient()
-        self.group_types_client_latest = self.volume_v3.GroupTypesClient()
-        self.groups_client_latest = self.volume_v3.GroupsClient()
-        self.group_snapshots_client_latest = \
-            self.volume_v3.GroupSnapshotsClient()
-        self.volume_messages_client_latest = (
-            self.volume_v3.MessagesClient())
-        self.volume_versions_client_latest = (
-            self.volume_v3.VersionsClient())
-        self.attachments_client_latest = (
-            self.volume_v3.AttachmentsClient())
+        self._set_lazy_client(
+            'backups_client_latest', self.volume_v3.BackupsClient)
+        self._set_lazy_client(
+            'encryption_types_client_latest',
+            self.volume_v3.EncryptionTypesClient)
+        self._set_lazy_client(
+            'snapshot_manage_client_latest',
+            self.volume_v3.SnapshotManageClient)
+        self._set_lazy_client(
+            'snapshots_client_latest', self.volume_v3.SnapshotsClient)
+        self._set_lazy_client(
+            'volume_capabilities_client_latest',
+            self.volume_v3.CapabilitiesClient)
+        self._set_lazy_client(
+            'volume_manage_client_latest', self.volume_v3.VolumeManageClient)
+        self._set_lazy_client(
+            'volume_qos_client_latest', self.volume_v3.QosSpecsClient)
+        self._set_lazy_client(
+            'volume_services_client_latest', self.volume_v3.ServicesClient)
+        self._set_lazy_client(
+            'volume_types_client_latest', self.volume_v3.TypesClient)
+        self._set_lazy_client(
+            'volume_hosts_client_latest', self.volume_v3.HostsClient)
+        self._set_lazy_client(
+            'volume_quotas_client_latest', self.volume_v3.QuotasClient)
+        self._set_lazy_client(
+            'volume_quota_classes_client_latest',
+            self.volume_v3.QuotaClassesClient)
+        self._set_lazy_client(
+            'volume_scheduler_stats_client_latest',
+            self.volume_v3.SchedulerStatsClient)
+        self._set_lazy_client(
+            'volume_transfers_client_latest', self.volume_v3.TransfersClient)
+        self._set_lazy_client(
+            'volume_transfers_mv355_client_latest',
+            self.volume_v3.TransfersV355Client)
+        self._set_lazy_client(
+            'volume_availability_zone_client_latest',
+            self.volume_v3.AvailabilityZoneClient)
+        self._set_lazy_client(
+            'volume_limits_client_latest', self.volume_v3.LimitsClient)
+        self._set_lazy_client(
+            'volumes_client_latest', self.volume_v3.VolumesClient)
+        self._set_lazy_client(
+            'volumes_extension_client_latest', self.volume_v3.ExtensionsClient)
+        self._set_lazy_client(
+            'group_types_client_latest', self.volume_v3.GroupTypesClient)
+        self._set_lazy_client(
+            'groups_client_latest', self.volume_v3.GroupsClient)
+        self._set_lazy_client(
+            'group_snapshots_client_latest',
+            self.volume_v3.GroupSnapshotsClient)
+        self._set_lazy_client(
+            'volume_messages_client_latest', self.volume_v3.MessagesClient)
+        self._set_lazy_client(
+            'volume_versions_client_latest', self.volume_v3.VersionsClient)
+        self._set_lazy_client(
+            'attachments_client_latest', self.volume_v3.AttachmentsClient)
 
         # TODO(gmann): Below alias for service clients have been
         # deprecated and will be removed in future. Start using the alias
         # defined above with suffix _latest.
         # ****************Deprecated alias start from here***************
-        self.backups_v2_client = self.volume_v3.BackupsClient()
-        self.encryption_types_v2_client = \
-            self.volume_v3.EncryptionTypesClient()
-        self.snapshot_manage_v2_client = \
-            self.volume_v3.SnapshotManageClient()
-        self.snapshots_v2_client = self.volume_v3.SnapshotsClient()
-        self.volume_capabilities_v2_client = \
-            self.volume_v3.CapabilitiesClient()
-        self.volume_manage_v2_client = self.volume_v3.VolumeManageClient()
-        self.volume_qos_v2_client = self.volume_v3.QosSpecsClient()
-        self.volume_services_v2_client = self.volume_v3.ServicesClient()
-        self.volume_types_v2_client = self.volume_v3.TypesClient()
-        self.volume_hosts_v2_client = self.volume_v3.HostsClient()
-        self.volume_quotas_v2_client = self.volume_v3.QuotasClient()
-        self.volume_quota_classes_v2_client = \
-            self.volume_v3.QuotaClassesClient()
-        self.volume_scheduler_stats_v2_client = \
-            self.volume_v3.SchedulerStatsClient()
-        self.volume_transfers_v2_client = self.volume_v3.TransfersClient()
-        self.volume_v2_availability_zone_client = \
-            self.volume_v3.AvailabilityZoneClient()
-        self.volume_v2_limits_client = self.volume_v3.LimitsClient()
-        self.volumes_v2_client = self.volume_v3.VolumesClient()
-        self.volumes_v2_extension_client = \
-            self.volume_v3.ExtensionsClient()
+        self._set_lazy_client(
+            'backups_v2_client', self.volume_v3.BackupsClient)
+        self._set_lazy_client(
+            'encryption_types_v2_client', self.volume_v3.EncryptionTypesClient)
+        self._set_lazy_client(
+            'snapshot_manage_v2_client', self.volume_v3.SnapshotManageClient)
+        self._set_lazy_client(
+            'snapshots_v2_client', self.volume_v3.SnapshotsClient)
+        self._set_lazy_client(
+            'volume_capabilities_v2_client', self.volume_v3.CapabilitiesClient)
+        self._set_lazy_client(
+            'volume_manage_v2_client', self.volume_v3.VolumeManageClient)
+        self._set_lazy_client(
+            'volume_qos_v2_client', self.volume_v3.QosSpecsClient)
+        self._set_lazy_client(
+            'volume_services_v2_client', self.volume_v3.ServicesClient)
+        self._set_lazy_client(
+            'volume_types_v2_client', self.volume_v3.TypesClient)
+        self._set_lazy_client(
+            'volume_hosts_v2_client', self.volume_v3.HostsClient)
+        self._set_lazy_client(
+            'volume_quotas_v2_client', self.volume_v3.QuotasClient)
+        self._set_lazy_client(
+            'volume_quota_classes_v2_client',
+            self.volume_v3.QuotaClassesClient)
+        self._set_lazy_client(
+            'volume_scheduler_stats_v2_client',
+            self.volume_v3.SchedulerStatsClient)
+        self._set_lazy_client(
+            'volume_transfers_v2_client', self.volume_v3.TransfersClient)
+        self._set_lazy_client(
+            'volume_v2_availability_zone_client',
+            self.volume_v3.AvailabilityZoneClient)
+        self._set_lazy_client(
+            'volume_v2_limits_client', self.volume_v3.LimitsClient)
+        self._set_lazy_client(
+            'volumes_v2_client', self.volume_v3.VolumesClient)
+        self._set_lazy_client(
+            'volumes_v2_extension_client', self.volume_v3.ExtensionsClient)
 
-        self.backups_v3_client = self.volume_v3.BackupsClient()
-        self.group_types_v3_client = self.volume_v3.GroupTypesClient()
-        self.groups_v3_client = self.volume_v3.GroupsClient()
-        self.group_snapshots_v3_client = \
-            self.volume_v3.GroupSnapshotsClient()
-        self.snapshots_v3_client = self.volume_v3.SnapshotsClient()
-        self.volume_v3_messages_client = self.volume_v3.MessagesClient()
-        self.volume_v3_versions_client = self.volume_v3.VersionsClient()
-        self.volumes_v3_client = self.volume_v3.VolumesClient()
+        self._set_lazy_client(
+            'backups_v3_client', self.volume_v3.BackupsClient)
+        self._set_lazy_client(
+            'group_types_v3_client', self.volume_v3.GroupTypesClient)
+        self._set_lazy_client('groups_v3_client', self.volume_v3.GroupsClient)
+        self._set_lazy_client(
+            'group_snapshots_v3_client', self.volume_v3.GroupSnapshotsClient)
+        self._set_lazy_client(
+            'snapshots_v3_client', self.volume_v3.SnapshotsClient)
+        self._set_lazy_client(
+            'volume_v3_messages_client', self.volume_v3.MessagesClient)
+        self._set_lazy_client(
+            'volume_v3_versions_client', self.volume_v3.VersionsClient)
+        self._set_lazy_client(
+            'volumes_v3_client', self.volume_v3.VolumesClient)
         # ****************Deprecated alias end here***********************
 
     def _set_object_storage_clients(self):
-        self.account_client = self.object_storage.AccountClient()
-        self.bulk_client = self.object_storage.BulkMiddlewareClient()
-        self.capabilities_client = self.object_storage.CapabilitiesClient()
-        self.container_client = self.object_storage.ContainerClient()
-        self.object_client = self.object_storage.ObjectClient()
+        self._set_lazy_client(
+            'account_client', self.object_storage.AccountClient)
+        self._set_lazy_client(
+            'bulk_client', self.object_storage.BulkMiddlewareClient)
+        self._set_lazy_client(
+            'capabilities_client', self.object_storage.CapabilitiesClient)
+        self._set_lazy_client(
+            'container_client', self.object_storage.ContainerClient)
+        self._set_lazy_client(
+            'object_client', self.object_storage.ObjectClient)
 
 
 def get_auth_provider_class(credentials):
@@ -342,9 +505,9 @@ def get_auth_provider(credentials, pre_auth=False, scope='project'):
             'Credentials must be specified')
     auth_provider_class, auth_url = get_auth_provider_class(
         credentials)
-    _auth_provider = auth_provider_class(credentials, auth_url,
-                                         scope=scope,
-                                         **default_params)
+    _auth_provider = auth_provider_class(
+        credentials, auth_url, scope=scope,
+        token_cache=CONF.identity.token_cache, **default_params)
     if pre_auth:
         _auth_provider.set_auth()
     return _auth_provider
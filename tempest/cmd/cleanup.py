@@ -91,8 +91,11 @@ Runtime Arguments
   contains all resources created by Tempest during all Tempest runs, to
   create another method for removing only resources created by Tempest.
   List of these resources is created when config option ``record_resources``
-  in default section is set to true. After using this option for cleanup,
-  the existing ``./resource_list.json`` is cleared from deleted resources.
+  in default section is set to true. Tempest appends the resources it
+  creates to ``./resource_list.journal``, which is merged into
+  ``./resource_list.json`` when this option is used. After using this option
+  for cleanup, the existing ``./resource_list.json`` is cleared from deleted
+  resources.
 
   When this option is used, ``saved_state.json`` file is not needed (no
   need to run with ``--init-saved-state`` first). If there is any
@@ -104,6 +107,26 @@ Runtime Arguments
   the ``--resource-list`` option will be ignored and cleanup will be done
   based on the ``--prefix`` option only.
 
+* ``--workers``: Number of cleanups running concurrently, default is 1.
+  When there are several projects to clean up, that many projects are
+  cleaned up concurrently, and the services of each project run one after
+  the other. With a single project, and for the global and resource
+  services, that many services which do not depend on each other run
+  concurrently, while dependent ones keep their order (e.g. servers and
+  ports are deleted before networks). Either way, no more than that many
+  services run at the same time. The content of ``dry_run.json`` does not
+  depend on this option.
+
+  Whatever the number of workers, services whose resources depend on
+  resources deleted asynchronously, like volumes attached to servers, wait
+  until those resources are gone before they run, for at most
+  ``--deletion-timeout`` seconds. The time taken by each service is logged.
+
+* ``--deletion-timeout``: Maximum time in seconds a service waits for the
+  asynchronous deletions of the services it depends on, default is 300.
+  The deletions which are not complete by then are logged and the service
+  runs anyway. With 0, the deletions are not waited for.
+
 * ``--help``: Print the help text for the command and parameters.
 
 .. [1] The ``_projects_to_clean`` dictionary in ``dry_run.json`` lists the
@@ -124,11 +147,14 @@ Runtime Arguments
     complicated logic.
 
 """
+from concurrent import futures
+import functools
 import os
 import sys
 import traceback
 
 from cliff import command
+from oslo_concurrency import lockutils
 from oslo_log import log as logging
 from oslo_serialization import jsonutils as json
 
@@ -136,11 +162,13 @@ from tempest import clients
 from tempest.cmd import cleanup_service
 from tempest.common import credentials_factory as credentials
 from tempest import config
+from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 
 SAVED_STATE_JSON = "saved_state.json"
 DRY_RUN_JSON = "dry_run.json"
 RESOURCE_LIST_JSON = "resource_list.json"
+RESOURCE_LIST_JOURNAL = "resource_list.journal"
 LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
@@ -243,8 +271,18 @@ class TempestCleanup(command.Command):
         LOG.info("Processing %s projects", len(projects))
 
         # Loop through list of projects and clean them up.
-        for project in projects:
-            self._clean_project(project)
+        workers = self.options.workers
+        if workers > 1 and len(projects) > 1:
+            # The projects are cleaned up concurrently, and the services of
+            # each project one after the other, so that no more than
+            # `workers` services run at the same time
+            clean_project = functools.partial(self._clean_project, workers=1)
+            with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                # list() re-raises the errors of the project cleanups
+                list(executor.map(clean_project, projects))
+        else:
+            for project in projects:
+                self._clean_project(project, workers=workers)
 
         kwargs = {'data': self.dry_run_data,
                   'is_dry_run': is_dry_run,
@@ -256,14 +294,14 @@ class TempestCleanup(command.Command):
                   'prefix': cleanup_prefix,
                   'got_exceptions': self.GOT_EXCEPTIONS}
         LOG.info("Processing global services")
-        for service in self.global_services:
-            svc = service(admin_mgr, **kwargs)
-            svc.run()
+        cleanup_service.run_cleanup_services(
+            self.global_services, admin_mgr, workers,
+            deletion_timeout=self.options.deletion_timeout, **kwargs)
 
         LOG.info("Processing services")
-        for service in self.resource_cleanup_services:
-            svc = service(self.admin_mgr, **kwargs)
-            svc.run()
+        cleanup_service.run_cleanup_services(
+            self.resource_cleanup_services, self.admin_mgr, workers,
+            deletion_timeout=self.options.deletion_timeout, **kwargs)
 
         if is_dry_run:
             with open(DRY_RUN_JSON, 'w+') as f:
@@ -275,7 +313,7 @@ class TempestCleanup(command.Command):
             with open(RESOURCE_LIST_JSON, 'w') as f:
                 f.write('{}')
 
-    def _clean_project(self, project):
+    def _clean_project(self, project, workers=1):
         LOG.debug("Cleaning project:  %s ", project['name'])
         is_dry_run = self.options.dry_run
         dry_run_data = self.dry_run_data
@@ -299,9 +337,9 @@ class TempestCleanup(command.Command):
                   'project_id': project_id,
                   'prefix': cleanup_prefix,
                   'got_exceptions': self.GOT_EXCEPTIONS}
-        for service in self.project_associated_services:
-            svc = service(self.admin_mgr, **kwargs)
-            svc.run()
+        cleanup_service.run_cleanup_services(
+            self.project_associated_services, self.admin_mgr, workers,
+            deletion_timeout=self.options.deletion_timeout, **kwargs)
 
     def get_parser(self, prog_name):
         parser = super(TempestCleanup, self).get_parser(prog_name)
@@ -350,6 +388,23 @@ class TempestCleanup(command.Command):
                             "state - all resources present at that moment. "
                             "This option will be ignored if passed with "
                             "--prefix.")
+        parser.add_argument('--workers', type=int, default=1,
+                            dest='workers',
+                            help="Number of cleanups running concurrently: "
+                            "projects when there are several projects to "
+                            "clean up, else services which do not depend "
+                            "on each other. Services which depend on each "
+                            "other, such as servers, ports and networks, "
+                            "still run in order. Defaults to 1, which "
+                            "cleans up everything serially.")
+        parser.add_argument('--deletion-timeout', type=int,
+                            default=cleanup_service.DELETION_TIMEOUT,
+                            dest='deletion_timeout',
+                            help="Maximum time in seconds a service waits "
+                            "for the asynchronous deletions, such as the "
+                            "servers and volumes ones, of the services it "
+                            "depends on. Defaults to %d, 0 disables the "
+                            "waiting." % cleanup_service.DELETION_TIMEOUT)
         parser.add_argument('--config-file', default=None, dest='config_file',
                             help='Configuration file to cleanup tempest with')
         return parser
@@ -392,8 +447,16 @@ class TempestCleanup(command.Command):
             f.write(json.dumps(data, sort_keys=True,
                                indent=2, separators=(',', ': ')))
 
-    def _load_resource_list(self, resource_list_json=RESOURCE_LIST_JSON):
+    def _load_resource_list(self, resource_list_json=RESOURCE_LIST_JSON,
+                            journal=RESOURCE_LIST_JOURNAL):
         try:
+            if os.path.exists(journal):
+                LOG.info("Merging '%s' into '%s'.", journal,
+                         resource_list_json)
+                rest_client.compact_resource_journal(
+                    resource_list_json, journal,
+                    lock_path=os.path.join(lockutils.get_lock_path(CONF),
+                                           'tempest-rec-rw-lock'))
             with open(resource_list_json, 'rb') as json_file:
                 self.resource_data = json.load(json_file)
         except IOError as ex:
@@ -12,7 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from urllib import parse as urllib
+from concurrent import futures
+import threading
+import time
 
 from oslo_log import log as logging
 
@@ -22,6 +24,8 @@ from tempest.common import identity
 from tempest.common import utils
 from tempest.common.utils import net_info
 from tempest import config
+from tempest.lib.common import polling
+from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 
 LOG = logging.getLogger('tempest.cmd.cleanup')
@@ -41,6 +45,10 @@ IS_GLANCE = None
 IS_NEUTRON = None
 IS_NOVA = None
 
+# Default maximum time in seconds a service waits for the deletions issued
+# by the services it depends on
+DELETION_TIMEOUT = 300
+
 
 def init_conf():
     global CONF_FLAVORS
@@ -143,6 +151,19 @@ class BaseService(object):
                 items.append(item)
         return items
 
+    def _track_deletions(self, resource_ids):
+        """Records deletions which complete asynchronously.
+
+        The services depending on this one wait until the resources are
+        not listed anymore before they run.
+        """
+        tracker = getattr(self, 'deletion_tracker', None)
+        if tracker is not None and resource_ids:
+            tracker.track(self.__class__, resource_ids, self._list_ids)
+
+    def _list_ids(self):
+        return {item['id'] for item in self.list()}
+
     def list(self):
         pass
 
@@ -183,7 +204,8 @@ class SnapshotService(BaseService):
 
     def list(self):
         client = self.client
-        snaps = client.list_snapshots()['snapshots']
+        snaps = list(rest_client.paginate(client.list_snapshots,
+                                          'snapshots'))
 
         if self.prefix:
             snaps = self._filter_by_prefix(snaps)
@@ -198,12 +220,15 @@ class SnapshotService(BaseService):
     def delete(self):
         snaps = self.list()
         client = self.client
+        deleted = []
         for snap in snaps:
             try:
                 LOG.debug("Deleting Snapshot with id %s", snap['id'])
                 client.delete_snapshot(snap['id'])
+                deleted.append(snap['id'])
             except Exception:
                 LOG.exception("Delete Snapshot %s exception.", snap['id'])
+        self._track_deletions(deleted)
 
     def dry_run(self):
         snaps = self.list()
@@ -224,8 +249,7 @@ class ServerService(BaseService):
 
     def list(self):
         client = self.client
-        servers_body = client.list_servers()
-        servers = servers_body['servers']
+        servers = list(rest_client.paginate(client.list_servers, 'servers'))
 
         if self.prefix:
             servers = self._filter_by_prefix(servers)
@@ -240,12 +264,15 @@ class ServerService(BaseService):
     def delete(self):
         client = self.client
         servers = self.list()
+        deleted = []
         for server in servers:
             try:
                 LOG.debug("Deleting Server with id %s", server['id'])
                 client.delete_server(server['id'])
+                deleted.append(server['id'])
             except Exception:
                 LOG.exception("Delete Server %s exception.", server['id'])
+        self._track_deletions(deleted)
 
     def dry_run(self):
         servers = self.list()
@@ -343,7 +370,7 @@ class VolumeService(BaseService):
 
     def list(self):
         client = self.client
-        vols = client.list_volumes()['volumes']
+        vols = list(rest_client.paginate(client.list_volumes, 'volumes'))
 
         if self.prefix:
             vols = self._filter_by_prefix(vols)
@@ -358,12 +385,15 @@ class VolumeService(BaseService):
     def delete(self):
         client = self.client
         vols = self.list()
+        deleted = []
         for v in vols:
             try:
                 LOG.debug("Deleting volume with id %s", v['id'])
                 client.delete_volume(v['id'])
+                deleted.append(v['id'])
             except Exception:
                 LOG.exception("Delete Volume %s exception.", v['id'])
+        self._track_deletions(deleted)
 
     def dry_run(self):
         vols = self.list()
@@ -490,8 +520,8 @@ class NetworkService(BaseNetworkService):
 
     def list(self):
         client = self.networks_client
-        networks = client.list_networks(**self.tenant_filter)
-        networks = networks['networks']
+        networks = list(rest_client.paginate(client.list_networks,
+                                             'networks', **self.tenant_filter))
 
         if self.prefix:
             networks = self._filter_by_prefix(networks)
@@ -534,8 +564,8 @@ class NetworkFloatingIpService(BaseNetworkService):
 
     def list(self):
         client = self.floating_ips_client
-        flips = client.list_floatingips(**self.tenant_filter)
-        flips = flips['floatingips']
+        flips = list(rest_client.paginate(client.list_floatingips,
+                                          'floatingips', **self.tenant_filter))
 
         if self.prefix:
             # this means we're cleaning resources based on a certain prefix,
@@ -576,8 +606,8 @@ class NetworkRouterService(BaseNetworkService):
 
     def list(self):
         client = self.routers_client
-        routers = client.list_routers(**self.tenant_filter)
-        routers = routers['routers']
+        routers = list(rest_client.paginate(client.list_routers, 'routers',
+                                            **self.tenant_filter))
 
         if self.prefix:
             routers = self._filter_by_prefix(routers)
@@ -719,7 +749,8 @@ class NetworkPortService(BaseNetworkService):
     def list(self):
         client = self.ports_client
         ports = [port for port in
-                 client.list_ports(**self.tenant_filter)['ports']
+                 rest_client.paginate(client.list_ports, 'ports',
+                                      **self.tenant_filter)
                  if port["device_owner"] == "" or
                  port["device_owner"].startswith("compute:")]
 
@@ -763,7 +794,8 @@ class NetworkSecGroupService(BaseNetworkService):
         filter = self.tenant_filter
         # cannot delete default sec group so never show it.
         secgroups = [secgroup for secgroup in
-                     client.list_security_groups(**filter)['security_groups']
+                     rest_client.paginate(client.list_security_groups,
+                                          'security_groups', **filter)
                      if secgroup['name'] != 'default']
 
         if self.prefix:
@@ -810,8 +842,8 @@ class NetworkSubnetService(BaseNetworkService):
 
     def list(self):
         client = self.subnets_client
-        subnets = client.list_subnets(**self.tenant_filter)
-        subnets = subnets['subnets']
+        subnets = list(rest_client.paginate(client.list_subnets, 'subnets',
+                                            **self.tenant_filter))
 
         if self.prefix:
             subnets = self._filter_by_prefix(subnets)
@@ -851,7 +883,8 @@ class NetworkSubnetPoolsService(BaseNetworkService):
 
     def list(self):
         client = self.subnetpools_client
-        pools = client.list_subnetpools(**self.tenant_filter)['subnetpools']
+        pools = list(rest_client.paginate(client.list_subnetpools,
+                                          'subnetpools', **self.tenant_filter))
 
         if self.prefix:
             pools = self._filter_by_prefix(pools)
@@ -990,14 +1023,7 @@ class ImageService(BaseService):
 
     def list(self):
         client = self.client
-        response = client.list_images()
-        images = []
-        images.extend(response['images'])
-        while 'next' in response:
-            parsed = urllib.urlparse(response['next'])
-            marker = urllib.parse_qs(parsed.query)['marker'][0]
-            response = client.list_images(params={"marker": marker})
-            images.extend(response['images'])
+        images = list(rest_client.paginate(client.list_images, 'images'))
 
         if self.prefix:
             images = self._filter_by_prefix(images)
@@ -1270,3 +1296,188 @@ def get_global_cleanup_services():
     global_services.append(RoleService)
     global_services.append(RegionService)
     return global_services
+
+
+# Services which must have completed before a service can run. Only the
+# services in the same call to run_cleanup_services are taken into account,
+# the order of the lists returned by the get_*_cleanup_services functions
+# already satisfies these dependencies.
+CLEANUP_DEPENDENCIES = {
+    ServerGroupService: (ServerService,),
+    NetworkMeteringLabelService: (NetworkMeteringLabelRuleService,),
+    NetworkRouterService: (NetworkFloatingIpService,),
+    NetworkPortService: (ServerService, NetworkFloatingIpService,
+                         NetworkRouterService),
+    NetworkSubnetService: (NetworkRouterService, NetworkPortService),
+    NetworkService: (NetworkRouterService, NetworkPortService,
+                     NetworkSubnetService),
+    NetworkSecGroupService: (ServerService, NetworkPortService),
+    NetworkSubnetPoolsService: (NetworkSubnetService,),
+    VolumeService: (ServerService, SnapshotService),
+    DomainService: (UserService, ProjectService),
+}
+
+
+class DeletionTracker(object):
+    """Tracks the deletions issued by cleanup services.
+
+    Some resources, like servers and volumes, are deleted asynchronously.
+    The services which delete them record the deletions with `track`, and
+    the services depending on them `wait` until the resources are gone,
+    rather than failing on resources still in use. The outstanding
+    deletions of a service are polled with a single list call.
+
+    :param timeout: maximum time in seconds a call to `wait` lasts
+    :param policy: the `tempest.lib.common.polling.PollingPolicy` used
+        between two polls
+    """
+
+    def __init__(self, timeout=DELETION_TIMEOUT, policy=None):
+        self.timeout = timeout
+        self.policy = policy or polling.ExponentialPolicy(0.5, 5)
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def track(self, service, resource_ids, list_ids):
+        """Records deletions issued by a service.
+
+        :param service: the service class which deleted the resources
+        :param resource_ids: the ids of the deleted resources
+        :param list_ids: callable returning the ids of the resources
+            still existing, with one list call
+        """
+        with self._lock:
+            pending_ids, _ = self._pending.get(service, (set(), None))
+            pending_ids.update(resource_ids)
+            self._pending[service] = (pending_ids, list_ids)
+
+    def pending(self, service):
+        """Returns the ids of the resources not deleted yet."""
+        with self._lock:
+            return set(self._pending.get(service, (set(), None))[0])
+
+    def _poll(self, service):
+        # The list call is made without holding the lock, so that it does
+        # not block the services tracking deletions or polling other ones
+        with self._lock:
+            if service not in self._pending:
+                return
+            pending_ids, list_ids = self._pending[service]
+            polled_ids = set(pending_ids)
+        try:
+            existing_ids = list_ids()
+        except Exception:
+            LOG.exception("Failed listing the resources of %s",
+                          service.__name__)
+            return
+        with self._lock:
+            if service not in self._pending:
+                return
+            # Deleted resources do not come back, only the ids tracked
+            # after the snapshot may still need to be listed
+            pending_ids = self._pending[service][0]
+            pending_ids -= polled_ids - existing_ids
+            if not pending_ids:
+                del self._pending[service]
+
+    def wait(self, services):
+        """Waits until the resources deleted by services are gone.
+
+        Deletions which are not complete after the timeout are logged and
+        not waited for anymore.
+
+        :param services: the service classes to wait for
+        :return: the time waited, in seconds
+        """
+        poller = self.policy.start()
+        logged = False
+        while True:
+            for service in services:
+                self._poll(service)
+            with self._lock:
+                outstanding = [service for service in services
+                               if service in self._pending]
+                if outstanding and poller.elapsed >= self.timeout:
+                    for service in outstanding:
+                        LOG.warning(
+                            "Resources deleted by %s still exist after %s "
+                            "seconds: %s", service.__name__, self.timeout,
+                            ', '.join(sorted(self._pending[service][0])))
+                        del self._pending[service]
+                    outstanding = []
+            if not outstanding:
+                return poller.elapsed
+            if not logged:
+                LOG.info("Waiting up to %s seconds for the deletions issued "
+                         "by %s", self.timeout,
+                         ', '.join(service.__name__
+                                   for service in outstanding))
+                logged = True
+            poller.sleep()
+
+
+def run_cleanup_services(services, manager, workers=1,
+                         deletion_timeout=DELETION_TIMEOUT, **kwargs):
+    """Runs cleanup services, concurrently when possible.
+
+    Before running, each service waits for the deletions issued by the
+    services it depends on, according to CLEANUP_DEPENDENCIES, to complete.
+    This is done whatever the number of workers. The time taken by each
+    service is logged.
+
+    :param services: list of service classes, as returned by the
+        get_*_cleanup_services functions
+    :param manager: the clients.Manager passed to the services
+    :param workers: the maximum number of services running at the same
+        time. With one worker, the services run one after the other, in
+        the order of the list. Otherwise each service starts as soon as the
+        services it depends on are done.
+    :param deletion_timeout: the maximum time in seconds a service waits
+        for the deletions of the services it depends on. With 0, the
+        deletions are not waited for.
+    :param kwargs: the parameters passed to the services
+    :return: a dict with the wall time in seconds of each service class
+    """
+    tracker = None
+    if deletion_timeout > 0:
+        tracker = DeletionTracker(timeout=deletion_timeout)
+    kwargs = dict(kwargs, deletion_tracker=tracker)
+    timings = {}
+
+    def dependencies(service):
+        return [dependency for dependency in
+                CLEANUP_DEPENDENCIES.get(service, ())
+                if dependency in services]
+
+    def run_service(service):
+        start = time.monotonic()
+        waited = 0
+        if tracker is not None:
+            waited = tracker.wait(dependencies(service))
+        service(manager, **kwargs).run()
+        timings[service] = time.monotonic() - start
+        LOG.info("%s done in %.2f seconds, including %.2f seconds waiting "
+                 "for deletions", service.__name__, timings[service], waited)
+
+    if workers <= 1:
+        for service in services:
+            run_service(service)
+        return timings
+
+    pending = list(services)
+    done = set()
+    running = {}
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for service in list(pending):
+                if all(dependency in done
+                       for dependency in dependencies(service)):
+                    pending.remove(service)
+                    running[executor.submit(run_service, service)] = service
+            finished, _ = futures.wait(
+                running, return_when=futures.FIRST_COMPLETED)
+            for future in finished:
+                done.add(running.pop(future))
+                # Re-raise errors as the serial cleanup does
+                future.result()
+    return timings
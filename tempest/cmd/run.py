@@ -108,6 +108,40 @@ your system. You are required to provide a config file in this case with the
 directory and a .stestr.conf file in your current working directory. This way
 you can use stestr commands directly to inspect the state of the previous run.
 
+Test Manifest
+-------------
+Listing or selecting the tests imports every test module of Tempest and of
+the installed plugins. With the ``--manifest`` option, the tests are listed
+and selected from a test manifest instead, the ``.tempest_manifest.json``
+file of the current directory, without importing any test module. The
+selected tests are then given to stestr as a load list. The manifest is
+built by discovering the tests once, and it is rebuilt when the content of
+the test directories, the installed plugins or the content of the config
+file change.
+
+Duration Aware Scheduling
+-------------------------
+By default stestr balances the workers with the durations of the tests,
+which leave out the class level setup of tempest (the credentials and the
+resources created by ``resource_setup``), and tests of a same class always
+run on the same worker. With the ``--schedule-by-duration`` option, the cost
+of each test class, including its setup, is estimated from the last runs of
+the stestr repository and the classes are balanced between the workers on
+that cost. The classes decorated with ``@serial`` are all scheduled on the
+same worker. The tests are selected from the test manifest, as with the
+``--manifest`` option, and the schedule is written to the
+``.tempest_workers.yaml`` worker file of the current directory, which can
+be given to ``--worker-file`` again. This option is ignored when the tests
+are run serially.
+
+Test Timings
+------------
+With the ``--record-timings`` option, the durations of the tests, of the
+class setups and of the API calls of the run are recorded in the
+``.tempest_timings.db`` timing database of the current directory, on which
+the ``tempest timings`` command reports. A failure to record the timings
+is logged and does not fail the run.
+
 Test Output
 ===========
 By default tempest run's output to STDOUT will be generated using the
@@ -124,20 +158,26 @@ as a single run you can leverage the ``--combine`` option which will append
 the current run's results with the previous runs.
 """
 
+import contextlib
 import os
 import sys
+import tempfile
 
 from cliff import command
 from oslo_log import log
 from oslo_serialization import jsonutils as json
 from stestr import commands
+from stestr import scheduler as stestr_scheduler
 
 from tempest import clients
 from tempest.cmd import cleanup_service
 from tempest.cmd import init
+from tempest.cmd import timings
 from tempest.cmd import workspace
 from tempest.common import credentials_factory as credentials
 from tempest import config
+from tempest.test_discover import manifest
+from tempest.test_discover import scheduler
 
 CONF = config.CONF
 SAVED_STATE_JSON = "saved_state.json"
@@ -145,6 +185,18 @@ SAVED_STATE_JSON = "saved_state.json"
 LOG = log.getLogger(__name__)
 
 
+@contextlib.contextmanager
+def _temporary_list(test_ids):
+    """Write the test ids to a temporary load list, removed afterwards"""
+    with tempfile.NamedTemporaryFile(
+            'w', prefix='tempest-load-list-', delete=False) as f:
+        f.write(''.join('%s\n' % test_id for test_id in test_ids))
+    try:
+        yield f.name
+    finally:
+        os.remove(f.name)
+
+
 class TempestRun(command.Command):
 
     def _set_env(self, config_file=None):
@@ -235,6 +287,55 @@ class TempestRun(command.Command):
         in_list = parse_dep('--whitelist-file', parsed_args.whitelist_file,
                             '--include-list', parsed_args.include_list)
 
+        load_list = parsed_args.load_list
+        test_ids = None
+        if parsed_args.manifest and not load_list:
+            test_ids = manifest.select_tests(
+                manifest.get_tests(), regexes=regex, include_list=in_list,
+                exclude_list=ex_list, exclude_regex=ex_regex)
+            if parsed_args.list_tests:
+                for test_id in test_ids:
+                    print(test_id)
+                return 0
+        if (parsed_args.schedule_by_duration and
+                not parsed_args.worker_file and parsed_args.parallel and
+                not parsed_args.list_tests):
+            return self._run_scheduled(parsed_args, regex, in_list, ex_list,
+                                       ex_regex, load_list, test_ids)
+        if test_ids is not None:
+            # The selected tests are given to stestr, which does not need
+            # to discover them again
+            with _temporary_list(test_ids) as path:
+                return self._run_stestr(parsed_args, None, None, None, None,
+                                        path)
+        return self._run_stestr(parsed_args, regex, in_list, ex_list,
+                                ex_regex, load_list)
+
+    def _run_scheduled(self, parsed_args, regex, in_list, ex_list, ex_regex,
+                       load_list, test_ids):
+        tests = manifest.get_tests()
+        if test_ids is None:
+            if load_list:
+                with open(load_list) as f:
+                    test_ids = [line.strip() for line in f if line.strip()]
+            else:
+                test_ids = manifest.select_tests(
+                    tests, regexes=regex, include_list=in_list,
+                    exclude_list=ex_list, exclude_regex=ex_regex)
+        serial_classes = set(scheduler.get_class_id(test['id'])
+                             for test in tests if test.get('serial'))
+        concurrency = (parsed_args.concurrency or
+                       stestr_scheduler.local_concurrency() or 1)
+        workers = scheduler.schedule(test_ids, concurrency,
+                                     scheduler.load_timings(),
+                                     serial_classes)
+        scheduler.save_worker_file(workers)
+        with _temporary_list(test_ids) as path:
+            return self._run_stestr(parsed_args, None, None, None, None,
+                                    path, worker_path=scheduler.WORKER_FILE)
+
+    def _run_stestr(self, parsed_args, regex, in_list, ex_list, ex_regex,
+                    load_list, worker_path=None):
         return_code = 0
         if parsed_args.list_tests:
             try:
@@ -254,8 +355,8 @@ class TempestRun(command.Command):
             params = {
                 'filters': regex, 'subunit_out': parsed_args.subunit,
                 'serial': serial, 'concurrency': parsed_args.concurrency,
-                'worker_path': parsed_args.worker_file,
-                'load_list': parsed_args.load_list,
+                'worker_path': worker_path or parsed_args.worker_file,
+                'load_list': load_list,
                 'combine': parsed_args.combine
             }
             try:
@@ -269,12 +370,21 @@ class TempestRun(command.Command):
                 return_code = commands.run_command(
                     **params, blacklist_file=ex_list,
                     whitelist_file=in_list, black_regex=ex_regex)
+            if parsed_args.record_timings:
+                self._record_timings()
             if parsed_args.slowest:
                 commands.slowest_command()
             if return_code > 0:
                 sys.exit(return_code)
         return return_code
 
+    def _record_timings(self):
+        try:
+            timings.record_run()
+        except Exception:
+            # The timings are a report, they never fail the run
+            LOG.exception('The timings of the run were not recorded')
+
     def get_description(self):
         return 'Run tempest'
 
@@ -362,10 +472,27 @@ class TempestRun(command.Command):
                                  'on each newline. This command '
                                  'supports files created by the tempest '
                                  'run ``--list-tests`` command')
-        parser.add_argument('--worker-file', '--worker_file',
+        parser.add_argument('--manifest', action='store_true',
+                            help='Select the tests from the test manifest '
+                                 'of the current directory instead of '
+                                 'discovering them. The manifest is built, '
+                                 'or rebuilt when the test files, the '
+                                 'installed plugins or the config file '
+                                 'changed, by discovering the tests once. '
+                                 'This is ignored when --load-list is used.')
+        worker = parser.add_mutually_exclusive_group()
+        worker.add_argument('--worker-file', '--worker_file',
                             help='Optional path to a worker file. This file '
                             'contains each worker configuration to be '
                             'used to schedule the tests run')
+        worker.add_argument('--schedule-by-duration', action='store_true',
+                            help='Schedule the test classes on the workers '
+                                 'from the durations of the tests and of the '
+                                 'class setups of the previous runs, keeping '
+                                 'the serial classes on the same worker. The '
+                                 'tests are selected from the test manifest '
+                                 'and the schedule is written to the %s '
+                                 'worker file.' % scheduler.WORKER_FILE)
         # list only args
         parser.add_argument('--list-tests', '-l', action='store_true',
                             help='List tests',
@@ -397,6 +524,12 @@ class TempestRun(command.Command):
         parser.add_argument('--slowest', action='store_true',
                             help='Show the longest running tests in the '
                                  'stestr repository after it finishes')
+        parser.add_argument('--record-timings', action='store_true',
+                            help='Record the durations of the tests, of the '
+                                 'class setups and of the API calls of the '
+                                 'run in the %s timing database, on which '
+                                 'the tempest timings command reports'
+                                 % timings.TIMINGS_DB)
 
         parser.set_defaults(parallel=True)
         return parser
@@ -0,0 +1,440 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Reports the durations of the tests across the tempest runs
+
+``tempest run --record-timings`` records the durations of its run in the
+timing database, the ``.tempest_timings.db`` SQLite file of the directory
+it runs from. The database stores, for each run:
+
+* the duration and the status of each test
+* the time spent by each test class outside of its tests, its class level
+  setup and teardown
+* the duration of each API call made by the tests, from the request lines
+  of their logs, with the ids, uuids and IP addresses of the URL replaced
+  by ``<id>``, ``<uuid>`` and ``<ip>``
+
+The ``tempest timings`` command reports, over the last runs of the database:
+
+* the tests and the class setups which regressed in the last run, compared
+  to the median of their durations in the previous runs
+* the slowest test classes, with the percentiles of their duration
+* the slowest API calls, with the percentiles of their duration
+
+Runtime Arguments
+-----------------
+
+* ``--db``: The path of the timing database, defaults to
+  ``.tempest_timings.db``
+* ``--record``: Record the last run of the stestr repository of the current
+  directory before reporting, for the runs not made with
+  ``tempest run --record-timings``
+* ``--label``: A label for the recorded run, such as a release name
+* ``--runs``: The number of last runs to report on, defaults to 10
+* ``--slowest``: The number of classes and API calls to report, defaults to
+  10
+* ``--threshold``: The increase of duration, in percent, over which a test or
+  a class setup regressed, defaults to 50
+* ``--min-duration``: The duration, in seconds, under which a test or a class
+  setup is not reported as regressed, defaults to 1
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import statistics
+import sys
+
+from cliff import command
+import prettytable
+from stestr.repository import util
+
+from tempest.cmd import subunit_describe_calls
+from tempest.test_discover import scheduler
+
+TIMINGS_DB = '.tempest_timings.db'
+
+_REQUEST_RE = re.compile(
+    r'Request \((?P<name>[^)]*)\): (?P<status>\d{3}) (?P<method>\w+) '
+    r'(?P<url>\S+) (?P<secs>\d+\.\d+)s')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    digest TEXT UNIQUE NOT NULL,
+    started TEXT,
+    duration REAL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    class_id TEXT NOT NULL,
+    status TEXT,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS class_setups (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    class_id TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS api_calls (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    service TEXT,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_run_id ON tests (run_id);
+CREATE INDEX IF NOT EXISTS class_setups_run_id ON class_setups (run_id);
+CREATE INDEX IF NOT EXISTS api_calls_run_id ON api_calls (run_id);
+'''
+
+
+class _RunReader(object):
+    """Keep the durations of the tests of a run, dropping their details"""
+
+    def __init__(self):
+        self.records = []
+        self.api_calls = []
+        self._url_parser = subunit_describe_calls.UrlParser()
+
+    def __call__(self, record):
+        self.records.append({'id': record['id'], 'tags': record['tags'],
+                             'status': record['status'],
+                             'timestamps': record['timestamps']})
+        for name, logs in record['details'].items():
+            # The logs of the tests are attached as pythonlogging:'<logger>'
+            if not name.startswith('pythonlogging'):
+                continue
+            for match in _REQUEST_RE.finditer(logs.as_text()):
+                url = match.group('url')
+                self.api_calls.append((
+                    record['id'], self._url_parser.get_service(url),
+                    match.group('method'), self._url_parser.url_path(url),
+                    int(match.group('status')), float(match.group('secs'))))
+
+    def get_run(self):
+        """Return the timings of the run, see TimingStore.add_run()"""
+        timed = [record for record in self.records
+                 if None not in record['timestamps']]
+        digest = hashlib.sha256()
+        for record in sorted(timed, key=lambda record: record['id']):
+            digest.update(('%s %s %s\n' % (
+                record['id'], record['timestamps'][0].isoformat(),
+                record['timestamps'][1].isoformat())).encode('utf-8'))
+        started = min((record['timestamps'][0] for record in timed),
+                      default=None)
+        stopped = max((record['timestamps'][1] for record in timed),
+                      default=None)
+        test_durations, class_setups = scheduler.get_run_timings(timed)
+        return {
+            'digest': digest.hexdigest(),
+            'started': started.isoformat() if started else None,
+            'duration': ((stopped - started).total_seconds()
+                         if started else None),
+            'tests': [(record['id'], record['status'],
+                       test_durations[record['id']]) for record in timed
+                      if record['id'] in test_durations],
+            'class_setups': class_setups,
+            'api_calls': self.api_calls,
+        }
+
+
+def read_stestr_run(repo_url=None, run_id=None):
+    """Read the timings of a run of a stestr repository
+
+    :param str repo_url: the directory of the stestr repository, defaults to
+                         the current directory
+    :param str run_id: the id of the run, defaults to the last run
+    :return: the timings of the run, see TimingStore.add_run()
+    :raises stestr.repository.abstract.RepositoryNotFound: if there is no
+                                                           repository
+    :raises KeyError: if the repository has no such run
+    """
+    repo = util.get_repo_open(repo_url=repo_url)
+    if run_id is None:
+        run_id = repo.latest_id()
+    reader = _RunReader()
+    scheduler.read_run(repo.get_test_run(run_id), reader)
+    return reader.get_run()
+
+
+def _percentile(values, percent):
+    """Return the nearest-rank percentile of sorted values"""
+    return values[max(int(math.ceil(percent / 100.0 * len(values))) - 1, 0)]
+
+
+class TimingStore(object):
+    """The timing database
+
+    :param str path: the path of the SQLite database, created if needed
+    """
+
+    def __init__(self, path=TIMINGS_DB):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add_run(self, run, label=None):
+        """Store the timings of a run
+
+        :param dict run: the timings of the run, a dict with the digest
+                         identifying the run, its start time, its duration,
+                         its (test id, status, duration) tests, its class
+                         setup duration by class id and its (test id,
+                         service, method, url, status, duration) API calls
+        :param str label: a label for the run
+        :return: the id of the run, or None if the run was already stored,
+                 in which case only its label is updated
+        """
+        with self.connection:
+            row = self.connection.execute(
+                'SELECT id FROM runs WHERE digest = ?',
+                (run['digest'],)).fetchone()
+            if row is not None:
+                if label is not None:
+                    self.connection.execute(
+                        'UPDATE runs SET label = ? WHERE id = ?',
+                        (label, row[0]))
+                return None
+            run_id = self.connection.execute(
+                'INSERT INTO runs (digest, started, duration, label) '
+                'VALUES (?, ?, ?, ?)',
+                (run['digest'], run['started'], run['duration'],
+                 label)).lastrowid
+            self.connection.executemany(
+                'INSERT INTO tests VALUES (?, ?, ?, ?, ?)',
+                ((run_id, test_id, scheduler.get_class_id(test_id), status,
+                  duration) for test_id, status, duration in run['tests']))
+            self.connection.executemany(
+                'INSERT INTO class_setups VALUES (?, ?, ?)',
+                ((run_id, class_id, duration)
+                 for class_id, duration in run['class_setups'].items()))
+            self.connection.executemany(
+                'INSERT INTO api_calls VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((run_id,) + call for call in run['api_calls']))
+        return run_id
+
+    def get_runs(self, limit=None):
+        """Return the last runs, the most recent first
+
+        :return: a list of (id, started, duration, label, tests) tuples
+        """
+        return self.connection.execute(
+            'SELECT runs.id, started, runs.duration, label, COUNT(test_id) '
+            'FROM runs LEFT JOIN tests ON tests.run_id = runs.id '
+            'GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?',
+            (-1 if limit is None else limit,)).fetchall()
+
+    def _get_durations(self, query, run_ids):
+        durations = {}
+        for row in self.connection.execute(
+                query % ', '.join('?' * len(run_ids)), run_ids):
+            durations.setdefault(row[:-2], {})[row[-2]] = row[-1]
+        return durations
+
+    def get_test_durations(self, run_ids):
+        """Return the durations of the successful tests of runs
+
+        :return: a dict mapping a (test id,) key to the duration by run id
+        """
+        return self._get_durations(
+            "SELECT test_id, run_id, duration FROM tests "
+            "WHERE status = 'success' AND run_id IN (%s)", run_ids)
+
+    def get_class_setup_durations(self, run_ids):
+        """Return the class setup durations of runs
+
+        :return: a dict mapping a (class id,) key to the duration by run id
+        """
+        return self._get_durations(
+            'SELECT class_id, run_id, duration FROM class_setups '
+            'WHERE run_id IN (%s)', run_ids)
+
+    def get_class_durations(self, run_ids):
+        """Return the durations of the classes of runs, setup included
+
+        :return: a dict mapping a (class id,) key to the duration by run id
+        """
+        return self._get_durations(
+            'SELECT class_id, run_id, SUM(duration) FROM ('
+            '    SELECT class_id, run_id, duration FROM tests'
+            '    UNION ALL'
+            '    SELECT class_id, run_id, duration FROM class_setups) '
+            'WHERE run_id IN (%s) GROUP BY class_id, run_id', run_ids)
+
+    def get_api_call_durations(self, run_ids):
+        """Return the durations of the API calls of runs
+
+        :return: a dict mapping (service, method, url) to the sorted
+                 durations of its calls
+        """
+        durations = {}
+        for service, method, url, duration in self.connection.execute(
+                'SELECT service, method, url, duration FROM api_calls '
+                'WHERE run_id IN (%s)' % ', '.join('?' * len(run_ids)),
+                run_ids):
+            durations.setdefault((service, method, url), []).append(duration)
+        for values in durations.values():
+            values.sort()
+        return durations
+
+
+def record_run(path=TIMINGS_DB, repo_url=None, label=None):
+    """Record the last run of a stestr repository in the timing database
+
+    :return: the id of the run in the database, or None if it was already
+             recorded
+    """
+    run = read_stestr_run(repo_url)
+    store = TimingStore(path)
+    try:
+        return store.add_run(run, label)
+    finally:
+        store.close()
+
+
+def find_regressions(durations, run_ids, threshold=50.0, min_duration=1.0):
+    """Find the durations of the last run which regressed
+
+    :param dict durations: the durations by run id of each key
+    :param list run_ids: the run ids, the last run first
+    :param float threshold: the increase in percent over the median of the
+                            previous runs that is a regression
+    :param float min_duration: the duration under which there is no
+                               regression
+    :return: a list of (key, median, last duration) tuples, the largest
+             increase first
+    """
+    regressions = []
+    for key, by_run in durations.items():
+        last = by_run.get(run_ids[0])
+        previous = [by_run[run_id] for run_id in run_ids[1:]
+                    if run_id in by_run]
+        if last is None or last < min_duration or not previous:
+            continue
+        median = statistics.median(previous)
+        if last > median * (1 + threshold / 100.0):
+            regressions.append((key, median, last))
+    regressions.sort(key=lambda regression: (
+        -(regression[2] - regression[1]), regression[0]))
+    return regressions
+
+
+def _format(seconds):
+    return '%.2f' % seconds
+
+
+class TempestTimings(command.Command):
+
+    def get_parser(self, prog_name):
+        parser = super(TempestTimings, self).get_parser(prog_name)
+        parser.add_argument('--db', default=TIMINGS_DB,
+                            help='The path of the timing database, defaults '
+                                 'to %s' % TIMINGS_DB)
+        parser.add_argument('--record', action='store_true',
+                            help='Record the last run of the stestr '
+                                 'repository of the current directory '
+                                 'before reporting')
+        parser.add_argument('--label', default=None,
+                            help='A label for the recorded run, such as a '
+                                 'release name')
+        parser.add_argument('--runs', type=int, default=10,
+                            help='The number of last runs to report on')
+        parser.add_argument('--slowest', type=int, default=10,
+                            help='The number of classes and API calls to '
+                                 'report')
+        parser.add_argument('--threshold', type=float, default=50.0,
+                            help='The increase of duration, in percent, over '
+                                 'which a test or a class setup regressed')
+        parser.add_argument('--min-duration', type=float, default=1.0,
+                            help='The duration, in seconds, under which a '
+                                 'test or a class setup is not reported as '
+                                 'regressed')
+        return parser
+
+    def get_description(self):
+        return 'Report the durations of the tests across the tempest runs'
+
+    def take_action(self, parsed_args):
+        if parsed_args.record:
+            if record_run(parsed_args.db, label=parsed_args.label) is None:
+                print('The last run was already recorded')
+        store = TimingStore(parsed_args.db)
+        try:
+            runs = store.get_runs(parsed_args.runs)
+            if not runs:
+                sys.exit('No run is recorded in %s' % parsed_args.db)
+            self._report(store, runs, parsed_args)
+        finally:
+            store.close()
+
+    def _report(self, store, runs, parsed_args):
+        run_ids = [run[0] for run in runs]
+        output = prettytable.PrettyTable(
+            ['Run', 'Started', 'Label', 'Tests', 'Duration'])
+        for run_id, started, duration, label, tests in runs:
+            output.add_row([run_id, started, label or '', tests,
+                            _format(duration or 0.0)])
+        print('Runs')
+        print(output)
+
+        output = prettytable.PrettyTable(
+            ['Regressed', 'Median', 'Last run', 'Increase'])
+        for kind, durations in (
+                ('test', store.get_test_durations(run_ids)),
+                ('class setup', store.get_class_setup_durations(run_ids))):
+            for key, median, last in find_regressions(
+                    durations, run_ids, parsed_args.threshold,
+                    parsed_args.min_duration):
+                output.add_row(['%s (%s)' % (key[0], kind), _format(median),
+                                _format(last), '%+.0f%%' % (
+                                    (last - median) / median * 100
+                                    if median else float('inf'))])
+        print('Regressions of run %d' % run_ids[0])
+        print(output)
+
+        classes = []
+        for key, by_run in store.get_class_durations(run_ids).items():
+            values = sorted(by_run.values())
+            classes.append((statistics.median(values), key[0], values))
+        classes.sort(reverse=True)
+        output = prettytable.PrettyTable(
+            ['Class', 'Runs', 'Median', 'p90', 'Max'])
+        for median, class_id, values in classes[:parsed_args.slowest]:
+            output.add_row([class_id, len(values), _format(median),
+                            _format(_percentile(values, 90)),
+                            _format(values[-1])])
+        print('Slowest classes')
+        print(output)
+
+        calls = sorted(store.get_api_call_durations(run_ids).items(),
+                       key=lambda call: (-_percentile(call[1], 90), call[0]))
+        output = prettytable.PrettyTable(
+            ['Service', 'Method', 'URL', 'Calls', 'p50', 'p90', 'p99'])
+        for (service, method, url), values in calls[:parsed_args.slowest]:
+            output.add_row([service, method, url, len(values),
+                            _format(_percentile(values, 50)),
+                            _format(_percentile(values, 90)),
+                            _format(_percentile(values, 99))])
+        print('Slowest API calls')
+        print(output)
@@ -324,11 +324,19 @@ def create_test_server(clients, validatable=False, validation_resources=None,
             # with those full server response so that we will have addresses
             # field present in server which is needed to be used for wait for
             # ssh
-            for server in created_servers:
-                server = waiters.wait_for_server_status(
-                    clients.servers_client, server['id'], wait_until,
-                    request_id=request_id)
-                servers.append(server)
+            if len(created_servers) > 1:
+                # NOTE: Poll all the servers at once rather than waiting
+                # for each of them in turn.
+                servers = waiters.wait_for_servers_status(
+                    clients.servers_client,
+                    [server['id'] for server in created_servers],
+                    wait_until, request_id=request_id)
+            else:
+                for server in created_servers:
+                    server = waiters.wait_for_server_status(
+                        clients.servers_client, server['id'], wait_until,
+                        request_id=request_id)
+                    servers.append(server)
 
             for server in servers:
                 if CONF.validation.run_validation and validatable:
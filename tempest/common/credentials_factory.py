@@ -11,12 +11,15 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import atexit
+
 from oslo_concurrency import lockutils
 
 from tempest import clients
 from tempest import config
 from tempest.lib import auth
 from tempest.lib.common import dynamic_creds
+from tempest.lib.common import dynamic_creds_pool
 from tempest.lib.common import preprov_creds
 from tempest.lib import exceptions
 
@@ -87,10 +90,44 @@ def get_dynamic_provider_params(identity_version, admin_creds=None):
         ('create_networks', (CONF.auth.create_isolated_networks and not
                              CONF.network.shared_physical_network)),
         ('resource_prefix', 'tempest'),
-        ('identity_admin_endpoint_type', endpoint_type)
+        ('identity_admin_endpoint_type', endpoint_type),
+        ('workers', CONF.auth.dynamic_credentials_workers)
     ]))
 
 
+# Pools of dynamic credentials, by identity version
+_credential_pools = {}
+
+
+def get_credential_pool(identity_version):
+    """Return the pool of dynamic credentials of this process
+
+    The pool is created on first use, and drained when the process exits.
+    It checks with the admin credentials that no volume is left in the
+    projects given back to it when the volume service is available.
+
+    :param identity_version: 'v2' or 'v3'
+    :return: A `CredentialPool`
+    """
+    if identity_version not in _credential_pools:
+        params = get_dynamic_provider_params(identity_version)
+
+        def provider_factory(network_resources):
+            return dynamic_creds.DynamicCredentialProvider(
+                name='pool', network_resources=network_resources, **params)
+
+        volumes_client = None
+        if CONF.service_available.cinder:
+            volumes_client = clients.Manager(
+                params['admin_creds']).volumes_client_latest
+        pool = dynamic_creds_pool.CredentialPool(
+            provider_factory, CONF.auth.dynamic_credentials_pool_size,
+            volumes_client=volumes_client)
+        atexit.register(pool.drain)
+        _credential_pools[identity_version] = pool
+    return _credential_pools[identity_version]
+
+
 def get_preprov_provider_params(identity_version):
     """Pre-provisioned provider parameters setup from config
 
@@ -107,13 +144,14 @@ def get_preprov_provider_params(identity_version):
         ('accounts_lock_dir', lockutils.get_lock_path(CONF)),
         ('test_accounts_file', CONF.auth.test_accounts_file),
         ('object_storage_operator_role', CONF.object_storage.operator_role),
-        ('object_storage_reseller_admin_role', reseller_admin_role)
+        ('object_storage_reseller_admin_role', reseller_admin_role),
+        ('atomic_allocation', CONF.auth.test_accounts_atomic_allocation)
     ]))
 
 
 def get_credentials_provider(name, network_resources=None,
                              force_tenant_isolation=False,
-                             identity_version=None):
+                             identity_version=None, use_pool=False):
     """Return the right implementation of CredentialProvider based on config
 
     This helper returns the right implementation of CredentialProvider based on
@@ -128,6 +166,8 @@ def get_credentials_provider(name, network_resources=None,
                                    regardless of the configuration.
     :param identity_version: Use the specified identity API version, regardless
                              of the configuration. Valid values are 'v2', 'v3'.
+    :param use_pool: Take dynamic credentials from the pool of the process
+                     when `[auth] dynamic_credentials_pool_size` is set.
     """
     # If a test requires a new account to work, it can have it via forcing
     # dynamic credentials. A new account will be produced only for that test.
@@ -135,6 +175,12 @@ def get_credentials_provider(name, network_resources=None,
     # the test should be skipped else it would fail.
     identity_version = identity_version or CONF.identity.auth_version
     if CONF.auth.use_dynamic_credentials or force_tenant_isolation:
+        if use_pool and CONF.auth.dynamic_credentials_pool_size:
+            return dynamic_creds_pool.PooledDynamicCredentialProvider(
+                name=name,
+                network_resources=network_resources,
+                pool=get_credential_pool(identity_version),
+                **get_dynamic_provider_params(identity_version))
         return dynamic_creds.DynamicCredentialProvider(
             name=name,
             network_resources=network_resources,
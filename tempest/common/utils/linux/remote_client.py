@@ -49,7 +49,9 @@ class RemoteClient(remote_client.RemoteClient):
             ssh_shell_prologue=CONF.validation.ssh_shell_prologue,
             ping_count=CONF.validation.ping_count,
             ping_size=CONF.validation.ping_size,
-            ssh_key_type=CONF.validation.ssh_key_type)
+            ssh_key_type=CONF.validation.ssh_key_type,
+            ssh_persistent=CONF.validation.ssh_persistent_connections,
+            ssh_buf_size=CONF.validation.ssh_buf_size)
 
     # Note that this method will not work on SLES11 guests, as they do
     # not support the TYPE column on lsblk
@@ -14,6 +14,7 @@
 
 import netaddr
 
+from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 
 
@@ -25,7 +26,8 @@ def get_unused_ip_addresses(ports_client, subnets_client,
     unused IP addresses on the given subnet using the supplied subnets_client
     """
 
-    ports = ports_client.list_ports(network_id=network_id)['ports']
+    ports = rest_client.paginate(ports_client.list_ports, 'ports',
+                                 network_id=network_id)
     subnet = subnets_client.show_subnet(subnet_id)
     ip_net = netaddr.IPNetwork(subnet['subnet']['cidr'])
     subnet_set = netaddr.IPSet(ip_net.iter_hosts())
@@ -10,30 +10,84 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import os
 import re
+import threading
 import time
 
 from oslo_log import log as logging
 
 from tempest import config
 from tempest import exceptions
+from tempest.lib.common import polling
 from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions as lib_exc
 
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
+_pollers = threading.local()
+
+
+class _BuildIntervalPolicy(polling.PollingPolicy):
+    """Poll every build_interval seconds of a client"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def interval(self, polls):
+        return self.client.build_interval
+
+    def __repr__(self):
+        return 'FixedPolicy(fixed_interval=%s)' % self.client.build_interval
+
+
+def _start_polling(client):
+    """Start polling with the polling policy of the client
+
+    Clients which do not provide a polling policy are polled every
+    build_interval seconds.
+    """
+    policy = getattr(client, 'polling_policy', None)
+    if not isinstance(policy, polling.PollingPolicy):
+        policy = _BuildIntervalPolicy(client)
+    poller = policy.start()
+    getattr(_pollers, 'active', []).append(poller)
+    return poller
+
+
+def _report_polling(func):
+    """Report the polls done by a waiter once it returns
+
+    Failed waits are not reported, their exception already tells how long
+    they waited.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_pollers, 'active', None)
+        _pollers.active = []
+        try:
+            result = func(*args, **kwargs)
+            for poller in _pollers.active:
+                poller.report(func.__name__)
+            return result
+        finally:
+            _pollers.active = previous
+    return wrapper
+
 
 def _get_task_state(body):
     return body.get('OS-EXT-STS:task_state', None)
 
 
 # NOTE(afazekas): This function needs to know a token and a subject.
+@_report_polling
 def wait_for_server_status(client, server_id, status, ready_wait=True,
                            extra_timeout=0, raise_on_error=True,
                            request_id=None):
     """Waits for a server to reach a given status."""
+    poller = _start_polling(client)
 
     # NOTE(afazekas): UNKNOWN status possible on ERROR
     # or in a very early stage.
@@ -61,7 +115,7 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
             else:
                 return body
 
-        time.sleep(client.build_interval)
+        poller.sleep()
         body = client.show_server(server_id)['server']
         server_status = body['status']
         task_state = _get_task_state(body)
@@ -103,9 +157,129 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
         old_task_state = task_state
 
 
+def _server_reached_status(body, status, ready_wait):
+    """Whether a server body satisfies the wait_for_server_status rules."""
+    server_status = body['status']
+    if status == 'BUILD' and server_status != 'UNKNOWN':
+        return True
+    if server_status != status:
+        return False
+    # NOTE(afazekas): The instance is in "ready for action state"
+    # when no task in progress
+    return not ready_wait or _get_task_state(body) is None
+
+
+@_report_polling
+def wait_for_servers_status(client, server_ids, status, ready_wait=True,
+                            extra_timeout=0, raise_on_error=True,
+                            request_id=None):
+    """Waits for several servers to reach a given status.
+
+    This is the multi-server counterpart of wait_for_server_status, with
+    the same per-server semantics for ready_wait, errors and timeout. All
+    the servers are polled at once, with a single list_servers(detail=True)
+    call per poll, instead of one show_server call per server. The polls
+    are spaced according to the polling policy of the client.
+    Once a server reaches the expected status it is not tracked anymore.
+    Polls after the first one only fetch the servers updated since the
+    last known change, using the changes-since filter.
+
+    :param client: compute servers client
+    :param server_ids: list of server IDs to wait for
+    :param status: the expected status of all the servers
+    :returns: the list of server bodies, in the same order as server_ids
+    """
+    poller = _start_polling(client)
+    server_ids = list(server_ids)
+    pending = set(server_ids)
+    bodies = {}
+    states = {}
+    start_time = int(time.time())
+    timeout = client.build_timeout + extra_timeout
+    changes_since = None
+    while True:
+        params = {'detail': True}
+        if changes_since:
+            params['changes-since'] = changes_since
+        for body in client.list_servers(**params)['servers']:
+            if body['id'] in pending:
+                bodies[body['id']] = body
+        for server_id in pending - set(bodies):
+            # NOTE: Fall back on show_server for servers not (yet) listed,
+            # this also raises NotFound for unknown servers.
+            bodies[server_id] = client.show_server(server_id)['server']
+
+        for server_id in sorted(pending):
+            body = bodies[server_id]
+            server_status = body['status']
+            task_state = _get_task_state(body)
+            if server_status == 'DELETED':
+                raise lib_exc.NotFound(
+                    'Server %s was deleted while waiting for it to reach '
+                    '%s status.' % (server_id, status))
+            old_state = states.get(server_id)
+            if old_state and old_state != (server_status, task_state):
+                LOG.info('Server %s state transition "%s" ==> "%s" after %d '
+                         'second wait', server_id,
+                         '/'.join((old_state[0], str(old_state[1]))),
+                         '/'.join((server_status, str(task_state))),
+                         time.time() - start_time)
+            states[server_id] = (server_status, task_state)
+            if (server_status == 'ERROR' and raise_on_error and
+                    status != 'ERROR'):
+                details = ''
+                if 'fault' in body:
+                    details += 'Fault: %s.' % body['fault']
+                if request_id:
+                    details += ' Request ID of server operation performed'
+                    details += ' before checking the server status %s.' % (
+                        request_id)
+                raise exceptions.BuildErrorException(details,
+                                                     server_id=server_id)
+            if _server_reached_status(body, status, ready_wait):
+                pending.discard(server_id)
+
+        if not pending:
+            if ready_wait and status != 'BUILD':
+                # without state api extension 3 sec usually enough
+                time.sleep(CONF.compute.ready_wait)
+            return [bodies[server_id] for server_id in server_ids]
+
+        if int(time.time()) - start_time >= timeout:
+            expected_task_state = 'None' if ready_wait else 'n/a'
+            message = ('Servers %(server_ids)s failed to reach %(status)s '
+                       'status and task state "%(expected_task_state)s" '
+                       'within the required time (%(timeout)s s).' %
+                       {'server_ids': ', '.join(sorted(pending)),
+                        'status': status,
+                        'expected_task_state': expected_task_state,
+                        'timeout': timeout})
+            if request_id:
+                message += ' Request ID of server operation performed before'
+                message += ' checking the server status %s.' % request_id
+            for server_id in sorted(pending):
+                message += (' Server %s current status: %s, current task '
+                            'state: %s.' % ((server_id,) + states[server_id]))
+            caller = test_utils.find_test_caller()
+            if caller:
+                message = '(%s) %s' % (caller, message)
+            raise lib_exc.TimeoutException(message)
+
+        updated = [bodies[server_id].get('updated') for server_id in bodies]
+        if updated and all(updated):
+            # NOTE: changes-since is inclusive and is compared with the
+            # server side timestamps, so using the latest known update
+            # time does not depend on the local clock and can't miss any
+            # later state transition.
+            changes_since = max(updated)
+        poller.sleep()
+
+
+@_report_polling
 def wait_for_server_termination(client, server_id, ignore_error=False,
                                 request_id=None):
     """Waits for server to reach termination."""
+    poller = _start_polling(client)
     try:
         body = client.show_server(server_id)['server']
     except lib_exc.NotFound:
@@ -114,7 +288,7 @@ def wait_for_server_termination(client, server_id, ignore_error=False,
     old_task_state = _get_task_state(body)
     start_time = int(time.time())
     while True:
-        time.sleep(client.build_interval)
+        poller.sleep()
         try:
             body = client.show_server(server_id)['server']
         except lib_exc.NotFound:
@@ -153,6 +327,7 @@ def wait_for_server_termination(client, server_id, ignore_error=False,
         old_task_state = task_state
 
 
+@_report_polling
 def wait_for_image_status(client, image_id, status):
     """Waits for an image to reach a given status (or list of them).
 
@@ -162,6 +337,7 @@ def wait_for_image_status(client, image_id, status):
     status can be either a string or a list of strings that constitute a
     terminal state that we will return.
     """
+    poller = _start_polling(client)
     show_image = client.show_image
 
     if isinstance(status, str):
@@ -187,7 +363,7 @@ def wait_for_image_status(client, image_id, status):
         if current_status.lower() == 'error':
             raise exceptions.AddImageException(image_id=image_id)
 
-        time.sleep(client.build_interval)
+        poller.sleep()
 
     message = ('Image %(image_id)s failed to reach %(status)s state '
                '(current state %(current_status)s) within the required '
@@ -201,8 +377,10 @@ def wait_for_image_status(client, image_id, status):
     raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_image_tasks_status(client, image_id, status):
     """Waits for an image tasks to reach a given status."""
+    poller = _start_polling(client)
     pending_tasks = []
     start = int(time.time())
     while int(time.time()) - start < client.build_timeout:
@@ -211,7 +389,7 @@ def wait_for_image_tasks_status(client, image_id, status):
         pending_tasks = [task for task in tasks if task['status'] != status]
         if not pending_tasks:
             return tasks
-        time.sleep(client.build_interval)
+        poller.sleep()
 
     message = ('Image %(image_id)s tasks: %(pending_tasks)s '
                'failed to reach %(status)s state within the required '
@@ -225,13 +403,15 @@ def wait_for_image_tasks_status(client, image_id, status):
     raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_tasks_status(client, task_id, status):
+    poller = _start_polling(client)
     start = int(time.time())
     while int(time.time()) - start < client.build_timeout:
         task = client.show_tasks(task_id)
         if task['status'] == status:
             return task
-        time.sleep(client.build_interval)
+        poller.sleep()
     message = ('Task %(task_id)s tasks: '
                'failed to reach %(status)s state within the required '
                'time (%(timeout)s s).' % {'task_id': task_id,
@@ -243,6 +423,7 @@ def wait_for_tasks_status(client, task_id, status):
     raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_image_imported_to_stores(client, image_id, stores=None):
     """Waits for an image to be imported to all requested stores.
 
@@ -251,6 +432,7 @@ def wait_for_image_imported_to_stores(client, image_id, stores=None):
 
     The client should also have build_interval and build_timeout attributes.
     """
+    poller = _start_polling(client)
 
     exc_cls = lib_exc.TimeoutException
     start = int(time.time())
@@ -283,7 +465,7 @@ def wait_for_image_imported_to_stores(client, image_id, stores=None):
             exc_cls = lib_exc.OtherRestClientException
             break
 
-        time.sleep(client.build_interval)
+        poller.sleep()
 
     message = ('Image %s failed to import on stores: %s' %
                (image_id, str(image.get('os_glance_failed_import'))))
@@ -293,12 +475,14 @@ def wait_for_image_imported_to_stores(client, image_id, stores=None):
     raise exc_cls(message)
 
 
+@_report_polling
 def wait_for_image_copied_to_stores(client, image_id):
     """Waits for an image to be copied on all requested stores.
 
     The client should also have build_interval and build_timeout attributes.
     This return the list of stores where copy is failed.
     """
+    poller = _start_polling(client)
 
     start = int(time.time())
     store_left = []
@@ -314,7 +498,7 @@ def wait_for_image_copied_to_stores(client, image_id):
             raise exceptions.ImageKilledException(image_id=image_id,
                                                   status=image['status'])
 
-        time.sleep(client.build_interval)
+        poller.sleep()
 
     message = ('Image %s failed to finish the copy operation '
                'on stores: %s' % (image_id, str(store_left)))
@@ -324,6 +508,7 @@ def wait_for_image_copied_to_stores(client, image_id):
     raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_image_deleted_from_store(client, image, available_stores,
                                       image_store_deleted):
     """Waits for an image to be deleted from specific store.
@@ -331,6 +516,7 @@ def wait_for_image_deleted_from_store(client, image, available_stores,
     API will not allow deletion of the last location for an image.
     This return image if image deleted from store.
     """
+    poller = _start_polling(client)
 
     # Check if image have last store location
     if len(available_stores) == 1:
@@ -343,7 +529,7 @@ def wait_for_image_deleted_from_store(client, image, available_stores,
         image_stores = image['stores'].split(",")
         if image_store_deleted not in image_stores:
             return
-        time.sleep(client.build_interval)
+        poller.sleep()
     message = ('Failed to delete %s from requested store location: %s '
                'within the required time: (%s s)' %
                (image, image_store_deleted, client.build_timeout))
@@ -353,6 +539,7 @@ def wait_for_image_deleted_from_store(client, image, available_stores,
     raise exc_cls(message)
 
 
+@_report_polling
 def wait_for_volume_resource_status(client, resource_id, status,
                                     server_id=None, servers_client=None):
     """Waits for a volume resource to reach a given status.
@@ -364,6 +551,7 @@ def wait_for_volume_resource_status(client, resource_id, status,
     If server_id and servers_client are provided, dump the console for that
     server on failure.
     """
+    poller = _start_polling(client)
     resource_name = re.findall(
         r'(volume|group-snapshot|snapshot|backup|group)',
         client.resource_type)[-1].replace('-', '_')
@@ -372,7 +560,7 @@ def wait_for_volume_resource_status(client, resource_id, status,
     start = int(time.time())
 
     while resource_status != status:
-        time.sleep(client.build_interval)
+        poller.sleep()
         resource_status = show_resource(resource_id)[
             '{}'.format(resource_name)]['status']
         if resource_status == 'error' and resource_status != status:
@@ -398,8 +586,10 @@ def wait_for_volume_resource_status(client, resource_id, status,
              resource_name, resource_id, status, time.time() - start)
 
 
+@_report_polling
 def wait_for_volume_attachment_create(client, volume_id, server_id):
     """Waits for a volume attachment to be created at a given volume."""
+    poller = _start_polling(client)
     start = int(time.time())
     while True:
         attachments = client.show_volume(volume_id)['volume']['attachments']
@@ -409,7 +599,7 @@ def wait_for_volume_attachment_create(client, volume_id, server_id):
                      'waiting for %f seconds', found[0]['attachment_id'],
                      volume_id, server_id, time.time() - start)
             return found[0]
-        time.sleep(client.build_interval)
+        poller.sleep()
         if int(time.time()) - start >= client.build_timeout:
             message = ('Failed to attach volume %s to server %s '
                        'within the required time (%s s).' %
@@ -417,12 +607,14 @@ def wait_for_volume_attachment_create(client, volume_id, server_id):
             raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_volume_attachment_remove(client, volume_id, attachment_id):
     """Waits for a volume attachment to be removed from a given volume."""
+    poller = _start_polling(client)
     start = int(time.time())
     attachments = client.show_volume(volume_id)['volume']['attachments']
     while any(attachment_id == a['attachment_id'] for a in attachments):
-        time.sleep(client.build_interval)
+        poller.sleep()
         if int(time.time()) - start >= client.build_timeout:
             message = ('Failed to remove attachment %s from volume %s '
                        'within the required time (%s s).' %
@@ -433,8 +625,10 @@ def wait_for_volume_attachment_remove(client, volume_id, attachment_id):
              'seconds', attachment_id, volume_id, time.time() - start)
 
 
+@_report_polling
 def wait_for_volume_replication_status(client, volume_id, expected_status):
     """Waits for a volume to reach the expected replication_status."""
+    poller = _start_polling(client)
     start = int(time.time())
     volume = client.show_volume(volume_id)['volume']
     current_status = volume['replication_status']
@@ -448,7 +642,7 @@ def wait_for_volume_replication_status(client, volume_id, expected_status):
                         client.build_timeout))
             raise lib_exc.TimeoutException(message)
 
-        time.sleep(client.build_interval)
+        poller.sleep()
         volume = client.show_volume(volume_id)['volume']
         current_status = volume['replication_status']
 
@@ -456,12 +650,14 @@ def wait_for_volume_replication_status(client, volume_id, expected_status):
              volume_id, expected_status, time.time() - start)
 
 
+@_report_polling
 def wait_for_volume_attachment_remove_from_server(
         client, server_id, volume_id):
     """Waits for a volume to be removed from a given server.
 
     This waiter checks the compute API if the volume attachment is removed.
     """
+    poller = _start_polling(client)
     start = int(time.time())
 
     try:
@@ -473,7 +669,7 @@ def wait_for_volume_attachment_remove_from_server(
         return
 
     while any(volume for volume in volumes if volume['volumeId'] == volume_id):
-        time.sleep(client.build_interval)
+        poller.sleep()
 
         timed_out = int(time.time()) - start >= client.build_timeout
         if timed_out:
@@ -495,8 +691,10 @@ def wait_for_volume_attachment_remove_from_server(
     return
 
 
+@_report_polling
 def wait_for_volume_migration(client, volume_id, new_host):
     """Waits for a Volume to move to a new host."""
+    poller = _start_polling(client)
     body = client.show_volume(volume_id)['volume']
     host = body['os-vol-host-attr:host']
     migration_status = body['migration_status']
@@ -504,7 +702,7 @@ def wait_for_volume_migration(client, volume_id, new_host):
 
     # new_host is hostname@backend while current_host is hostname@backend#type
     while migration_status != 'success' or new_host not in host:
-        time.sleep(client.build_interval)
+        poller.sleep()
         body = client.show_volume(volume_id)['volume']
         host = body['os-vol-host-attr:host']
         migration_status = body['migration_status']
@@ -520,14 +718,16 @@ def wait_for_volume_migration(client, volume_id, new_host):
             raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_volume_retype(client, volume_id, new_volume_type):
     """Waits for a Volume to have a new volume type."""
+    poller = _start_polling(client)
     body = client.show_volume(volume_id)['volume']
     current_volume_type = body['volume_type']
     start = int(time.time())
 
     while current_volume_type != new_volume_type:
-        time.sleep(client.build_interval)
+        poller.sleep()
         body = client.show_volume(volume_id)['volume']
         current_volume_type = body['volume_type']
 
@@ -539,6 +739,7 @@ def wait_for_volume_retype(client, volume_id, new_volume_type):
             raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_qos_operations(client, qos_id, operation, args=None):
     """Waits for a qos operations to be completed.
 
@@ -548,6 +749,7 @@ def wait_for_qos_operations(client, qos_id, operation, args=None):
     args = volume-type-id disassociated when operation = 'disassociate'
     args = None when operation = 'disassociate-all'
     """
+    poller = _start_polling(client)
     start_time = int(time.time())
     while True:
         if operation == 'qos-key-unset':
@@ -568,18 +770,20 @@ def wait_for_qos_operations(client, qos_id, operation, args=None):
 
         if int(time.time()) - start_time >= client.build_timeout:
             raise lib_exc.TimeoutException
-        time.sleep(client.build_interval)
+        poller.sleep()
 
 
+@_report_polling
 def wait_for_interface_status(client, server_id, port_id, status):
     """Waits for an interface to reach a given status."""
+    poller = _start_polling(client)
     body = (client.show_interface(server_id, port_id)
             ['interfaceAttachment'])
     interface_status = body['port_state']
     start = int(time.time())
 
     while interface_status != status:
-        time.sleep(client.build_interval)
+        poller.sleep()
         body = (client.show_interface(server_id, port_id)
                 ['interfaceAttachment'])
         interface_status = body['port_state']
@@ -596,8 +800,11 @@ def wait_for_interface_status(client, server_id, port_id, status):
     return body
 
 
+@_report_polling
 def wait_for_interface_detach(client, server_id, port_id, detach_request_id):
     """Waits for an interface to be detached from a server."""
+    poller = _start_polling(client)
+
     def _get_detach_event_results():
         # NOTE(gibi): The obvious choice for this waiter would be to wait
         # until the interface disappears from the client.list_interfaces()
@@ -619,7 +826,7 @@ def wait_for_interface_detach(client, server_id, port_id, detach_request_id):
     start = int(time.time())
 
     while "Success" not in detach_event_results:
-        time.sleep(client.build_interval)
+        poller.sleep()
         detach_event_results = _get_detach_event_results()
         if "Success" in detach_event_results:
             return client.show_instance_action(
@@ -633,6 +840,7 @@ def wait_for_interface_detach(client, server_id, port_id, detach_request_id):
             raise lib_exc.TimeoutException(message)
 
 
+@_report_polling
 def wait_for_server_floating_ip(servers_client, server, floating_ip,
                                 wait_for_disassociate=False):
     """Wait for floating IP association or disassociation.
@@ -644,6 +852,7 @@ def wait_for_server_floating_ip(servers_client, server, floating_ip,
     :param wait_for_disassociate: Boolean indicating whether to wait for
     disassociation instead of association.
     """
+    poller = _start_polling(servers_client)
 
     def _get_floating_ip_in_server_addresses(floating_ip, server):
         for addresses in server['addresses'].values():
@@ -672,7 +881,7 @@ def wait_for_server_floating_ip(servers_client, server, floating_ip,
                 msg = ('Floating ip %s failed to associate with server %s '
                        'in time.' % (floating_ip, server['id']))
             raise lib_exc.TimeoutException(msg)
-        time.sleep(servers_client.build_interval)
+        poller.sleep()
 
 
 def wait_for_ping(server_ip, timeout=30, interval=1):
@@ -686,6 +895,7 @@ def wait_for_ping(server_ip, timeout=30, interval=1):
     raise lib_exc.TimeoutException()
 
 
+@_report_polling
 def wait_for_port_status(client, port_id, status):
     """Wait for a port reach a certain status : ["BUILD" | "DOWN" | "ACTIVE"]
     :param client: The network client to use when querying the port's
@@ -693,15 +903,17 @@ def wait_for_port_status(client, port_id, status):
     :param status: A string to compare the current port status-to.
     :param port_id: The uuid of the port we would like queried for status.
     """
+    poller = _start_polling(client)
     start_time = time.time()
     while (time.time() - start_time <= client.build_timeout):
         result = client.show_port(port_id)
         if result['port']['status'].lower() == status.lower():
             return result
-        time.sleep(client.build_interval)
+        poller.sleep()
     raise lib_exc.TimeoutException
 
 
+@_report_polling
 def wait_for_server_ports_active(client, server_id, is_active, **kwargs):
     """Wait for all server ports to reach active status
     :param client: The network client to use when querying the port's status
@@ -709,6 +921,7 @@ def wait_for_server_ports_active(client, server_id, is_active, **kwargs):
     :param is_active: A function to call to the check port active status.
     :param kwargs: Additional arguments, if any, to pass to list_ports()
     """
+    poller = _start_polling(client)
     start_time = time.time()
     while (time.time() - start_time <= client.build_timeout):
         ports = client.list_ports(device_id=server_id, **kwargs)['ports']
@@ -718,7 +931,7 @@ def wait_for_server_ports_active(client, server_id, is_active, **kwargs):
             return ports
         LOG.warning("Server ID %s has ports that are not ACTIVE, waiting "
                     "for state to change on all: %s", server_id, ports)
-        time.sleep(client.build_interval)
+        poller.sleep()
     LOG.error("Server ID %s ports have failed to transition to ACTIVE, "
               "timing out: %s", server_id, ports)
     raise lib_exc.TimeoutException
@@ -736,8 +949,10 @@ def wait_for_ssh(ssh_client, timeout=30):
     raise lib_exc.TimeoutException()
 
 
+@_report_polling
 def wait_for_caching(client, cache_client, image_id):
     """Waits until image is cached"""
+    poller = _start_polling(client)
     start = int(time.time())
     while int(time.time()) - start < client.build_timeout:
         caching = cache_client.list_cache()
@@ -745,7 +960,7 @@ def wait_for_caching(client, cache_client, image_id):
         if output and image_id in output:
             return caching
 
-        time.sleep(client.build_interval)
+        poller.sleep()
 
     message = ('Image %s failed to cache in time.' % image_id)
     caller = test_utils.find_test_caller()
@@ -21,6 +21,7 @@ from oslo_config import cfg
 from oslo_config import types
 from oslo_log import log as logging
 
+from tempest.lib.common import polling
 from tempest.lib import exceptions
 from tempest.lib.services import clients
 from tempest.test_discover import plugins
@@ -54,6 +55,16 @@ AuthGroup = [
                     "at least `2 * CONC` distinct accounts configured in "
                     " the `test_accounts_file`, with CONC == the "
                     "number of concurrent test processes."),
+    cfg.BoolOpt('test_accounts_atomic_allocation',
+                default=False,
+                help="Allocate the accounts of the `test_accounts_file` by "
+                     "creating their lock files atomically, instead of "
+                     "taking a lock shared by all the test processes. This "
+                     "reduces the contention between test processes with "
+                     "large accounts files. Lock files left by test "
+                     "processes which are no longer running are reclaimed. "
+                     "All the test processes using the accounts file must "
+                     "run on the same host and use the same value."),
     cfg.BoolOpt('use_dynamic_credentials',
                 default=True,
                 help="Allows test cases to create/destroy projects and "
@@ -76,6 +87,27 @@ AuthGroup = [
                      "creates. However in some neutron configurations, like "
                      "with VLAN provider networks, this doesn't work. So if "
                      "set to False the isolated networks will not be created"),
+    cfg.IntOpt('dynamic_credentials_workers',
+               default=1,
+               min=1,
+               help="Maximum number of dynamic credentials, with their "
+                    "network resources, which are provisioned or cleared "
+                    "concurrently for a test class. With more than one "
+                    "worker, the credentials listed by a test class are "
+                    "provisioned ahead of time when the class is set up."),
+    cfg.IntOpt('dynamic_credentials_pool_size',
+               default=0,
+               min=0,
+               help="Number of dynamic credentials, i.e. projects with a "
+                    "user and their network resources, which each test "
+                    "worker keeps ready for each combination of roles and "
+                    "network resources. Test classes take their credentials "
+                    "from the pool and give them back after use, instead "
+                    "of creating and deleting them. The pool is refilled in "
+                    "the background. Only the test classes which set "
+                    "use_credentials_pool, because they leave the state of "
+                    "their projects unchanged, use the pool. 0 disables the "
+                    "pool."),
     cfg.StrOpt('admin_username',
                help="Username for an administrative user. This is needed for "
                     "authenticating requests made by project isolation to "
@@ -225,7 +257,14 @@ IdentityGroup = [
                 help="Keystone supports both system as well as project "
                      "scoped token. This config option tells tempest to "
                      "use the system scoped token for keystone identity "
-                     "tests.")
+                     "tests."),
+    cfg.BoolOpt('token_cache',
+                default=False,
+                help="Share the tokens between the clients managers of a "
+                     "test worker which use the same credentials and scope, "
+                     "instead of requesting a token for each of them. A "
+                     "shared token is used until it expires or until a "
+                     "test forces a new one."),
 ]
 
 service_clients_group = cfg.OptGroup(name='service-clients',
@@ -237,7 +276,54 @@ ServiceClientsGroup = [
                help='Timeout in seconds to wait for the http request to '
                     'return'),
     cfg.StrOpt('proxy_url',
-               help='Specify an http proxy to use.')
+               help='Specify an http proxy to use.'),
+    cfg.BoolOpt('connection_pooling',
+                default=False,
+                help='Keep HTTP connections to the service endpoints alive '
+                     'across requests instead of opening a new connection '
+                     'for each request. This saves a TCP and TLS handshake '
+                     'per API call.'),
+    cfg.IntOpt('pool_maxsize',
+               default=10,
+               help='Number of connections kept alive per host when '
+                    'connection_pooling is enabled.'),
+    cfg.IntOpt('pool_num_pools',
+               default=10,
+               help='Number of hosts for which a connection pool is kept '
+                    'when connection_pooling is enabled. The least recently '
+                    'used pool is closed when the limit is reached.'),
+    cfg.IntOpt('pool_idle_timeout',
+               default=60,
+               help='Time in seconds after which a connection pool which '
+                    'was not used is closed, when connection_pooling is '
+                    'enabled. Set to 0 to never close idle pools.'),
+    cfg.FloatOpt('polling_initial_interval',
+                 default=0.5,
+                 help='Time in seconds between the first polls of the '
+                      'exponential and jittered polling policies, and '
+                      'between the fast polls of the fast-first policy.'),
+    cfg.FloatOpt('polling_max_interval',
+                 default=10,
+                 help='Maximum time in seconds between two polls for the '
+                      'exponential and jittered polling policies.'),
+    cfg.FloatOpt('polling_backoff_factor',
+                 default=2.0,
+                 help='Growth factor of the interval between two polls for '
+                      'the exponential and jittered polling policies.'),
+    cfg.IntOpt('polling_fast_polls',
+               default=5,
+               help='Number of fast polls of the fast-first polling policy '
+                    'before falling back on build_interval.'),
+    cfg.FloatOpt('polling_jitter',
+                 default=0.2,
+                 help='Ratio by which the jittered polling policy randomly '
+                      'shortens or lengthens each interval.'),
+    cfg.BoolOpt('warm_up_schema_validators',
+                default=False,
+                help='Build the JSON schema validators of all the response '
+                     'schemas of the service clients when the first test '
+                     'class is set up, rather than when each schema is '
+                     'first used.'),
 ]
 
 identity_feature_group = cfg.OptGroup(name='identity-feature-enabled',
@@ -329,6 +415,19 @@ ComputeGroup = [
     cfg.IntOpt('build_interval',
                default=1,
                help="Time in seconds between build status checks."),
+    cfg.StrOpt('polling_policy',
+               default='fixed',
+               choices=[('fixed', 'poll every build_interval seconds'),
+                        ('exponential', 'double the interval after each '
+                                        'poll, up to a maximum'),
+                        ('jittered', 'exponential with random jitter'),
+                        ('fast-first', 'poll fast a few times, then every '
+                                       'build_interval seconds')],
+               help="Policy used by the waiters to schedule the polls of "
+                    "a resource status. The policies are tuned with the "
+                    "polling_* options of the [service-clients] group. "
+                    "Other services that do not define polling_policy "
+                    "will inherit this value."),
     cfg.IntOpt('build_timeout',
                default=300,
                help="Timeout in seconds to wait for an instance to build. "
@@ -696,6 +795,11 @@ ImageGroup = [
                default=1,
                help="Time in seconds between image operation status "
                     "checks."),
+    cfg.StrOpt('polling_policy',
+               choices=['fixed', 'exponential', 'jittered', 'fast-first'],
+               help="Policy used by the waiters to schedule the polls of "
+                    "image resources. Defaults to the compute "
+                    "polling_policy."),
     cfg.ListOpt('container_formats',
                 default=['bare', 'ami', 'ari', 'aki', 'ovf', 'ova'],
                 help="A list of image's container formats "
@@ -834,6 +938,11 @@ NetworkGroup = [
                default=1,
                help="Time in seconds between network operation status "
                     "checks."),
+    cfg.StrOpt('polling_policy',
+               choices=['fixed', 'exponential', 'jittered', 'fast-first'],
+               help="Policy used by the waiters to schedule the polls of "
+                    "network resources. Defaults to the compute "
+                    "polling_policy."),
     cfg.StrOpt('port_vnic_type',
                choices=[None, 'normal', 'direct', 'macvtap', 'direct-physical',
                         'baremetal', 'virtio-forwarder'],
@@ -1000,6 +1109,18 @@ ValidationGroup = [
                default='ecdsa',
                choices=['ecdsa', 'rsa'],
                help='Type of key to use for ssh connections.'),
+    cfg.BoolOpt('ssh_persistent_connections',
+                default=False,
+                help="Keep the authenticated ssh connections to the guests "
+                     "open between commands, instead of connecting for "
+                     "each command. Connections are re-established "
+                     "transparently when lost, and closed when the test "
+                     "class is torn down."),
+    cfg.IntOpt('ssh_buf_size',
+               default=64 * 1024,
+               min=1,
+               help="Maximum number of bytes read at once from the output "
+                    "of the commands run over ssh."),
     cfg.FloatOpt('allowed_network_downtime',
                  default=5.0,
                  help="Allowed VM network connection downtime during live "
@@ -1021,6 +1142,11 @@ VolumeGroup = [
     cfg.IntOpt('build_interval',
                default=1,
                help='Time in seconds between volume availability checks.'),
+    cfg.StrOpt('polling_policy',
+               choices=['fixed', 'exponential', 'jittered', 'fast-first'],
+               help="Policy used by the waiters to schedule the polls of "
+                    "volume resources. Defaults to the compute "
+                    "polling_policy."),
     cfg.IntOpt('build_timeout',
                default=300,
                help='Timeout in seconds to wait for a volume to become '
@@ -1390,6 +1516,30 @@ ProfilerGroup = [
                     "value keeps profiling disabled"),
 ]
 
+metrics_group = cfg.OptGroup(name="metrics",
+                             title="Latency Metrics")
+
+MetricsGroup = [
+    cfg.StrOpt('json_dir',
+               help="The directory where each test worker writes the "
+                    "histograms of the latencies of the API requests it "
+                    "sent, by service, method, URL template and status "
+                    "code, to a tempest-latency-<pid>.json file when it "
+                    "exits. The default empty value keeps it disabled"),
+    cfg.HostAddressOpt('statsd_host',
+                       help="The host of a statsd collector to which the "
+                            "latency of each API request is sent as a "
+                            "timer, over UDP. The default empty value keeps "
+                            "it disabled"),
+    cfg.PortOpt('statsd_port',
+                default=8125,
+                help="The UDP port of the statsd collector"),
+    cfg.StrOpt('statsd_prefix',
+               default='tempest',
+               help="The prefix of the names of the timers sent to the "
+                    "statsd collector"),
+]
+
 DefaultGroup = [
     cfg.BoolOpt('pause_teardown',
                 default=False,
@@ -1410,12 +1560,15 @@ $ python -m testtools.run TEST_ID"""),
     cfg.BoolOpt('record_resources',
                 default=False,
                 help="Allows to record all resources created by Tempest. "
-                     "These resources are stored in file resource_list.json, "
-                     "which can be later used for resource deletion by "
-                     "command tempest cleanup. The resource_list.json file "
-                     "will be appended in case of multiple Tempest runs, "
-                     "so the file will contain a list of resources created "
-                     "during all Tempest runs."),
+                     "These resources are appended to file "
+                     "resource_list.journal. They are only in that file "
+                     "until command tempest cleanup with option "
+                     "--resource-list compacts it: the journal is then "
+                     "merged into file resource_list.json, which is used "
+                     "for resource deletion, and emptied. The files will be "
+                     "appended in case of multiple Tempest runs, so they "
+                     "will contain a list of resources created during all "
+                     "Tempest runs."),
 ]
 
 _opts = [
@@ -1441,6 +1594,7 @@ _opts = [
     (debug_group, DebugGroup),
     (placement_group, PlacementGroup),
     (profiler_group, ProfilerGroup),
+    (metrics_group, MetricsGroup),
     (None, DefaultGroup)
 ]
 
@@ -1528,25 +1682,32 @@ class TempestConfigPrivate(object):
             # case of name conflict we would not have reached this point.
             setattr(self, group_dest, _CONF[group_name])
 
-    def __init__(self, parse_conf=True, config_path=None):
-        """Initialize a configuration from a conf directory and conf file."""
-        super(TempestConfigPrivate, self).__init__()
-        config_files = []
-        failsafe_path = "/etc/tempest/" + self.DEFAULT_CONFIG_FILE
+    @classmethod
+    def get_config_path(cls, config_path=None):
+        """Return the path of the config file used by a configuration
 
+        :param str config_path: the path given to the configuration, if any
+        """
         if config_path:
             path = config_path
         else:
             # Environment variables override defaults...
             conf_dir = os.environ.get('TEMPEST_CONFIG_DIR',
-                                      self.DEFAULT_CONFIG_DIR)
+                                      cls.DEFAULT_CONFIG_DIR)
             conf_file = os.environ.get('TEMPEST_CONFIG',
-                                       self.DEFAULT_CONFIG_FILE)
+                                       cls.DEFAULT_CONFIG_FILE)
 
             path = os.path.join(conf_dir, conf_file)
 
         if not os.path.isfile(path):
-            path = failsafe_path
+            path = "/etc/tempest/" + cls.DEFAULT_CONFIG_FILE
+        return path
+
+    def __init__(self, parse_conf=True, config_path=None):
+        """Initialize a configuration from a conf directory and conf file."""
+        super(TempestConfigPrivate, self).__init__()
+        config_files = []
+        path = self.get_config_path(config_path)
 
         # only parse the config file if we expect one to exist. This is needed
         # to remove an issue with the config file up to date checker.
@@ -1636,6 +1797,11 @@ def service_client_config(service_client_name=None):
         * `endpoint_type`
         * `build_timeout` (object-storage and identity default to compute)
         * `build_interval` (object-storage and identity default to compute)
+        * `polling_policy` (only when it is not the default `fixed`
+          policy, services without a polling_policy setting default to
+          compute)
+        * `connection_pooling` (only when enabled, along with the
+          `pool_maxsize`, `pool_num_pools` and `pool_idle_timeout` settings)
 
     The following common settings are always returned, even if
     `service_client_name` is None:
@@ -1697,6 +1863,32 @@ def service_client_config(service_client_name=None):
             _parameters[setting] = getattr(CONF.compute, setting)
         else:
             _parameters[setting] = getattr(options, setting)
+    # Set polling_policy
+    # Services that do not define polling_policy default to compute. The
+    # fixed policy is the default of the service clients, it is not passed
+    # so that the service clients of plugins which do not accept it keep
+    # working
+    policy_name = getattr(options, 'polling_policy', None)
+    if not policy_name:
+        policy_name = CONF.compute.polling_policy
+    if policy_name != 'fixed':
+        _parameters['polling_policy'] = polling.get_policy(
+            policy_name, _parameters['build_interval'],
+            initial_interval=CONF.service_clients.polling_initial_interval,
+            max_interval=CONF.service_clients.polling_max_interval,
+            factor=CONF.service_clients.polling_backoff_factor,
+            fast_polls=CONF.service_clients.polling_fast_polls,
+            jitter=CONF.service_clients.polling_jitter)
+    # Set connection pooling
+    # Only when enabled, so that the service clients of plugins which do not
+    # accept these parameters keep working. The common settings above are
+    # also used for credentials and auth providers, which do not accept them
+    if CONF.service_clients.connection_pooling:
+        _parameters['connection_pooling'] = True
+        _parameters['pool_maxsize'] = CONF.service_clients.pool_maxsize
+        _parameters['pool_num_pools'] = CONF.service_clients.pool_num_pools
+        _parameters['pool_idle_timeout'] = (
+            CONF.service_clients.pool_idle_timeout)
     # Set region
     # If a service client does not define region or region is not set
     # default to the identity region
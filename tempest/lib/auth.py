@@ -15,9 +15,11 @@
 #    under the License.
 
 import abc
-import copy
 import datetime
+import hashlib
+import json
 import re
+import threading
 from urllib import parse as urlparse
 
 from oslo_log import log as logging
@@ -31,6 +33,19 @@ ISO8601_FLOAT_SECONDS = '%Y-%m-%dT%H:%M:%S.%fZ'
 ISO8601_INT_SECONDS = '%Y-%m-%dT%H:%M:%SZ'
 LOG = logging.getLogger(__name__)
 
+# Auth data shared by the auth providers created with token_cache=True,
+# keyed by KeystoneAuthProvider._token_cache_key()
+_token_cache = {}
+_token_cache_locks = {}
+_token_cache_lock = threading.Lock()
+
+
+def clear_token_cache():
+    """Drop all the tokens shared by the auth providers"""
+    with _token_cache_lock:
+        _token_cache.clear()
+        _token_cache_locks.clear()
+
 
 def replace_version(url, new_version):
     parts = urlparse.urlparse(url)
@@ -65,6 +80,16 @@ def apply_url_filters(url, filters):
     return url
 
 
+def _filters_key(filters):
+    """Hashable form of the base_url filters, None if there is none"""
+    try:
+        key = tuple(sorted(filters.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 class AuthProvider(object, metaclass=abc.ABCMeta):
     """Provide authentication"""
 
@@ -260,7 +285,16 @@ class KeystoneAuthProvider(AuthProvider):
     def __init__(self, credentials, auth_url,
                  disable_ssl_certificate_validation=None,
                  ca_certs=None, trace_requests=None, scope='project',
-                 http_timeout=None, proxy_url=None):
+                 http_timeout=None, proxy_url=None, token_cache=False):
+        """Auth provider for the Keystone identity API
+
+        :param token_cache: if True, the tokens are shared with the other
+            auth providers of the process created with token_cache=True for
+            the same auth URL, credentials and scope. A shared token is used
+            until it expires, or until one of the providers clears or forces
+            its auth.
+        """
+        self.token_cache = token_cache
         super(KeystoneAuthProvider, self).__init__(credentials, scope)
         self.dscv = disable_ssl_certificate_validation
         self.ca_certs = ca_certs
@@ -269,6 +303,9 @@ class KeystoneAuthProvider(AuthProvider):
         self.proxy_url = proxy_url
         self.auth_url = auth_url
         self.auth_client = self._auth_client(auth_url)
+        # (auth data, catalog index, base URL by filters) of the last auth
+        # data used by base_url
+        self._catalog_cache = None
 
     def _decorate_request(self, filters, method, url, headers=None, body=None,
                           auth_data=None):
@@ -278,19 +315,60 @@ class KeystoneAuthProvider(AuthProvider):
         base_url = self.base_url(filters=filters, auth_data=auth_data)
         # build authenticated request
         # returns new request, it does not touch the original values
-        _headers = copy.deepcopy(headers) if headers is not None else {}
+        _headers = dict(headers) if headers is not None else {}
         _headers['X-Auth-Token'] = str(token)
         if url is None or url == "":
             _url = base_url
         else:
             # Join base URL and url, and remove multiple contiguous slashes
             _url = "/".join([base_url, url])
-            parts = [x for x in urlparse.urlparse(_url)]
-            parts[2] = re.sub("/{2,}", "/", parts[2])
-            _url = urlparse.urlunparse(parts)
+            if '//' in _url.partition('://')[2]:
+                parts = [x for x in urlparse.urlparse(_url)]
+                parts[2] = re.sub("/{2,}", "/", parts[2])
+                _url = urlparse.urlunparse(parts)
         # no change to method or body
         return str(_url), _headers, body
 
+    def _index_catalog(self, auth_data_body):
+        """Index the catalog entries of auth data by service type"""
+        index = {}
+        for ep in auth_data_body.get(self.catalog_key) or []:
+            index.setdefault(ep['type'], []).append(ep)
+        return index
+
+    def _get_catalog_cache(self, auth_data_body):
+        """Returns the catalog index and base URL cache of auth data
+
+        Both are built once for each auth data, so they are dropped when a
+        new token is fetched. Auth data must not be modified once used.
+        """
+        cache = self._catalog_cache
+        if cache is None or cache[0] is not auth_data_body:
+            cache = (auth_data_body, self._index_catalog(auth_data_body), {})
+            self._catalog_cache = cache
+        return cache[1], cache[2]
+
+    def _get_base_url(self, filters, auth_data, lookup):
+        """Base URL from the cache, else looked up in the catalog index
+
+        The base URLs are cached for each filters until the auth data
+        changes.
+
+        :param lookup: callable which takes the filters, the auth data body
+                       and the catalog index and returns the base URL
+        """
+        if auth_data is None:
+            auth_data = self.get_auth()
+        _, _auth_data = auth_data
+        index, base_urls = self._get_catalog_cache(_auth_data)
+        key = _filters_key(filters)
+        _base_url = base_urls.get(key) if key is not None else None
+        if _base_url is None:
+            _base_url = lookup(filters, _auth_data, index)
+            if key is not None:
+                base_urls[key] = _base_url
+        return _base_url
+
     @abc.abstractmethod
     def _auth_client(self):
         return
@@ -311,7 +389,59 @@ class KeystoneAuthProvider(AuthProvider):
 
         # returns token, auth_data
         token, auth_data = auth_func(**auth_params)
-        return token, auth_data
+        result = token, auth_data
+        if self.token_cache:
+            # Share the new token, set_auth forces a new one
+            with _token_cache_lock:
+                _token_cache[self._token_cache_key()] = result
+        return result
+
+    def _token_cache_key(self):
+        # The credentials the provider was created with, their other fields
+        # are filled from the token
+        credentials = json.dumps(self.credentials._initial, sort_keys=True,
+                                 default=str)
+        return (self.__class__.__name__, self.auth_url, self.scope,
+                hashlib.sha256(credentials.encode('utf-8')).hexdigest())
+
+    def get_auth(self):
+        """Returns auth from cache if available, else auth first
+
+        With token_cache, a valid token shared by another auth provider is
+        used before requesting a new one.
+        """
+        if not self.token_cache:
+            return super(KeystoneAuthProvider, self).get_auth()
+        if self.cache is None or self.is_expired(self.cache):
+            key = self._token_cache_key()
+            with _token_cache_lock:
+                key_lock = _token_cache_locks.setdefault(
+                    key, threading.Lock())
+            # Only one provider requests a token for the same key
+            with key_lock:
+                auth_data = _token_cache.get(key)
+                if auth_data is None or self.is_expired(auth_data):
+                    self.set_auth()
+                else:
+                    self.cache = auth_data
+                    self._fill_credentials(self.cache[1])
+        return self.cache
+
+    def clear_auth(self):
+        """Clear access cache
+
+        Can be called to clear the access cache so that next request
+        will fetch a new token and base_url. With token_cache, the token is
+        also dropped from the tokens shared with other auth providers.
+        """
+        # The parent constructor calls this before setting the cache
+        cache = getattr(self, 'cache', None)
+        if self.token_cache and cache is not None:
+            key = self._token_cache_key()
+            with _token_cache_lock:
+                if _token_cache.get(key) is cache:
+                    del _token_cache[key]
+        super(KeystoneAuthProvider, self).clear_auth()
 
     def _parse_expiry_time(self, expiry_string):
         expiry = None
@@ -340,6 +470,7 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
     """
 
     SCOPES = set(['project'])
+    catalog_key = 'serviceCatalog'
 
     def _auth_client(self, auth_url):
         return json_v2id.TokenClient(
@@ -388,9 +519,10 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
         :rtype: string
         :return: url with filters applied
         """
-        if auth_data is None:
-            auth_data = self.get_auth()
-        _, _auth_data = auth_data
+        return self._get_base_url(filters, auth_data, self._base_url)
+
+    def _base_url(self, filters, auth_data_body, catalog_index):
+        """Base URL from the catalog entries by service type"""
         service = filters.get('service')
         region = filters.get('region')
         name = filters.get('name')
@@ -400,17 +532,16 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
             raise exceptions.EndpointNotFound("No service provided")
 
         _base_url = None
-        for ep in _auth_data['serviceCatalog']:
-            if ep["type"] == service:
-                if name is not None and ep["name"] != name:
-                    continue
-                for _ep in ep['endpoints']:
-                    if region is not None and _ep['region'] == region:
-                        _base_url = _ep.get(endpoint_type)
-                if not _base_url:
-                    # No region or name matching, use the first
-                    _base_url = ep['endpoints'][0].get(endpoint_type)
-                break
+        for ep in catalog_index.get(service, []):
+            if name is not None and ep["name"] != name:
+                continue
+            for _ep in ep['endpoints']:
+                if region is not None and _ep['region'] == region:
+                    _base_url = _ep.get(endpoint_type)
+            if not _base_url:
+                # No region or name matching, use the first
+                _base_url = ep['endpoints'][0].get(endpoint_type)
+            break
         if _base_url is None:
             raise exceptions.EndpointNotFound(
                 "service: %s, region: %s, endpoint_type: %s, name: %s" %
@@ -427,6 +558,7 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
     """Provides authentication based on the Identity V3 API"""
 
     SCOPES = set(['system', 'project', 'domain', 'unscoped', None])
+    catalog_key = 'catalog'
 
     def _auth_client(self, auth_url):
         return json_v3id.V3TokenClient(
@@ -527,9 +659,11 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         :rtype: string
         :return: url with filters applied
         """
-        if auth_data is None:
-            auth_data = self.get_auth()
-        _, _auth_data = auth_data
+        return self._get_base_url(filters, auth_data, self._base_url)
+
+    def _base_url(self, filters, auth_data_body, catalog_index):
+        """Base URL from the catalog entries by service type"""
+        _auth_data = auth_data_body
         service = filters.get('service')
         region = filters.get('region')
         name = filters.get('name')
@@ -544,7 +678,7 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         catalog = _auth_data.get('catalog', [])
 
         # Select entries with matching service type
-        service_catalog = [ep for ep in catalog if ep['type'] == service]
+        service_catalog = catalog_index.get(service, [])
         if service_catalog:
             if name is not None:
                 service_catalog = (
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import re
 
 from tempest.lib import exceptions
@@ -157,3 +158,17 @@ class APIVersionRequest(object):
             self.ver_minor == self.latest_ver_minor):
             return 'latest'
         return "%s.%s" % (self.ver_major, self.ver_minor)
+
+
+@functools.lru_cache(maxsize=256)
+def get_api_version_request(version_string=None):
+    """Return a shared APIVersionRequest for a version string
+
+    Parsing version strings is not free, and the microversion aware clients
+    compare the same few versions on each request. The objects returned are
+    shared by all the callers and must not be modified.
+
+    :param version_string: see `APIVersionRequest`
+    :raises InvalidAPIVersionString: if the version string is invalid
+    """
+    return APIVersionRequest(version_string)
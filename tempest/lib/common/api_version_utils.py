@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import testtools
 
 from tempest.lib.common import api_version_request
@@ -20,6 +22,13 @@ from tempest.lib import exceptions
 
 LATEST_MICROVERSION = 'latest'
 
+# Schemas selected by select_schema, keyed by the id of the
+# schema_versions_info list and the microversion. The list is kept along with
+# the schema, so that its id can not be reused by another object.
+_selected_schemas = {}
+_selected_schemas_lock = threading.Lock()
+MAX_SELECTED_SCHEMAS = 1024
+
 
 class BaseMicroversionTest(object):
     """Mixin class for API microversion test class."""
@@ -102,6 +111,54 @@ def select_request_microversion(test_min_version, cfg_min_version):
     return max_version.get_string()
 
 
+def select_schema(schema_versions_info, api_microversion):
+    """Select the JSON schema matching a microversion
+
+    The selection only depends on its arguments, so it is made once for each
+    schema_versions_info list and microversion, and then served from a cache.
+    The lists are cached by identity and must not be modified once used.
+
+    :param schema_versions_info: List of dict which provides schema
+                                 information with range of valid versions.
+    :param api_microversion: The requested microversion like "2.10", or None
+                             for requests without microversion, which select
+                             the schema with no minimum version.
+    :returns: the selected schema
+    :raises JSONSchemaNotFound: if no schema matches the microversion
+    """
+    key = (id(schema_versions_info), api_microversion)
+    entry = _selected_schemas.get(key)
+    if entry is not None and entry[0] is schema_versions_info:
+        return entry[1]
+
+    schema = None
+    version = api_version_request.get_api_version_request(api_microversion)
+    for items in schema_versions_info:
+        min_version = api_version_request.get_api_version_request(
+            items['min'])
+        max_version = api_version_request.get_api_version_request(
+            items['max'])
+        # This is case where api_microversion is None, which means
+        # request without microversion So select base schema.
+        if version.is_null() and items['min'] is None:
+            schema = items['schema']
+            break
+        # else select appropriate schema as per api_microversion
+        elif version.matches(min_version, max_version):
+            schema = items['schema']
+            break
+    if schema is None:
+        raise exceptions.JSONSchemaNotFound(
+            version=version.get_string(),
+            schema_versions_info=schema_versions_info)
+    with _selected_schemas_lock:
+        if len(_selected_schemas) >= MAX_SELECTED_SCHEMAS:
+            # Evict the oldest selection
+            del _selected_schemas[next(iter(_selected_schemas))]
+        _selected_schemas[key] = (schema_versions_info, schema)
+    return schema
+
+
 def assert_version_header_matches_request(api_microversion_header_name,
                                           api_microversion,
                                           response_header):
@@ -177,8 +234,8 @@ def compare_version_header_to_response(api_microversion_header_name,
     api_version = api_microversion.split(' ')[-1]
     resp_version = response_header[api_microversion_header_name].split(' ')[-1]
     if not op(
-        api_version_request.APIVersionRequest(api_version),
-        api_version_request.APIVersionRequest(resp_version)):
+        api_version_request.get_api_version_request(api_version),
+        api_version_request.get_api_version_request(resp_version)):
         return False
 
     return True
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import ipaddress
 
 import netaddr
@@ -25,6 +26,22 @@ from tempest.lib.services import clients
 
 LOG = logging.getLogger(__name__)
 
+# Credential types which share a project: the first one provisioned creates
+# the project, the others reuse it, so they are provisioned one after the
+# other by provision_credentials.
+_SHARED_PROJECT_GROUPS = {
+    'primary': 'project',
+    'project_admin': 'project',
+    'project_manager': 'project',
+    'project_member': 'project',
+    'project_reader': 'project',
+    'alt': 'project_alt',
+    'project_alt_admin': 'project_alt',
+    'project_alt_manager': 'project_alt',
+    'project_alt_member': 'project_alt',
+    'project_alt_reader': 'project_alt',
+}
+
 
 class DynamicCredentialProvider(cred_provider.CredentialProvider):
     """Creates credentials dynamically for tests
@@ -63,6 +80,9 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
     :param identity_admin_endpoint_type: The endpoint type for identity
                                          admin clients. Defaults to public.
     :param identity_uri: Identity URI of the target cloud
+    :param int workers: maximum number of credentials provisioned or
+                        cleared concurrently by `provision_credentials` and
+                        `clear_creds`. Defaults to 1, i.e. one at a time.
     """
 
     def __init__(self, identity_version, name=None, network_resources=None,
@@ -72,7 +92,8 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
                  neutron_available=False, create_networks=True,
                  project_network_cidr=None, project_network_mask_bits=None,
                  public_network_id=None, resource_prefix=None,
-                 identity_admin_endpoint_type='public', identity_uri=None):
+                 identity_admin_endpoint_type='public', identity_uri=None,
+                 workers=1):
         super(DynamicCredentialProvider, self).__init__(
             identity_version=identity_version, identity_uri=identity_uri,
             admin_role=admin_role, name=name,
@@ -92,6 +113,7 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
         self.identity_admin_role = identity_admin_role or 'admin'
         self.identity_admin_endpoint_type = identity_admin_endpoint_type
         self.extra_roles = extra_roles or []
+        self.workers = workers
         (self.identity_admin_client,
          self.tenants_admin_client,
          self.users_admin_client,
@@ -509,6 +531,52 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
     def get_project_alt_reader_creds(self):
         return self.get_credentials(['alt_reader'], scope='project')
 
+    def _map(self, func, items):
+        """Call func on each item, concurrently up to `workers` at a time
+
+        :returns: the list of results, in the order of the items
+        """
+        items = list(items)
+        workers = min(self.workers, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
+    def _provision(self, credential_type):
+        credentials_method = 'get_%s_creds' % credential_type
+        if not hasattr(self, credentials_method):
+            raise lib_exc.InvalidCredentials(
+                "Invalid credentials type %s" % credential_type)
+        return getattr(self, credentials_method)()
+
+    def provision_credentials(self, credential_types):
+        """Provision several types of credentials ahead of their use
+
+        Credentials are provisioned concurrently, up to `workers` at a
+        time, and are then returned by the `get_*_creds` methods as usual.
+        Types which share a project, like 'primary' and 'project_reader',
+        are provisioned one after the other.
+
+        :param credential_types: credential types like 'primary', 'alt' or
+                                 'project_reader', with a matching
+                                 `get_<type>_creds` method
+        :raises InvalidCredentials: for an unknown credential type
+        """
+        groups = {}
+        for credential_type in credential_types:
+            group = groups.setdefault(
+                _SHARED_PROJECT_GROUPS.get(credential_type, credential_type),
+                [])
+            if credential_type not in group:
+                group.append(credential_type)
+
+        def provision_group(group):
+            for credential_type in group:
+                self._provision(credential_type)
+
+        self._map(provision_group, groups.values())
+
     def get_creds_by_roles(self, roles, force_new=False, scope=None):
         roles = list(set(roles))
         # The roles list as a str will become the index as the dict key for
@@ -550,85 +618,91 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
             LOG.warning('network with name: %s not found for delete',
                         network_name)
 
-    def _clear_isolated_net_resources(self):
+    def _clear_creds_net_resources(self, creds):
         client = self.routers_admin_client
-        for cred in self._creds:
-            creds = self._creds.get(cred)
-            if (not creds or not any([creds.router, creds.network,
-                                      creds.subnet])):
-                continue
-            LOG.debug("Clearing network: %(network)s, "
-                      "subnet: %(subnet)s, router: %(router)s",
-                      {'network': creds.network, 'subnet': creds.subnet,
-                       'router': creds.router})
-            if (not self.network_resources or
-                    (self.network_resources.get('router') and creds.subnet)):
-                try:
-                    client.remove_router_interface(
-                        creds.router['id'],
-                        subnet_id=creds.subnet['id'])
-                except lib_exc.NotFound:
-                    LOG.warning('router with name: %s not found for delete',
-                                creds.router['name'])
-                self._clear_isolated_router(creds.router['id'],
-                                            creds.router['name'])
-            if (not self.network_resources or
-                self.network_resources.get('subnet')):
-                self._clear_isolated_subnet(creds.subnet['id'],
-                                            creds.subnet['name'])
-            if (not self.network_resources or
-                self.network_resources.get('network')):
-                self._clear_isolated_network(creds.network['id'],
-                                             creds.network['name'])
-
-    def clear_creds(self):
-        if not self._creds:
+        if (not creds or not any([creds.router, creds.network,
+                                  creds.subnet])):
             return
-        self._clear_isolated_net_resources()
-        project_ids = set()
-        for creds in self._creds.values():
-            # NOTE(gmann): With new RBAC personas, we can have single project
-            # and multiple user created under it, to avoid conflict let's
-            # cleanup the projects at the end.
-            # Adding project if id is not None, means leaving domain and
-            # system creds.
-            if creds.project_id:
-                project_ids.add(creds.project_id)
+        LOG.debug("Clearing network: %(network)s, "
+                  "subnet: %(subnet)s, router: %(router)s",
+                  {'network': creds.network, 'subnet': creds.subnet,
+                   'router': creds.router})
+        if (not self.network_resources or
+                (self.network_resources.get('router') and creds.subnet)):
             try:
-                self.creds_client.delete_user(creds.user_id)
+                client.remove_router_interface(
+                    creds.router['id'],
+                    subnet_id=creds.subnet['id'])
             except lib_exc.NotFound:
-                LOG.warning("user with name: %s not found for delete",
-                            creds.username)
-            # if cred is domain scoped, delete ephemeral domain
-            # do not delete default domain
-            if (hasattr(creds, 'domain_id') and
-                    creds.domain_id != creds.project_domain_id):
-                try:
-                    self.creds_client.delete_domain(creds.domain_id)
-                except lib_exc.NotFound:
-                    LOG.warning("domain with name: %s not found for delete",
-                                creds.domain_name)
-        for project_id in project_ids:
-            # NOTE(zhufl): Only when neutron's security_group ext is
-            # enabled, cleanup_default_secgroup will not raise error. But
-            # here cannot use test_utils.is_extension_enabled for it will
-            # cause "circular dependency". So here just use try...except to
-            # ensure project deletion without big changes.
-            LOG.info("Deleting project and security group for project: %s",
-                     project_id)
+                LOG.warning('router with name: %s not found for delete',
+                            creds.router['name'])
+            self._clear_isolated_router(creds.router['id'],
+                                        creds.router['name'])
+        if (not self.network_resources or
+            self.network_resources.get('subnet')):
+            self._clear_isolated_subnet(creds.subnet['id'],
+                                        creds.subnet['name'])
+        if (not self.network_resources or
+            self.network_resources.get('network')):
+            self._clear_isolated_network(creds.network['id'],
+                                         creds.network['name'])
 
+    def _clear_isolated_net_resources(self):
+        self._map(self._clear_creds_net_resources, self._creds.values())
+
+    def _clear_user(self, creds):
+        try:
+            self.creds_client.delete_user(creds.user_id)
+        except lib_exc.NotFound:
+            LOG.warning("user with name: %s not found for delete",
+                        creds.username)
+        # if cred is domain scoped, delete ephemeral domain
+        # do not delete default domain
+        if (hasattr(creds, 'domain_id') and
+                creds.domain_id != creds.project_domain_id):
             try:
-                if self.neutron_available:
-                    self.cleanup_default_secgroup(
-                        self.security_groups_admin_client, project_id)
-            except lib_exc.NotFound:
-                LOG.warning("failed to cleanup project %s's secgroup",
-                            project_id)
-            try:
-                self.creds_client.delete_project(project_id)
+                self.creds_client.delete_domain(creds.domain_id)
             except lib_exc.NotFound:
-                LOG.warning("project with id: %s not found for delete",
-                            project_id)
+                LOG.warning("domain with name: %s not found for delete",
+                            creds.domain_name)
+
+    def _clear_project(self, project_id):
+        # NOTE(zhufl): Only when neutron's security_group ext is
+        # enabled, cleanup_default_secgroup will not raise error. But
+        # here cannot use test_utils.is_extension_enabled for it will
+        # cause "circular dependency". So here just use try...except to
+        # ensure project deletion without big changes.
+        LOG.info("Deleting project and security group for project: %s",
+                 project_id)
+
+        try:
+            if self.neutron_available:
+                self.cleanup_default_secgroup(
+                    self.security_groups_admin_client, project_id)
+        except lib_exc.NotFound:
+            LOG.warning("failed to cleanup project %s's secgroup",
+                        project_id)
+        try:
+            self.creds_client.delete_project(project_id)
+        except lib_exc.NotFound:
+            LOG.warning("project with id: %s not found for delete",
+                        project_id)
+
+    def clear_creds(self):
+        if not self._creds:
+            return
+        self._clear_isolated_net_resources()
+        # NOTE(gmann): With new RBAC personas, we can have single project
+        # and multiple user created under it, to avoid conflict let's
+        # cleanup the projects at the end.
+        # Adding project if id is not None, means leaving domain and
+        # system creds.
+        project_ids = []
+        for creds in self._creds.values():
+            if creds.project_id and creds.project_id not in project_ids:
+                project_ids.append(creds.project_id)
+        self._map(self._clear_user, self._creds.values())
+        self._map(self._clear_project, project_ids)
 
         self._creds = {}
 
@@ -0,0 +1,269 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Dynamic credentials shared by the test classes of a worker
+
+Creating a project, a user and the network resources of the project is the
+largest fixed cost of a test class using dynamic credentials. A
+:py:class:`CredentialPool` keeps such bundles ready for use, and a
+:py:class:`PooledDynamicCredentialProvider` takes its credentials from the
+pool and gives them back, instead of deleting them, in `clear_creds`.
+"""
+
+import collections
+from concurrent import futures
+import threading
+
+from oslo_log import log as logging
+
+from tempest.lib.common import dynamic_creds
+from tempest.lib import exceptions as lib_exc
+
+LOG = logging.getLogger(__name__)
+
+
+class CredentialPool(object):
+    """Pool of provisioned dynamic credentials
+
+    A bundle is a project with a user, and the network resources of the
+    project when they are created. Bundles are kept by signature, i.e. the
+    admin flag and the roles of the user along with the network resources
+    of the project. Once a signature has been requested, the pool is
+    refilled in the background to keep `size` bundles of that signature
+    ready.
+
+    :param provider_factory: a callable taking the network resources and
+                             returning the `DynamicCredentialProvider` used to
+                             create, scrub and delete the bundles
+    :param int size: number of bundles kept ready for each signature
+    :param volumes_client: an admin volumes client used to check that no
+                           volume is left in a project, None when the volume
+                           service is not available
+    """
+
+    def __init__(self, provider_factory, size, volumes_client=None):
+        self.provider_factory = provider_factory
+        self.size = size
+        self.volumes_client = volumes_client
+        self._bundles = collections.defaultdict(list)
+        self._pending = collections.Counter()
+        self._providers = {}
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _get_provider(self, network_resources):
+        with self._lock:
+            if network_resources not in self._providers:
+                self._providers[network_resources] = self.provider_factory(
+                    dict(network_resources) if network_resources else None)
+            return self._providers[network_resources]
+
+    def acquire(self, signature):
+        """Take a bundle of the given signature out of the pool
+
+        :returns: the `TestResources` of the bundle, or None when no bundle
+                  of that signature is ready
+        """
+        with self._lock:
+            bundles = self._bundles[signature]
+            creds = bundles.pop() if bundles else None
+        self._refill(signature)
+        return creds
+
+    def release(self, signature, creds):
+        """Give back a bundle after use
+
+        The bundle is scrubbed and put back in the pool. It is deleted
+        instead when it was not left clean, or when the pool is full.
+        """
+        if self._scrub(signature, creds):
+            with self._lock:
+                bundles = self._bundles[signature]
+                if not self._closed and len(bundles) < self.size:
+                    bundles.append(creds)
+                    return
+        self._delete(signature, creds)
+
+    def drain(self):
+        """Stop refilling the pool and delete the bundles it holds"""
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+        if executor:
+            executor.shutdown(wait=True)
+        with self._lock:
+            bundles = [(signature, creds)
+                       for signature, creds_list in self._bundles.items()
+                       for creds in creds_list]
+            self._bundles.clear()
+        for signature, creds in bundles:
+            self._delete(signature, creds)
+
+    def _refill(self, signature):
+        with self._lock:
+            missing = (self.size - len(self._bundles[signature]) -
+                       self._pending[signature])
+            if self._closed or missing <= 0:
+                return
+            self._pending[signature] += missing
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(max_workers=1)
+            for _ in range(missing):
+                self._executor.submit(self._provision, signature)
+
+    def _provision(self, signature):
+        try:
+            creds = self._create(signature)
+        except Exception:
+            LOG.exception("Failed to provision pooled credentials for %s",
+                          signature)
+            creds = None
+        with self._lock:
+            self._pending[signature] -= 1
+            if creds is not None and not self._closed:
+                self._bundles[signature].append(creds)
+                return
+        if creds is not None:
+            self._delete(signature, creds)
+
+    def _create(self, signature):
+        admin, roles, network_resources = signature
+        provider = self._get_provider(network_resources)
+        creds = provider._create_creds(admin=admin, roles=list(roles))
+        if provider.neutron_available and provider.create_networks:
+            network, subnet, router = provider._create_network_resources(
+                creds.tenant_id)
+            creds.set_resources(network=network, subnet=subnet,
+                                router=router)
+        LOG.info("Provisioned pooled credentials: %s", creds)
+        return creds
+
+    def _scrub(self, signature, creds):
+        """Check that a bundle can be handed out again
+
+        The project must still exist, and nothing may be left in it: no
+        security group besides the default one, no port on its network
+        besides those of the network service, like the DHCP and router
+        ports, and no volume. Bundles are only used by the test classes
+        which leave the state of their projects unchanged, so this is a
+        safety net rather than a complete inventory.
+        """
+        provider = self._get_provider(signature[2])
+        try:
+            provider.creds_client.show_project(creds.project_id)
+            for kind, leftovers in self._list_leftovers(provider, creds):
+                if leftovers:
+                    LOG.info("Not reusing credentials %s, %s %s were left "
+                             "in their project", creds, kind, leftovers)
+                    return False
+        except lib_exc.NotFound:
+            return False
+        return True
+
+    def _list_leftovers(self, provider, creds):
+        """Yield the kinds and ids of the resources left in a project"""
+        if provider.neutron_available:
+            client = provider.security_groups_admin_client
+            secgroups = client.list_security_groups(
+                project_id=creds.project_id)['security_groups']
+            yield 'security groups', [secgroup['id'] for secgroup in secgroups
+                                      if secgroup['name'] != 'default']
+        if creds.network:
+            ports = provider.ports_admin_client.list_ports(
+                network_id=creds.network['id'])['ports']
+            yield 'ports', [port['id'] for port in ports
+                            if not port['device_owner'].startswith(
+                                'network:')]
+        if self.volumes_client:
+            volumes = self.volumes_client.list_volumes(
+                params={'all_tenants': True,
+                        'project_id': creds.project_id})['volumes']
+            yield 'volumes', [volume['id'] for volume in volumes]
+
+    def _delete(self, signature, creds):
+        provider = self._get_provider(signature[2])
+        provider._clear_creds_net_resources(creds)
+        provider._clear_user(creds)
+        provider._clear_project(creds.project_id)
+
+
+class PooledDynamicCredentialProvider(dynamic_creds.DynamicCredentialProvider):
+    """Dynamic credentials provider backed by a `CredentialPool`
+
+    Credentials which own a project are taken from the pool when one is
+    ready, and given back to the pool by `clear_creds`. Other credentials,
+    like those of users added to a pooled project or domain and system
+    scoped ones, are created and deleted as by `DynamicCredentialProvider`.
+
+    :param str identity_version: identity API version to use `v2` or `v3`
+    :param CredentialPool pool: the pool of credentials
+    :param kwargs: the other parameters of `DynamicCredentialProvider`
+    """
+
+    def __init__(self, identity_version, pool, **kwargs):
+        super(PooledDynamicCredentialProvider, self).__init__(
+            identity_version, **kwargs)
+        self.pool = pool
+        self._pooled = {}
+
+    def _signature(self, admin, roles):
+        network_resources = None
+        if self.network_resources:
+            network_resources = tuple(sorted(self.network_resources.items()))
+        return bool(admin), tuple(sorted(roles or [])), network_resources
+
+    def _create_creds(self, admin=False, roles=None, scope='project',
+                      project_id=None):
+        if scope != 'project' or project_id:
+            return super(PooledDynamicCredentialProvider, self)._create_creds(
+                admin=admin, roles=roles, scope=scope, project_id=project_id)
+        signature = self._signature(admin, roles)
+        creds = self.pool.acquire(signature)
+        if creds is None:
+            creds = super(PooledDynamicCredentialProvider, self)._create_creds(
+                admin=admin, roles=roles)
+        else:
+            LOG.info("Using pooled credentials: %s", creds)
+        self._pooled[id(creds)] = (signature, creds)
+        return creds
+
+    def _create_network_resources(self, project_id):
+        for _, creds in self._pooled.values():
+            if creds.project_id == project_id and creds.network:
+                return creds.network, creds.subnet, creds.router
+        return super(PooledDynamicCredentialProvider,
+                     self)._create_network_resources(project_id)
+
+    def clear_creds(self):
+        pooled = list(self._pooled.values())
+        self._pooled = {}
+        pooled_ids = set(id(creds) for _, creds in pooled)
+        pooled_projects = set(creds.project_id for _, creds in pooled)
+        shared_project_creds = []
+        creds_to_clear = {}
+        for name, creds in self._creds.items():
+            if id(creds) in pooled_ids:
+                continue
+            if creds.project_id in pooled_projects:
+                shared_project_creds.append(creds)
+            else:
+                creds_to_clear[name] = creds
+        # Users added to a pooled project are deleted, the project is kept
+        self._map(self._clear_user, shared_project_creds)
+        self._creds = creds_to_clear
+        super(PooledDynamicCredentialProvider, self).clear_creds()
+        self._map(lambda item: self.pool.release(*item), pooled)
+        self._creds = {}
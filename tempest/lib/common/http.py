@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import ssl
+import time
+
 import urllib3
 
 
@@ -136,3 +139,164 @@ class ClosingHttp(urllib3.poolmanager.PoolManager):
             return r, b''
         else:
             return Response(r), r.data
+
+
+def _build_ssl_context(disable_ssl_certificate_validation=False,
+                       ca_certs=None):
+    """Build a single SSL context to be shared by all pooled connections
+
+    Loading the CA bundle once in a shared context, instead of letting each
+    HTTPSConnection load it, keeps the certificate memory bounded no matter
+    how many connections are kept alive in the pools.
+    """
+    if disable_ssl_certificate_validation:
+        return urllib3.util.ssl_.create_urllib3_context(
+            cert_reqs=ssl.CERT_NONE)
+    context = urllib3.util.ssl_.create_urllib3_context(
+        cert_reqs=ssl.CERT_REQUIRED)
+    if ca_certs:
+        context.load_verify_locations(cafile=ca_certs)
+    else:
+        context.load_default_certs()
+    return context
+
+
+class _PooledHttpMixin(object):
+    """Keep-alive behaviour shared by the pooled HTTP managers
+
+    Connections are not closed after each request, so consecutive requests
+    to the same endpoint reuse the TCP and TLS session. The memory used by
+    the pools is bounded by ``num_pools`` (the number of hosts for which a
+    pool is kept, least recently used pools are closed first) and by
+    ``maxsize`` (the number of connections kept per host). Pools that have
+    not been used for ``idle_timeout`` seconds are closed and dropped.
+    """
+
+    def _init_pooling(self, disable_ssl_certificate_validation, ca_certs,
+                      timeout, follow_redirects, maxsize, num_pools,
+                      idle_timeout):
+        self.follow_redirects = follow_redirects
+        self.idle_timeout = idle_timeout
+        # The time of the last use of each pool, by pool key, and the key of
+        # each pool. Both are protected by the lock of the pool container.
+        self._last_used = {}
+        self._pool_keys = {}
+        kwargs = {'num_pools': num_pools, 'maxsize': maxsize}
+
+        if disable_ssl_certificate_validation:
+            urllib3.disable_warnings()
+            kwargs['cert_reqs'] = 'CERT_NONE'
+        else:
+            kwargs['cert_reqs'] = 'CERT_REQUIRED'
+        kwargs['ssl_context'] = _build_ssl_context(
+            disable_ssl_certificate_validation, ca_certs)
+
+        if timeout:
+            kwargs['timeout'] = timeout
+        return kwargs
+
+    def _close_disposed_pools(self):
+        # NOTE: Recent urllib3 releases do not close the pools evicted from
+        # the container, so their connections (and the certificates they
+        # hold) would linger until garbage collection.
+        self.pools.dispose_func = self._dispose_pool
+
+    def _dispose_pool(self, pool):
+        # Called for the pools evicted by the container, when there are more
+        # than num_pools, as well as for the idle and cleared ones
+        with self.pools.lock:
+            pool_key = self._pool_keys.pop(pool, None)
+            self._last_used.pop(pool_key, None)
+        pool.close()
+
+    def connection_from_pool_key(self, pool_key, request_context=None):
+        # urllib3 looks the pool of each request up by its key, which is the
+        # one of the proxy for the plain http requests of a ProxyManager
+        with self.pools.lock:
+            pool = super(_PooledHttpMixin, self).connection_from_pool_key(
+                pool_key, request_context=request_context)
+            self._last_used[pool_key] = time.monotonic()
+            self._pool_keys[pool] = pool_key
+        return pool
+
+    def _expire_idle_pools(self, now):
+        if not self.idle_timeout:
+            return
+        with self.pools.lock:
+            for pool_key in self.pools.keys():
+                last_used = self._last_used.get(pool_key)
+                if (last_used is not None and
+                        now - last_used > self.idle_timeout):
+                    # The pool is closed and forgotten by _dispose_pool
+                    del self.pools[pool_key]
+
+    def _pooled_request(self, super_request, url, method, *args, **kwargs):
+
+        class Response(dict):
+            def __init__(self, info):
+                for key, value in info.getheaders().items():
+                    self[str(key).lower()] = value
+                self.status = info.status
+                self['status'] = str(self.status)
+                self.reason = info.reason
+                self.version = info.version
+                self['content-location'] = url
+
+        self._expire_idle_pools(time.monotonic())
+        if self.follow_redirects:
+            retry = urllib3.util.Retry(raise_on_redirect=False, redirect=5)
+        else:
+            retry = urllib3.util.Retry(redirect=False)
+        r = super_request(method, url, retries=retry, *args, **kwargs)
+
+        if not kwargs.get('preload_content', True):
+            return r, b''
+        else:
+            return Response(r), r.data
+
+
+class PooledHttp(_PooledHttpMixin, urllib3.poolmanager.PoolManager):
+    """A PoolManager which keeps connections alive across requests
+
+    This is an opt-in alternative to `ClosingHttp`. It has the same
+    interface, plus a few parameters to bound the pools.
+
+    :param int maxsize: Number of connections kept alive per host
+    :param int num_pools: Number of hosts for which a pool is kept
+    :param int idle_timeout: Seconds after which an unused pool is closed.
+                             Zero or None disables the idle expiry.
+    """
+
+    def __init__(self, disable_ssl_certificate_validation=False,
+                 ca_certs=None, timeout=None, follow_redirects=True,
+                 maxsize=10, num_pools=10, idle_timeout=60):
+        kwargs = self._init_pooling(
+            disable_ssl_certificate_validation, ca_certs, timeout,
+            follow_redirects, maxsize, num_pools, idle_timeout)
+        super(PooledHttp, self).__init__(**kwargs)
+        self._close_disposed_pools()
+
+    def request(self, url, method, *args, **kwargs):
+        return self._pooled_request(
+            super(PooledHttp, self).request, url, method, *args, **kwargs)
+
+
+class PooledProxyHttp(_PooledHttpMixin, urllib3.ProxyManager):
+    """A ProxyManager which keeps connections alive across requests
+
+    See `PooledHttp` for the meaning of the pool parameters.
+    """
+
+    def __init__(self, proxy_url, disable_ssl_certificate_validation=False,
+                 ca_certs=None, timeout=None, follow_redirects=True,
+                 maxsize=10, num_pools=10, idle_timeout=60):
+        kwargs = self._init_pooling(
+            disable_ssl_certificate_validation, ca_certs, timeout,
+            follow_redirects, maxsize, num_pools, idle_timeout)
+        super(PooledProxyHttp, self).__init__(proxy_url, **kwargs)
+        self._close_disposed_pools()
+
+    def request(self, url, method, *args, **kwargs):
+        return self._pooled_request(
+            super(PooledProxyHttp, self).request, url, method, *args,
+            **kwargs)
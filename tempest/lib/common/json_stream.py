@@ -0,0 +1,188 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Incremental parsing of JSON list responses
+
+List responses of the OpenStack APIs wrap the list of resources under a
+single top-level key, like ``{"servers": [...], "servers_links": [...]}``.
+:py:class:`JSONListStream` yields the items of that list one by one while
+the body is read, so that only one item at a time is held in memory.
+"""
+
+import codecs
+import json
+
+# Number of bytes of the body kept for logging
+PREVIEW_SIZE = 4096
+
+_WHITESPACE = ' \t\n\r'
+
+
+class JSONListStream(object):
+    """Iterate over the items of the list of a JSON document
+
+    The document is either a list, or an object with the list under one of
+    its top-level keys. The other top-level members of the object, like
+    pagination links, are available in `others` once the iteration is
+    over.
+
+    :param chunks: an iterable of the bytes of the document
+    :param key: the top-level key of the list. When None, the first
+                top-level member whose value is a list is used.
+    :param close_callback: called without arguments once the stream is
+                           exhausted or closed
+    :param encoding: the encoding of the document
+    :raises ValueError: while iterating, if the document is not valid JSON
+                        or has no matching list
+    """
+
+    def __init__(self, chunks, key=None, close_callback=None,
+                 encoding='utf-8'):
+        self.key = key
+        self.others = {}
+        self.preview = b''
+        self._chunks = iter(chunks)
+        self._close_callback = close_callback
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._closed = False
+        self._items = self._parse()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._items)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop reading the document"""
+        if self._closed:
+            return
+        self._closed = True
+        self._items.close()
+        if self._close_callback:
+            self._close_callback()
+
+    def _fill(self):
+        """Read the next chunk of the document
+
+        :return: False at the end of the document
+        """
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            if len(self.preview) < PREVIEW_SIZE:
+                self.preview += chunk[:PREVIEW_SIZE - len(self.preview)]
+            self._buffer += self._decoder.decode(chunk)
+            return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def _peek(self):
+        """Skip whitespace and return the next character, None at the end"""
+        while True:
+            while (self._pos < len(self._buffer) and
+                   self._buffer[self._pos] in _WHITESPACE):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, characters):
+        char = self._peek()
+        if char is None or char not in characters:
+            raise ValueError('Expected one of %r at offset %d of the JSON '
+                             'stream, found %r' % (characters, self._pos,
+                                                   char))
+        self._pos += 1
+        return char
+
+    def _decode(self):
+        """Decode the next JSON value"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(
+                    self._buffer, self._pos)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may go on in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _parse_list(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._expect(',]') == ']':
+                return
+
+    def _parse(self):
+        if self._peek() == '[' and self.key is None:
+            yield from self._parse_list()
+            self._expect_end()
+            return
+        self._expect('{')
+        found = False
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self._decode()
+                self._expect(':')
+                if (not found and self._peek() == '[' and
+                        (self.key is None or self.key == key)):
+                    found = True
+                    self.key = key
+                    yield from self._parse_list()
+                else:
+                    self.others[key] = self._decode()
+                if self._expect(',}') == '}':
+                    break
+        self._expect_end()
+        if not found:
+            raise ValueError('No list found under the key %s of the JSON '
+                             'stream' % self.key)
+
+    def _expect_end(self):
+        if self._peek() is not None:
+            raise ValueError('Extra data at offset %d of the JSON stream' %
+                             self._pos)
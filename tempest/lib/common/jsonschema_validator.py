@@ -12,10 +12,17 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import importlib
+import pkgutil
+import threading
+
 import jsonschema
+from oslo_log import log as logging
 from oslo_serialization import base64
 from oslo_utils import timeutils
 
+LOG = logging.getLogger(__name__)
+
 # JSON Schema validator and format checker used for JSON Schema validation
 JSONSCHEMA_VALIDATOR = jsonschema.Draft4Validator
 FORMAT_CHECKER = JSONSCHEMA_VALIDATOR.FORMAT_CHECKER
@@ -51,3 +58,86 @@ def _validate_base64_format(instance):
         return False
 
     return True
+
+
+# Validators built by get_validator, keyed by the id of their schema. The
+# schema is kept along with its validator, so that its id can not be reused
+# by another object.
+_validators = {}
+_validators_lock = threading.Lock()
+# Bound the cache for schemas built on the fly, the schemas of the service
+# clients are far fewer than this.
+MAX_CACHED_VALIDATORS = 4096
+
+RESPONSE_SCHEMAS_PACKAGE = 'tempest.lib.api_schema.response'
+_warmed_up_packages = set()
+
+
+def get_validator(schema):
+    """Return a validator for a schema, built once per process
+
+    `jsonschema.validate` checks the schema against its metaschema and builds
+    a new validator on every call. The validators returned here are checked
+    and built the first time a schema is seen and reused afterwards. They are
+    cached by schema identity, so the schemas must not be modified after
+    they were first used.
+
+    :param schema: the JSON schema, a dict
+    :raises jsonschema.SchemaError: if the schema is invalid
+    """
+    entry = _validators.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+    JSONSCHEMA_VALIDATOR.check_schema(schema)
+    validator = JSONSCHEMA_VALIDATOR(schema, format_checker=FORMAT_CHECKER)
+    with _validators_lock:
+        if len(_validators) >= MAX_CACHED_VALIDATORS:
+            # Evict the oldest schema
+            del _validators[next(iter(_validators))]
+        _validators[id(schema)] = (schema, validator)
+    return validator
+
+
+def validate(instance, schema):
+    """Validate an instance against a schema with a cached validator
+
+    This is equivalent to `jsonschema.validate` with `JSONSCHEMA_VALIDATOR`
+    and `FORMAT_CHECKER`, and raises the same error.
+
+    :raises jsonschema.ValidationError: if the instance is invalid
+    """
+    validator = get_validator(schema)
+    error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def warm_up_validators(package=RESPONSE_SCHEMAS_PACKAGE):
+    """Build the validators of all the response schemas of a package
+
+    The modules of the package are imported and a validator is built for
+    the body and header schemas of each response schema they define, so that
+    the first responses validated by the tests do not pay for it. Packages
+    which were already warmed up are skipped.
+
+    :param package: name of the package containing the response schemas
+    :returns: the number of response schemas found
+    """
+    if package in _warmed_up_packages:
+        return 0
+    count = 0
+    root = importlib.import_module(package)
+    for module_info in pkgutil.walk_packages(root.__path__,
+                                             prefix=package + '.'):
+        module = importlib.import_module(module_info.name)
+        for value in vars(module).values():
+            if not (isinstance(value, dict) and 'status_code' in value):
+                continue
+            for key in ('response_body', 'response_header'):
+                if value.get(key):
+                    get_validator(value[key])
+            count += 1
+    _warmed_up_packages.add(package)
+    LOG.debug('Built the validators of %d response schemas from %s',
+              count, package)
+    return count
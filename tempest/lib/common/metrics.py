@@ -0,0 +1,263 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Latency metrics of the requests sent by the service clients
+
+The RestClient reports the latency of each request, measured with a
+monotonic clock, to the sinks added with add_sink(). A request is identified
+by its service, its method, the template of its URL and the status code of
+its response. Nothing is recorded while there is no sink.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import socket
+import threading
+import urllib
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+_sinks = []
+
+_URL_TEMPLATE_PATTERNS = [
+    (re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-'
+                r'[0-9a-f]{12}$', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'^[0-9a-f]{32}$', re.IGNORECASE), '<id>'),
+    # The accounts of the object storage
+    (re.compile(r'^AUTH_[0-9a-f]{32}$', re.IGNORECASE), 'AUTH_<id>'),
+    (re.compile(r'^[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}$'), '<ip>'),
+    (re.compile(r'^[0-9]+$'), '<id>'),
+    # The names generated by data_utils.rand_name()
+    (re.compile(r'-[0-9]{6,}$'), '<name>'),
+]
+
+
+def get_url_template(url):
+    """Return the template of the path of a URL
+
+    The scheme, the host, the query string and the trailing slash are
+    dropped, and the uuids, ids, IP addresses and random names of the path
+    are replaced by ``<uuid>``, ``<id>``, ``<ip>`` and ``<name>``.
+    """
+    path = urllib.parse.urlsplit(url).path
+    segments = []
+    for segment in path.strip('/').split('/'):
+        for pattern, replacement in _URL_TEMPLATE_PATTERNS:
+            if pattern.search(segment):
+                segment = replacement
+                break
+        segments.append(segment)
+    return '/' + '/'.join(segments)
+
+
+def add_sink(sink):
+    """Add a sink, which is given the latency of each request"""
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    """Remove a sink added with add_sink()"""
+    _sinks.remove(sink)
+
+
+def get_sinks():
+    """Return the sinks added with add_sink()"""
+    return list(_sinks)
+
+
+def record(service, method, url, status, secs):
+    """Give the latency of a request to the sinks
+
+    :param str service: the service of the client which sent the request
+    :param str method: the HTTP method of the request
+    :param str url: the URL of the request
+    :param int status: the status code of the response
+    :param float secs: the latency of the request in seconds
+    """
+    if not _sinks:
+        return
+    template = get_url_template(url)
+    for sink in _sinks:
+        try:
+            sink.record(service, method, template, status, secs)
+        except Exception:
+            LOG.exception('The latency sink %s failed', sink)
+
+
+class Histogram(object):
+    """A histogram of latencies with a bounded relative error
+
+    In the manner of HdrHistogram, the latencies are counted in buckets whose
+    width grows with their value, so that the histogram has a small fixed
+    size while any value it returns, percentiles included, is within
+    ``2 ** -precision_bits`` of a recorded latency.
+
+    :param int precision_bits: the number of significant bits of the
+                               recorded latencies
+    """
+
+    # The unit of the recorded latencies, a microsecond
+    UNIT = 1e-6
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _get_bucket(self, value):
+        shift = max(value.bit_length() - self.precision_bits - 1, 0)
+        return (value >> shift) << shift, 1 << shift
+
+    def record(self, secs):
+        value = max(int(secs / self.UNIT), 0)
+        start, _ = self._get_bucket(value)
+        self.buckets[start] = self.buckets.get(start, 0) + 1
+        self.count += 1
+        self.total += secs
+        self.min = secs if self.min is None else min(self.min, secs)
+        self.max = secs if self.max is None else max(self.max, secs)
+
+    def get_percentile(self, percent):
+        """Return the latency under which a percent of the latencies are
+
+        :return: the latency in seconds, the middle of its bucket or the
+                 maximum latency, or None when the histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = max(int(math.ceil(percent / 100.0 * self.count)), 1)
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        for start in sorted(self.buckets):
+            seen += self.buckets[start]
+            if seen >= rank:
+                _, width = self._get_bucket(start)
+                value = (start + (width - 1) / 2.0) * self.UNIT
+                return min(max(value, self.min), self.max)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.get_percentile(50),
+            'p90': self.get_percentile(90),
+            'p99': self.get_percentile(99),
+            'precision_bits': self.precision_bits,
+            'buckets': dict((str(start), count) for start, count
+                            in sorted(self.buckets.items())),
+        }
+
+
+class HistogramSink(object):
+    """Keep a histogram of the latencies of each kind of request in memory"""
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, service, method, url, status, secs):
+        key = (service, method, url, status)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.precision_bits)
+                self.histograms[key] = histogram
+            histogram.record(secs)
+
+    def to_list(self):
+        """Return the histograms as a list of JSON serializable dicts"""
+        with self._lock:
+            items = sorted(self.histograms.items(),
+                           key=lambda item: tuple(map(str, item[0])))
+            result = []
+            for (service, method, url, status), histogram in items:
+                latency = {'service': service, 'method': method, 'url': url,
+                           'status': status}
+                latency.update(histogram.to_dict())
+                result.append(latency)
+            return result
+
+
+class JSONFileSink(HistogramSink):
+    """Keep the histograms in memory and dump them to a file at exit
+
+    :param str path: the path of the JSON file, which is replaced
+    """
+
+    def __init__(self, path, precision_bits=7):
+        super(JSONFileSink, self).__init__(precision_bits)
+        self.path = path
+        atexit.register(self.dump)
+
+    def dump(self):
+        """Write the histograms to the JSON file"""
+        tmp_path = '%s.tmp' % self.path
+        with open(tmp_path, 'w') as f:
+            json.dump({'pid': os.getpid(), 'latencies': self.to_list()}, f,
+                      indent=1)
+        os.replace(tmp_path, self.path)
+
+
+class StatsdSink(object):
+    """Send each latency to a statsd collector as a timer, over UDP
+
+    The name of the timer is ``<prefix>.<service>.<method>.<url>.<status>``,
+    with the characters of the URL template which statsd does not accept
+    replaced.
+
+    :param str host: the host of the collector
+    :param int port: the UDP port of the collector
+    :param str prefix: the prefix of the names of the timers
+    """
+
+    _INVALID_CHARS = re.compile(r'[^A-Za-z0-9_\-]+')
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='tempest'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(
+            socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)[0][0],
+            socket.SOCK_DGRAM)
+
+    def _get_name(self, service, method, url, status):
+        parts = [self.prefix, service or 'unknown', method]
+        parts.extend(self._INVALID_CHARS.sub('_', segment).strip('_') or '_'
+                     for segment in url.strip('/').split('/'))
+        parts.append(str(status))
+        return '.'.join(part for part in parts if part)
+
+    def record(self, service, method, url, status, secs):
+        data = '%s:%.3f|ms' % (self._get_name(service, method, url, status),
+                               secs * 1000)
+        try:
+            self._socket.sendto(data.encode('utf-8'), self.address)
+        except OSError as e:
+            # The collector may not be there, the requests are not failed
+            LOG.debug('Failed to send %s to statsd: %s', data, e)
+
+    def close(self):
+        self._socket.close()
@@ -0,0 +1,197 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Polling policies used by the waiters
+
+A polling policy decides how long a waiter sleeps between two polls of a
+resource. Policies are immutable and can be shared by several clients,
+each wait gets its own :py:class:`Poller` from :py:meth:`PollingPolicy.start`
+which keeps track of the number of polls and of the time spent waiting.
+"""
+
+import random
+import time
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class Poller(object):
+    """Tracks a single wait driven by a polling policy
+
+    :param policy: the `PollingPolicy` which provides the sleep intervals
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.polls = 0
+        self.slept = 0.0
+        self.start_time = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """Total time in seconds since the wait started"""
+        return time.monotonic() - self.start_time
+
+    def next_interval(self):
+        """The time in seconds the next call to sleep() will wait"""
+        return self.policy.interval(self.polls)
+
+    def sleep(self):
+        """Sleep until the next poll is due"""
+        interval = self.next_interval()
+        self.polls += 1
+        self.slept += interval
+        time.sleep(interval)
+
+    def report(self, name):
+        """Log the number of polls and the time spent waiting"""
+        LOG.debug('%s waited %.3f seconds over %d polls (%s)', name,
+                  self.elapsed, self.polls, self.policy)
+
+
+class PollingPolicy(object):
+    """Base class of the polling policies
+
+    Subclasses implement `interval` which returns the time to sleep after
+    a given number of polls.
+    """
+
+    def interval(self, polls):
+        """Time in seconds to sleep after `polls` unsuccessful polls"""
+        raise NotImplementedError
+
+    def start(self):
+        """Start a new wait
+
+        :return: a `Poller` instance to be used for a single wait
+        """
+        return Poller(self)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(
+            '%s=%s' % item for item in sorted(vars(self).items())))
+
+
+class FixedPolicy(PollingPolicy):
+    """Sleep the same interval between all polls
+
+    This is the historical behaviour of the waiters, which sleep
+    `build_interval` seconds between polls.
+    """
+
+    def __init__(self, interval):
+        self.fixed_interval = interval
+
+    def interval(self, polls):
+        return self.fixed_interval
+
+
+class ExponentialPolicy(PollingPolicy):
+    """Multiply the interval by `factor` after each poll, up to a cap
+
+    :param initial_interval: time in seconds to sleep after the first poll
+    :param max_interval: the interval never grows above this value
+    :param factor: the growth factor of the interval
+    """
+
+    def __init__(self, initial_interval, max_interval, factor=2.0):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.factor = factor
+
+    def interval(self, polls):
+        if self.initial_interval <= 0 or self.factor <= 1:
+            return min(self.initial_interval, self.max_interval)
+        interval = self.initial_interval
+        for _ in range(polls):
+            interval *= self.factor
+            if interval >= self.max_interval:
+                return self.max_interval
+        return interval
+
+
+class FastFirstPolicy(PollingPolicy):
+    """Poll fast a few times, then fall back on a slower interval
+
+    This suits operations which usually complete in a few seconds, but
+    sometimes take much longer.
+
+    :param fast_interval: time in seconds to sleep between the first polls
+    :param fast_polls: how many polls use `fast_interval`
+    :param interval: time in seconds to sleep between later polls
+    """
+
+    def __init__(self, fast_interval, fast_polls, interval):
+        self.fast_interval = fast_interval
+        self.fast_polls = fast_polls
+        self.slow_interval = interval
+
+    def interval(self, polls):
+        if polls < self.fast_polls:
+            return self.fast_interval
+        return self.slow_interval
+
+
+class JitteredPolicy(PollingPolicy):
+    """Randomize the intervals of another policy
+
+    Jitter avoids the waiters of many concurrent tests polling in lockstep.
+
+    :param policy: the `PollingPolicy` providing the base intervals
+    :param jitter: the intervals are multiplied by a random factor between
+                   1 - jitter and 1 + jitter
+    """
+
+    def __init__(self, policy, jitter=0.2):
+        self.policy = policy
+        self.jitter = jitter
+
+    def interval(self, polls):
+        base = self.policy.interval(polls)
+        return max(0, base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+POLICIES = ('fixed', 'exponential', 'jittered', 'fast-first')
+
+
+def get_policy(name, build_interval, initial_interval=0.5,
+               max_interval=10, factor=2.0, fast_polls=5, jitter=0.2):
+    """Build a polling policy from its name
+
+    :param name: one of `POLICIES`
+    :param build_interval: the interval of the fixed policy, and of the
+                           polls which follow the fast ones for `fast-first`
+    :param initial_interval: the first interval of the `exponential` and
+                             `jittered` policies, and the interval of the
+                             fast polls of `fast-first`
+    :param max_interval: the cap of the `exponential` and `jittered` policies
+    :param factor: the growth factor of `exponential` and `jittered`
+    :param fast_polls: the number of fast polls of `fast-first`
+    :param jitter: the jitter ratio of the `jittered` policy
+    :raises ValueError: if the name is not a known policy
+    """
+    if name == 'fixed':
+        return FixedPolicy(build_interval)
+    if name == 'exponential':
+        return ExponentialPolicy(initial_interval, max_interval, factor)
+    if name == 'jittered':
+        return JitteredPolicy(
+            ExponentialPolicy(initial_interval, max_interval, factor), jitter)
+    if name == 'fast-first':
+        return FastFirstPolicy(initial_interval, fast_polls, build_interval)
+    raise ValueError('Unknown polling policy %s, valid values are: %s' %
+                     (name, ', '.join(POLICIES)))
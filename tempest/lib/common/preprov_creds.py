@@ -14,6 +14,7 @@
 
 import hashlib
 import os
+import random
 
 from oslo_concurrency import lockutils
 from oslo_log import log as logging
@@ -27,6 +28,14 @@ from tempest.lib.services import clients
 
 LOG = logging.getLogger(__name__)
 
+# Role lists of the two groups of project personas. The first credentials
+# requested for a persona of a group, before a project is picked for the
+# group, are preferably taken from the project with the most personas of the
+# group, so the hashes matching them are probed in order. The later requests
+# of the group are limited to the picked project.
+_PERSONAS = [['manager'], ['member'], ['reader']]
+_ALT_PERSONAS = [['alt_manager'], ['alt_member'], ['alt_reader']]
+
 
 def read_accounts_yaml(path):
     try:
@@ -68,6 +77,11 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
     :param object_storage_operator_role: name of the role
     :param object_storage_reseller_admin_role: name of the role
     :param identity_uri: Identity URI of the target cloud
+    :param atomic_allocation: allocate accounts by creating their lock file
+                              with O_CREAT|O_EXCL, without taking the global
+                              `test_accounts_io` lock. Lock files left by
+                              processes which are no longer alive are
+                              reclaimed.
     """
 
     # Exclude from the hash fields specific to v2 or v3 identity API
@@ -78,7 +92,8 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
     def __init__(self, identity_version, test_accounts_file,
                  accounts_lock_dir, name=None, credentials_domain=None,
                  admin_role=None, object_storage_operator_role=None,
-                 object_storage_reseller_admin_role=None, identity_uri=None):
+                 object_storage_reseller_admin_role=None, identity_uri=None,
+                 atomic_allocation=False):
         super(PreProvisionedCredentialProvider, self).__init__(
             identity_version=identity_version, name=name,
             admin_role=admin_role, credentials_domain=credentials_domain,
@@ -92,7 +107,9 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
             accounts, admin_role, object_storage_operator_role,
             object_storage_reseller_admin_role)
         self.accounts_dir = accounts_lock_dir
+        self.atomic_allocation = atomic_allocation
         self._creds = {}
+        self._match_hashes = {}
 
     @classmethod
     def _append_role(cls, role, account_hash, hash_dict):
@@ -227,7 +244,112 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
                'the credentials for this allocation request' % ','.join(names))
         raise lib_exc.InvalidCredentials(msg)
 
+    def _read_hash_file(self, path):
+        """Return the (name, pid) of the owner of a lock file
+
+        The pid is None for lock files which do not record it. None is
+        returned when the lock file does not exist.
+        """
+        try:
+            with open(path, 'r') as fd:
+                content = fd.read().split('\n')
+        except FileNotFoundError:
+            return None
+        pid = None
+        if len(content) > 1 and content[1].isdigit():
+            pid = int(content[1])
+        return content[0], pid
+
+    @staticmethod
+    def _is_process_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # The process exists, it belongs to another user
+            return True
+        return True
+
+    def _create_hash_file_atomic(self, hash_string):
+        path = os.path.join(self.accounts_dir, hash_string)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as lock_file:
+            lock_file.write('%s\n%d' % (self.name, os.getpid()))
+        return True
+
+    def _reclaim_stale_hash_file(self, hash_string):
+        """Remove the lock file of an account if its owner is dead
+
+        :return: True if the lock file was removed
+        """
+        path = os.path.join(self.accounts_dir, hash_string)
+        owner = self._read_hash_file(path)
+        if not owner or owner[1] is None or self._is_process_alive(owner[1]):
+            return False
+        # Move the lock file away before checking it again, so that a lock
+        # file created meanwhile by a live process is not removed
+        stale_path = '%s.%d.stale' % (path, os.getpid())
+        try:
+            os.rename(path, stale_path)
+        except FileNotFoundError:
+            return False
+        if self._read_hash_file(stale_path) != owner:
+            try:
+                os.link(stale_path, path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+        os.remove(stale_path)
+        LOG.warning('Reclaimed the account lock file %s of %s, process %d '
+                    'is not alive', path, owner[0], owner[1])
+        return True
+
+    def _get_free_hash_atomic(self, hashes, ordered=False):
+        """Allocate one of the hashes without taking the global lock
+
+        Hashes are probed from a random position, unless `ordered` is True,
+        so that concurrent processes seldom compete for the same lock file.
+        """
+        hashes = list(hashes)
+        os.makedirs(self.accounts_dir, exist_ok=True)
+        if not ordered:
+            start = random.randrange(len(hashes))
+            hashes = hashes[start:] + hashes[:start]
+        for _hash in hashes:
+            if self._create_hash_file_atomic(_hash):
+                return _hash
+        for _hash in hashes:
+            if (self._reclaim_stale_hash_file(_hash) and
+                    self._create_hash_file_atomic(_hash)):
+                return _hash
+        names = []
+        for _hash in hashes:
+            owner = self._read_hash_file(
+                os.path.join(self.accounts_dir, _hash))
+            if owner:
+                names.append(owner[0])
+        msg = ('Insufficient number of users provided. %s have allocated all '
+               'the credentials for this allocation request' % ','.join(names))
+        raise lib_exc.InvalidCredentials(msg)
+
     def _get_match_hash_list(self, roles=None, scope=None, project_name=None):
+        # The accounts do not change, so the matching hashes of each request
+        # are only computed once
+        key = (tuple(roles) if roles else None, scope, project_name)
+        if key not in self._match_hashes:
+            self._match_hashes[key] = self._compute_match_hash_list(
+                roles, scope, project_name)
+        useable_hashes = self._match_hashes[key]
+        LOG.info('Pre provisioned useable hashes: %s', useable_hashes)
+        return useable_hashes
+
+    def _compute_match_hash_list(self, roles=None, scope=None,
+                                 project_name=None):
         hashes = []
         if roles:
             # Loop over all the creds for each role in the subdict and generate
@@ -285,16 +407,11 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
         # project with the largest set of role accounts. This helps ensure
         # that subsequent credential requests can be fulfilled from the same
         # project.
-        if (scope == 'project' and not project_name and
-                roles in [['manager'], ['member'], ['reader'],
-                          ['alt_manager'], ['alt_member'], ['alt_reader']]):
-            if roles in [['manager'], ['member'], ['reader']]:
-                personas = ['manager', 'member', 'reader']
-            else:
-                personas = ['alt_manager', 'alt_member', 'alt_reader']
+        personas = self._get_first_persona_group(roles, scope, project_name)
+        if personas:
             scoped_hashes = [
                 set(self.hash_dict['scoped_roles'].get(
-                    'project_%s' % persona, []))
+                    'project_%s' % persona[0], []))
                 for persona in personas
             ]
             scored = []
@@ -308,8 +425,21 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
                 scored.append((score, hash))
             scored.sort(reverse=True)
             useable_hashes = [hash for _, hash in scored]
-        LOG.info('Pre provisioned useable hashes: %s', useable_hashes)
-        return useable_hashes
+        return list(useable_hashes)
+
+    @staticmethod
+    def _get_first_persona_group(roles, scope, project_name):
+        """The persona group of the first request of the group, else None
+
+        A request is the first of its group when no project was picked for
+        the group yet, which `_get_creds` passes as `project_name`.
+        """
+        if scope != 'project' or project_name:
+            return None
+        for personas in (_PERSONAS, _ALT_PERSONAS):
+            if roles in personas:
+                return personas
+        return None
 
     def _sanitize_creds(self, creds):
         temp_creds = creds.copy()
@@ -318,15 +448,21 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
 
     def _get_creds(self, roles=None, scope=None):
         project_name = None
-        if scope == 'project' and roles in [['manager'], ['member'],
-                                            ['reader'], ['alt_manager'],
-                                            ['alt_member'], ['alt_reader']]:
+        if scope == 'project' and roles in _PERSONAS + _ALT_PERSONAS:
             project_name = self._get_project_id(roles, scope, return_name=True)
         useable_hashes = self._get_match_hash_list(roles, scope, project_name)
         if not useable_hashes:
             msg = 'No users configured for type/roles %s' % roles
             raise lib_exc.InvalidCredentials(msg)
-        free_hash = self._get_free_hash(useable_hashes)
+        if self.atomic_allocation:
+            # Only the hashes of the first request of a persona group are
+            # ranked, the others are probed from a random position
+            ranked = self._get_first_persona_group(
+                roles, scope, project_name) is not None
+            free_hash = self._get_free_hash_atomic(useable_hashes,
+                                                   ordered=ranked)
+        else:
+            free_hash = self._get_free_hash(useable_hashes)
         clean_creds = self._sanitize_creds(
             self.hash_dict['creds'][free_hash])
         LOG.info('%s allocated creds:\n%s', self.name, clean_creds)
@@ -343,6 +479,14 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
             if not os.listdir(self.accounts_dir):
                 os.rmdir(self.accounts_dir)
 
+    def _remove_hash_atomic(self, hash_string):
+        hash_path = os.path.join(self.accounts_dir, hash_string)
+        try:
+            os.remove(hash_path)
+        except FileNotFoundError:
+            LOG.warning('Expected an account lock file %s to remove, but '
+                        'one did not exist', hash_path)
+
     def get_hash(self, creds):
         for _hash in self.hash_dict['creds']:
             # Comparing on the attributes that are expected in the YAML
@@ -361,7 +505,10 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
     def remove_credentials(self, creds):
         _hash = self.get_hash(creds)
         clean_creds = self._sanitize_creds(self.hash_dict['creds'][_hash])
-        self.remove_hash(_hash)
+        if self.atomic_allocation:
+            self._remove_hash_atomic(_hash)
+        else:
+            self.remove_hash(_hash)
         LOG.info("%s returned allocated creds:\n%s", self.name, clean_creds)
 
     # TODO(gmann): Remove this method in favor of get_project_member_creds()
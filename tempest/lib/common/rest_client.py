@@ -16,6 +16,8 @@
 
 from collections import abc
 import email.utils
+import inspect
+import os
 import re
 import time
 import urllib
@@ -28,7 +30,10 @@ from oslo_log import versionutils
 from oslo_serialization import jsonutils as json
 
 from tempest.lib.common import http
+from tempest.lib.common import json_stream
 from tempest.lib.common import jsonschema_validator
+from tempest.lib.common import metrics
+from tempest.lib.common import polling
 from tempest.lib.common import profiler
 from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions
@@ -46,7 +51,16 @@ HTTP_REDIRECTION = (300, 301, 302, 303, 304, 305, 306, 307)
 JSONSCHEMA_VALIDATOR = jsonschema_validator.JSONSCHEMA_VALIDATOR
 FORMAT_CHECKER = jsonschema_validator.FORMAT_CHECKER
 
+# Size of the chunks read from streamed responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# The bodies of these content types are not logged
+_BINARY_CONTENT_TYPES = ('application/octet-stream',)
+
 RESOURCE_LIST_JSON = "resource_list.json"
+# Resources are appended to the journal as they are created, and merged into
+# RESOURCE_LIST_JSON by compact_resource_journal()
+RESOURCE_LIST_JOURNAL = "resource_list.journal"
 
 
 class RestClient(object):
@@ -76,6 +90,19 @@ class RestClient(object):
                              return
     :param str proxy_url: http proxy url to use.
     :param bool follow_redirects: Set to false to stop following redirects.
+    :param bool connection_pooling: Set to true to keep the connections alive
+                                    across requests instead of closing them
+                                    after each request.
+    :param int pool_maxsize: Number of connections kept alive per host when
+                             connection_pooling is enabled.
+    :param int pool_num_pools: Number of hosts for which a connection pool is
+                               kept when connection_pooling is enabled.
+    :param int pool_idle_timeout: Time in seconds after which an unused
+                                  connection pool is closed when
+                                  connection_pooling is enabled.
+    :param polling_policy: a `tempest.lib.common.polling.PollingPolicy` used
+                           by the wait loops. Defaults to polling every
+                           build_interval seconds.
     """
 
     # The version of the API this client implements
@@ -92,6 +119,10 @@ class RestClient(object):
     # the recording of all resources created by Tempest.
     record_resources = False
 
+    # Set to True to not log the request and response bodies of the client,
+    # like those of the clients of binary data endpoints.
+    skip_body_logging = False
+
     LOG = logging.getLogger(__name__)
 
     def __init__(self, auth_provider, service, region,
@@ -99,7 +130,9 @@ class RestClient(object):
                  build_interval=1, build_timeout=60,
                  disable_ssl_certificate_validation=False, ca_certs=None,
                  trace_requests='', name=None, http_timeout=None,
-                 proxy_url=None, follow_redirects=True, service_token=None):
+                 proxy_url=None, follow_redirects=True, service_token=None,
+                 connection_pooling=False, pool_maxsize=10, pool_num_pools=10,
+                 pool_idle_timeout=60, polling_policy=None):
         self.auth_provider = auth_provider
         self.service = service
         self.region = region
@@ -107,6 +140,7 @@ class RestClient(object):
         self.endpoint_type = endpoint_type
         self.build_interval = build_interval
         self.build_timeout = build_timeout
+        self._polling_policy = polling_policy
         self.trace_requests = trace_requests
         self.service_token = service_token
 
@@ -121,7 +155,17 @@ class RestClient(object):
                                        'vary', 'www-authenticate'))
         self.dscv = disable_ssl_certificate_validation
 
-        if proxy_url:
+        if connection_pooling:
+            pool_kwargs = dict(
+                disable_ssl_certificate_validation=self.dscv,
+                ca_certs=ca_certs, timeout=http_timeout,
+                follow_redirects=follow_redirects, maxsize=pool_maxsize,
+                num_pools=pool_num_pools, idle_timeout=pool_idle_timeout)
+            if proxy_url:
+                self.http_obj = http.PooledProxyHttp(proxy_url, **pool_kwargs)
+            else:
+                self.http_obj = http.PooledHttp(**pool_kwargs)
+        elif proxy_url:
             self.http_obj = http.ClosingProxyHttp(
                 proxy_url,
                 disable_ssl_certificate_validation=self.dscv,
@@ -236,6 +280,17 @@ class RestClient(object):
     def token(self):
         return self.auth_provider.get_token()
 
+    @property
+    def polling_policy(self):
+        """The polling policy used by the wait loops of this client"""
+        if self._polling_policy is None:
+            return polling.FixedPolicy(self.build_interval)
+        return self._polling_policy
+
+    @polling_policy.setter
+    def polling_policy(self, policy):
+        self._polling_policy = policy
+
     @property
     def filters(self):
         _filters = dict(
@@ -345,6 +400,56 @@ class RestClient(object):
         return self.request('GET', url, extra_headers, headers,
                             chunked=chunked)
 
+    def get_list_stream(self, url, key=None, headers=None,
+                        extra_headers=False):
+        """Send a HTTP GET request and iterate over the list it returns
+
+        The response body is parsed while it is read, instead of being
+        loaded at once, so that large list responses are not held in
+        memory. Only a preview of the body is logged. Rate limited requests
+        are not retried, and the response is not validated against a
+        schema.
+
+        :param str url: the relative url to send the get request to
+        :param str key: the top-level key of the list in the response body.
+                        If None, the first list of the body is used.
+        :param dict headers: The headers to use for the request
+        :param bool extra_headers: Boolean value than indicates if the headers
+                                   returned by the get_headers() method are to
+                                   be used but additional headers are needed in
+                                   the request pass them in as a dict.
+        :return: a tuple with the first entry containing the response headers
+                 and the second a
+                 `tempest.lib.common.json_stream.JSONListStream` yielding the
+                 items of the list. The other top-level members of the body,
+                 like links, are in its `others` attribute once it is
+                 exhausted. The stream **MUST** be exhausted or closed to
+                 release the connection.
+        :rtype: tuple
+        :raises: the exceptions raised by `request` on error responses
+        """
+        headers = self._get_request_headers(headers, extra_headers)
+        start = time.monotonic()
+        raw_resp, _ = self._request('GET', url, headers=headers, chunked=True)
+        secs = time.monotonic() - start
+        resp = _StreamedResponse(raw_resp, url)
+        if resp.status >= 400:
+            resp_body = raw_resp.data
+            raw_resp.release_conn()
+            self._log_request('GET', url, resp, secs=secs,
+                              req_headers=headers, resp_body=resp_body)
+            self._error_checker(resp, resp_body)
+
+        def release():
+            raw_resp.release_conn()
+            self._log_request('GET', url, resp, secs=secs,
+                              req_headers=headers, resp_body=stream.preview)
+
+        stream = json_stream.JSONListStream(
+            raw_resp.stream(STREAM_CHUNK_SIZE), key=key,
+            close_callback=release)
+        return resp, stream
+
     def delete(self, url, headers=None, body=None, extra_headers=False):
         """Send a HTTP DELETE request using keystone service catalog and auth
 
@@ -451,21 +556,33 @@ class RestClient(object):
             return resp['x-openstack-request-id']
         return ''
 
-    def _safe_body(self, body, maxlen=4096):
-        # convert a structure into a string safely
+    def _safe_body(self, body, maxlen=4096, content_type=None):
+        # convert a structure into a string safely, without converting more
+        # than maxlen characters of it
+        if self.skip_body_logging and body:
+            return "<Body: not logged>"
+        if content_type and content_type.startswith(_BINARY_CONTENT_TYPES):
+            if isinstance(body, (bytes, bytearray)):
+                return "<BinaryData: %d bytes>" % len(body)
+            if body:
+                return "<BinaryData: removed>"
+        if isinstance(body, (str, bytes, bytearray)):
+            # The representation of the first maxlen bytes starts with the
+            # first maxlen characters of the representation of the body
+            body = body[:maxlen]
+        elif isinstance(body, abc.Iterator):
+            return "<StreamedData: not logged>"
         try:
-            text = str(body)
+            return _bounded_str(body, maxlen)
         except UnicodeDecodeError:
             # if this isn't actually text, return marker that
             return "<BinaryData: removed>"
-        if len(text) > maxlen:
-            return text[:maxlen]
-        else:
-            return text
 
     def _log_request_start(self, method, req_url):
+        if not self.trace_requests:
+            return
         caller_name = test_utils.find_test_caller()
-        if self.trace_requests and re.search(self.trace_requests, caller_name):
+        if re.search(self.trace_requests, caller_name):
             self.LOG.debug('Starting Request (%s): %s %s', caller_name,
                            method, req_url)
 
@@ -477,9 +594,10 @@ class RestClient(object):
             req_headers['X-Subject-Token'] = '<omitted>'
         if 'X-Service-Token' in req_headers:
             req_headers['X-Service-Token'] = '<omitted>'
-        # A shallow copy is sufficient
-        resp_log = resp.copy()
-        if 'x-subject-token' in resp_log:
+        resp_log = resp
+        if 'x-subject-token' in resp:
+            # A shallow copy is sufficient
+            resp_log = resp.copy()
             resp_log['x-subject-token'] = '<omitted>'
         log_fmt = """Request - Headers: %s
         Body: %s
@@ -489,9 +607,10 @@ class RestClient(object):
         self.LOG.debug(
             log_fmt,
             str(req_headers),
-            self._safe_body(req_body),
+            self._safe_body(req_body,
+                            content_type=req_headers.get('Content-Type')),
             str(resp_log),
-            self._safe_body(resp_body),
+            self._safe_body(resp_body, content_type=resp.get('content-type')),
             extra=extra)
 
     def _log_request(self, method, req_url, resp,
@@ -661,12 +780,13 @@ class RestClient(object):
             # for PUT/POST type operations
             chunked = False
         # Do the actual request, and time it
-        start = time.time()
+        start = time.monotonic()
         self._log_request_start(method, url)
         resp, resp_body = self.http_obj.request(
             url, method, headers=headers,
             body=body, chunked=chunked, preload_content=preload)
-        end = time.time()
+        end = time.monotonic()
+        metrics.record(self.service, method, url, resp.status, end - start)
         req_body = body if log_req_body is None else log_req_body
         if preload:
             # NOTE(danms): If we are reading the whole response, we can do
@@ -734,19 +854,8 @@ class RestClient(object):
                                         received and it doesn't fall into any
                                         of the handled checks
         """
-        # if extra_headers is True
-        # default headers would be added to headers
         retry = 0
-
-        if headers is None:
-            # NOTE(vponomaryov): if some client do not need headers,
-            # it should explicitly pass empty dict
-            headers = self.get_headers()
-        elif extra_headers:
-            try:
-                headers.update(self.get_headers())
-            except (ValueError, TypeError):
-                headers = self.get_headers()
+        headers = self._get_request_headers(headers, extra_headers)
 
         resp, resp_body = self._request(method, url, headers=headers,
                                         body=body, chunked=chunked)
@@ -767,6 +876,20 @@ class RestClient(object):
         self._error_checker(resp, resp_body)
         return resp, resp_body
 
+    def _get_request_headers(self, headers, extra_headers):
+        # if extra_headers is True
+        # default headers would be added to headers
+        if headers is None:
+            # NOTE(vponomaryov): if some client do not need headers,
+            # it should explicitly pass empty dict
+            headers = self.get_headers()
+        elif extra_headers:
+            try:
+                headers.update(self.get_headers())
+            except (ValueError, TypeError):
+                headers = self.get_headers()
+        return headers
+
     def _get_retry_after_delay(self, resp):
         """Extract the delay from the retry-after header.
 
@@ -974,8 +1097,10 @@ class RestClient(object):
                                   resource still hasn't been deleted
         """
         start_time = int(time.time())
+        poller = self.polling_policy.start()
         while True:
             if self.is_resource_deleted(id, *args, **kwargs):
+                poller.report('Deletion of %s %s' % (self.resource_type, id))
                 return
             if int(time.time()) - start_time >= self.build_timeout:
                 message = ('Failed to delete %(resource_type)s %(id)s within '
@@ -991,7 +1116,7 @@ class RestClient(object):
                 if caller:
                     message = '(%s) %s' % (caller, message)
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
 
     def wait_for_resource_activation(self, id):
         """Waits for a resource to become active
@@ -1005,8 +1130,11 @@ class RestClient(object):
                                   resource still hasn't been active
         """
         start_time = int(time.time())
+        poller = self.polling_policy.start()
         while True:
             if self.is_resource_active(id):
+                poller.report('Activation of %s %s' % (self.resource_type,
+                                                       id))
                 return
             if int(time.time()) - start_time >= self.build_timeout:
                 message = ('Failed to reach active state %(resource_type)s '
@@ -1017,7 +1145,7 @@ class RestClient(object):
                 if caller:
                     message = '(%s) %s' % (caller, message)
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
 
     def is_resource_deleted(self, id):
         """Subclasses override with specific deletion detection."""
@@ -1037,46 +1165,33 @@ class RestClient(object):
         return 'resource'
 
     def resource_update(self, data, res_type, res_dict):
-        """Updates resource_list.json file with current resource."""
-        if not isinstance(res_dict, dict):
-            return
-
-        if not res_type.endswith('s'):
-            res_type += 's'
-
-        if res_type not in data:
-            data[res_type] = {}
+        """Updates resource_list.json file with current resource.
 
-        if 'uuid' in res_dict:
-            data[res_type].update(
-                {res_dict.get('uuid'): res_dict.get('name')})
-        elif 'id' in res_dict:
-            data[res_type].update(
-                {res_dict.get('id'): res_dict.get('name')})
-        elif 'name' in res_dict:
-            data[res_type].update({res_dict.get('name'): ""})
-
-        self.rec_rw_lock.acquire_write_lock()
-        with open(RESOURCE_LIST_JSON, 'w+') as f:
-            f.write(json.dumps(data, indent=2, separators=(',', ': ')))
-        self.rec_rw_lock.release_write_lock()
+        `resource_record` does not use it anymore, it appends the resources
+        to the resource_list.journal file instead.
+        """
+        entry = _resource_entry(res_type, res_dict)
+        if entry is None:
+            return
+        _add_resource(data, entry)
 
-    def resource_record(self, resp_dict):
-        """Records resources into resource_list.json file."""
         if self.rec_rw_lock is None:
-            path = self.lock_dir
             self.rec_rw_lock = (
-                process_lock.InterProcessReaderWriterLock(path)
+                process_lock.InterProcessReaderWriterLock(self.lock_dir)
             )
-
-        self.rec_rw_lock.acquire_read_lock()
+        self.rec_rw_lock.acquire_write_lock()
         try:
-            with open(RESOURCE_LIST_JSON, 'rb') as f:
-                data = json.load(f)
-        except IOError:
-            data = {}
-        self.rec_rw_lock.release_read_lock()
+            with open(RESOURCE_LIST_JSON, 'w+') as f:
+                f.write(json.dumps(data, indent=2, separators=(',', ': ')))
+        finally:
+            self.rec_rw_lock.release_write_lock()
 
+    def resource_record(self, resp_dict):
+        """Records resources into the resource_list.journal file.
+
+        Each resource is appended as one JSON line, the journal is merged
+        into resource_list.json by `compact_resource_journal`.
+        """
         try:
             resp_dict = json.loads(resp_dict.decode('utf-8'))
         except (AttributeError, TypeError, ValueError):
@@ -1090,11 +1205,27 @@ class RestClient(object):
 
         resource_dict = resp_dict[resource_type]
 
-        if isinstance(resource_dict, list):
-            for resource in resource_dict:
-                self.resource_update(data, resource_type, resource)
-        else:
-            self.resource_update(data, resource_type, resource_dict)
+        if not isinstance(resource_dict, list):
+            resource_dict = [resource_dict]
+        entries = [_resource_entry(resource_type, resource)
+                   for resource in resource_dict]
+        lines = ''.join(json.dumps(entry) + '\n' for entry in entries
+                        if entry and entry['id'] is not None)
+        if not lines:
+            return
+
+        if self.rec_rw_lock is None:
+            path = self.lock_dir
+            self.rec_rw_lock = (
+                process_lock.InterProcessReaderWriterLock(path)
+            )
+
+        self.rec_rw_lock.acquire_write_lock()
+        try:
+            with open(RESOURCE_LIST_JOURNAL, 'a') as f:
+                f.write(lines)
+        finally:
+            self.rec_rw_lock.release_write_lock()
 
     @classmethod
     def validate_response(cls, schema, resp, body):
@@ -1110,9 +1241,7 @@ class RestClient(object):
             body_schema = schema.get('response_body')
             if body_schema:
                 try:
-                    jsonschema.validate(body, body_schema,
-                                        cls=JSONSCHEMA_VALIDATOR,
-                                        format_checker=FORMAT_CHECKER)
+                    jsonschema_validator.validate(body, body_schema)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response body is invalid (%s)" % ex)
                     raise exceptions.InvalidHTTPResponseBody(msg)
@@ -1125,9 +1254,7 @@ class RestClient(object):
             header_schema = schema.get('response_header')
             if header_schema:
                 try:
-                    jsonschema.validate(resp, header_schema,
-                                        cls=JSONSCHEMA_VALIDATOR,
-                                        format_checker=FORMAT_CHECKER)
+                    jsonschema_validator.validate(resp, header_schema)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response header is invalid (%s)" % ex)
                     raise exceptions.InvalidHTTPResponseHeader(msg)
@@ -1143,6 +1270,23 @@ class RestClient(object):
         return urllib.parse.urlunsplit(url)
 
 
+class _StreamedResponse(dict):
+    """The headers and status of a streamed urllib3 response
+
+    This mirrors the responses returned by `tempest.lib.common.http` when
+    the content is preloaded.
+    """
+
+    def __init__(self, response, url):
+        for key, value in response.getheaders().items():
+            self[str(key).lower()] = value
+        self.status = response.status
+        self['status'] = str(self.status)
+        self.reason = response.reason
+        self.version = response.version
+        self['content-location'] = url
+
+
 class ResponseBody(dict):
     """Class that wraps an http response and dict body into a single value.
 
@@ -1188,3 +1332,216 @@ class ResponseBodyList(list):
     def __str__(self):
         body = super(ResponseBodyList, self).__str__()
         return "response: %s\nBody: %s" % (self.response, body)
+
+
+def _iter_str(value):
+    """Yield the parts of str(value) one after the other
+
+    Only the dicts, lists and tuples are split, the other values are
+    converted at once.
+    """
+    if type(value) is dict:
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield ', ' if index else ''
+            yield repr(key) + ': '
+            yield from _iter_repr(item)
+        yield '}'
+    elif type(value) in (list, tuple):
+        yield '[' if type(value) is list else '('
+        for index, item in enumerate(value):
+            yield ', ' if index else ''
+            yield from _iter_repr(item)
+        if type(value) is tuple:
+            yield ',)' if len(value) == 1 else ')'
+        else:
+            yield ']'
+    else:
+        yield str(value)
+
+
+def _iter_repr(value):
+    if type(value) in (dict, list, tuple):
+        return _iter_str(value)
+    return iter((repr(value),))
+
+
+def _bounded_str(value, maxlen):
+    """Return the first maxlen characters of str(value)
+
+    The containers are converted part by part, and the conversion stops
+    once maxlen characters are reached.
+    """
+    parts = []
+    length = 0
+    for part in _iter_str(value):
+        parts.append(part)
+        length += len(part)
+        if length >= maxlen:
+            break
+    return ''.join(parts)[:maxlen]
+
+
+def paginate(list_method, key, page_size=None, **params):
+    """Iterate over all the resources returned by a list method
+
+    The pages are requested one after the other while the resources are
+    consumed, following the `next` links of the responses, like
+    ``servers_links`` of compute or ``next`` of image. When a response
+    has no link but returns a full page of `page_size` resources, the next
+    page is requested with the id of the last resource as the marker.
+
+    Example::
+
+        for port in rest_client.paginate(ports_client.list_ports, 'ports',
+                                         page_size=100,
+                                         network_id=network_id):
+            ...
+
+    :param list_method: the list method of a service client, like
+                        `ServersClient.list_servers`. The parameters are
+                        passed to it as keyword arguments, or as the
+                        `params` dict when it takes one.
+    :param str key: the key of the list of resources in the response body
+    :param int page_size: the number of resources requested per page, the
+                          `limit` of the request. If None, the server default
+                          limit applies.
+    :param params: the other parameters of the list method, like filters
+    :return: a generator of the resources
+    """
+    params = dict(params)
+    if page_size:
+        params['limit'] = page_size
+    marker = None
+    while True:
+        if marker:
+            params['marker'] = marker
+        body = _call_list_method(list_method, params)
+        resources = body[key]
+        for resource in resources:
+            yield resource
+        next_marker = _get_next_marker(body, key)
+        if (next_marker is None and page_size and
+                len(resources) >= page_size and 'id' in resources[-1]):
+            next_marker = resources[-1]['id']
+        if not next_marker or next_marker == marker:
+            return
+        marker = next_marker
+
+
+def _call_list_method(list_method, params):
+    try:
+        parameters = inspect.signature(list_method).parameters
+    except (TypeError, ValueError):
+        parameters = {}
+    takes_kwargs = any(param.kind == param.VAR_KEYWORD
+                       for param in parameters.values())
+    if 'params' in parameters and not takes_kwargs:
+        return list_method(params=params)
+    return list_method(**params)
+
+
+def _get_next_marker(body, key):
+    """Extract the marker of the next page from the links of a response"""
+    next_link = body.get('next')
+    if not isinstance(next_link, str):
+        next_link = None
+        links = body.get('%s_links' % key) or body.get('links') or []
+        if isinstance(links, dict):
+            next_link = links.get('next')
+        else:
+            for link in links:
+                if link.get('rel') == 'next':
+                    next_link = link.get('href')
+                    break
+    if not next_link:
+        return None
+    query = urllib.parse.urlsplit(next_link).query
+    markers = urllib.parse.parse_qs(query).get('marker')
+    return markers[-1] if markers else None
+
+
+def _resource_entry(res_type, res_dict):
+    """Builds the resource list entry of a resource from a response
+
+    :return: a dict with the type, id and name of the resource, the id is
+             None if the resource has no uuid, id nor name, None is returned
+             if res_dict is not a dict
+    """
+    if not isinstance(res_dict, dict):
+        return None
+
+    if not res_type.endswith('s'):
+        res_type += 's'
+
+    res_id = None
+    name = res_dict.get('name')
+    if 'uuid' in res_dict:
+        res_id = res_dict.get('uuid')
+    elif 'id' in res_dict:
+        res_id = res_dict.get('id')
+    elif 'name' in res_dict:
+        res_id, name = name, ""
+    return {'type': res_type, 'id': res_id, 'name': name}
+
+
+def _add_resource(data, entry):
+    if entry is None:
+        return
+    resources = data.setdefault(entry['type'], {})
+    if entry['id'] is not None:
+        resources[entry['id']] = entry['name']
+
+
+def compact_resource_journal(resource_list_json=RESOURCE_LIST_JSON,
+                             journal=RESOURCE_LIST_JOURNAL, lock_path=None):
+    """Merges the resource journal into the resource list file
+
+    The resources recorded in the journal are added to the ones already
+    stored in the resource list file, which is then rewritten once, and the
+    journal is emptied.
+
+    :param resource_list_json: path of the resource list file
+    :param journal: path of the journal written by `RestClient`
+    :param lock_path: path of the lock used by `RestClient` when recording
+                      resources. If set, the lock is held during the
+                      compaction so that no resource recorded meanwhile is
+                      lost.
+    :return: the content of the resource list, as a dict
+    """
+    lock = None
+    if lock_path:
+        lock = process_lock.InterProcessReaderWriterLock(lock_path)
+        lock.acquire_write_lock()
+    try:
+        try:
+            with open(resource_list_json, 'rb') as f:
+                data = json.load(f)
+        except IOError:
+            data = {}
+        try:
+            with open(journal, 'r') as f:
+                lines = f.readlines()
+        except IOError:
+            return data
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                _add_resource(data, json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                # A line may be truncated if a test run was interrupted
+                RestClient.LOG.warning(
+                    "Skipping invalid line of %s: %s", journal, line)
+
+        tmp_file = resource_list_json + '.tmp'
+        with open(tmp_file, 'w') as f:
+            f.write(json.dumps(data, indent=2, separators=(',', ': ')))
+        os.replace(tmp_file, resource_list_json)
+        open(journal, 'w').close()
+        return data
+    finally:
+        if lock:
+            lock.release_write_lock()
@@ -13,10 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import codecs
 import hashlib
 import io
 import select
 import socket
+import threading
 import time
 import warnings
 
@@ -32,6 +34,14 @@ with warnings.catch_warnings():
 
 LOG = logging.getLogger(__name__)
 
+# Size in bytes of the reads from the ssh channels. The channels buffer the
+# received packets, a large read empties them in a single call.
+DEFAULT_BUF_SIZE = 64 * 1024
+
+# Interval in seconds of the keepalive packets sent on the persistent
+# connections, so that idle connections are not dropped by firewalls or NAT
+PERSISTENT_KEEPALIVE_INTERVAL = 30
+
 
 def get_fingerprint(self):
     """Patch paramiko
@@ -47,13 +57,36 @@ def get_fingerprint(self):
 
 paramiko.pkey.PKey.get_fingerprint = get_fingerprint
 
+# Authenticated connections kept open by the clients in persistent mode,
+# keyed by Client._connection_key()
+_persistent_connections = {}
+_persistent_connections_lock = threading.Lock()
+
+
+def close_persistent_connections():
+    """Close all the connections kept open by persistent clients
+
+    A connection which fails to close is logged, and does not keep the
+    others open.
+    """
+    with _persistent_connections_lock:
+        connections = list(_persistent_connections.values())
+        _persistent_connections.clear()
+    for connection in connections:
+        try:
+            connection.close()
+        except Exception:
+            LOG.exception('Failed to close the ssh connection %s',
+                          connection)
+
 
 class Client(object):
 
     def __init__(self, host, username, password=None, timeout=300, pkey=None,
                  channel_timeout=10, look_for_keys=False, key_filename=None,
                  port=22, proxy_client=None, ssh_key_type='rsa',
-                 ssh_allow_agent=True):
+                 ssh_allow_agent=True, persistent=False,
+                 buf_size=DEFAULT_BUF_SIZE):
         """SSH client.
 
         Many of parameters are just passed to the underlying implementation
@@ -79,6 +112,15 @@ class Client(object):
         :param ssh_allow_agent: boolean, default True, if the SSH client is
             allowed to also utilize the ssh-agent. Explicit use of passwords
             in some tests may need this set as False.
+        :param persistent: boolean, default False. If True, the
+            authenticated connection is kept open after a command and reused
+            by the following ones, as well as by the other persistent clients
+            for the same host, port, user and credentials. A new channel is
+            opened for each command, and the connection is transparently
+            re-established if it was lost. Persistent connections are closed
+            by `close` or `close_persistent_connections`.
+        :param buf_size: the maximum number of bytes read from the channel
+            at once, defaults to `DEFAULT_BUF_SIZE`.
         :type proxy_client: ``tempest.lib.common.ssh.Client`` object
         """
         self.host = host
@@ -100,7 +142,7 @@ class Client(object):
         self.key_filename = key_filename
         self.timeout = int(timeout)
         self.channel_timeout = float(channel_timeout)
-        self.buf_size = 1024
+        self.buf_size = int(buf_size)
         self.proxy_client = proxy_client
         if (self.proxy_client and self.proxy_client.host == self.host and
                 self.proxy_client.port == self.port and
@@ -109,6 +151,7 @@ class Client(object):
                 host=self.host, port=self.port, username=self.username)
         self._proxy_conn = None
         self.ssh_allow_agent = ssh_allow_agent
+        self.persistent = persistent
 
     def _get_ssh_connection(self, sleep=1.5, backoff=1):
         """Returns an ssh connection to the specified host."""
@@ -162,6 +205,79 @@ class Client(object):
                             self.username, self.host, e, attempts, bsleep)
                 time.sleep(bsleep)
 
+    def _connection_key(self):
+        if self.pkey is not None:
+            credential = self.pkey.get_fingerprint()
+        else:
+            credential = (self.key_filename, self.password)
+        proxy = (self.proxy_client._connection_key()
+                 if self.proxy_client is not None else None)
+        return (self.host, self.port, self.username, credential, proxy)
+
+    def _get_persistent_connection(self):
+        """Returns the shared connection, connecting if it is not alive"""
+        key = self._connection_key()
+        with _persistent_connections_lock:
+            ssh = _persistent_connections.get(key)
+            if ssh is not None:
+                transport = ssh.get_transport()
+                if transport is not None and transport.is_active():
+                    return ssh
+                LOG.info("ssh connection to %s@%s was lost, reconnecting",
+                         self.username, self.host)
+                del _persistent_connections[key]
+                ssh.close()
+        # Connect without holding the lock, it can take minutes
+        ssh = self._get_ssh_connection()
+        ssh.get_transport().set_keepalive(PERSISTENT_KEEPALIVE_INTERVAL)
+        with _persistent_connections_lock:
+            existing = _persistent_connections.setdefault(key, ssh)
+        if existing is not ssh:
+            # Another thread connected meanwhile
+            ssh.close()
+        return existing
+
+    def _drop_persistent_connection(self, ssh):
+        key = self._connection_key()
+        with _persistent_connections_lock:
+            if _persistent_connections.get(key) is ssh:
+                del _persistent_connections[key]
+        ssh.close()
+
+    def _new_channel(self, ssh):
+        # Do not wait forever for a channel on a connection which hung
+        return ssh.get_transport().open_session(timeout=self.channel_timeout)
+
+    def _open_session(self):
+        """Returns an ssh connection and a new channel on it"""
+        if not self.persistent:
+            ssh = self._get_ssh_connection()
+            return ssh, self._new_channel(ssh)
+        ssh = self._get_persistent_connection()
+        try:
+            return ssh, self._new_channel(ssh)
+        except (EOFError, socket.error, paramiko.SSHException) as e:
+            # The connection may have died since the liveness check
+            LOG.info("Failed to open a channel to %s@%s (%s), reconnecting",
+                     self.username, self.host, e)
+            self._drop_persistent_connection(ssh)
+            ssh = self._get_persistent_connection()
+            return ssh, self._new_channel(ssh)
+
+    def close(self):
+        """Close the persistent connection used by this client
+
+        The connection is shared with other persistent clients for the same
+        host, port, user and credentials, they transparently reconnect when
+        needed.
+        """
+        if not self.persistent:
+            return
+        with _persistent_connections_lock:
+            ssh = _persistent_connections.pop(self._connection_key(), None)
+        if ssh is not None:
+            ssh.close()
+
     def _is_timed_out(self, start_time):
         return (time.time() - self.timeout) > start_time
 
@@ -183,9 +299,8 @@ class Client(object):
                  status. The exception contains command status stderr content.
         :raises: TimeoutException if cmd doesn't end when timeout expires.
         """
-        ssh = self._get_ssh_connection()
-        transport = ssh.get_transport()
-        with transport.open_session() as channel:
+        ssh, session = self._open_session()
+        with session as channel:
             channel.fileno()  # Register event pipe
             channel.exec_command(cmd)
             channel.shutdown_write()
@@ -194,29 +309,11 @@ class Client(object):
             if self._can_system_poll():
                 out_data_chunks = []
                 err_data_chunks = []
-                poll = select.poll()
-                poll.register(channel, select.POLLIN)
-                start_time = time.time()
-
-                while True:
-                    ready = poll.poll(self.channel_timeout)
-                    if not any(ready):
-                        if not self._is_timed_out(start_time):
-                            continue
-                        raise exceptions.TimeoutException(
-                            "Command: '{0}' executed on host '{1}'.".format(
-                                cmd, self.host))
-                    if not ready[0]:  # If there is nothing to read.
-                        continue
-                    out_chunk = err_chunk = None
-                    if channel.recv_ready():
-                        out_chunk = channel.recv(self.buf_size)
-                        out_data_chunks += out_chunk,
-                    if channel.recv_stderr_ready():
-                        err_chunk = channel.recv_stderr(self.buf_size)
-                        err_data_chunks += err_chunk,
-                    if not err_chunk and not out_chunk:
-                        break
+                for out_chunk, err_chunk in self._poll_channel(channel, cmd):
+                    if out_chunk:
+                        out_data_chunks.append(out_chunk)
+                    if err_chunk:
+                        err_data_chunks.append(err_chunk)
                 out_data = b''.join(out_data_chunks)
                 err_data = b''.join(err_data_chunks)
             # Just read from the channels
@@ -231,7 +328,8 @@ class Client(object):
 
             exit_status = channel.recv_exit_status()
 
-        ssh.close()
+        if not self.persistent:
+            ssh.close()
 
         if 0 != exit_status:
             raise exceptions.SSHExecCommandFailed(
@@ -239,8 +337,142 @@ class Client(object):
                 stderr=err_data, stdout=out_data)
         return out_data
 
+    def exec_command_iter(self, cmd, encoding="utf-8", lines=False,
+                          max_bytes=None):
+        """Execute the specified command and stream its standard output
+
+        Unlike `exec_command`, the output is not accumulated in memory: it is
+        yielded as soon as it is read from the channel, which suits commands
+        with large outputs like ``dmesg`` or reading console logs. This is a
+        generator, the command runs while it is iterated over.
+
+        :param str cmd: Command to run at remote server.
+        :param str encoding: Encoding for the output from paramiko.
+                             Output will not be decoded if None.
+        :param bool lines: if True, yield the output line by line, without
+                           the line separators, instead of as it is read.
+        :param int max_bytes: if set, stop reading after this many bytes of
+                              standard output. The channel is closed and the
+                              exit status of the command is not checked.
+        :returns: iterator over the chunks or lines of standard output.
+        :raises: SSHExecCommandFailed if command returns nonzero
+                 status, once the whole output has been yielded. The
+                 exception contains command status stderr content, its
+                 stdout is empty.
+        :raises: TimeoutException if cmd doesn't end when timeout expires.
+        """
+        if encoding:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            decode = decoder.decode
+            separator = '\n'
+        else:
+            def decode(data, final=False):
+                return data
+            separator = b'\n'
+        pending = separator[:0]
+        received = 0
+        truncated = False
+        err_data_chunks = []
+        err_received = 0
+
+        ssh, session = self._open_session()
+        try:
+            with session as channel:
+                channel.fileno()  # Register event pipe
+                channel.exec_command(cmd)
+                channel.shutdown_write()
+                for out_chunk, err_chunk in self._read_channel(channel, cmd):
+                    if err_chunk and (max_bytes is None or
+                                      err_received < max_bytes):
+                        err_data_chunks.append(err_chunk)
+                        err_received += len(err_chunk)
+                    if not out_chunk:
+                        continue
+                    if max_bytes is not None and (
+                            received + len(out_chunk) >= max_bytes):
+                        out_chunk = out_chunk[:max_bytes - received]
+                        truncated = True
+                    received += len(out_chunk)
+                    data = decode(out_chunk)
+                    if lines:
+                        parts = (pending + data).split(separator)
+                        pending = parts.pop()
+                        yield from parts
+                    elif data:
+                        yield data
+                    if truncated:
+                        break
+                data = pending + decode(b'', final=True)
+                if data:
+                    yield data
+                if truncated:
+                    LOG.info("Stopped reading the output of '%s' on %s "
+                             "after %d bytes", cmd, self.host, received)
+                    return
+                exit_status = channel.recv_exit_status()
+        finally:
+            if not self.persistent:
+                ssh.close()
+
+        if 0 != exit_status:
+            err_data = b''.join(err_data_chunks)
+            if encoding:
+                err_data = err_data.decode(encoding, 'replace')
+            raise exceptions.SSHExecCommandFailed(
+                command=cmd, exit_status=exit_status,
+                stderr=err_data, stdout=separator[:0])
+
+    def _poll_channel(self, channel, cmd):
+        """Yield the stdout and stderr chunks read from a channel
+
+        Either chunk is None when there was nothing to read on that stream.
+
+        :raises: TimeoutException if the channel is not closed before the
+                 client timeout expires.
+        """
+        poll = select.poll()
+        poll.register(channel, select.POLLIN)
+        start_time = time.time()
+
+        while True:
+            ready = poll.poll(self.channel_timeout)
+            if not any(ready):
+                if not self._is_timed_out(start_time):
+                    continue
+                raise exceptions.TimeoutException(
+                    "Command: '{0}' executed on host '{1}'.".format(
+                        cmd, self.host))
+            if not ready[0]:  # If there is nothing to read.
+                continue
+            out_chunk = err_chunk = None
+            if channel.recv_ready():
+                out_chunk = channel.recv(self.buf_size)
+            if channel.recv_stderr_ready():
+                err_chunk = channel.recv_stderr(self.buf_size)
+            if not err_chunk and not out_chunk:
+                return
+            yield out_chunk, err_chunk
+
+    def _read_channel(self, channel, cmd):
+        """Like _poll_channel, also on hosts which cannot poll"""
+        if self._can_system_poll():
+            yield from self._poll_channel(channel, cmd)
+            return
+        out_file = channel.makefile('rb', self.buf_size)
+        while True:
+            out_chunk = out_file.read(self.buf_size)
+            if not out_chunk:
+                break
+            yield out_chunk, None
+        err_file = channel.makefile_stderr('rb', self.buf_size)
+        yield None, err_file.read()
+
     def test_connection_auth(self):
         """Raises an exception when we can not connect to server via ssh."""
+        if self.persistent:
+            # Keep the connection for the following commands
+            self._get_persistent_connection()
+            return
         connection = self._get_ssh_connection()
         connection.close()
 
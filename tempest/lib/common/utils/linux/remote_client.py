@@ -70,7 +70,8 @@ class RemoteClient(object):
                  connect_timeout=60, console_output_enabled=True,
                  ssh_shell_prologue="set -eu -o pipefail; PATH=$PATH:/sbin;",
                  ping_count=1, ping_size=56, ssh_key_type='rsa',
-                 ssh_allow_agent=True):
+                 ssh_allow_agent=True, ssh_persistent=False,
+                 ssh_buf_size=ssh.DEFAULT_BUF_SIZE):
         """Executes commands in a VM over ssh
 
         :param ip_address: IP address to ssh to
@@ -88,6 +89,11 @@ class RemoteClient(object):
         :param ssh_key_type: ssh key type (rsa, ecdsa)
         :param ssh_allow_agent: Boolean if ssh agent support is permitted.
             Defaults to True.
+        :param ssh_persistent: Boolean if the ssh connection is kept open
+            between commands. Defaults to False. See
+            `tempest.lib.common.ssh.Client`.
+        :param ssh_buf_size: maximum number of bytes read at once from the
+            output of the commands.
         """
         self.server = server
         self.servers_client = servers_client
@@ -104,6 +110,8 @@ class RemoteClient(object):
                                      channel_timeout=connect_timeout,
                                      ssh_key_type=ssh_key_type,
                                      ssh_allow_agent=ssh_allow_agent,
+                                     persistent=ssh_persistent,
+                                     buf_size=ssh_buf_size,
                                      )
 
     @debug_ssh
@@ -114,6 +122,16 @@ class RemoteClient(object):
         LOG.debug("Remote command: %s", cmd)
         return self.ssh_client.exec_command(cmd)
 
+    def exec_command_iter(self, cmd, lines=False, max_bytes=None):
+        """Execute a command and stream its output
+
+        See `tempest.lib.common.ssh.Client.exec_command_iter`.
+        """
+        cmd = self.ssh_shell_prologue + " " + cmd
+        LOG.debug("Remote command: %s", cmd)
+        return self.ssh_client.exec_command_iter(cmd, lines=lines,
+                                                 max_bytes=max_bytes)
+
     @debug_ssh
     def validate_authentication(self):
         """Validate ssh connection and authentication
@@ -122,6 +140,10 @@ class RemoteClient(object):
         """
         self.ssh_client.test_connection_auth()
 
+    def close(self):
+        """Close the persistent ssh connection, if any"""
+        self.ssh_client.close()
+
     def ping_host(self, host, count=None, size=None, nic=None):
         if count is None:
             count = self.ping_count
@@ -12,8 +12,10 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import contextlib
 import inspect
 import re
+import threading
 import time
 
 from oslo_log import log as logging
@@ -22,6 +24,40 @@ from tempest.lib import exceptions
 
 LOG = logging.getLogger(__name__)
 
+_caller = threading.local()
+
+
+def get_test_caller():
+    """Return the caller name set for the current thread, if any."""
+    return getattr(_caller, 'name', None)
+
+
+def set_test_caller(name):
+    """Set the name returned by find_test_caller in the current thread.
+
+    Test base classes know which test phase is running, and can record the
+    caller name once per phase instead of having it computed from the call
+    stack on every request. The name must match what find_test_caller
+    would compute, e.g. 'MyTest:test_something' or 'MyTest:setUpClass'.
+    Setting None restores the stack based lookup.
+
+    :param name: the caller name, or None
+    :return: the previous caller name
+    """
+    previous = getattr(_caller, 'name', None)
+    _caller.name = name
+    return previous
+
+
+@contextlib.contextmanager
+def caller_context(name):
+    """Context manager that sets the caller name for the current thread."""
+    previous = set_test_caller(name)
+    try:
+        yield
+    finally:
+        set_test_caller(previous)
+
 
 def find_test_caller():
     """Find the caller class and test name.
@@ -30,8 +66,13 @@ def find_test_caller():
     test_* methods, and various kinds of setUp / tearDown, we
     can look through the call stack to find appropriate methods,
     and the class we were in when those were called.
+
+    If a caller name was set for the current thread with set_test_caller
+    or caller_context, it is returned without inspecting the stack.
     """
-    caller_name = None
+    caller_name = getattr(_caller, 'name', None)
+    if caller_name is not None:
+        return caller_name
     names = []
     frame = inspect.currentframe()
     is_cleanup = False
@@ -54,7 +95,7 @@ def find_test_caller():
             elif name == 'main':
                 caller_name = 'main'
                 break
-            else:
+            elif is_cleanup:
                 cname = ""
                 if 'self' in frame.f_locals:
                     cname = frame.f_locals['self'].__class__.__name__
@@ -65,7 +106,7 @@ def find_test_caller():
                 # deep in the stack, so if we see that we want to just
                 # start looking for a real class name, and declare victory
                 # once we do.
-                if is_cleanup and cname:
+                if cname:
                     if not re.search("^RunTest", cname):
                         caller_name = cname + ":_run_cleanups"
                         break
@@ -205,8 +205,11 @@ class ClientsFactory(object):
             :param later_kwargs: kwargs passed through to the service client
                 __init__ on top of defaults set at factory level.
             """
-            kwargs.update(later_kwargs)
-            _client = klass(auth_provider=auth_provider, **kwargs)
+            # NOTE: the defaults are copied so that later_kwargs only apply
+            # to this client and not to the ones built afterwards.
+            client_kwargs = copy.copy(kwargs)
+            client_kwargs.update(later_kwargs)
+            _client = klass(auth_provider=auth_provider, **client_kwargs)
             if alias:
                 setattr(self, alias, _client)
             return _client
@@ -257,7 +260,8 @@ class ServiceClients(object):
     @removals.removed_kwarg('client_parameters')
     def __init__(self, credentials, identity_uri, region=None, scope=None,
                  disable_ssl_certificate_validation=True, ca_certs=None,
-                 trace_requests='', client_parameters=None, proxy_url=None):
+                 trace_requests='', client_parameters=None, proxy_url=None,
+                 token_cache=False):
         """Service Clients provider
 
         Instantiate a `ServiceClients` object, from a set of credentials and an
@@ -319,6 +323,9 @@ class ServiceClients(object):
             going to be passed to all clients in the service client module.
         :param proxy_url: Applies to auth and to all service clients, set a
             proxy url for the clients to use.
+        :param token_cache: Share the tokens of the auth provider with the
+            other auth providers of the process which use the same
+            credentials, see `auth.KeystoneAuthProvider`.
         """
         self._registered_services = set([])
         self.credentials = credentials
@@ -359,7 +366,7 @@ class ServiceClients(object):
             self.credentials, self.identity_uri, scope=scope,
             disable_ssl_certificate_validation=self.dscv,
             ca_certs=self.ca_certs, trace_requests=self.trace_requests,
-            proxy_url=proxy_url)
+            proxy_url=proxy_url, token_cache=token_cache)
 
         # Setup some defaults for client parameters of registered services
         client_parameters = client_parameters or {}
@@ -23,6 +23,9 @@ from tempest.lib import exceptions
 
 class ObjectClient(rest_client.RestClient):
 
+    # The bodies are object data
+    skip_body_logging = True
+
     def is_resource_deleted(self, object_name, container):
         try:
             self.get_object(container, object_name)
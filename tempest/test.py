@@ -29,7 +29,11 @@ from tempest.common import credentials_factory as credentials
 from tempest import config
 from tempest.lib.common import api_microversion_fixture
 from tempest.lib.common import fixed_network
+from tempest.lib.common import jsonschema_validator
+from tempest.lib.common import metrics
 from tempest.lib.common import profiler
+from tempest.lib.common import ssh
+from tempest.lib.common.utils import test_utils
 from tempest.lib.common import validation_resources as vr
 from tempest.lib import exceptions as lib_exc
 
@@ -52,6 +56,36 @@ def validate_tearDownClass():
 atexit.register(validate_tearDownClass)
 
 
+# Whether the latency sinks were added in this worker
+metrics_sinks_added = False
+
+
+def add_metrics_sinks():
+    """Add the latency sinks enabled in the [metrics] group
+
+    A sink which cannot be set up is logged and left out, the latencies are
+    a report and must not fail the tests.
+    """
+    if CONF.metrics.json_dir:
+        try:
+            os.makedirs(CONF.metrics.json_dir, exist_ok=True)
+            metrics.add_sink(metrics.JSONFileSink(os.path.join(
+                CONF.metrics.json_dir,
+                'tempest-latency-%d.json' % os.getpid())))
+        except Exception:
+            LOG.exception("Failed to set up the latency JSON file sink in "
+                          "%s", CONF.metrics.json_dir)
+    if CONF.metrics.statsd_host:
+        try:
+            metrics.add_sink(metrics.StatsdSink(CONF.metrics.statsd_host,
+                                                CONF.metrics.statsd_port,
+                                                CONF.metrics.statsd_prefix))
+        except Exception:
+            LOG.exception("Failed to set up the latency statsd sink to "
+                          "%s:%s", CONF.metrics.statsd_host,
+                          CONF.metrics.statsd_port)
+
+
 class BaseTestCase(testtools.testcase.WithAttributes,
                    testtools.TestCase):
     """The test base class defines Tempest framework for class level fixtures.
@@ -86,6 +120,12 @@ class BaseTestCase(testtools.testcase.WithAttributes,
     # Only used with the dynamic credentials provider.
     _network_resources = {}
 
+    # Dynamic credentials may be taken from a pool shared by the test classes
+    # of a worker, when it is enabled. Only test classes which leave the state
+    # of their projects unchanged, e.g. quotas, limits or the metadata of
+    # their object storage account, may set this to True.
+    use_credentials_pool = False
+
     # Stack of resource cleanups
     _class_cleanups = []
 
@@ -137,6 +177,11 @@ class BaseTestCase(testtools.testcase.WithAttributes,
 
     @classmethod
     def setUpClass(cls):
+        with test_utils.caller_context('%s:setUpClass' % cls.__name__):
+            cls._set_up_class()
+
+    @classmethod
+    def _set_up_class(cls):
         cls.__setupclass_called = True
 
         if cls.serial_rw_lock is None:
@@ -146,6 +191,17 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                 process_lock.InterProcessReaderWriterLock(path)
             )
 
+        if CONF.service_clients.warm_up_schema_validators:
+            # Only the first class of each worker builds the validators
+            jsonschema_validator.warm_up_validators()
+
+        global metrics_sinks_added
+        if not metrics_sinks_added:
+            # Only the first class of each worker adds the sinks, even if
+            # they could not be set up
+            metrics_sinks_added = True
+            add_metrics_sinks()
+
         # Reset state
         cls._reset_class()
         # It should never be overridden by descendants
@@ -188,6 +244,11 @@ class BaseTestCase(testtools.testcase.WithAttributes,
 
     @classmethod
     def tearDownClass(cls):
+        with test_utils.caller_context('%s:tearDownClass' % cls.__name__):
+            cls._tear_down_class()
+
+    @classmethod
+    def _tear_down_class(cls):
         # insert pdb breakpoint when pause_teardown is enabled
         if CONF.pause_teardown:
             cls.insert_pdb_breakpoint()
@@ -238,6 +299,9 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                 LOG.debug('%s released the write lock', cls.__name__)
             else:
                 cls.serial_rw_lock.release_read_lock()
+            # Close the ssh connections kept open for the tests of the class,
+            # once the other workers are no longer waiting for the lock
+            ssh.close_persistent_connections()
 
         # If exceptions were raised during teardown, and not before, re-raise
         # the first one
@@ -247,6 +311,47 @@ class BaseTestCase(testtools.testcase.WithAttributes,
             finally:
                 del trace  # to avoid circular refs
 
+    # NOTE: The caller name of the requests made by a test is recorded once
+    # per test phase, so that the service clients don't need to look for it
+    # in the call stack on every request. The names match the ones computed
+    # by test_utils.find_test_caller from the stack.
+    def run(self, result=None):
+        previous = test_utils.set_test_caller(None)
+        try:
+            return super(BaseTestCase, self).run(result)
+        finally:
+            test_utils.set_test_caller(previous)
+
+    def _set_phase_caller(self, phase):
+        test_utils.set_test_caller(
+            '%s:%s' % (self.__class__.__name__, phase))
+
+    def _run_setup(self, result):
+        self._set_phase_caller('setUp')
+        try:
+            return super(BaseTestCase, self)._run_setup(result)
+        except Exception:
+            # The cleanups are run right away when setUp fails
+            self._set_phase_caller('_run_cleanups')
+            raise
+
+    def _run_test_method(self, result):
+        self._set_phase_caller(self._testMethodName)
+        return super(BaseTestCase, self)._run_test_method(result)
+
+    def _run_teardown(self, result):
+        self._set_phase_caller('tearDown')
+        try:
+            return super(BaseTestCase, self)._run_teardown(result)
+        finally:
+            # The cleanups are run right after tearDown
+            self._set_phase_caller('_run_cleanups')
+
+    def useFixture(self, fixture):
+        with test_utils.caller_context(
+                '%s:setUp' % fixture.__class__.__name__):
+            return super(BaseTestCase, self).useFixture(fixture)
+
     def tearDown(self):
         super(BaseTestCase, self).tearDown()
         # insert pdb breakpoint when pause_teardown is enabled
@@ -390,6 +495,14 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                     pass
         """
         cls.__setup_credentials_called = True
+        # NOTE: Dynamic credentials providers can provision several types of
+        # credentials concurrently, warm them up before the managers are
+        # created. Role lists are left out as they always get new users.
+        credentials_types = [c for c in cls.credentials if isinstance(c, str)]
+        if len(credentials_types) > 1:
+            cred_provider = cls._get_credentials_provider()
+            if getattr(cred_provider, 'workers', 1) > 1:
+                cred_provider.provision_credentials(credentials_types)
         for credentials_type in cls.credentials:
             # This may raise an exception in case credentials are not available
             # In that case we want to let the exception through and the test
@@ -701,7 +814,8 @@ class BaseTestCase(testtools.testcase.WithAttributes,
 
             cls._creds_provider = credentials.get_credentials_provider(
                 name=cls.__name__, network_resources=cls._network_resources,
-                force_tenant_isolation=force_tenant_isolation)
+                force_tenant_isolation=force_tenant_isolation,
+                use_pool=cls.use_credentials_pool)
         return cls._creds_provider
 
     @classmethod
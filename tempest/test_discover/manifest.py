@@ -0,0 +1,184 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Persistent manifest of the tests of Tempest and of its plugins
+
+Discovering the tests imports every test module of Tempest and of the
+installed plugins. The manifest records the tests found by a discovery,
+along with their idempotent id, attributes, services and whether their
+class is to be run serially, so that they can be listed, selected and
+scheduled again without importing any test module.
+
+The manifest is rebuilt when its fingerprint changes. The fingerprint
+covers the content of the files of the test directories, the installed
+plugins and the content of the Tempest configuration file, which some
+test modules read at discovery time.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import unittest
+
+from oslo_log import log as logging
+from stestr import selection
+import testtools
+
+from tempest.common import utils
+from tempest import config
+from tempest.test_discover import test_discover
+
+LOG = logging.getLogger(__name__)
+
+MANIFEST_FILE = '.tempest_manifest.json'
+
+# Bumped when the format of the manifest changes
+_VERSION = 2
+
+
+def _hash_file(path, digest):
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+
+
+def get_fingerprint(test_dirs=None, config_path=None):
+    """Compute the fingerprint of the tests
+
+    :param list test_dirs: the test directories and their top level
+                           directory, defaults to those of Tempest and of the
+                           installed plugins
+    :param str config_path: the path of the Tempest configuration file,
+                            defaults to the one in use
+    :return: the hex digest of the content of the test directories and of
+             the configuration file
+    """
+    if test_dirs is None:
+        test_dirs = test_discover.get_test_dirs()
+    if config_path is None:
+        config_path = config.TempestConfigPrivate.get_config_path(
+            config.CONF._path)
+    digest = hashlib.sha256()
+    digest.update(('%d %s\n' % (_VERSION, sys.version)).encode('utf-8'))
+    for test_dir, top_path in test_dirs:
+        digest.update(('dir %s %s\n' % (test_dir, top_path)).encode('utf-8'))
+        for root, dirs, files in os.walk(test_dir):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith(('.pyc', '.pyo')):
+                    continue
+                path = os.path.join(root, name)
+                digest.update(('file %s\n' % os.path.relpath(
+                    path, test_dir)).encode('utf-8'))
+                _hash_file(path, digest)
+    if os.path.isfile(config_path):
+        digest.update(('config %s\n' % config_path).encode('utf-8'))
+        _hash_file(config_path, digest)
+    return digest.hexdigest()
+
+
+def _get_test_entry(test):
+    method = getattr(test, getattr(test, '_testMethodName', ''), None)
+    attrs = sorted(getattr(method, '__testtools_attrs', ()))
+    idempotent_ids = [attr[3:] for attr in attrs if attr.startswith('id-')]
+    services = utils.get_service_list()
+    return {
+        'id': test.id(),
+        'idempotent_id': idempotent_ids[0] if idempotent_ids else None,
+        'attrs': [attr for attr in attrs if not attr.startswith('id-')],
+        'services': [attr for attr in attrs if attr in services],
+        'serial': bool(getattr(test, '_serial', False)),
+    }
+
+
+def discover_tests():
+    """Discover the tests of Tempest and of the installed plugins
+
+    This imports every test module.
+
+    :return: the manifest entries of the tests, a list of dicts with the id,
+             idempotent_id, attrs, services and serial flag of each test
+    :raises ImportError: if a test module cannot be loaded
+    """
+    loader = unittest.TestLoader()
+    suite = test_discover.load_tests(loader, None, None)
+    if loader.errors:
+        raise ImportError('Failed to discover the tests:\n%s' %
+                          '\n'.join(loader.errors))
+    return [_get_test_entry(test)
+            for test in testtools.iterate_tests(suite)]
+
+
+def load_manifest(fingerprint, path=MANIFEST_FILE):
+    """Load the manifest entries
+
+    :return: the entries of the manifest, or None when there is no manifest
+             or when it was built for another fingerprint
+    """
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(manifest, dict) or
+            manifest.get('version') != _VERSION or
+            manifest.get('fingerprint') != fingerprint):
+        return None
+    return manifest['tests']
+
+
+def save_manifest(fingerprint, tests, path=MANIFEST_FILE):
+    """Save the manifest entries, replacing the manifest atomically"""
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': _VERSION, 'fingerprint': fingerprint,
+                   'tests': tests}, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def get_tests(path=MANIFEST_FILE):
+    """Return the manifest entries, rebuilding the manifest if it is stale
+
+    :param str path: the path of the manifest
+    :return: the entries of the tests of Tempest and of the installed
+             plugins
+    """
+    fingerprint = get_fingerprint()
+    tests = load_manifest(fingerprint, path)
+    if tests is None:
+        LOG.info('Building the test manifest %s', path)
+        tests = discover_tests()
+        save_manifest(fingerprint, tests, path)
+    return tests
+
+
+def select_tests(tests, regexes=None, include_list=None, exclude_list=None,
+                 exclude_regex=None):
+    """Select tests the way stestr does, without importing them
+
+    :param list tests: the manifest entries of the tests
+    :param list regexes: the selection regexes, a test is selected when one
+                         of them matches with re.search()
+    :param str include_list: the path of an include list file
+    :param str exclude_list: the path of an exclude list file
+    :param str exclude_regex: a regex excluding the tests it matches
+    :return: the sorted ids of the selected tests
+    """
+    test_ids = [test['id'] for test in tests]
+    return sorted(selection.construct_list(
+        test_ids, regexes=list(regexes) if regexes else None,
+        include_list=include_list, exclude_list=exclude_list,
+        exclude_regex=exclude_regex))
@@ -176,6 +176,12 @@ class TempestTestPluginManager(object):
 
     This class is used to manage the lifecycle of external tempest test
     plugins. It provides functions for getting set
+
+    There is a single instance per process, so the entry points are scanned
+    and the plugins loaded once. Stevedore keeps the entry points found in
+    an on-disk cache, keyed on the entries of sys.path and their mtimes, so
+    other processes like the test workers do not scan them again. The
+    options and tests of the plugins are computed once too.
     """
 
     def __init__(self):
@@ -183,6 +189,15 @@ class TempestTestPluginManager(object):
             'tempest.test_plugins', invoke_on_load=True,
             propagate_map_exceptions=True,
             on_load_failure_callback=self.failure_hook)
+        self._cache = {}
+
+    def _cached(self, name, func):
+        # The cached values are dropped when the plugins are replaced
+        plugins, value = self._cache.get(name, (None, None))
+        if plugins is not self.ext_plugins:
+            value = func()
+            self._cache[name] = (self.ext_plugins, value)
+        return value
 
     @staticmethod
     def failure_hook(_, ep, err):
@@ -190,6 +205,9 @@ class TempestTestPluginManager(object):
         raise err
 
     def get_plugin_load_tests_tuple(self):
+        return dict(self._cached('load_tests', self._get_load_tests_tuple))
+
+    def _get_load_tests_tuple(self):
         load_tests_dict = {}
         for plug in self.ext_plugins:
             LOG.info('Loading tests from Tempest plugin: %s', plug.name)
@@ -207,6 +225,9 @@ class TempestTestPluginManager(object):
                               'register_opts', plug.name)
 
     def get_plugin_options_list(self):
+        return list(self._cached('options', self._get_options_list))
+
+    def _get_options_list(self):
         plugin_options = []
         for plug in self.ext_plugins:
             opt_list = plug.obj.get_opt_lists()
@@ -0,0 +1,238 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Schedule the test classes on the workers from their past durations
+
+stestr balances the workers with the durations of the tests, which leave out
+the class level setup of Tempest: the credentials and the resources created
+by ``resource_setup`` are set up once per class, between two tests. The
+scheduler estimates the cost of each class from the subunit streams of the
+previous runs of the stestr repository, as the time its worker spent on it
+including the gaps between its tests, and builds worker partitions that keep
+each class on one worker.
+
+The classes decorated with ``@serial`` hold a lock excluding the classes of
+every other worker while they run, so they are grouped on the same worker
+instead of being spread over the workers.
+"""
+
+import collections
+import heapq
+import re
+
+from oslo_log import log as logging
+from stestr.repository import abstract
+from stestr.repository import util
+import testtools
+import yaml
+
+LOG = logging.getLogger(__name__)
+
+WORKER_FILE = '.tempest_workers.yaml'
+
+# The number of previous runs the durations are taken from, the most recent
+# duration of a test or of a class is used
+HISTORY_RUNS = 5
+
+# The duration of a test when there is no duration recorded at all
+DEFAULT_TEST_DURATION = 1.0
+
+_CLASS_FIXTURE = re.compile(r'^(?:setUpClass|tearDownClass) \((.+)\)$')
+
+
+def get_class_id(test_id):
+    """Return the id of the class of a test
+
+    The ``setUpClass (<class id>)`` and ``tearDownClass (<class id>)`` ids
+    reported for the errors of the class fixtures belong to their class.
+    """
+    match = _CLASS_FIXTURE.match(test_id)
+    if match:
+        return match.group(1)
+    return test_id.split('[', 1)[0].rsplit('.', 1)[0]
+
+
+class Timings(object):
+    """The past durations of the tests and of the class overheads
+
+    :param dict test_durations: the duration of each test id, in seconds
+    :param dict class_overheads: the time spent by each class outside of its
+                                 tests, in seconds
+    """
+
+    def __init__(self, test_durations=None, class_overheads=None):
+        self.test_durations = test_durations or {}
+        self.class_overheads = class_overheads or {}
+        # Tests and classes without history are expected to cost the mean
+        # of the others
+        self.default_test_duration = _mean(self.test_durations.values(),
+                                           DEFAULT_TEST_DURATION)
+        self.default_class_overhead = _mean(self.class_overheads.values(),
+                                            0.0)
+
+    def get_class_cost(self, class_id, test_ids):
+        """Return the expected duration of a class running the test ids"""
+        cost = self.class_overheads.get(class_id,
+                                        self.default_class_overhead)
+        for test_id in test_ids:
+            cost += self.test_durations.get(test_id,
+                                            self.default_test_duration)
+        return cost
+
+
+def _mean(values, default):
+    values = list(values)
+    if not values:
+        return default
+    return sum(values) / len(values)
+
+
+def get_run_timings(records):
+    """Compute the durations of the tests and classes of a run
+
+    :param list records: the ``testtools.StreamToDict`` dicts of the tests of
+                         a run
+    :return: a tuple of the test durations and of the class overheads
+    """
+    workers = collections.defaultdict(list)
+    for record in records:
+        start, stop = record['timestamps']
+        if start is None or stop is None:
+            continue
+        worker = sorted(tag for tag in record['tags']
+                        if tag.startswith('worker-'))
+        workers[tuple(worker)].append((start, stop, record['id']))
+    test_durations = {}
+    class_overheads = {}
+    # The setup of the first class of a worker is not measured
+    unmeasured = set()
+    for tests in workers.values():
+        tests.sort()
+        last_stop = None
+        for start, stop, test_id in tests:
+            class_id = get_class_id(test_id)
+            overhead = class_overheads.get(class_id, 0.0)
+            duration = (stop - start).total_seconds()
+            if _CLASS_FIXTURE.match(test_id):
+                overhead += duration
+            else:
+                test_durations[test_id] = duration
+            if last_stop is None:
+                unmeasured.add(class_id)
+            elif start > last_stop:
+                # The worker was setting up this class, or tearing down the
+                # previous one, between the two tests
+                overhead += (start - last_stop).total_seconds()
+            class_overheads[class_id] = overhead
+            last_stop = stop if last_stop is None else max(last_stop, stop)
+    for class_id in unmeasured:
+        del class_overheads[class_id]
+    return test_durations, class_overheads
+
+
+def read_run(run, callback):
+    """Read the tests of a run of a stestr repository
+
+    :param run: the run, as returned by the get_test_run() method of the
+                repository
+    :param callback: called with the ``testtools.StreamToDict`` dict of each
+                     test as it is read
+    """
+    result = testtools.StreamToDict(callback)
+    result.startTestRun()
+    try:
+        run.get_test().run(result)
+    finally:
+        result.stopTestRun()
+
+
+def load_timings(repo_url=None, runs=HISTORY_RUNS):
+    """Load the timings of the previous runs of a stestr repository
+
+    :param str repo_url: the directory of the stestr repository, defaults to
+                         the current directory
+    :param int runs: the number of previous runs to read
+    :return: a Timings, empty when there is no repository
+    """
+    try:
+        repo = util.get_repo_open(repo_url=repo_url)
+        run_ids = sorted(repo.get_run_ids(), key=int, reverse=True)[:runs]
+    except (abstract.RepositoryNotFound, KeyError, OSError, ValueError):
+        return Timings()
+    test_durations = {}
+    class_overheads = {}
+    for run_id in run_ids:
+        records = []
+        try:
+            read_run(repo.get_test_run(run_id), records.append)
+        except (KeyError, OSError):
+            continue
+        run_durations, run_overheads = get_run_timings(records)
+        for test_id, duration in run_durations.items():
+            test_durations.setdefault(test_id, duration)
+        for class_id, overhead in run_overheads.items():
+            class_overheads.setdefault(class_id, overhead)
+    return Timings(test_durations, class_overheads)
+
+
+def schedule(test_ids, concurrency, timings, serial_classes=()):
+    """Partition the test classes between the workers
+
+    The classes are assigned from the most to the least expensive, each to
+    the worker with the smallest expected duration so far. The serial classes
+    are all assigned to the first worker beforehand.
+
+    :param list test_ids: the ids of the tests to run
+    :param int concurrency: the number of workers
+    :param Timings timings: the past durations
+    :param serial_classes: the ids of the classes to run serially
+    :return: a list of (expected duration, class ids) tuples, one per
+             worker that has classes to run
+    """
+    classes = collections.defaultdict(list)
+    for test_id in test_ids:
+        classes[get_class_id(test_id)].append(test_id)
+    costs = dict((class_id, timings.get_class_cost(class_id, tests))
+                 for class_id, tests in classes.items())
+    workers = [(0.0, index, []) for index in range(max(concurrency, 1))]
+    serial = sorted(class_id for class_id in classes
+                    if class_id in serial_classes)
+    if serial:
+        workers[0] = (sum(costs[class_id] for class_id in serial), 0, serial)
+    heapq.heapify(workers)
+    for class_id in sorted((class_id for class_id in classes
+                            if class_id not in serial_classes),
+                           key=lambda class_id: (-costs[class_id], class_id)):
+        cost, index, worker = heapq.heappop(workers)
+        worker.append(class_id)
+        heapq.heappush(workers, (cost + costs[class_id], index, worker))
+    return [(cost, worker) for cost, _, worker in sorted(
+        workers, key=lambda worker: worker[1]) if worker]
+
+
+def save_worker_file(workers, path=WORKER_FILE):
+    """Write the stestr worker file of a schedule
+
+    :param list workers: the schedule returned by schedule()
+    :param str path: the path of the worker file
+    """
+    content = []
+    for cost, class_ids in workers:
+        LOG.info('Scheduled %d test classes expected to run in %.1fs on '
+                 'worker %d', len(class_ids), cost, len(content))
+        content.append({'worker': ['^%s\\.' % re.escape(class_id)
+                                   for class_id in class_ids]})
+    with open(path, 'w') as f:
+        yaml.safe_dump(content, f, default_flow_style=False)
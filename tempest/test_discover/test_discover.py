@@ -18,29 +18,29 @@ import unittest
 from tempest.test_discover import plugins
 
 
-def load_tests(loader, tests, pattern):
-    ext_plugins = plugins.TempestTestPluginManager()
+def get_test_dirs():
+    """Return the directories of the tests of Tempest and of its plugins
 
-    suite = unittest.TestSuite()
+    :return: a list of tuples with the test directory and its top level
+             directory
+    """
     base_path = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
     base_path = os.path.split(base_path)[0]
-    # Load local tempest tests
-    for test_dir in ['api', 'scenario', 'serial_tests']:
-        full_test_dir = os.path.join(base_path, 'tempest', test_dir)
-        if not pattern:
-            suite.addTests(loader.discover(full_test_dir,
-                                           top_level_dir=base_path))
-        else:
-            suite.addTests(loader.discover(full_test_dir, pattern=pattern,
-                                           top_level_dir=base_path))
-
+    # Local tempest tests
+    test_dirs = [(os.path.join(base_path, 'tempest', test_dir), base_path)
+                 for test_dir in ['api', 'scenario', 'serial_tests']]
+    # Installed plugin tests
+    ext_plugins = plugins.TempestTestPluginManager()
     plugin_load_tests = ext_plugins.get_plugin_load_tests_tuple()
-    if not plugin_load_tests:
-        return suite
-
-    # Load any installed plugin tests
     for plugin in plugin_load_tests:
         test_dir, top_path = plugin_load_tests[plugin]
+        test_dirs.append((test_dir, top_path))
+    return test_dirs
+
+
+def load_tests(loader, tests, pattern):
+    suite = unittest.TestSuite()
+    for test_dir, top_path in get_test_dirs():
         if not pattern:
             suite.addTests(loader.discover(test_dir, top_level_dir=top_path))
         else:
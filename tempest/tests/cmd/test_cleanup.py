@@ -13,9 +13,13 @@
 # limitations under the License.
 
 import json
+import os
 from unittest import mock
 
+import fixtures
+
 from tempest.cmd import cleanup
+from tempest.cmd import cleanup_service
 from tempest.tests import base
 
 
@@ -48,6 +52,102 @@ class TestTempestCleanup(base.TestCase):
         c._load_resource_list(test_resource_list)
         self.assertEqual(c.resource_data, test_resource_list_content)
 
+    @mock.patch('tempest.lib.common.rest_client.compact_resource_journal')
+    def test_load_json_resource_list_merges_journal(self, mock_compact):
+        app = mock.Mock()
+        c = cleanup.TempestCleanup(app, None, 'test')
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        resource_list = os.path.join(tmp_dir, 'resource_list.json')
+        journal = os.path.join(tmp_dir, 'resource_list.journal')
+        with open(journal, 'w') as f:
+            f.write('{"type": "servers", "id": "s1", "name": "vm"}\n')
+
+        def compact(resource_list_json, journal, lock_path):
+            with open(resource_list_json, 'w') as f:
+                f.write('{"servers": {"s1": "vm"}}')
+        mock_compact.side_effect = compact
+
+        c._load_resource_list(resource_list, journal)
+
+        mock_compact.assert_called_once_with(resource_list, journal,
+                                             lock_path=mock.ANY)
+        self.assertEqual({'servers': {'s1': 'vm'}}, c.resource_data)
+
+    @mock.patch('tempest.lib.common.rest_client.compact_resource_journal')
+    def test_load_json_resource_list_no_journal(self, mock_compact):
+        app = mock.Mock()
+        c = cleanup.TempestCleanup(app, None, 'test')
+        test_resource_list = 'tempest/tests/cmd/test_resource_list.json'
+        journal = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                               'resource_list.journal')
+        c._load_resource_list(test_resource_list, journal)
+        mock_compact.assert_not_called()
+
+    def test_get_parser_workers(self):
+        c = cleanup.TempestCleanup(mock.Mock(), None, 'test')
+        parser = c.get_parser('cleanup')
+        self.assertEqual(1, parser.parse_args([]).workers)
+        self.assertEqual(8, parser.parse_args(['--workers', '8']).workers)
+
+    def test_get_parser_deletion_timeout(self):
+        c = cleanup.TempestCleanup(mock.Mock(), None, 'test')
+        parser = c.get_parser('cleanup')
+        self.assertEqual(cleanup_service.DELETION_TIMEOUT,
+                         parser.parse_args([]).deletion_timeout)
+        self.assertEqual(0, parser.parse_args(
+            ['--deletion-timeout', '0']).deletion_timeout)
+
+    def _dry_run(self, workers, num_projects=20):
+        class FakeQuotaService(object):
+            def __init__(self, manager, **kwargs):
+                self.kwargs = kwargs
+
+            def run(self):
+                self.kwargs['data']['quotas'] = {
+                    'project': self.kwargs['project_id']}
+
+        dry_run_json = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                    'dry_run.json')
+        self.patch('tempest.cmd.cleanup.DRY_RUN_JSON', dry_run_json)
+        projects = [{'id': 'id%d' % i, 'name': 'project%d' % i}
+                    for i in range(num_projects)]
+        self.patch('tempest.cmd.cleanup_service.ProjectService.__init__',
+                   return_value=None)
+        self.patch('tempest.cmd.cleanup_service.ProjectService.list',
+                   return_value=projects)
+        c = cleanup.TempestCleanup(mock.Mock(), None, 'test')
+        c.options = mock.Mock(dry_run=True, delete_tempest_conf_objects=False,
+                              resource_list=False, prefix=None,
+                              workers=workers, deletion_timeout=300)
+        c.admin_mgr = mock.Mock()
+        c.dry_run_data = {}
+        c.resource_data = {}
+        c.json_data = {}
+        c.project_associated_services = [FakeQuotaService]
+        c.global_services = []
+        c.resource_cleanup_services = []
+        c._cleanup()
+        with open(dry_run_json) as f:
+            return f.read()
+
+    def test_cleanup_workers_dry_run_deterministic(self):
+        serial = self._dry_run(workers=1)
+        self.assertEqual(20, len(json.loads(serial)['_projects_to_clean']))
+        self.assertEqual(serial, self._dry_run(workers=8))
+
+    def test_cleanup_workers_bound_concurrency(self):
+        run = self.patch('tempest.cmd.cleanup_service.run_cleanup_services',
+                         side_effect=cleanup_service.run_cleanup_services)
+        # Concurrent projects run their services one after the other
+        self._dry_run(workers=8)
+        self.assertEqual([1] * 20 + [8, 8],
+                         [call[0][2] for call in run.call_args_list])
+        run.reset_mock()
+        # The services of a single project run concurrently
+        self._dry_run(workers=8, num_projects=1)
+        self.assertEqual([8, 8, 8],
+                         [call[0][2] for call in run.call_args_list])
+
     @mock.patch('tempest.cmd.cleanup.TempestCleanup.init')
     @mock.patch('tempest.cmd.cleanup.TempestCleanup._cleanup')
     def test_take_action_got_exception(self, mock_cleanup, mock_init):
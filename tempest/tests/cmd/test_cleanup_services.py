@@ -13,12 +13,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import threading
+from unittest import mock
+
 import fixtures
 
 from oslo_serialization import jsonutils as json
 from tempest import clients
 from tempest.cmd import cleanup_service
 from tempest import config
+from tempest.lib.common import polling
 from tempest.lib import exceptions
 from tempest.tests import base
 from tempest.tests import fake_config
@@ -86,6 +90,212 @@ class TestBaseService(base.TestCase):
         self.assertEqual(len(base.got_exceptions), 3)
 
 
+class TestRunCleanupServices(base.TestCase):
+
+    def setUp(self):
+        super(TestRunCleanupServices, self).setUp()
+        self.events = []
+        self.servers_started = threading.Event()
+        events = self.events
+        servers_started = self.servers_started
+
+        class FakeService(cleanup_service.BaseService):
+            def __init__(self, manager, **kwargs):
+                super(FakeService, self).__init__(kwargs)
+
+            def delete(self):
+                events.append(('start', self.__class__.__name__))
+                self._delete()
+                events.append(('end', self.__class__.__name__))
+
+            def _delete(self):
+                pass
+
+        class Servers(FakeService):
+            def _delete(self):
+                servers_started.set()
+
+        class KeyPairs(FakeService):
+            def _delete(self):
+                # Only succeeds if servers are deleted concurrently
+                if not servers_started.wait(5):
+                    raise Exception('Services did not run concurrently')
+
+        class Ports(FakeService):
+            pass
+
+        class Networks(FakeService):
+            pass
+
+        self.services = [Servers, KeyPairs, Ports, Networks]
+        self.patch('tempest.cmd.cleanup_service.CLEANUP_DEPENDENCIES',
+                   {Ports: (Servers,), Networks: (Ports, Servers)})
+        self.kwargs = {'is_dry_run': False, 'is_save_state': False,
+                       'got_exceptions': []}
+
+    def test_serial(self):
+        self.services.remove(self.services[1])
+        cleanup_service.run_cleanup_services(
+            self.services, 'manager', **self.kwargs)
+        self.assertEqual(
+            [('start', 'Servers'), ('end', 'Servers'),
+             ('start', 'Ports'), ('end', 'Ports'),
+             ('start', 'Networks'), ('end', 'Networks')], self.events)
+
+    def test_concurrent(self):
+        cleanup_service.run_cleanup_services(
+            self.services, 'manager', workers=4, **self.kwargs)
+        self.assertEqual(8, len(self.events))
+        # Dependencies are respected
+        order = [event for event in self.events
+                 if event[1] in ('Servers', 'Ports', 'Networks')]
+        self.assertEqual(
+            [('start', 'Servers'), ('end', 'Servers'),
+             ('start', 'Ports'), ('end', 'Ports'),
+             ('start', 'Networks'), ('end', 'Networks')], order)
+
+    def test_concurrent_ignores_missing_dependencies(self):
+        networks = self.services[3]
+        cleanup_service.run_cleanup_services(
+            [networks], 'manager', workers=4, **self.kwargs)
+        self.assertEqual([('start', 'Networks'), ('end', 'Networks')],
+                         self.events)
+
+    def test_wait_for_deletions(self):
+        self.patch('tempest.lib.common.polling.time.sleep')
+        servers, ports = self.services[0], self.services[2]
+        remaining = [{'s1'}, set()]
+
+        def delete(service):
+            self.events.append(('delete', 's1'))
+            service._track_deletions(['s1'])
+
+        def list_ids(service):
+            self.events.append(('list', remaining[0]))
+            return remaining.pop(0)
+        self.patchobject(servers, '_delete', delete)
+        self.patchobject(servers, '_list_ids', list_ids)
+
+        timings = cleanup_service.run_cleanup_services(
+            [servers, ports], 'manager', **self.kwargs)
+
+        # Ports start once the server is gone
+        self.assertEqual(
+            [('start', 'Servers'), ('delete', 's1'), ('end', 'Servers'),
+             ('list', {'s1'}), ('list', set()),
+             ('start', 'Ports'), ('end', 'Ports')], self.events)
+        self.assertEqual({servers, ports}, set(timings))
+
+    def test_no_wait_for_deletions(self):
+        servers, ports = self.services[0], self.services[2]
+        list_ids = self.patchobject(servers, '_list_ids')
+        self.patchobject(servers, '_delete',
+                         lambda service: service._track_deletions(['s1']))
+
+        cleanup_service.run_cleanup_services(
+            [servers, ports], 'manager', deletion_timeout=0, **self.kwargs)
+
+        list_ids.assert_not_called()
+        self.assertEqual(
+            [('start', 'Servers'), ('end', 'Servers'),
+             ('start', 'Ports'), ('end', 'Ports')], self.events)
+
+    def test_concurrent_error(self):
+        self.servers_started.set()
+
+        class Failing(self.services[0]):
+            def _delete(self):
+                raise exceptions.ServerFault()
+
+        self.assertRaises(
+            exceptions.ServerFault, cleanup_service.run_cleanup_services,
+            [Failing, self.services[2]], 'manager', workers=2, **self.kwargs)
+
+
+class TestCleanupDependencies(base.TestCase):
+
+    def test_dependencies_follow_list_order(self):
+        for name in ('IS_NOVA', 'IS_NEUTRON', 'IS_CINDER', 'IS_GLANCE'):
+            self.patch('tempest.cmd.cleanup_service.%s' % name, True)
+        self.patch('tempest.common.utils.is_extension_enabled',
+                   return_value=True)
+        # The serial order of the cleanup services must satisfy the
+        # dependencies used by the concurrent cleanup
+        for services in (
+                cleanup_service.get_resource_cleanup_services(),
+                cleanup_service.get_global_cleanup_services()):
+            for index, service in enumerate(services):
+                for dependency in cleanup_service.CLEANUP_DEPENDENCIES.get(
+                        service, ()):
+                    if dependency in services:
+                        self.assertLess(services.index(dependency), index)
+        self.assertIn(cleanup_service.NetworkMeteringLabelService,
+                      cleanup_service.get_resource_cleanup_services())
+
+
+class TestDeletionTracker(base.TestCase):
+
+    class Servers(object):
+        pass
+
+    class Volumes(object):
+        pass
+
+    def setUp(self):
+        super(TestDeletionTracker, self).setUp()
+        self.tracker = cleanup_service.DeletionTracker(
+            policy=polling.FixedPolicy(0))
+
+    def test_wait(self):
+        list_ids = mock.Mock(side_effect=[{'s1', 's2', 'other'}, {'s2'},
+                                          set()])
+        self.tracker.track(self.Servers, ['s1', 's2'], list_ids)
+        self.assertEqual({'s1', 's2'}, self.tracker.pending(self.Servers))
+        self.tracker.wait([self.Servers, self.Volumes])
+        self.assertEqual(3, list_ids.call_count)
+        self.assertEqual(set(), self.tracker.pending(self.Servers))
+
+    def test_wait_nothing_pending(self):
+        list_ids = mock.Mock(return_value=set())
+        self.tracker.track(self.Servers, ['s1'], list_ids)
+        self.tracker.wait([self.Volumes])
+        list_ids.assert_not_called()
+        self.assertEqual({'s1'}, self.tracker.pending(self.Servers))
+
+    def test_wait_one_list_per_poll(self):
+        list_ids = mock.Mock(side_effect=[{'s1', 's2'}, set()])
+        self.tracker.track(self.Servers, ['s1'], list_ids)
+        self.tracker.track(self.Servers, ['s2'], list_ids)
+        self.tracker.wait([self.Servers])
+        self.assertEqual(2, list_ids.call_count)
+
+    def test_wait_list_error(self):
+        list_ids = mock.Mock(side_effect=[exceptions.ServerFault(), set()])
+        self.tracker.track(self.Servers, ['s1'], list_ids)
+        self.tracker.wait([self.Servers])
+        self.assertEqual(2, list_ids.call_count)
+        self.assertEqual(set(), self.tracker.pending(self.Servers))
+
+    def test_poll_tracked_while_listing(self):
+        def list_ids():
+            # Another service tracks a deletion during the list call
+            self.tracker.track(self.Servers, ['s2'], list_ids)
+            return set()
+        self.tracker.track(self.Servers, ['s1'], list_ids)
+        self.tracker._poll(self.Servers)
+        self.assertEqual({'s2'}, self.tracker.pending(self.Servers))
+
+    def test_wait_timeout(self):
+        self.tracker.timeout = 0
+        list_ids = mock.Mock(return_value={'s1'})
+        self.tracker.track(self.Servers, ['s1'], list_ids)
+        self.tracker.wait([self.Servers])
+        # Deletions are not waited for anymore after a timeout
+        self.assertEqual(set(), self.tracker.pending(self.Servers))
+        self.tracker.wait([self.Servers])
+        list_ids.assert_called_once_with()
+
+
 class MockFunctionsBase(base.TestCase):
 
     def _create_response(self, body, status, headers):
@@ -464,6 +674,18 @@ class TestServerService(BaseCmdServiceTests):
                        (self.log_method, 'exception', None)]
         self._test_resource_list_opt_precedence(delete_mock)
 
+    def test_delete_tracks_deletions(self):
+        serv = self._create_cmd_service(self.service_class)
+        serv.deletion_tracker = cleanup_service.DeletionTracker(
+            policy=polling.FixedPolicy(0))
+        delete_mock = [(self.get_method, self.response, 200),
+                       (self.delete_method, None, 204)]
+        self.run_function_with_mocks(serv.delete, delete_mock)
+        # The saved server is not deleted, thus not tracked
+        self.assertEqual({'22c91117-08de-4894-9aa9-6ef382400985'},
+                         serv.deletion_tracker.pending(
+                             cleanup_service.ServerService))
+
 
 class TestServerGroupService(BaseCmdServiceTests):
 
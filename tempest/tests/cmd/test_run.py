@@ -16,16 +16,19 @@ import argparse
 import atexit
 import os
 import shutil
+import sqlite3
 import subprocess
 import tempfile
 from unittest import mock
 
 import fixtures
+import yaml
 
 from tempest.cmd import run
 from tempest.cmd import workspace
 from tempest import config
 from tempest.lib.common.utils import data_utils
+from tempest.test_discover import scheduler
 from tempest.tests import base
 
 DEVNULL = open(os.devnull, 'wb')
@@ -476,3 +479,137 @@ class TestTakeAction(base.TestCase):
             self.assertEqual(0, tempest_run.take_action(parsed_args))
             m.assert_called()
         mock_init_state.assert_called()
+
+
+class TestTakeActionManifest(base.TestCase):
+
+    tests = [{'id': 'tempest.api.test_a.TestA.test_a[id-1,smoke]'},
+             {'id': 'tempest.api.test_b.TestB.test_b[id-2]'}]
+
+    def setUp(self):
+        super(TestTakeActionManifest, self).setUp()
+        directory = self.useFixture(fixtures.TempDir()).path
+        self.addCleanup(os.chdir, os.path.abspath(os.curdir))
+        os.chdir(directory)
+        _, self.config_file = tempfile.mkstemp(dir=directory)
+        open('.stestr.conf', 'w').close()
+        self.get_tests = self.useFixture(fixtures.MockPatch(
+            'tempest.test_discover.manifest.get_tests',
+            return_value=self.tests)).mock
+        self.parsed_args = run.TempestRun(
+            app=mock.Mock(), app_args=mock.Mock()).get_parser(
+                'tempest').parse_args(['--manifest', '--smoke',
+                                       '--config-file', self.config_file])
+
+    def test_list_tests(self):
+        self.parsed_args.list_tests = True
+        stdout = self.useFixture(fixtures.StringStream('stdout')).stream
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', stdout))
+        with mock.patch('stestr.commands.list_command') as list_command:
+            self.assertEqual(0, run.TempestRun(
+                app=mock.Mock(), app_args=mock.Mock()).take_action(
+                    self.parsed_args))
+        list_command.assert_not_called()
+        stdout.seek(0)
+        self.assertEqual('%s\n' % self.tests[0]['id'], stdout.read())
+
+    def test_run(self):
+        def run_command(**kwargs):
+            with open(kwargs['load_list']) as f:
+                load_lists.append((kwargs['load_list'], f.read()))
+            return 0
+
+        load_lists = []
+        with mock.patch('stestr.commands.run_command',
+                        side_effect=run_command) as m:
+            self.assertEqual(0, run.TempestRun(
+                app=mock.Mock(), app_args=mock.Mock()).take_action(
+                    self.parsed_args))
+        # The tests are selected from the manifest and given to stestr
+        self.assertIsNone(m.call_args[1]['filters'])
+        self.assertIsNone(m.call_args[1]['exclude_regex'])
+        path, content = load_lists[0]
+        self.assertEqual('%s\n' % self.tests[0]['id'], content)
+        self.assertFalse(os.path.exists(path))
+
+    def test_run_load_list(self):
+        self.parsed_args.load_list = 'load-list'
+        with mock.patch('stestr.commands.run_command',
+                        return_value=0) as m:
+            run.TempestRun(app=mock.Mock(), app_args=mock.Mock()).take_action(
+                self.parsed_args)
+        self.get_tests.assert_not_called()
+        self.assertEqual('load-list', m.call_args[1]['load_list'])
+        self.assertEqual(['smoke'], m.call_args[1]['filters'])
+
+    def test_run_schedule_by_duration(self):
+        def run_command(**kwargs):
+            with open(kwargs['load_list']) as f:
+                load_lists.append(f.read())
+            with open(kwargs['worker_path']) as f:
+                workers.extend(yaml.safe_load(f))
+            return 0
+
+        load_lists = []
+        workers = []
+        tests = self.tests + [
+            {'id': 'tempest.api.test_c.TestC.test_c[id-3]', 'serial': True},
+            {'id': 'tempest.api.test_d.TestD.test_d[id-4]', 'serial': True}]
+        self.get_tests.return_value = tests
+        self.useFixture(fixtures.MockPatch(
+            'tempest.test_discover.scheduler.load_timings',
+            return_value=scheduler.Timings(
+                {tests[0]['id']: 10.0, tests[1]['id']: 2.0})))
+        parsed_args = run.TempestRun(
+            app=mock.Mock(), app_args=mock.Mock()).get_parser(
+                'tempest').parse_args(['--schedule-by-duration',
+                                       '--concurrency', '2',
+                                       '--config-file', self.config_file])
+        with mock.patch('stestr.commands.run_command',
+                        side_effect=run_command) as m:
+            self.assertEqual(0, run.TempestRun(
+                app=mock.Mock(), app_args=mock.Mock()).take_action(
+                    parsed_args))
+        self.assertIsNone(m.call_args[1]['filters'])
+        self.assertEqual(''.join('%s\n' % test['id'] for test in tests),
+                         load_lists[0])
+        # The serial classes share the first worker
+        self.assertEqual(
+            [{'worker': ['^tempest\\.api\\.test_c\\.TestC\\.',
+                         '^tempest\\.api\\.test_d\\.TestD\\.']},
+             {'worker': ['^tempest\\.api\\.test_a\\.TestA\\.',
+                         '^tempest\\.api\\.test_b\\.TestB\\.']}],
+            workers)
+        self.assertEqual(scheduler.WORKER_FILE, m.call_args[1]['worker_path'])
+
+    def test_run_schedule_by_duration_serial(self):
+        self.parsed_args.schedule_by_duration = True
+        self.parsed_args.parallel = False
+        with mock.patch('stestr.commands.run_command',
+                        return_value=0) as m:
+            run.TempestRun(app=mock.Mock(), app_args=mock.Mock()).take_action(
+                self.parsed_args)
+        self.assertIsNone(m.call_args[1]['worker_path'])
+        self.assertFalse(os.path.exists(scheduler.WORKER_FILE))
+
+    def test_run_records_timings(self):
+        record_run = self.useFixture(fixtures.MockPatch(
+            'tempest.cmd.timings.record_run')).mock
+        # The timings are only recorded when asked
+        with mock.patch('stestr.commands.run_command', return_value=0):
+            run.TempestRun(app=mock.Mock(), app_args=mock.Mock()).take_action(
+                self.parsed_args)
+        record_run.assert_not_called()
+        self.parsed_args.record_timings = True
+        with mock.patch('stestr.commands.run_command', return_value=0):
+            run.TempestRun(app=mock.Mock(), app_args=mock.Mock()).take_action(
+                self.parsed_args)
+        record_run.assert_called_once_with()
+        # A run is not failed by its timings
+        for error in (sqlite3.OperationalError('locked'),
+                      ValueError('malformed subunit stream')):
+            record_run.side_effect = error
+            with mock.patch('stestr.commands.run_command', return_value=0):
+                self.assertEqual(0, run.TempestRun(
+                    app=mock.Mock(), app_args=mock.Mock()).take_action(
+                        self.parsed_args))
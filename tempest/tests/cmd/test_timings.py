@@ -0,0 +1,228 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import os
+from unittest import mock
+
+import fixtures
+from stestr.repository import abstract
+from stestr.repository import file as repo_file
+
+from tempest.cmd import timings
+from tempest.tests import base
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+LOGS = (
+    '2026-01-01 00:00:01.000 1 INFO tempest.lib.common.rest_client '
+    '[req-1] Request (ServersTest:test_a): 202 POST '
+    'http://10.0.0.1:8774/v2.1/servers 0.500s\n'
+    '2026-01-01 00:00:01.500 1 INFO tempest.lib.common.rest_client '
+    '[req-2] Request (ServersTest:test_a): 200 GET '
+    'http://10.0.0.1:8774/v2.1/servers/'
+    '3f1b4c2e-8d7a-4e6b-9c0f-1a2b3c4d5e6f 0.250s\n'
+    '2026-01-01 00:00:01.600 1 DEBUG tempest.lib.common.rest_client '
+    '[req-2] Request - Headers: {}\n')
+
+
+def _run(tests, class_setups=None, api_calls=(), digest='1'):
+    return {'digest': digest, 'started': T0.isoformat(), 'duration': 10.0,
+            'tests': tests, 'class_setups': class_setups or {},
+            'api_calls': list(api_calls)}
+
+
+def _get_row(output, first_cell):
+    for line in output.splitlines():
+        cells = [cell.strip() for cell in line.strip('|').split('|')]
+        if cells[0] == first_cell:
+            return cells
+
+
+class TestReadStestrRun(base.TestCase):
+
+    def setUp(self):
+        super(TestReadStestrRun, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.repo = repo_file.RepositoryFactory().initialise(self.directory)
+
+    def _insert(self, tests):
+        inserter = self.repo.get_inserter()
+        inserter.startTestRun()
+        for test_id, start, stop, logs in tests:
+            tags = {'worker-0'}
+            inserter.status(
+                test_id=test_id, test_status='inprogress', test_tags=tags,
+                timestamp=T0 + datetime.timedelta(seconds=start))
+            if logs:
+                inserter.status(
+                    test_id=test_id, file_name="pythonlogging:''",
+                    file_bytes=logs.encode('utf-8'),
+                    mime_type='text/plain; charset="utf8"', eof=True)
+            inserter.status(
+                test_id=test_id, test_status='success', test_tags=tags,
+                timestamp=T0 + datetime.timedelta(seconds=stop))
+        inserter.stopTestRun()
+
+    def test_read_stestr_run(self):
+        self._insert([('a.A.test_a', 0, 2, LOGS), ('a.B.test_b', 5, 6, None)])
+        run = timings.read_stestr_run(self.directory)
+        self.assertEqual(T0.isoformat(), run['started'])
+        self.assertEqual(6.0, run['duration'])
+        self.assertEqual([('a.A.test_a', 'success', 2.0),
+                          ('a.B.test_b', 'success', 1.0)], run['tests'])
+        self.assertEqual({'a.B': 3.0}, run['class_setups'])
+        self.assertEqual(
+            [('a.A.test_a', 'Nova', 'POST', 'v2.1/servers', 202, 0.5),
+             ('a.A.test_a', 'Nova', 'GET', 'v2.1/servers/<uuid>', 200,
+              0.25)], run['api_calls'])
+
+    def test_digest(self):
+        self._insert([('a.A.test_a', 0, 2, None)])
+        self._insert([('a.A.test_a', 0, 3, None)])
+        self.assertNotEqual(
+            timings.read_stestr_run(self.directory, '0')['digest'],
+            timings.read_stestr_run(self.directory, '1')['digest'])
+        self.assertEqual(
+            timings.read_stestr_run(self.directory)['digest'],
+            timings.read_stestr_run(self.directory, '1')['digest'])
+
+    def test_record_run(self):
+        self._insert([('a.A.test_a', 0, 2, LOGS)])
+        path = os.path.join(self.directory, 'timings.db')
+        self.assertEqual(1, timings.record_run(path, self.directory))
+        self.assertIsNone(timings.record_run(path, self.directory))
+
+    def test_record_run_without_repository(self):
+        directory = self.useFixture(fixtures.TempDir()).path
+        path = os.path.join(directory, 'timings.db')
+        self.assertRaises(abstract.RepositoryNotFound, timings.record_run,
+                          path, directory)
+        self.assertFalse(os.path.exists(path))
+
+
+class TestTimingStore(base.TestCase):
+
+    def setUp(self):
+        super(TestTimingStore, self).setUp()
+        self.store = timings.TimingStore(':memory:')
+        self.addCleanup(self.store.close)
+        self.first = self.store.add_run(_run(
+            [('a.A.test_a[id-1]', 'success', 2.0),
+             ('a.A.test_b', 'fail', 1.0)],
+            {'a.A': 3.0},
+            [('a.A.test_a[id-1]', 'Nova', 'GET', 'servers', 200, 0.5)]))
+        self.second = self.store.add_run(_run(
+            [('a.A.test_a[id-1]', 'success', 4.0)], {'a.A': 1.0},
+            [('a.A.test_a[id-1]', 'Nova', 'GET', 'servers', 200, 0.1)],
+            digest='2'), label='release')
+
+    def test_add_run(self):
+        self.assertIsNone(self.store.add_run(_run([], digest='1'),
+                                             label='first'))
+        self.assertEqual(
+            [(self.second, T0.isoformat(), 10.0, 'release', 1),
+             (self.first, T0.isoformat(), 10.0, 'first', 2)],
+            self.store.get_runs())
+        self.assertEqual([(self.second, T0.isoformat(), 10.0, 'release', 1)],
+                         self.store.get_runs(1))
+
+    def test_durations(self):
+        run_ids = [self.second, self.first]
+        self.assertEqual(
+            {('a.A.test_a[id-1]',): {self.first: 2.0, self.second: 4.0}},
+            self.store.get_test_durations(run_ids))
+        self.assertEqual({('a.A',): {self.first: 3.0, self.second: 1.0}},
+                         self.store.get_class_setup_durations(run_ids))
+        self.assertEqual({('a.A',): {self.first: 6.0, self.second: 5.0}},
+                         self.store.get_class_durations(run_ids))
+        self.assertEqual({('Nova', 'GET', 'servers'): [0.1, 0.5]},
+                         self.store.get_api_call_durations(run_ids))
+        self.assertEqual({('a.A',): {self.first: 6.0}},
+                         self.store.get_class_durations([self.first]))
+
+
+class TestReport(base.TestCase):
+
+    def test_find_regressions(self):
+        durations = {
+            ('regressed',): {3: 9.0, 2: 3.0, 1: 4.0, 0: 20.0},
+            ('stable',): {3: 5.0, 2: 4.0, 1: 4.0},
+            ('fast',): {3: 0.5, 2: 0.1},
+            ('new',): {3: 30.0},
+            ('faster',): {3: 1.0, 2: 10.0},
+        }
+        self.assertEqual([(('regressed',), 4.0, 9.0)],
+                         timings.find_regressions(durations, [3, 2, 1, 0]))
+        self.assertEqual([(('regressed',), 4.0, 9.0), (('stable',), 4.0, 5.0)],
+                         timings.find_regressions(durations, [3, 2, 1, 0],
+                                                  threshold=20.0))
+        self.assertEqual([(('regressed',), 3.0, 9.0), (('fast',), 0.1, 0.5)],
+                         timings.find_regressions(durations, [3, 2],
+                                                  min_duration=0.1))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, timings._percentile(values, 50))
+        self.assertEqual(99, timings._percentile(values, 99))
+        self.assertEqual(100, timings._percentile(values, 100))
+        self.assertEqual(7, timings._percentile([7], 90))
+
+
+class TestTempestTimings(base.TestCase):
+
+    def setUp(self):
+        super(TestTempestTimings, self).setUp()
+        directory = self.useFixture(fixtures.TempDir()).path
+        self.path = os.path.join(directory, 'timings.db')
+        self.stdout = self.useFixture(fixtures.StringStream('stdout')).stream
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
+
+    def _take_action(self, *args):
+        command = timings.TempestTimings(app=mock.Mock(),
+                                         app_args=mock.Mock())
+        command.take_action(command.get_parser('tempest').parse_args(
+            ('--db', self.path) + args))
+        self.stdout.seek(0)
+        return self.stdout.read()
+
+    def test_report(self):
+        store = timings.TimingStore(self.path)
+        for digest, duration in (('1', 2.0), ('2', 10.0)):
+            store.add_run(_run(
+                [('a.A.test_a', 'success', duration)], {'a.A': 1.0},
+                [('a.A.test_a', 'Nova', 'GET', 'servers', 200, 0.5)],
+                digest=digest))
+        store.close()
+        output = self._take_action()
+        for title in ('Runs', 'Regressions of run 2', 'Slowest classes',
+                      'Slowest API calls'):
+            self.assertIn('\n%s\n' % title, '\n' + output)
+        self.assertEqual(['a.A.test_a (test)', '2.00', '10.00', '+400%'],
+                         _get_row(output, 'a.A.test_a (test)'))
+        self.assertEqual(['a.A', '2', '7.00', '11.00', '11.00'],
+                         _get_row(output, 'a.A'))
+        self.assertEqual(['Nova', 'GET', 'servers', '2', '0.50', '0.50',
+                          '0.50'], _get_row(output, 'Nova'))
+
+    def test_record(self):
+        record_run = self.patchobject(timings, 'record_run',
+                                      return_value=None)
+        self.assertRaises(SystemExit, self._take_action, '--record',
+                          '--label', 'release')
+        record_run.assert_called_once_with(self.path, label='release')
+        self.stdout.seek(0)
+        self.assertIn('The last run was already recorded',
+                      self.stdout.read())
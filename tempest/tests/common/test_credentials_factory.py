@@ -21,6 +21,7 @@ import testtools
 from tempest.common import credentials_factory as cf
 from tempest import config
 from tempest.lib.common import dynamic_creds
+from tempest.lib.common import dynamic_creds_pool
 from tempest.lib.common import preprov_creds
 from tempest.lib import exceptions
 from tempest.tests import base
@@ -118,6 +119,55 @@ class TestCredentialsFactory(base.TestCase):
             name=expected_name, network_resources=expected_network_resources,
             **expected_params)
 
+    @mock.patch.object(dynamic_creds_pool, 'PooledDynamicCredentialProvider')
+    @mock.patch.object(cf, 'get_credential_pool')
+    @mock.patch.object(cf, 'get_dynamic_provider_params')
+    def test_get_credentials_provider_pooled(
+            self, mock_dynamic_provider_params, mock_get_credential_pool,
+            mock_pooled_provider_class):
+        cfg.CONF.set_default('use_dynamic_credentials', True, group='auth')
+        cfg.CONF.set_default('dynamic_credentials_pool_size', 2,
+                             group='auth')
+        expected_params = {'foo': 'bar'}
+        mock_dynamic_provider_params.return_value = expected_params
+        cf.get_credentials_provider(
+            'my_name', network_resources=None,
+            identity_version='identity_version', use_pool=True)
+        mock_get_credential_pool.assert_called_once_with('identity_version')
+        mock_pooled_provider_class.assert_called_once_with(
+            name='my_name', network_resources=None,
+            pool=mock_get_credential_pool.return_value, **expected_params)
+
+    @mock.patch('atexit.register')
+    @mock.patch.object(cf.clients, 'Manager')
+    @mock.patch.object(cf, 'get_dynamic_provider_params')
+    def test_get_credential_pool(self, mock_dynamic_provider_params,
+                                 mock_manager, mock_register):
+        cfg.CONF.set_default('dynamic_credentials_pool_size', 2,
+                             group='auth')
+        cfg.CONF.set_default('cinder', True, group='service_available')
+        mock_dynamic_provider_params.return_value = {'admin_creds': 'admin'}
+        self.patchobject(cf, '_credential_pools', {})
+        pool = cf.get_credential_pool('v3')
+        self.assertIs(pool, cf.get_credential_pool('v3'))
+        self.assertEqual(2, pool.size)
+        mock_manager.assert_called_once_with('admin')
+        self.assertEqual(mock_manager.return_value.volumes_client_latest,
+                         pool.volumes_client)
+        mock_register.assert_called_once_with(pool.drain)
+
+    @mock.patch.object(dynamic_creds, 'DynamicCredentialProvider')
+    @mock.patch.object(cf, 'get_dynamic_provider_params')
+    def test_get_credentials_provider_pool_disabled(
+            self, mock_dynamic_provider_params,
+            mock_dynamic_credentials_provider_class):
+        cfg.CONF.set_default('use_dynamic_credentials', True, group='auth')
+        mock_dynamic_provider_params.return_value = {}
+        cf.get_credentials_provider(
+            'my_name', identity_version='identity_version', use_pool=True)
+        mock_dynamic_credentials_provider_class.assert_called_once_with(
+            name='my_name', network_resources=None)
+
     @mock.patch.object(preprov_creds, 'PreProvisionedCredentialProvider')
     @mock.patch.object(cf, 'get_preprov_provider_params')
     def test_get_credentials_provider_preprov(
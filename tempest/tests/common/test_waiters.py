@@ -19,6 +19,7 @@ from oslo_utils.fixture import uuidsentinel as uuids
 
 from tempest.common import waiters
 from tempest import exceptions
+from tempest.lib.common import polling
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.services.compute import servers_client
 from tempest.lib.services.network import ports_client
@@ -74,6 +75,106 @@ class TestServerWaiters(base.TestCase):
                           waiters.wait_for_server_status,
                           self.client, fake_server['id'], 'ACTIVE')
 
+    def test_wait_for_servers_status(self):
+        self.patch('time.sleep')
+        self.client.list_servers.side_effect = [
+            {'servers': [
+                {'id': 'uuid-1', 'status': 'BUILD',
+                 'updated': '2024-01-01T00:00:01Z'},
+                {'id': 'uuid-2', 'status': 'ACTIVE',
+                 'updated': '2024-01-01T00:00:02Z'},
+                {'id': 'uuid-other', 'status': 'BUILD'}]},
+            {'servers': [
+                {'id': 'uuid-1', 'status': 'ACTIVE',
+                 'updated': '2024-01-01T00:00:05Z'}]}]
+        servers = waiters.wait_for_servers_status(
+            self.client, ['uuid-1', 'uuid-2'], 'ACTIVE')
+        self.assertEqual(['uuid-1', 'uuid-2'], [s['id'] for s in servers])
+        self.assertEqual(['ACTIVE', 'ACTIVE'],
+                         [s['status'] for s in servers])
+        self.client.list_servers.assert_has_calls([
+            mock.call(detail=True),
+            mock.call(**{'detail': True,
+                         'changes-since': '2024-01-01T00:00:02Z'})])
+        self.client.show_server.assert_not_called()
+
+    def test_wait_for_servers_status_not_listed(self):
+        self.client.list_servers.return_value = {'servers': []}
+        self.client.show_server.return_value = {
+            'server': {'id': 'uuid-1', 'status': 'ACTIVE'}}
+        servers = waiters.wait_for_servers_status(
+            self.client, ['uuid-1'], 'ACTIVE', ready_wait=False)
+        self.assertEqual('uuid-1', servers[0]['id'])
+        self.client.show_server.assert_called_once_with('uuid-1')
+
+    def test_wait_for_servers_status_ready_wait(self):
+        sleep = self.patch('time.sleep')
+        self.client.list_servers.side_effect = [
+            {'servers': [{'id': 'uuid-1', 'status': 'ACTIVE',
+                          'OS-EXT-STS:task_state': 'powering-on'}]},
+            {'servers': [{'id': 'uuid-1', 'status': 'ACTIVE',
+                          'OS-EXT-STS:task_state': None}]}]
+        waiters.wait_for_servers_status(self.client, ['uuid-1'], 'ACTIVE')
+        self.assertEqual(2, self.client.list_servers.call_count)
+        sleep.assert_has_calls([mock.call(self.client.build_interval),
+                                mock.call(waiters.CONF.compute.ready_wait)])
+
+    def test_wait_for_servers_status_timeout(self):
+        time_mock = self.patch('time.time')
+        time_mock.side_effect = utils.generate_timeout_series(1)
+        self.client.list_servers.return_value = {'servers': [
+            {'id': 'uuid-1', 'status': 'ACTIVE'},
+            {'id': 'uuid-2', 'status': 'BUILD'}]}
+        exc = self.assertRaises(lib_exc.TimeoutException,
+                                waiters.wait_for_servers_status,
+                                self.client, ['uuid-1', 'uuid-2'], 'ACTIVE',
+                                ready_wait=False)
+        self.assertIn('uuid-2', str(exc))
+        self.assertNotIn('uuid-1', str(exc))
+
+    def test_wait_for_servers_status_error(self):
+        self.client.list_servers.return_value = {'servers': [
+            {'id': 'uuid-1', 'status': 'ACTIVE'},
+            {'id': 'uuid-2', 'status': 'ERROR', 'fault': 'boom'}]}
+        exc = self.assertRaises(exceptions.BuildErrorException,
+                                waiters.wait_for_servers_status,
+                                self.client, ['uuid-1', 'uuid-2'], 'ACTIVE',
+                                request_id='req-1')
+        self.assertIn('boom', str(exc))
+        self.assertIn('uuid-2', str(exc))
+        self.assertIn('req-1', str(exc))
+
+    def test_wait_for_servers_status_deleted(self):
+        self.client.list_servers.return_value = {'servers': [
+            {'id': 'uuid-1', 'status': 'DELETED'}]}
+        self.assertRaises(lib_exc.NotFound,
+                          waiters.wait_for_servers_status,
+                          self.client, ['uuid-1'], 'ACTIVE')
+
+    def test_wait_for_server_status_polling_policy(self):
+        sleep = self.patch('time.sleep')
+        self.client.polling_policy = polling.ExponentialPolicy(0.1, 1)
+        self.client.show_server.side_effect = [
+            {'server': {'id': 'fake-uuid', 'status': 'BUILD'}},
+            {'server': {'id': 'fake-uuid', 'status': 'BUILD'}},
+            {'server': {'id': 'fake-uuid', 'status': 'ACTIVE'}}]
+        report = self.patchobject(polling.Poller, 'report')
+        waiters.wait_for_server_status(
+            self.client, 'fake-uuid', 'ACTIVE', ready_wait=False)
+        sleep.assert_has_calls([mock.call(0.1), mock.call(0.2)])
+        report.assert_called_once_with('wait_for_server_status')
+
+    def test_wait_for_server_status_timeout_not_reported(self):
+        time_mock = self.patch('time.time')
+        time_mock.side_effect = utils.generate_timeout_series(1)
+        report = self.patchobject(polling.Poller, 'report')
+        self.client.show_server.return_value = {
+            'server': {'id': 'fake-uuid', 'status': 'BUILD'}}
+        self.assertRaises(lib_exc.TimeoutException,
+                          waiters.wait_for_server_status,
+                          self.client, 'fake-uuid', 'ACTIVE')
+        report.assert_not_called()
+
     def test_wait_for_server_termination(self):
         fake_server = {'id': 'fake-uuid',
                        'status': 'ACTIVE'}
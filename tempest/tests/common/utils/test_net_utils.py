@@ -31,3 +31,25 @@ class TestGetPingPayloadSize(base.TestCase):
 
     def test_None(self):
         self.assertIsNone(net_utils.get_ping_payload_size(None, mock.Mock()))
+
+
+class TestGetUnusedIpAddresses(base.TestCase):
+
+    def test_all_pages_of_ports(self):
+        ports_client = mock.Mock()
+        ports_client.list_ports.side_effect = [
+            {'ports': [{'fixed_ips': [{'ip_address': '10.0.0.6'}]}],
+             'ports_links': [{'rel': 'next',
+                              'href': 'http://net/v2.0/ports?marker=p1'}]},
+            {'ports': [{'fixed_ips': [{'ip_address': '10.0.0.5'}]}]},
+        ]
+        subnets_client = mock.Mock()
+        subnets_client.show_subnet.return_value = {
+            'subnet': {'cidr': '10.0.0.0/29', 'gateway_ip': '10.0.0.1'}}
+        self.assertEqual(
+            ['10.0.0.4', '10.0.0.3'],
+            net_utils.get_unused_ip_addresses(ports_client, subnets_client,
+                                              'net', 'subnet', 2))
+        ports_client.list_ports.assert_has_calls([
+            mock.call(network_id='net'),
+            mock.call(network_id='net', marker='p1')])
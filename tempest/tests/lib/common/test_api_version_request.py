@@ -144,3 +144,13 @@ class APIVersionRequestTests(base.TestCase):
 
         self.assertIsNotNone(
             api_version_request.APIVersionRequest().get_string)
+
+    def test_get_api_version_request(self):
+        ver_obj = api_version_request.get_api_version_request('2.10')
+        self.assertEqual('2.10', ver_obj.get_string())
+        self.assertIs(ver_obj,
+                      api_version_request.get_api_version_request('2.10'))
+        self.assertTrue(
+            api_version_request.get_api_version_request(None).is_null())
+        self.assertRaises(exceptions.InvalidAPIVersionString,
+                          api_version_request.get_api_version_request, '2')
@@ -12,8 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 import testtools
 
+from tempest.lib.common import api_version_request
 from tempest.lib.common import api_version_utils
 from tempest.lib import exceptions
 from tempest.tests import base
@@ -86,6 +89,60 @@ class TestSelectRequestMicroversion(base.TestCase):
         self._test_request_version('2.3', '2.3', expected_version='2.3')
 
 
+class TestSelectSchema(base.TestCase):
+
+    schema_versions_info = [
+        {'min': None, 'max': '2.1', 'schema': 'schemav21'},
+        {'min': '2.2', 'max': '2.9', 'schema': 'schemav22'},
+        {'min': '2.10', 'max': None, 'schema': 'schemav210'}]
+
+    def setUp(self):
+        super(TestSelectSchema, self).setUp()
+        self.patch('tempest.lib.common.api_version_utils._selected_schemas',
+                   {})
+
+    def test_select_schema(self):
+        for version, expected in ((None, 'schemav21'), ('2.1', 'schemav21'),
+                                  ('2.5', 'schemav22'),
+                                  ('2.10', 'schemav210'),
+                                  ('latest', 'schemav210')):
+            self.assertEqual(expected, api_version_utils.select_schema(
+                self.schema_versions_info, version))
+
+    def test_select_schema_not_found(self):
+        self.assertRaises(exceptions.JSONSchemaNotFound,
+                          api_version_utils.select_schema,
+                          self.schema_versions_info[:2], '2.10')
+
+    def test_select_schema_cached(self):
+        self.assertEqual('schemav22', api_version_utils.select_schema(
+            self.schema_versions_info, '2.5'))
+        with mock.patch.object(api_version_request,
+                               'get_api_version_request') as get_version:
+            self.assertEqual('schemav22', api_version_utils.select_schema(
+                self.schema_versions_info, '2.5'))
+        self.assertFalse(get_version.called)
+
+    def test_select_schema_by_identity(self):
+        api_version_utils.select_schema(self.schema_versions_info, '2.5')
+        # An equal list with another content is not served from the cache
+        other = [dict(items) for items in self.schema_versions_info]
+        other[1]['schema'] = 'other'
+        self.assertEqual('other',
+                         api_version_utils.select_schema(other, '2.5'))
+
+    def test_select_schema_evicts_oldest(self):
+        self.patch(
+            'tempest.lib.common.api_version_utils.MAX_SELECTED_SCHEMAS', 2)
+        for version in ('2.1', '2.5', '2.10'):
+            api_version_utils.select_schema(self.schema_versions_info,
+                                            version)
+        self.assertEqual(
+            [(id(self.schema_versions_info), '2.5'),
+             (id(self.schema_versions_info), '2.10')],
+            list(api_version_utils._selected_schemas))
+
+
 class TestMicroversionHeaderMatches(base.TestCase):
 
     def test_header_matches(self):
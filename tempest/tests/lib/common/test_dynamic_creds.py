@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import threading
 from unittest import mock
 
 import fixtures
@@ -659,6 +661,72 @@ class TestDynamicCredentialProvider(base.TestCase):
         self.assertIn('12345', args)
         self.assertIn('123456', args)
 
+    def test_provision_credentials(self):
+        creds = dynamic_creds.DynamicCredentialProvider(
+            workers=4, **self.fixed_params)
+        # primary and alt use different projects, they can only both get
+        # past the barrier if they are provisioned concurrently
+        barrier = threading.Barrier(2, timeout=10)
+        calls = []
+
+        def fake_get_creds(credential_type, wait=False):
+            def get_creds():
+                if wait:
+                    barrier.wait()
+                calls.append(credential_type)
+            return get_creds
+
+        for credential_type in ('primary', 'project_reader', 'alt', 'admin'):
+            self.patchobject(
+                creds, 'get_%s_creds' % credential_type,
+                side_effect=fake_get_creds(
+                    credential_type,
+                    wait=credential_type in ('primary', 'alt')))
+        creds.provision_credentials(
+            ['primary', 'alt', 'project_reader', 'primary', 'admin'])
+        self.assertEqual(['admin', 'alt', 'primary', 'project_reader'],
+                         sorted(calls))
+        # project_reader shares the project of primary, it is provisioned
+        # once primary has created it
+        self.assertLess(calls.index('primary'), calls.index('project_reader'))
+
+    def test_provision_credentials_sequential(self):
+        creds = dynamic_creds.DynamicCredentialProvider(**self.fixed_params)
+        calls = []
+        for credential_type in ('primary', 'alt', 'admin'):
+            self.patchobject(
+                creds, 'get_%s_creds' % credential_type,
+                side_effect=functools.partial(calls.append, credential_type))
+        creds.provision_credentials(['admin', 'primary', 'alt'])
+        self.assertEqual(['admin', 'primary', 'alt'], calls)
+
+    def test_provision_credentials_invalid_type(self):
+        creds = dynamic_creds.DynamicCredentialProvider(
+            workers=4, **self.fixed_params)
+        self.patchobject(creds, 'get_primary_creds')
+        self.assertRaises(lib_exc.InvalidCredentials,
+                          creds.provision_credentials, ['primary', 'fake'])
+
+    def test_clear_creds_concurrently(self):
+        creds = dynamic_creds.DynamicCredentialProvider(
+            workers=4, **self.fixed_params)
+        for index in range(2):
+            creds._creds['fake_%d' % index] = mock.Mock(
+                user_id='user_%d' % index, project_id='project_%d' % index,
+                domain_id='default', project_domain_id='default',
+                router=None, network=None, subnet=None)
+        # Both users are deleted before any of them returns
+        barrier = threading.Barrier(2, timeout=10)
+        user_mock = self.patchobject(creds.creds_client, 'delete_user',
+                                     side_effect=lambda _: barrier.wait())
+        project_mock = self.patchobject(creds.creds_client, 'delete_project')
+        creds.clear_creds()
+        self.assertEqual([mock.call('user_0'), mock.call('user_1')],
+                         sorted(user_mock.mock_calls))
+        self.assertEqual([mock.call('project_0'), mock.call('project_1')],
+                         sorted(project_mock.mock_calls))
+        self.assertEqual({}, creds._creds)
+
     @mock.patch('tempest.lib.common.rest_client.RestClient')
     def test_alt_creds(self, MockRestClient):
         creds = dynamic_creds.DynamicCredentialProvider(**self.fixed_params)
@@ -0,0 +1,244 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tempest.common import credentials_factory as credentials
+from tempest import config
+from tempest.lib import auth
+from tempest.lib.common import cred_provider
+from tempest.lib.common import dynamic_creds
+from tempest.lib.common import dynamic_creds_pool
+from tempest.lib import exceptions as lib_exc
+from tempest.lib.services.identity.v3 import domains_client
+from tempest.lib.services.identity.v3 import token_client
+from tempest.tests import base
+from tempest.tests import fake_config
+from tempest.tests.lib import fake_identity
+from tempest.tests.lib.services import registry_fixture
+
+SIGNATURE = (False, ('member',), None)
+
+
+def _fake_creds(project_id, user_id=None, network=None):
+    creds = cred_provider.TestResources(auth.KeystoneV3Credentials(
+        username='user-%s' % project_id, password='password',
+        project_name='project-%s' % project_id, project_id=project_id,
+        user_id=user_id or 'user-%s' % project_id))
+    if network:
+        creds.set_resources(network={'id': network, 'name': network},
+                            subnet={'id': network, 'name': network},
+                            router={'id': network, 'name': network})
+    return creds
+
+
+class TestCredentialPool(base.TestCase):
+
+    def setUp(self):
+        super(TestCredentialPool, self).setUp()
+        self.provider = mock.Mock(neutron_available=False)
+        self.provider.ports_admin_client.list_ports.return_value = {
+            'ports': [{'id': 'dhcp', 'device_owner': 'network:dhcp'}]}
+        self.provider.security_groups_admin_client.list_security_groups.\
+            return_value = {'security_groups': [
+                {'id': 'sg1', 'name': 'default'}]}
+        self.provider_factory = mock.Mock(return_value=self.provider)
+        self.volumes_client = mock.Mock()
+        self.volumes_client.list_volumes.return_value = {'volumes': []}
+        self.pool = dynamic_creds_pool.CredentialPool(
+            self.provider_factory, 2, volumes_client=self.volumes_client)
+        self.addCleanup(self.pool.drain)
+
+    def _wait_for_refill(self, pool=None):
+        pool = pool or self.pool
+        pool._executor.shutdown(wait=True)
+        pool._executor = None
+
+    def test_acquire_empty_pool(self):
+        self.provider._create_creds.side_effect = [
+            _fake_creds('p1'), _fake_creds('p2')]
+        self.assertIsNone(self.pool.acquire(SIGNATURE))
+        self._wait_for_refill()
+        self.assertEqual(2, len(self.pool._bundles[SIGNATURE]))
+        self.provider._create_creds.assert_called_with(
+            admin=False, roles=['member'])
+        self.provider_factory.assert_called_once_with(None)
+
+    def test_acquire_refills_pool(self):
+        self.provider._create_creds.side_effect = [
+            _fake_creds('p1'), _fake_creds('p2'), _fake_creds('p3')]
+        self.pool.acquire(SIGNATURE)
+        self._wait_for_refill()
+        creds = self.pool.acquire(SIGNATURE)
+        self.assertIn(creds.project_id, ('p1', 'p2'))
+        self._wait_for_refill()
+        self.assertEqual(3, self.provider._create_creds.call_count)
+        self.assertEqual(2, len(self.pool._bundles[SIGNATURE]))
+
+    def test_acquire_creates_network_resources(self):
+        self.provider.neutron_available = True
+        self.provider.create_networks = True
+        self.provider._create_creds.return_value = _fake_creds('p1')
+        self.provider._create_network_resources.return_value = (
+            'network', 'subnet', 'router')
+        pool = dynamic_creds_pool.CredentialPool(self.provider_factory, 1)
+        signature = (False, ('member',), (('network', True),))
+        pool.acquire(signature)
+        self._wait_for_refill(pool)
+        creds = pool.acquire(signature)
+        self._wait_for_refill(pool)
+        self.assertEqual('network', creds.network)
+        self.provider._create_network_resources.assert_called_with('p1')
+        self.provider_factory.assert_called_once_with({'network': True})
+
+    def test_release_clean_bundle(self):
+        self.provider.neutron_available = True
+        creds = _fake_creds('p1', network='net1')
+        self.pool.release(SIGNATURE, creds)
+        self.assertEqual([creds], self.pool._bundles[SIGNATURE])
+        self.provider.ports_admin_client.list_ports.assert_called_once_with(
+            network_id='net1')
+        self.provider.security_groups_admin_client.list_security_groups.\
+            assert_called_once_with(project_id='p1')
+        self.volumes_client.list_volumes.assert_called_once_with(
+            params={'all_tenants': True, 'project_id': 'p1'})
+        self.provider._clear_project.assert_not_called()
+
+    def test_release_bundle_with_leftover_security_groups(self):
+        self.provider.neutron_available = True
+        self.provider.security_groups_admin_client.list_security_groups.\
+            return_value = {'security_groups': [
+                {'id': 'sg1', 'name': 'default'},
+                {'id': 'sg2', 'name': 'tempest-sg'}]}
+        self.pool.release(SIGNATURE, _fake_creds('p1'))
+        self.assertEqual([], self.pool._bundles[SIGNATURE])
+        self.provider._clear_project.assert_called_once_with('p1')
+
+    def test_release_bundle_with_leftover_volumes(self):
+        self.volumes_client.list_volumes.return_value = {
+            'volumes': [{'id': 'v1', 'name': 'tempest-volume'}]}
+        self.pool.release(SIGNATURE, _fake_creds('p1'))
+        self.assertEqual([], self.pool._bundles[SIGNATURE])
+        self.provider._clear_project.assert_called_once_with('p1')
+
+    def test_release_bundle_with_leftover_ports(self):
+        self.provider.ports_admin_client.list_ports.return_value = {
+            'ports': [{'id': 'dhcp', 'device_owner': 'network:dhcp'},
+                      {'id': 'vm', 'device_owner': 'compute:nova'}]}
+        creds = _fake_creds('p1', network='net1')
+        self.pool.release(SIGNATURE, creds)
+        self.assertEqual([], self.pool._bundles[SIGNATURE])
+        self.provider._clear_creds_net_resources.assert_called_once_with(
+            creds)
+        self.provider._clear_user.assert_called_once_with(creds)
+        self.provider._clear_project.assert_called_once_with('p1')
+
+    def test_release_deleted_project(self):
+        self.provider.creds_client.show_project.side_effect = (
+            lib_exc.NotFound)
+        self.pool.release(SIGNATURE, _fake_creds('p1'))
+        self.assertEqual([], self.pool._bundles[SIGNATURE])
+        self.provider._clear_project.assert_called_once_with('p1')
+
+    def test_release_full_pool(self):
+        for project_id in ('p1', 'p2', 'p3'):
+            self.pool.release(SIGNATURE, _fake_creds(project_id))
+        self.assertEqual(['p1', 'p2'], [
+            creds.project_id for creds in self.pool._bundles[SIGNATURE]])
+        self.provider._clear_project.assert_called_once_with('p3')
+
+    def test_drain(self):
+        self.pool.release(SIGNATURE, _fake_creds('p1'))
+        self.pool.drain()
+        self.provider._clear_project.assert_called_once_with('p1')
+        self.assertIsNone(self.pool.acquire(SIGNATURE))
+        self.provider._create_creds.assert_not_called()
+        self.pool.release(SIGNATURE, _fake_creds('p2'))
+        self.provider._clear_project.assert_called_with('p2')
+
+
+class TestPooledDynamicCredentialProvider(base.TestCase):
+
+    def setUp(self):
+        super(TestPooledDynamicCredentialProvider, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.useFixture(registry_fixture.RegistryFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+        self.patchobject(config.CONF, '_config', fake_config.FakePrivate())
+        self.patchobject(token_client.V3TokenClient, 'raw_request',
+                         fake_identity._fake_v3_response)
+        self.patchobject(domains_client.DomainsClient, 'list_domains',
+                         return_value=dict(domains=[dict(id='default',
+                                                         name='Default')]))
+        admin_creds = credentials.get_credentials(
+            fill_in=False, identity_version='v3', username='fake_username',
+            password='fake_password', project_name='fake_project',
+            user_domain_name='Default', project_domain_name='Default')
+        self.pool = mock.Mock()
+        self.creds = dynamic_creds_pool.PooledDynamicCredentialProvider(
+            'v3', pool=self.pool, name='test class', admin_role='admin',
+            identity_uri='fake_uri', admin_creds=admin_creds,
+            neutron_available=True)
+        self.create_creds = self.patchobject(
+            dynamic_creds.DynamicCredentialProvider, '_create_creds')
+        self.create_network_resources = self.patchobject(
+            dynamic_creds.DynamicCredentialProvider,
+            '_create_network_resources', return_value=('n', 's', 'r'))
+        self.delete_user = self.patchobject(self.creds.creds_client,
+                                            'delete_user')
+        self.delete_project = self.patchobject(self.creds.creds_client,
+                                               'delete_project')
+
+    def test_pooled_credentials(self):
+        pooled = _fake_creds('p1', network='net1')
+        self.pool.acquire.return_value = pooled
+        self.create_creds.return_value = _fake_creds('p1', user_id='u2')
+        self.assertIs(pooled, self.creds.get_primary_creds())
+        self.pool.acquire.assert_called_once_with(SIGNATURE)
+        # The network resources of the bundle are reused
+        self.create_network_resources.assert_not_called()
+        # project_reader is a new user in the project of the bundle
+        reader = self.creds.get_project_reader_creds()
+        self.assertEqual('p1', reader.project_id)
+        self.create_creds.assert_called_once_with(
+            admin=False, roles=['reader'], scope='project', project_id='p1')
+        self.creds.clear_creds()
+        self.delete_user.assert_called_once_with('u2')
+        self.delete_project.assert_not_called()
+        self.pool.release.assert_called_once_with(SIGNATURE, pooled)
+        self.assertEqual({}, self.creds._creds)
+
+    def test_pool_miss(self):
+        self.pool.acquire.return_value = None
+        created = _fake_creds('p1')
+        self.create_creds.return_value = created
+        self.assertIs(created, self.creds.get_primary_creds())
+        self.create_creds.assert_called_once_with(
+            admin=False, roles=['member'])
+        self.create_network_resources.assert_called_once_with('p1')
+        self.creds.clear_creds()
+        # Credentials created on a miss are given to the pool too
+        self.pool.release.assert_called_once_with(SIGNATURE, created)
+        self.delete_project.assert_not_called()
+
+    def test_not_pooled_scope(self):
+        domain_creds = _fake_creds(None, user_id='u1')
+        self.create_creds.return_value = domain_creds
+        self.creds.get_domain_reader_creds()
+        self.pool.acquire.assert_not_called()
+        self.creds.clear_creds()
+        self.delete_user.assert_called_once_with('u1')
+        self.pool.release.assert_not_called()
@@ -213,3 +213,163 @@ class TestClosingProxyHttpRedirects(base.TestCase):
         connection = http.ClosingProxyHttp(follow_redirects=False,
                                            proxy_url=PROXY_URL)
         self.assertFalse(connection.follow_redirects)
+
+
+class TestPooledHttp(base.TestCase):
+
+    def pooled_http(self, **kwargs):
+        return http.PooledHttp(**kwargs)
+
+    def test_pooled_http(self):
+        connection = self.pooled_http(maxsize=3, num_pools=4)
+
+        self.assertEqual(CERT_REQUIRED,
+                         connection.connection_pool_kw['cert_reqs'])
+        self.assertIn('ssl_context', connection.connection_pool_kw)
+        self.assertNotIn('ca_certs', connection.connection_pool_kw)
+        self.assertNotIn('timeout', connection.connection_pool_kw)
+        self.assertEqual(3, connection.connection_pool_kw['maxsize'])
+        self.assertEqual(4, connection.pools._maxsize)
+
+    def test_pooled_http_with_ca_certs(self):
+        build = self.patch('tempest.lib.common.http._build_ssl_context')
+        connection = self.pooled_http(ca_certs=CERT_LOCATION)
+
+        build.assert_called_once_with(False, CERT_LOCATION)
+        self.assertEqual(build.return_value,
+                         connection.connection_pool_kw['ssl_context'])
+        self.assertNotIn('ca_certs', connection.connection_pool_kw)
+
+    def test_pooled_http_with_dscv(self):
+        connection = self.pooled_http(
+            disable_ssl_certificate_validation=True)
+
+        self.assertEqual(CERT_NONE,
+                         connection.connection_pool_kw['cert_reqs'])
+        self.assertFalse(
+            connection.connection_pool_kw['ssl_context'].check_hostname)
+
+    def test_pooled_http_with_timeout(self):
+        connection = self.pooled_http(timeout=30)
+        self.assertEqual(30, connection.connection_pool_kw['timeout'])
+
+    def test_request_keeps_connection_alive(self):
+        # Given
+        connection = self.pooled_http()
+        http_response = urllib3.HTTPResponse()
+        request = self.patch('urllib3.PoolManager.request',
+                             return_value=http_response)
+        clear = self.patch('urllib3.PoolManager.clear')
+        retry = self.patch('urllib3.util.Retry')
+
+        # When
+        response, data = connection.request(
+            method=REQUEST_METHOD,
+            url=REQUEST_URL,
+            headers={'Xtra Key': 'Xtra Value'})
+
+        # Then
+        request.assert_called_once_with(
+            REQUEST_METHOD,
+            REQUEST_URL,
+            headers={'Xtra Key': 'Xtra Value'},
+            retries=retry(raise_on_redirect=False, redirect=5))
+        clear.assert_not_called()
+        self.assertEqual(
+            {'content-location': REQUEST_URL,
+             'status': str(http_response.status)},
+            response)
+        self.assertEqual(http_response.data, data)
+
+    def test_request_preload(self):
+        connection = self.pooled_http()
+        http_response = urllib3.HTTPResponse()
+        self.patch('urllib3.PoolManager.request', return_value=http_response)
+
+        response, data = connection.request(
+            method=REQUEST_METHOD,
+            url=REQUEST_URL,
+            preload_content=False)
+
+        self.assertIs(http_response, response)
+        self.assertEqual(b'', data)
+
+    def test_idle_pools_are_closed(self):
+        connection = self.pooled_http(idle_timeout=10)
+        self.patch('urllib3.PoolManager.request',
+                   return_value=urllib3.HTTPResponse())
+        monotonic = self.patch('time.monotonic', return_value=100)
+        pool = connection.connection_from_url(REQUEST_URL)
+        close = self.patch('urllib3.HTTPConnectionPool.close')
+        connection.request(method=REQUEST_METHOD, url=REQUEST_URL)
+
+        # A request within the idle timeout keeps the pool
+        monotonic.return_value = 105
+        connection.request(method=REQUEST_METHOD,
+                           url='http://10.0.0.108:5000/v2.0')
+        self.assertIs(pool, connection.connection_from_url(REQUEST_URL))
+        close.assert_not_called()
+
+        # A request after the idle timeout drops it
+        monotonic.return_value = 200
+        connection.request(method=REQUEST_METHOD,
+                           url='http://10.0.0.108:5000/v2.0')
+        close.assert_called()
+        self.assertIsNot(pool, connection.connection_from_url(REQUEST_URL))
+
+    def test_idle_timeout_disabled(self):
+        connection = self.pooled_http(idle_timeout=0)
+        self.patch('urllib3.PoolManager.request',
+                   return_value=urllib3.HTTPResponse())
+        monotonic = self.patch('time.monotonic', return_value=100)
+        pool = connection.connection_from_url(REQUEST_URL)
+        connection.request(method=REQUEST_METHOD, url=REQUEST_URL)
+        monotonic.return_value = 100000
+        connection.request(method=REQUEST_METHOD, url=REQUEST_URL)
+        self.assertIs(pool, connection.connection_from_url(REQUEST_URL))
+
+    def test_evicted_pools_are_forgotten(self):
+        connection = self.pooled_http(num_pools=1)
+        close = self.patch('urllib3.HTTPConnectionPool.close')
+        pool = connection.connection_from_url(REQUEST_URL)
+        other = connection.connection_from_url('http://10.0.0.108:5000')
+
+        close.assert_called_once_with()
+        self.assertEqual([other], list(connection._pool_keys))
+        self.assertEqual(list(connection.pools.keys()),
+                         list(connection._last_used))
+        self.assertNotIn(pool, connection._pool_keys)
+
+
+class TestPooledProxyHttp(base.TestCase):
+
+    def test_pooled_proxy_http(self):
+        connection = http.PooledProxyHttp(proxy_url=PROXY_URL, maxsize=2)
+        self.assertEqual(2, connection.connection_pool_kw['maxsize'])
+        self.assertIn('ssl_context', connection.connection_pool_kw)
+        proxy = connection.proxy
+        self.assertEqual(PROXY_URL, '%s://%s:%i' % (proxy.scheme,
+                                                    proxy.host,
+                                                    proxy.port))
+
+    def test_redirect_off(self):
+        connection = http.PooledProxyHttp(follow_redirects=False,
+                                          proxy_url=PROXY_URL)
+        self.assertFalse(connection.follow_redirects)
+
+    def test_idle_pools_are_closed(self):
+        connection = http.PooledProxyHttp(proxy_url=PROXY_URL,
+                                          idle_timeout=10)
+        self.patch('urllib3.ProxyManager.request',
+                   return_value=urllib3.HTTPResponse())
+        monotonic = self.patch('time.monotonic', return_value=100)
+        # The plain http requests share the pool of the proxy
+        pool = connection.connection_from_url(REQUEST_URL)
+        self.assertEqual('myproxy', pool.host)
+        close = self.patch('urllib3.HTTPConnectionPool.close')
+
+        monotonic.return_value = 200
+        connection.request(method=REQUEST_METHOD, url=REQUEST_URL)
+        close.assert_called_once_with()
+        self.assertEqual(0, len(connection.pools))
+        self.assertEqual({}, connection._last_used)
@@ -0,0 +1,115 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+
+from tempest.lib.common import json_stream
+from tempest.tests import base
+
+
+def _chunks(document, size):
+    data = json.dumps(document).encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestJSONListStream(base.TestCase):
+
+    document = {
+        'servers': [{'id': str(i), 'name': 'server-é-%d' % i,
+                     'metadata': {'index': i, 'big': 12345678901234567890},
+                     'flags': [True, False, None, 1.5e3]}
+                    for i in range(20)],
+        'servers_links': [{'href': 'http://next', 'rel': 'next'}],
+    }
+
+    def test_items(self):
+        # Chunks of one byte split the numbers, the strings and the UTF-8
+        # sequences of the document
+        for size in (1, 7, 64, 100000):
+            stream = json_stream.JSONListStream(
+                _chunks(self.document, size), key='servers')
+            self.assertEqual(self.document['servers'], list(stream))
+            self.assertEqual(
+                {'servers_links': self.document['servers_links']},
+                stream.others)
+
+    def test_first_list(self):
+        document = {'count': 2, 'ports': [1, 2], 'other': [3]}
+        stream = json_stream.JSONListStream(_chunks(document, 3))
+        self.assertEqual([1, 2], list(stream))
+        self.assertEqual('ports', stream.key)
+        self.assertEqual({'count': 2, 'other': [3]}, stream.others)
+
+    def test_top_level_list(self):
+        stream = json_stream.JSONListStream(_chunks([{'a': 1}, 2], 2))
+        self.assertEqual([{'a': 1}, 2], list(stream))
+
+    def test_empty_list(self):
+        stream = json_stream.JSONListStream([b' { "images" : [ ] } '],
+                                            key='images')
+        self.assertEqual([], list(stream))
+
+    def test_items_are_lazy(self):
+        chunks = iter(_chunks(self.document, 16))
+        stream = json_stream.JSONListStream(chunks, key='servers')
+        self.assertEqual(self.document['servers'][0], next(stream))
+        # Most of the document is still to be read
+        self.assertGreater(len(list(chunks)), 100)
+
+    def test_missing_key(self):
+        stream = json_stream.JSONListStream(_chunks(self.document, 10),
+                                            key='ports')
+        self.assertRaises(ValueError, list, stream)
+
+    def test_invalid_document(self):
+        for data in (b'{"servers": [1, 2', b'{"servers": [1 2]}',
+                     b'{"servers": []} []', b'"servers"'):
+            stream = json_stream.JSONListStream([data], key='servers')
+            self.assertRaises(ValueError, list, stream)
+
+    def test_preview(self):
+        chunks = _chunks(self.document, 1000)
+        stream = json_stream.JSONListStream(chunks, key='servers')
+        list(stream)
+        self.assertEqual(b''.join(chunks)[:json_stream.PREVIEW_SIZE],
+                         stream.preview)
+
+    def test_close_callback(self):
+        callback = mock.Mock()
+        stream = json_stream.JSONListStream(
+            _chunks(self.document, 10), key='servers',
+            close_callback=callback)
+        list(stream)
+        callback.assert_called_once_with()
+        stream.close()
+        callback.assert_called_once_with()
+
+    def test_close_callback_on_close(self):
+        callback = mock.Mock()
+        with json_stream.JSONListStream(
+                _chunks(self.document, 10), key='servers',
+                close_callback=callback) as stream:
+            next(stream)
+            callback.assert_not_called()
+        callback.assert_called_once_with()
+        self.assertRaises(StopIteration, next, stream)
+
+    def test_close_callback_on_error(self):
+        callback = mock.Mock()
+        stream = json_stream.JSONListStream(
+            [b'{"servers": [1, }'], close_callback=callback)
+        self.assertRaises(ValueError, list, stream)
+        callback.assert_called_once_with()
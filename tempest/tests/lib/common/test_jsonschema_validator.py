@@ -12,7 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
+import jsonschema
+
 from tempest.lib.api_schema.response.compute.v2_1 import parameter_types
+from tempest.lib.common import jsonschema_validator
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 from tempest.tests import base
@@ -81,3 +86,75 @@ class TestJSONSchemaDateTimeFormat(base.TestCase):
         self.assertRaises(exceptions.InvalidHTTPResponseBody,
                           rest_client.RestClient.validate_response,
                           self.date_time_schema[0], resp, body)
+
+
+class TestValidatorCache(base.TestCase):
+
+    schema = {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'integer'},
+            'name': {'type': 'string'},
+        },
+        'required': ['id', 'name'],
+    }
+
+    def setUp(self):
+        super(TestValidatorCache, self).setUp()
+        self.patch('tempest.lib.common.jsonschema_validator._validators', {})
+        self.patch(
+            'tempest.lib.common.jsonschema_validator._warmed_up_packages',
+            set())
+
+    def test_get_validator_cached(self):
+        with mock.patch.object(jsonschema_validator.JSONSCHEMA_VALIDATOR,
+                               'check_schema') as check_schema:
+            validator = jsonschema_validator.get_validator(self.schema)
+            self.assertIs(validator,
+                          jsonschema_validator.get_validator(self.schema))
+        check_schema.assert_called_once_with(self.schema)
+
+    def test_get_validator_by_identity(self):
+        # An equal schema object gets its own validator
+        other = dict(self.schema)
+        self.assertIsNot(jsonschema_validator.get_validator(self.schema),
+                         jsonschema_validator.get_validator(other))
+
+    def test_get_validator_invalid_schema(self):
+        self.assertRaises(jsonschema.SchemaError,
+                          jsonschema_validator.get_validator,
+                          {'type': 'no-such-type'})
+
+    def test_get_validator_evicts_oldest(self):
+        self.patch(
+            'tempest.lib.common.jsonschema_validator.MAX_CACHED_VALIDATORS',
+            2)
+        schemas = [{'type': 'object'}, {'type': 'string'}, {'type': 'array'}]
+        for schema in schemas:
+            jsonschema_validator.get_validator(schema)
+        self.assertEqual(
+            [id(schema) for schema in schemas[1:]],
+            list(jsonschema_validator._validators))
+
+    def test_validate(self):
+        jsonschema_validator.validate({'id': 1, 'name': 'foo'}, self.schema)
+        body = {'id': 'one', 'name': 'foo'}
+        exc = self.assertRaises(jsonschema.ValidationError,
+                                jsonschema_validator.validate,
+                                body, self.schema)
+        # The error is the one jsonschema.validate would report
+        expected = self.assertRaises(
+            jsonschema.ValidationError, jsonschema.validate, body,
+            self.schema, cls=jsonschema_validator.JSONSCHEMA_VALIDATOR,
+            format_checker=jsonschema_validator.FORMAT_CHECKER)
+        self.assertEqual(str(expected), str(exc))
+
+    def test_warm_up_validators(self):
+        package = 'tempest.lib.api_schema.response.compute.v2_1'
+        self.assertGreater(jsonschema_validator.warm_up_validators(package),
+                           0)
+        cached = len(jsonschema_validator._validators)
+        self.assertGreater(cached, 0)
+        # The package is only walked once
+        self.assertEqual(0, jsonschema_validator.warm_up_validators(package))
+        self.assertEqual(cached, len(jsonschema_validator._validators))
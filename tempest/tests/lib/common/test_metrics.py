@@ -0,0 +1,176 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import random
+import socket
+from unittest import mock
+
+import fixtures
+
+from tempest.lib.common import http
+from tempest.lib.common import metrics
+from tempest.lib.common import rest_client
+from tempest.tests import base
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib import fake_http
+
+
+class TestMetrics(base.TestCase):
+
+    def setUp(self):
+        super(TestMetrics, self).setUp()
+        self.sink = metrics.HistogramSink()
+        metrics.add_sink(self.sink)
+        self.addCleanup(metrics.remove_sink, self.sink)
+
+    def test_get_url_template(self):
+        for url, template in (
+                ('http://10.0.0.1:8774/v2.1/servers/'
+                 '3f1b4c2e-8d7a-4e6b-9c0f-1a2b3c4d5e6f/action?all=1',
+                 '/v2.1/servers/<uuid>/action'),
+                ('https://cloud/identity/v3/projects/'
+                 '0123456789abcdef0123456789ABCDEF/users/',
+                 '/identity/v3/projects/<id>/users'),
+                ('http://cloud/v2.0/ports/12/10.0.0.3',
+                 '/v2.0/ports/<id>/<ip>'),
+                ('http://cloud:8080/v1/AUTH_0123456789abcdef0123456789abcdef/'
+                 'tempest-TestContainer-1234567890/object',
+                 '/v1/AUTH_<id>/<name>/object'),
+                ('http://cloud:5000', '/')):
+            self.assertEqual(template, metrics.get_url_template(url))
+
+    def test_record(self):
+        metrics.record('compute', 'GET', 'http://cloud/v2.1/servers/1', 200,
+                       0.5)
+        metrics.record('compute', 'GET', 'http://cloud/v2.1/servers/2', 200,
+                       0.25)
+        metrics.record('compute', 'GET', 'http://cloud/v2.1/servers/2', 404,
+                       0.125)
+        self.assertEqual(
+            [('compute', 'GET', '/v2.1/servers/<id>', 200, 2, 0.25, 0.5),
+             ('compute', 'GET', '/v2.1/servers/<id>', 404, 1, 0.125, 0.125)],
+            [(latency['service'], latency['method'], latency['url'],
+              latency['status'], latency['count'], latency['min'],
+              latency['max']) for latency in self.sink.to_list()])
+
+    def test_record_sink_error(self):
+        sink = mock.Mock()
+        sink.record.side_effect = ValueError
+        metrics.add_sink(sink)
+        self.addCleanup(metrics.remove_sink, sink)
+        metrics.record('compute', 'GET', '/servers', 200, 0.5)
+        self.assertEqual(1, len(self.sink.histograms))
+
+    def test_rest_client(self):
+        client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'compute', 'region')
+        self.patchobject(http.ClosingHttp, 'request',
+                         fake_http.fake_httplib2(return_type=204).request)
+        self.patchobject(client, '_log_request')
+        client.raw_request('http://cloud/v2.1/servers/1', 'DELETE')
+        latency, = self.sink.to_list()
+        self.assertEqual(('compute', 'DELETE', '/v2.1/servers/<id>', 204, 1),
+                         (latency['service'], latency['method'],
+                          latency['url'], latency['status'],
+                          latency['count']))
+        secs = client._log_request.call_args[1]['secs']
+        self.assertEqual(secs, latency['min'])
+
+
+class TestHistogram(base.TestCase):
+
+    def test_empty(self):
+        histogram = metrics.Histogram()
+        self.assertIsNone(histogram.get_percentile(50))
+        self.assertIsNone(histogram.to_dict()['mean'])
+
+    def test_percentiles(self):
+        rand = random.Random(0)
+        values = sorted(rand.lognormvariate(-2, 1) for _ in range(10000))
+        histogram = metrics.Histogram(precision_bits=7)
+        for value in values:
+            histogram.record(value)
+        for percent in (1, 50, 90, 99, 99.9, 100):
+            exact = values[int(percent / 100.0 * len(values)) - 1]
+            self.assertAlmostEqual(exact, histogram.get_percentile(percent),
+                                   delta=exact * 2 ** -7)
+        self.assertEqual(values[0], histogram.min)
+        self.assertEqual(values[-1], histogram.max)
+        self.assertEqual(values[-1], histogram.get_percentile(100))
+        # The size of the histogram does not grow with the values
+        self.assertLess(len(histogram.buckets), 1000)
+
+    def test_to_dict(self):
+        histogram = metrics.Histogram()
+        for value in (0.000001, 0.000255, 0.5):
+            histogram.record(value)
+        result = histogram.to_dict()
+        self.assertEqual(3, result['count'])
+        self.assertAlmostEqual(0.500256 / 3, result['mean'])
+        self.assertAlmostEqual(0.000255, result['p50'])
+        self.assertEqual(['1', '255', '499712'], list(result['buckets']))
+
+
+class TestJSONFileSink(base.TestCase):
+
+    def test_dump(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'latency.json')
+        register = self.patch('atexit.register')
+        sink = metrics.JSONFileSink(path)
+        register.assert_called_once_with(sink.dump)
+        sink.record('image', 'GET', '/v2/images', 200, 0.5)
+        sink.dump()
+        with open(path) as f:
+            result = json.load(f)
+        self.assertEqual(os.getpid(), result['pid'])
+        self.assertEqual(sink.to_list(), result['latencies'])
+        self.assertEqual(['latency.json'], os.listdir(os.path.dirname(path)))
+
+
+class TestStatsdSink(base.TestCase):
+
+    def setUp(self):
+        super(TestStatsdSink, self).setUp()
+        self.collector = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(self.collector.close)
+        self.collector.bind(('127.0.0.1', 0))
+        self.collector.settimeout(5)
+
+    def test_record(self):
+        sink = metrics.StatsdSink('127.0.0.1',
+                                  self.collector.getsockname()[1], 'cloud')
+        self.addCleanup(sink.close)
+        sink.record('compute', 'POST',
+                    '/v2.1/servers/<uuid>/os-volume_attachments', 202, 0.25)
+        sink.record(None, 'GET', '/', 200, 0.001)
+        self.assertEqual(
+            b'cloud.compute.POST.v2_1.servers.uuid.os-volume_attachments.202:'
+            b'250.000|ms', self.collector.recv(1024))
+        self.assertEqual(b'cloud.unknown.GET._.200:1.000|ms',
+                         self.collector.recv(1024))
+
+    def test_record_error(self):
+        sink = metrics.StatsdSink('127.0.0.1',
+                                  self.collector.getsockname()[1])
+        self.addCleanup(sink.close)
+        send = self.patchobject(sink, '_socket').sendto
+        send.side_effect = OSError
+        # The request is not failed
+        sink.record('compute', 'GET', '/servers', 200, 0.25)
+        send.assert_called_once_with(b'tempest.compute.GET.servers.200:'
+                                     b'250.000|ms', sink.address)
@@ -0,0 +1,85 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tempest.lib.common import polling
+from tempest.tests import base
+
+
+class TestPollingPolicies(base.TestCase):
+
+    def intervals(self, policy, polls=6):
+        return [policy.interval(poll) for poll in range(polls)]
+
+    def test_fixed(self):
+        self.assertEqual([3] * 6, self.intervals(polling.FixedPolicy(3)))
+
+    def test_exponential(self):
+        policy = polling.ExponentialPolicy(0.5, 5, factor=2)
+        self.assertEqual([0.5, 1, 2, 4, 5, 5], self.intervals(policy))
+
+    def test_exponential_many_polls(self):
+        policy = polling.ExponentialPolicy(0.5, 5, factor=2)
+        self.assertEqual(5, policy.interval(100000))
+
+    def test_fast_first(self):
+        policy = polling.FastFirstPolicy(0.2, 3, 2)
+        self.assertEqual([0.2, 0.2, 0.2, 2, 2, 2], self.intervals(policy))
+
+    @mock.patch('random.uniform', return_value=1.1)
+    def test_jittered(self, uniform):
+        policy = polling.JitteredPolicy(polling.FixedPolicy(2), jitter=0.1)
+        self.assertAlmostEqual(2.2, policy.interval(0))
+        uniform.assert_called_once_with(0.9, 1.1)
+
+    def test_jittered_bounds(self):
+        policy = polling.JitteredPolicy(polling.FixedPolicy(2), jitter=0.5)
+        for interval in self.intervals(policy, 50):
+            self.assertTrue(1 <= interval <= 3)
+
+    def test_get_policy(self):
+        self.assertIsInstance(polling.get_policy('fixed', 1),
+                              polling.FixedPolicy)
+        self.assertIsInstance(polling.get_policy('exponential', 1),
+                              polling.ExponentialPolicy)
+        self.assertIsInstance(polling.get_policy('jittered', 1),
+                              polling.JitteredPolicy)
+        policy = polling.get_policy('fast-first', 4, initial_interval=0.1,
+                                    fast_polls=2)
+        self.assertEqual([0.1, 0.1, 4], self.intervals(policy, 3))
+
+    def test_get_policy_unknown(self):
+        self.assertRaises(ValueError, polling.get_policy, 'fancy', 1)
+
+
+class TestPoller(base.TestCase):
+
+    def test_sleep(self):
+        sleep = self.patch('time.sleep')
+        poller = polling.ExponentialPolicy(1, 10).start()
+        poller.sleep()
+        poller.sleep()
+        sleep.assert_has_calls([mock.call(1), mock.call(2)])
+        self.assertEqual(2, poller.polls)
+        self.assertEqual(3, poller.slept)
+
+    def test_report(self):
+        self.patch('time.monotonic', side_effect=[10, 12.5])
+        poller = polling.FixedPolicy(1).start()
+        with mock.patch.object(polling.LOG, 'debug') as debug:
+            poller.report('wait_for_something')
+        debug.assert_called_once_with(
+            mock.ANY, 'wait_for_something', 2.5, 0, poller.policy)
@@ -268,6 +268,106 @@ class TestPreProvisionedCredentials(base.TestCase):
         remove_mock.mock.assert_called_once_with(hash_path)
         rmdir_mock.mock.assert_not_called()
 
+    def _get_atomic_provider(self):
+        lock_dir = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                'test_accounts')
+        return preprov_creds.PreProvisionedCredentialProvider(
+            **dict(self.fixed_params, accounts_lock_dir=lock_dir,
+                   atomic_allocation=True))
+
+    def test_get_free_hash_atomic(self):
+        hash_list = self._get_hash_list(self.test_accounts)
+        test_account_class = self._get_atomic_provider()
+        allocated = set()
+        for _ in hash_list:
+            allocated.add(test_account_class._get_free_hash_atomic(hash_list))
+        self.assertEqual(set(hash_list), allocated)
+        lock_path = os.path.join(test_account_class.accounts_dir,
+                                 hash_list[0])
+        with open(lock_path) as lock_file:
+            self.assertEqual('test class\n%d' % os.getpid(),
+                             lock_file.read())
+        exc = self.assertRaises(lib_exc.InvalidCredentials,
+                                test_account_class._get_free_hash_atomic,
+                                hash_list)
+        self.assertIn('test class', str(exc))
+
+    def test_get_free_hash_atomic_ordered(self):
+        hash_list = self._get_hash_list(self.test_accounts)
+        test_account_class = self._get_atomic_provider()
+        self.assertEqual(
+            hash_list[0],
+            test_account_class._get_free_hash_atomic(hash_list, ordered=True))
+        self.assertEqual(
+            hash_list[1],
+            test_account_class._get_free_hash_atomic(hash_list, ordered=True))
+
+    def test_get_first_persona_group(self):
+        get_group = (preprov_creds.PreProvisionedCredentialProvider.
+                     _get_first_persona_group)
+        self.assertEqual(preprov_creds._PERSONAS,
+                         get_group(['member'], 'project', None))
+        self.assertEqual(preprov_creds._ALT_PERSONAS,
+                         get_group(['alt_reader'], 'project', None))
+        # A project was already picked for the group
+        self.assertIsNone(get_group(['member'], 'project', 'project1'))
+        self.assertIsNone(get_group(['member'], 'domain', None))
+        self.assertIsNone(get_group(['role1'], 'project', None))
+
+    def test_get_free_hash_atomic_reclaims_stale_lock(self):
+        hash_list = self._get_hash_list(self.test_accounts)[:1]
+        test_account_class = self._get_atomic_provider()
+        os.makedirs(test_account_class.accounts_dir)
+        lock_path = os.path.join(test_account_class.accounts_dir,
+                                 hash_list[0])
+        with open(lock_path, 'w') as lock_file:
+            lock_file.write('dead class\n12345')
+        self.patchobject(test_account_class, '_is_process_alive',
+                         return_value=False)
+        self.assertEqual(
+            hash_list[0], test_account_class._get_free_hash_atomic(hash_list))
+        with open(lock_path) as lock_file:
+            self.assertEqual('test class\n%d' % os.getpid(),
+                             lock_file.read())
+        self.assertEqual([hash_list[0]],
+                         os.listdir(test_account_class.accounts_dir))
+
+    def test_get_free_hash_atomic_keeps_live_lock(self):
+        hash_list = self._get_hash_list(self.test_accounts)[:1]
+        test_account_class = self._get_atomic_provider()
+        os.makedirs(test_account_class.accounts_dir)
+        lock_path = os.path.join(test_account_class.accounts_dir,
+                                 hash_list[0])
+        for content in ('live class\n%d' % os.getpid(), 'old class'):
+            with open(lock_path, 'w') as lock_file:
+                lock_file.write(content)
+            self.assertRaises(lib_exc.InvalidCredentials,
+                              test_account_class._get_free_hash_atomic,
+                              hash_list)
+            with open(lock_path) as lock_file:
+                self.assertEqual(content, lock_file.read())
+
+    def test_remove_credentials_atomic(self):
+        test_account_class = self._get_atomic_provider()
+        creds = test_account_class.get_primary_creds()
+        _hash = test_account_class.get_hash(creds)
+        lock_path = os.path.join(test_account_class.accounts_dir, _hash)
+        self.assertTrue(original_isfile(lock_path))
+        test_account_class.clear_creds()
+        self.assertFalse(original_isfile(lock_path))
+        self.assertTrue(os.path.isdir(test_account_class.accounts_dir))
+
+    def test_get_match_hash_list_computed_once(self):
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **self.fixed_params)
+        compute_mock = self.patchobject(
+            test_account_class, '_compute_match_hash_list',
+            return_value=['hash'])
+        for _ in range(2):
+            self.assertEqual(['hash'], test_account_class._get_match_hash_list(
+                roles=['member'], scope='project'))
+        compute_mock.assert_called_once_with(['member'], 'project', None)
+
     def test_is_multi_user(self):
         test_accounts_class = preprov_creds.PreProvisionedCredentialProvider(
             **self.fixed_params)
@@ -13,6 +13,7 @@
 #    under the License.
 
 import copy
+import os
 from unittest import mock
 from unittest.mock import patch
 
@@ -103,6 +104,70 @@ class TestRestClientNotFoundHandling(BaseRestClientTestClass):
                           self.url, {}, {})
 
 
+class FakeStreamedResponse(object):
+
+    def __init__(self, body, status=200):
+        self.data = body
+        self.status = status
+        self.reason = 'Ok'
+        self.version = 11
+        self.release_conn = mock.Mock()
+
+    def getheaders(self):
+        return {'Content-Type': 'application/json'}
+
+    def stream(self, amt):
+        for i in range(0, len(self.data), amt):
+            yield self.data[i:i + amt]
+
+
+class TestRestClientGetListStream(BaseRestClientTestClass):
+
+    body = {'servers': [{'id': str(i)} for i in range(100)],
+            'servers_links': [{'rel': 'next', 'href': 'fake_next'}]}
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestRestClientGetListStream, self).setUp()
+        self.raw_resp = FakeStreamedResponse(
+            json.dumps(self.body).encode('utf-8'))
+        self.request = self.patchobject(http.ClosingHttp, 'request',
+                                        return_value=(self.raw_resp, b''))
+        self.patchobject(rest_client, 'STREAM_CHUNK_SIZE', 64)
+
+    def test_get_list_stream(self):
+        resp, stream = self.rest_client.get_list_stream(self.url,
+                                                        key='servers')
+        self.assertEqual(200, resp.status)
+        self.assertEqual('application/json', resp['content-type'])
+        self.assertEqual(self.body['servers'][0], next(stream))
+        self.raw_resp.release_conn.assert_not_called()
+        self.assertEqual(self.body['servers'][1:], list(stream))
+        self.assertEqual({'servers_links': self.body['servers_links']},
+                         stream.others)
+        self.raw_resp.release_conn.assert_called_once_with()
+        # The body is streamed from the response
+        self.assertFalse(self.request.call_args[1]['preload_content'])
+        # Only the preview of the body is logged, once it has been read
+        self.rest_client._log_request.assert_called_once_with(
+            'GET', self.url, resp, secs=mock.ANY, req_headers=mock.ANY,
+            resp_body=stream.preview)
+
+    def test_get_list_stream_closed(self):
+        _, stream = self.rest_client.get_list_stream(self.url)
+        next(stream)
+        stream.close()
+        self.raw_resp.release_conn.assert_called_once_with()
+        self.rest_client._log_request.assert_called_once()
+
+    def test_get_list_stream_error(self):
+        self.raw_resp.status = 404
+        self.raw_resp.data = b'{"itemNotFound": {"message": "not found"}}'
+        self.assertRaises(exceptions.NotFound,
+                          self.rest_client.get_list_stream, self.url)
+        self.raw_resp.release_conn.assert_called_once_with()
+
+
 class TestRestClientHeadersJSON(TestRestClientHTTPMethods):
 
     def _verify_headers(self, resp):
@@ -272,6 +337,65 @@ class TestRestClientServiceToken(BaseRestClientTestClass):
         self.assertEqual('<omitted>', req_headers['X-Auth-Token'])
 
 
+class TestRestClientSafeBody(BaseRestClientTestClass):
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestRestClientSafeBody, self).setUp()
+
+    def test_text(self):
+        self.assertEqual('x' * 10, self.rest_client._safe_body('x' * 100,
+                                                               maxlen=10))
+        self.assertEqual('short', self.rest_client._safe_body('short'))
+        self.assertEqual('None', self.rest_client._safe_body(None))
+
+    def test_bytes(self):
+        body = b'\x00' + b'x' * 10000
+        self.assertEqual(str(body)[:4096], self.rest_client._safe_body(body))
+        self.assertEqual("b'short'", self.rest_client._safe_body(b'short'))
+
+    def test_structure(self):
+        body = {'servers': [{'id': i, 'name': ('s', None)}
+                            for i in range(10000)]}
+        self.assertEqual(str(body)[:100],
+                         self.rest_client._safe_body(body, maxlen=100))
+        body = {'server': {'id': 1, 'tags': ['a', 'b'], 'c': (1,)}}
+        self.assertEqual(str(body), self.rest_client._safe_body(body))
+
+    def test_streamed(self):
+        def generator():
+            yield b'data'
+            self.fail('The body was consumed')
+
+        self.assertEqual('<StreamedData: not logged>',
+                         self.rest_client._safe_body(generator()))
+
+    def test_binary_content_type(self):
+        self.assertEqual(
+            '<BinaryData: 10000 bytes>',
+            self.rest_client._safe_body(
+                b'x' * 10000, content_type='application/octet-stream'))
+
+    def test_skip_body_logging(self):
+        self.rest_client.skip_body_logging = True
+        self.assertEqual('<Body: not logged>',
+                         self.rest_client._safe_body('{"object": "data"}'))
+        self.assertEqual('None', self.rest_client._safe_body(None))
+
+    def test_log_request_full_binary_response(self):
+        self.useFixture(fixtures.MockPatchObject(self.rest_client, 'LOG'))
+        resp = fake_http.fake_http_response(
+            {'content-type': 'application/octet-stream'})
+        self.rest_client._log_request_full(
+            resp, req_headers={}, req_body='{"key": "value"}',
+            resp_body=b'x' * 100)
+        args = self.rest_client.LOG.debug.call_args[0]
+        self.assertEqual('{"key": "value"}', args[2])
+        self.assertEqual('<BinaryData: 100 bytes>', args[4])
+        # The response headers are not copied when there is nothing to omit
+        self.assertEqual(str(resp), args[3])
+
+
 class TestRestClientParseRespJSON(BaseRestClientTestClass):
     TYPE = "json"
 
@@ -784,92 +908,74 @@ class TestExpectedSuccess(BaseRestClientTestClass):
 
 class TestRecordResources(BaseRestClientTestClass):
 
+    def _read_journal(self):
+        with open(self.journal) as f:
+            return [json.loads(line) for line in f]
+
     def setUp(self):
         self.fake_http = fake_http.fake_httplib2()
         super(TestRecordResources, self).setUp()
         self.rest_client.rec_rw_lock = mock.MagicMock()
+        self.tmp_dir = self.useFixture(fixtures.TempDir()).path
+        self.journal = os.path.join(self.tmp_dir, 'resource_list.journal')
+        self.patch('tempest.lib.common.rest_client.RESOURCE_LIST_JOURNAL',
+                   self.journal)
 
     def test_post_record_resources(self):
-        with patch('builtins.open', mock.mock_open(read_data=b'{}')):
-            self.rest_client.record_resources = True
-            __, return_dict = self.rest_client.post(self.url, {}, {})
-            self.assertEqual({}, return_dict['headers'])
-            self.assertEqual({}, return_dict['body'])
+        self.rest_client.record_resources = True
+        __, return_dict = self.rest_client.post(self.url, {}, {})
+        self.assertEqual({}, return_dict['headers'])
+        self.assertEqual({}, return_dict['body'])
 
     def test_resource_record_dict(self):
-        mock_resource_list_1 = mock.mock_open(read_data=b'{}')
-        mock_resource_list_2 = mock.mock_open(
-            read_data=b'{"projects": {"test-id": ""}}')
-
-        with patch('builtins.open') as mock_open_func:
-            mock_open_func.side_effect = [
-                mock_resource_list_1.return_value,
-                mock_resource_list_2.return_value
-            ]
-
-            test_dict_body = b'{"project": {"id": "test-id", "name": ""}}\n'
-            self.rest_client.resource_record(test_dict_body)
+        test_dict_body = b'{"project": {"id": "test-id", "name": ""}}\n'
+        self.rest_client.resource_record(test_dict_body)
 
-            content = mock_resource_list_2().read()
-            resource_list_2 = json.loads(content)
-            test_resource_list_2 = {
-                "projects": {"test-id": ""}
-            }
-            self.assertEqual(resource_list_2, test_resource_list_2)
+        self.assertEqual(
+            [{'type': 'projects', 'id': 'test-id', 'name': ''}],
+            self._read_journal())
+        self.rest_client.rec_rw_lock.acquire_write_lock.assert_called_once()
+        self.rest_client.rec_rw_lock.release_write_lock.assert_called_once()
+        self.rest_client.rec_rw_lock.acquire_read_lock.assert_not_called()
 
     def test_resource_record_list(self):
-        mock_content_2 = b'{"users": {"test-uuid": "test-name"}}'
-        mock_content_3 = (
-            b'{"users": {"test-uuid": "test-name",'
-            b'"test-uuid2": "test-name2"}}'
-        )
-
-        mock_resource_list_1 = mock.mock_open(read_data=b'{}')
-        mock_resource_list_2 = mock.mock_open(read_data=mock_content_2)
-        mock_resource_list_3 = mock.mock_open(read_data=mock_content_3)
-
-        with patch('builtins.open') as mock_open_func:
-            mock_open_func.side_effect = [
-                mock_resource_list_1.return_value,
-                mock_resource_list_2.return_value,
-                mock_resource_list_3.return_value
+        test_list_body = '''{
+            "user": [
+                {
+                    "id": "test-uuid",
+                    "name": "test-name"
+                },
+                {
+                    "id": "test-uuid2",
+                    "name": "test-name2"
+                }
             ]
+        }'''
+        test_list_body = test_list_body.encode('utf-8')
+        self.rest_client.resource_record(test_list_body)
 
-            test_list_body = '''{
-                "user": [
-                    {
-                        "id": "test-uuid",
-                        "name": "test-name"
-                    },
-                    {
-                        "id": "test-uuid2",
-                        "name": "test-name2"
-                    }
-                ]
-            }'''
-            test_list_body = test_list_body.encode('utf-8')
-            self.rest_client.resource_record(test_list_body)
+        self.assertEqual(
+            [{'type': 'users', 'id': 'test-uuid', 'name': 'test-name'},
+             {'type': 'users', 'id': 'test-uuid2', 'name': 'test-name2'}],
+            self._read_journal())
+        # All the resources of a response are appended at once
+        self.rest_client.rec_rw_lock.acquire_write_lock.assert_called_once()
 
-            content_2 = mock_resource_list_2().read()
-            resource_list_2 = json.loads(content_2)
+    def test_resource_record_appends(self):
+        self.rest_client.resource_record(b'{"keypair": {"name": "kp"}}')
+        self.rest_client.resource_record(b'{"server": {"id": "s1"}}')
 
-            test_resource_list_2 = {
-                "users": {
-                    "test-uuid": "test-name"
-                }
-            }
-            self.assertEqual(resource_list_2, test_resource_list_2)
+        self.assertEqual(
+            [{'type': 'keypairs', 'id': 'kp', 'name': ''},
+             {'type': 'servers', 'id': 's1', 'name': None}],
+            self._read_journal())
 
-            content_3 = mock_resource_list_3().read()
-            resource_list_3 = json.loads(content_3)
+    def test_resource_record_no_resource(self):
+        self.rest_client.resource_record(b'{"project": {"type": "test"}}')
+        self.rest_client.resource_record(b'not json')
 
-            test_resource_list_3 = {
-                "users": {
-                    "test-uuid": "test-name",
-                    "test-uuid2": "test-name2"
-                }
-            }
-            self.assertEqual(resource_list_3, test_resource_list_3)
+        self.assertFalse(os.path.exists(self.journal))
+        self.rest_client.rec_rw_lock.acquire_write_lock.assert_not_called()
 
     def test_resource_update_id(self):
         data = {}
@@ -906,6 +1012,89 @@ class TestRecordResources(BaseRestClientTestClass):
             self.rest_client.resource_update(data, 'user', res_dict)
             self.assertEqual(data, {})
 
+    def test_resource_update_writes_resource_list(self):
+        resource_list = os.path.join(self.tmp_dir, 'resource_list.json')
+        self.patch('tempest.lib.common.rest_client.RESOURCE_LIST_JSON',
+                   resource_list)
+        data = {'servers': {'s1': 'server'}}
+
+        self.rest_client.resource_update(data, 'user', {'id': 'u1',
+                                                        'name': 'user'})
+
+        with open(resource_list, 'rb') as f:
+            self.assertEqual({'servers': {'s1': 'server'},
+                              'users': {'u1': 'user'}}, json.load(f))
+        self.rest_client.rec_rw_lock.acquire_write_lock.assert_called_once()
+        self.rest_client.rec_rw_lock.release_write_lock.assert_called_once()
+        self.assertFalse(os.path.exists(self.journal))
+
+
+class TestCompactResourceJournal(base.TestCase):
+
+    def setUp(self):
+        super(TestCompactResourceJournal, self).setUp()
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        self.resource_list = os.path.join(tmp_dir, 'resource_list.json')
+        self.journal = os.path.join(tmp_dir, 'resource_list.journal')
+
+    def _write(self, path, content):
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def _compact(self, **kwargs):
+        return rest_client.compact_resource_journal(
+            self.resource_list, self.journal, **kwargs)
+
+    def test_compact(self):
+        self._write(self.resource_list,
+                    '{"users": {"test-uuid": "test-name"}}')
+        self._write(
+            self.journal,
+            '{"type": "users", "id": "test-uuid2", "name": "test-name2"}\n'
+            '{"type": "keypairs", "id": "kp", "name": ""}\n')
+
+        data = self._compact()
+
+        expected = {'users': {'test-uuid': 'test-name',
+                              'test-uuid2': 'test-name2'},
+                    'keypairs': {'kp': ''}}
+        self.assertEqual(expected, data)
+        with open(self.resource_list, 'rb') as f:
+            self.assertEqual(expected, json.load(f))
+        with open(self.journal) as f:
+            self.assertEqual('', f.read())
+
+    def test_compact_no_resource_list(self):
+        self._write(self.journal,
+                    '{"type": "servers", "id": "s1", "name": "vm"}\n')
+
+        self.assertEqual({'servers': {'s1': 'vm'}}, self._compact())
+        self.assertTrue(os.path.exists(self.resource_list))
+
+    def test_compact_no_journal(self):
+        self._write(self.resource_list, '{"servers": {"s1": "vm"}}')
+
+        self.assertEqual({'servers': {'s1': 'vm'}}, self._compact())
+        self.assertFalse(os.path.exists(self.journal))
+
+    def test_compact_skips_truncated_line(self):
+        self._write(self.journal,
+                    '{"type": "servers", "id": "s1", "name": "vm"}\n'
+                    '{"type": "servers", "id": "s2", "na')
+
+        self.assertEqual({'servers': {'s1': 'vm'}}, self._compact())
+
+    @mock.patch('fasteners.process_lock.InterProcessReaderWriterLock')
+    def test_compact_with_lock(self, mock_lock):
+        self._write(self.journal,
+                    '{"type": "servers", "id": "s1", "name": "vm"}\n')
+
+        self._compact(lock_path='fake_lock_path')
+
+        mock_lock.assert_called_once_with('fake_lock_path')
+        mock_lock.return_value.acquire_write_lock.assert_called_once_with()
+        mock_lock.return_value.release_write_lock.assert_called_once_with()
+
 
 class TestResponseBody(base.TestCase):
 
@@ -937,6 +1126,80 @@ class TestResponseBodyList(base.TestCase):
                          str(actual))
 
 
+class TestPaginate(base.TestCase):
+
+    def test_links(self):
+        list_method = mock.Mock(side_effect=[
+            {'servers': [{'id': '1'}, {'id': '2'}],
+             'servers_links': [
+                 {'rel': 'next',
+                  'href': 'http://compute/servers?limit=2&marker=2'}]},
+            {'servers': [{'id': '3'}]},
+        ])
+        resources = rest_client.paginate(list_method, 'servers', page_size=2,
+                                         name='test')
+        self.assertEqual({'id': '1'}, next(resources))
+        # The next page is only requested when needed
+        list_method.assert_called_once_with(name='test', limit=2)
+        self.assertEqual([{'id': '2'}, {'id': '3'}], list(resources))
+        list_method.assert_called_with(name='test', limit=2, marker='2')
+
+    def test_next(self):
+        list_method = mock.Mock(side_effect=[
+            {'images': [{'id': '1'}], 'next': '/v2/images?marker=1'},
+            {'images': [{'id': '2'}], 'next': None},
+        ])
+        self.assertEqual([{'id': '1'}, {'id': '2'}],
+                         list(rest_client.paginate(list_method, 'images')))
+        list_method.assert_called_with(marker='1')
+
+    def test_params_dict(self):
+        def list_images(params=None):
+            calls.append(dict(params))
+            return {'images': pages[len(calls) - 1]}
+
+        calls = []
+        pages = [[{'id': '1'}], [{'id': '2'}], []]
+        self.assertEqual(
+            [{'id': '1'}, {'id': '2'}],
+            list(rest_client.paginate(list_images, 'images', page_size=1,
+                                      status='active')))
+        self.assertEqual([{'status': 'active', 'limit': 1},
+                          {'status': 'active', 'limit': 1, 'marker': '1'},
+                          {'status': 'active', 'limit': 1, 'marker': '2'}],
+                         calls)
+
+    def test_full_page_marker(self):
+        list_method = mock.Mock(side_effect=[
+            {'ports': [{'id': '1'}, {'id': '2'}]},
+            {'ports': [{'id': '3'}, {'id': '4'}]},
+            {'ports': []},
+        ])
+        self.assertEqual(
+            ['1', '2', '3', '4'],
+            [port['id'] for port in rest_client.paginate(
+                list_method, 'ports', page_size=2)])
+        list_method.assert_has_calls([
+            mock.call(limit=2), mock.call(limit=2, marker='2'),
+            mock.call(limit=2, marker='4')])
+
+    def test_single_page(self):
+        list_method = mock.Mock(return_value={'networks': [{'id': '1'}]})
+        self.assertEqual(
+            [{'id': '1'}],
+            list(rest_client.paginate(list_method, 'networks')))
+        list_method.assert_called_once_with()
+
+    def test_repeated_marker(self):
+        list_method = mock.Mock(return_value={
+            'servers': [{'id': '1'}],
+            'servers_links': [{'rel': 'next',
+                               'href': 'http://compute/servers?marker=1'}]})
+        self.assertEqual(2, len(list(rest_client.paginate(list_method,
+                                                          'servers'))))
+        self.assertEqual(2, list_method.call_count)
+
+
 class TestJSONSchemaValidationBase(base.TestCase):
 
     class Response(dict):
@@ -1347,3 +1610,29 @@ class TestRestClientJSONSchemaValidatorVersion(TestJSONSchemaValidationBase):
             self._test_validate_pass(self.schema, body)
             chk_schema.mock.assert_called_once_with(
                 self.schema['response_body'])
+
+
+class TestRestClientHttpBackend(base.TestCase):
+
+    def setUp(self):
+        super(TestRestClientHttpBackend, self).setUp()
+        self.fake_auth_provider = fake_auth_provider.FakeAuthProvider()
+
+    def test_closing_http_by_default(self):
+        client = rest_client.RestClient(self.fake_auth_provider, None, None)
+        self.assertIsInstance(client.http_obj, http.ClosingHttp)
+
+    def test_connection_pooling(self):
+        client = rest_client.RestClient(
+            self.fake_auth_provider, None, None, connection_pooling=True,
+            pool_maxsize=5, pool_num_pools=3, pool_idle_timeout=30)
+        self.assertIsInstance(client.http_obj, http.PooledHttp)
+        self.assertEqual(5, client.http_obj.connection_pool_kw['maxsize'])
+        self.assertEqual(3, client.http_obj.pools._maxsize)
+        self.assertEqual(30, client.http_obj.idle_timeout)
+
+    def test_connection_pooling_with_proxy(self):
+        client = rest_client.RestClient(
+            self.fake_auth_provider, None, None, connection_pooling=True,
+            proxy_url='http://myproxy:3128')
+        self.assertIsInstance(client.http_obj, http.PooledProxyHttp)
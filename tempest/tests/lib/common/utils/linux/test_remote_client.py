@@ -36,6 +36,16 @@ class TestRemoteClient(base.TestCase):
         mock_ssh_exec_command.assert_called_once_with(
             'set -eu -o pipefail; PATH=$PATH:/sbin; ls')
 
+    @mock.patch.object(ssh.Client, 'exec_command_iter',
+                       return_value=iter(['success']))
+    def test_exec_command_iter(self, mock_ssh_exec_command_iter):
+        client = remote_client.RemoteClient('192.168.1.10', 'username')
+        self.assertEqual(['success'],
+                         list(client.exec_command_iter('dmesg', lines=True)))
+        mock_ssh_exec_command_iter.assert_called_once_with(
+            'set -eu -o pipefail; PATH=$PATH:/sbin; dmesg', lines=True,
+            max_bytes=None)
+
     @mock.patch.object(ssh.Client, 'test_connection_auth')
     def test_validate_authentication(self, mock_test_connection_auth):
         client = remote_client.RemoteClient('192.168.1.10', 'username')
@@ -62,6 +62,26 @@ class TestTestUtils(base.TestCase):
         self.assertEqual('TestTestUtils:tearDownClass',
                          tearDownClass(self.__class__))
 
+    def test_find_test_caller_context(self):
+        with test_utils.caller_context('MyTest:test_something'):
+            self.assertEqual('MyTest:test_something',
+                             test_utils.find_test_caller())
+            with test_utils.caller_context('MyFixture:setUp'):
+                self.assertEqual('MyFixture:setUp',
+                                 test_utils.find_test_caller())
+            self.assertEqual('MyTest:test_something',
+                             test_utils.find_test_caller())
+        self.assertIsNone(test_utils.get_test_caller())
+        self.assertEqual('TestTestUtils:test_find_test_caller_context',
+                         test_utils.find_test_caller())
+
+    @mock.patch('inspect.currentframe')
+    def test_find_test_caller_context_skips_stack(self, currentframe):
+        previous = test_utils.set_test_caller('MyTest:setUpClass')
+        self.addCleanup(test_utils.set_test_caller, previous)
+        self.assertEqual('MyTest:setUpClass', test_utils.find_test_caller())
+        currentframe.assert_not_called()
+
     def test_call_and_ignore_notfound_exc_when_notfound_raised(self):
         def raise_not_found():
             raise exceptions.NotFound()
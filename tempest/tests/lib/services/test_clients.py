@@ -160,6 +160,24 @@ class TestClientsFactory(base.TestCase):
         klass_mock.assert_called_once_with(auth_provider=auth_provider,
                                            **params)
 
+    def test__get_partial_class_later_kwargs_not_persisted(self):
+        self._setup_fake_module(class_names=[])
+        auth_provider = fake_auth_provider.FakeAuthProvider()
+        params = {'k1': 'v1', 'k2': 'v2'}
+        factory = clients.ClientsFactory(
+            'fake_path', [], auth_provider, **params)
+        klass_mock = mock.Mock()
+        partial = factory._get_partial_class(
+            klass_mock, auth_provider, dict(params))
+        partial(k2='v4', k3='v3')
+        partial()
+        # The later kwargs of the first client do not apply to the second
+        self.assertEqual(
+            [mock.call(auth_provider=auth_provider, k1='v1', k2='v4',
+                       k3='v3'),
+             mock.call(auth_provider=auth_provider, **params)],
+            klass_mock.call_args_list)
+
     def test__get_partial_class_with_alias(self):
         expected_fake_client = 'not_really_a_client'
         client_alias = 'fake_client'
@@ -15,6 +15,7 @@
 
 import copy
 import datetime
+from unittest import mock
 
 import fixtures
 from oslo_utils import timeutils
@@ -112,6 +113,27 @@ class TestBaseAuthProvider(BaseAuthTestsSetUp):
                           auth.AuthProvider,
                           fake_credentials.FakeCredentials)
 
+    def test_keystone_auth_class_with_base_url(self):
+        class KeystoneAuthProviderImpl(auth.KeystoneAuthProvider):
+            def _auth_client(self, auth_url):
+                pass
+
+            def _auth_params(self):
+                pass
+
+            def _fill_credentials(self, auth_data_body):
+                pass
+
+            def base_url(self, filters, auth_data=None):
+                return 'http://fake_url'
+
+            def is_expired(self, auth_data):
+                pass
+
+        auth_provider = KeystoneAuthProviderImpl(
+            fake_credentials.FakeKeystoneV3Credentials(), 'http://fake_url')
+        self.assertEqual('http://fake_url', auth_provider.base_url({}))
+
 
 class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
     _endpoints = fake_identity.IDENTITY_V2_RESPONSE['access']['serviceCatalog']
@@ -509,6 +531,67 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
         expected = 'http://fake_url/some_path/v2.0'
         self._test_base_url_helper(expected, filters, ('token', auth_data))
 
+    def test_base_url_cached(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        expected = self._get_result_url_from_endpoint(
+            self._endpoints[0]['endpoints'][1])
+        # The fake tokens are expired, pass the same auth data explicitly
+        auth_data = self.auth_provider.get_auth()
+        self._test_base_url_helper(expected, filters, auth_data)
+        with mock.patch.object(self.auth_provider, '_base_url') as base_url:
+            self._test_base_url_helper(expected, dict(filters), auth_data)
+            self.assertFalse(base_url.called)
+            # A new token drops the cached URLs
+            self.auth_provider.set_auth()
+            new_auth_data = self.auth_provider.cache
+            self.auth_provider.base_url(filters, new_auth_data)
+            base_url.assert_called_once_with(
+                filters, new_auth_data[1], mock.ANY)
+
+    def test_base_url_cached_per_filters(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        self.auth_provider.base_url(filters)
+        filters['api_version'] = 'v3.5'
+        expected = self._get_result_url_from_endpoint(
+            self._endpoints[0]['endpoints'][1], replacement='v3.5')
+        self._test_base_url_helper(expected, filters)
+
+    def test_base_url_unhashable_filters(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion',
+            'unknown': ['unhashable']
+        }
+        expected = self._get_result_url_from_endpoint(
+            self._endpoints[0]['endpoints'][1])
+        self._test_base_url_helper(expected, filters)
+        self._test_base_url_helper(expected, filters)
+
+    def test_request_removes_contiguous_slashes(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        headers = {'Content-Type': 'application/json'}
+        url, auth_headers, _ = self.auth_provider.auth_request(
+            'GET', '/servers//detail', headers=headers, filters=filters)
+        expected = self._get_result_url_from_endpoint(
+            self._endpoints[0]['endpoints'][1]) + '/servers/detail'
+        self.assertEqual(expected, url)
+        # The original headers are not modified
+        self.assertEqual({'Content-Type': 'application/json'}, headers)
+        self.assertIn('X-Auth-Token', auth_headers)
+
     def test_token_not_expired(self):
         expiry_data = timeutils.utcnow() + datetime.timedelta(days=1)
         self._verify_expiry(expiry_data=expiry_data, should_be_expired=False)
@@ -801,6 +884,87 @@ class TestKeystoneV3AuthProvider(TestKeystoneV2AuthProvider):
                 self.assertEqual(getattr(all_creds, attr), auth_params[attr])
 
 
+class TestTokenCache(base.TestCase):
+
+    def setUp(self):
+        super(TestTokenCache, self).setUp()
+        self.patchobject(auth, '_token_cache', {})
+        self.patchobject(auth, '_token_cache_locks', {})
+        self.raw_request = self.patchobject(
+            v3_client.V3TokenClient, 'raw_request', autospec=True,
+            side_effect=fake_identity._fake_v3_response)
+        self.expired = self.patchobject(
+            auth.KeystoneV3AuthProvider, 'is_expired', return_value=False)
+
+    def _auth_provider(self, token_cache=True, **credentials):
+        credentials = credentials or dict(username='fake_user',
+                                          password='fake_pwd',
+                                          project_name='fake_project',
+                                          user_domain_name='fake_domain',
+                                          project_domain_name='fake_domain')
+        return auth.KeystoneV3AuthProvider(
+            auth.KeystoneV3Credentials(**credentials),
+            fake_identity.FAKE_AUTH_URL, token_cache=token_cache)
+
+    def test_token_shared(self):
+        first = self._auth_provider()
+        second = self._auth_provider()
+        self.assertIs(first.get_auth(), second.get_auth())
+        self.assertEqual(1, self.raw_request.call_count)
+        # The credentials are filled from the shared token
+        self.assertEqual(fake_identity.IDENTITY_V3_RESPONSE['token'][
+            'user']['id'], second.credentials.user_id)
+
+    def test_token_not_shared_by_default(self):
+        self._auth_provider(token_cache=False).get_auth()
+        self._auth_provider(token_cache=False).get_auth()
+        self.assertEqual(2, self.raw_request.call_count)
+        self.assertEqual({}, auth._token_cache)
+
+    def test_token_not_shared_between_credentials(self):
+        self._auth_provider().get_auth()
+        self._auth_provider(username='other_user', password='fake_pwd',
+                            project_name='fake_project',
+                            user_domain_name='fake_domain',
+                            project_domain_name='fake_domain').get_auth()
+        self.assertEqual(2, self.raw_request.call_count)
+
+    def test_token_not_shared_between_scopes(self):
+        first = self._auth_provider()
+        first.get_auth()
+        second = self._auth_provider()
+        second.scope = 'domain'
+        self.assertNotEqual(first._token_cache_key(),
+                            second._token_cache_key())
+
+    def test_expired_token_renewed(self):
+        first = self._auth_provider()
+        first.get_auth()
+        self.expired.return_value = True
+        self._auth_provider().get_auth()
+        self.assertEqual(2, self.raw_request.call_count)
+
+    def test_set_auth_renews_shared_token(self):
+        first = self._auth_provider()
+        first.get_auth()
+        first.set_auth()
+        self.assertIs(first.cache, self._auth_provider().get_auth())
+        self.assertEqual(2, self.raw_request.call_count)
+
+    def test_clear_auth_drops_shared_token(self):
+        first = self._auth_provider()
+        first.get_auth()
+        first.clear_auth()
+        self.assertEqual({}, auth._token_cache)
+        self._auth_provider().get_auth()
+        self.assertEqual(2, self.raw_request.call_count)
+
+    def test_clear_token_cache(self):
+        self._auth_provider().get_auth()
+        auth.clear_token_cache()
+        self.assertEqual({}, auth._token_cache)
+
+
 class TestKeystoneV3Credentials(base.TestCase):
     def testSetAttrUserDomain(self):
         creds = auth.KeystoneV3Credentials()
@@ -210,9 +210,9 @@ class TestSshClient(base.TestCase):
             chan_mock, self.SELECT_POLLIN)
         poll_mock.poll.assert_called_once_with(10)
         chan_mock.recv_ready.assert_called_once_with()
-        chan_mock.recv.assert_called_once_with(1024)
+        chan_mock.recv.assert_called_once_with(ssh.DEFAULT_BUF_SIZE)
         chan_mock.recv_stderr_ready.assert_called_once_with()
-        chan_mock.recv_stderr.assert_called_once_with(1024)
+        chan_mock.recv_stderr.assert_called_once_with(ssh.DEFAULT_BUF_SIZE)
         chan_mock.recv_exit_status.assert_called_once_with()
 
         client_mock.close.assert_called_once_with()
@@ -303,7 +303,7 @@ class TestSshClient(base.TestCase):
         chan_mock.makefile.return_value = std_out_mock
         chan_mock.makefile_stderr.return_value = std_err_mock
 
-        client = ssh.Client('localhost', 'root', timeout=2)
+        client = ssh.Client('localhost', 'root', timeout=2, buf_size=1024)
         client.exec_command("test")
 
         chan_mock.makefile.assert_called_once_with('rb', 1024)
@@ -311,3 +311,196 @@ class TestSshClient(base.TestCase):
         std_out_mock.read.assert_called_once_with()
         std_err_mock.read.assert_called_once_with()
         self.assertFalse(select_mock.called)
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_iter(self):
+        chan_mock, _, _, client_mock = self._set_mocks_for_select([1, 0, 0])
+        chan_mock.recv_exit_status.return_value = 0
+        chan_mock.recv.side_effect = [b'a', self._utf8_bytes[0:1],
+                                      self._utf8_bytes[1:] + b'b', b'']
+        chan_mock.recv_stderr.return_value = b''
+
+        client = ssh.Client('localhost', 'root', timeout=2, buf_size=4096)
+        chunks = list(client.exec_command_iter("test"))
+
+        # The multibyte character split over two reads is decoded whole
+        self.assertEqual(['a', self._utf8_string + 'b'], chunks)
+        chan_mock.recv.assert_called_with(4096)
+        chan_mock.recv_exit_status.assert_called_once_with()
+        client_mock.close.assert_called_once_with()
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_iter_lines(self):
+        chan_mock, _, _, _ = self._set_mocks_for_select([1, 0, 0])
+        chan_mock.recv_exit_status.return_value = 0
+        chan_mock.recv.side_effect = [b'one\ntw', b'o\n', b'three', b'']
+        chan_mock.recv_stderr.return_value = b''
+
+        client = ssh.Client('localhost', 'root', timeout=2)
+        self.assertEqual(['one', 'two', 'three'],
+                         list(client.exec_command_iter("test", lines=True)))
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_iter_max_bytes(self):
+        chan_mock, _, _, client_mock = self._set_mocks_for_select([1, 0, 0])
+        chan_mock.recv.side_effect = [b'0123', b'4567', b'89']
+        chan_mock.recv_stderr.return_value = b''
+
+        client = ssh.Client('localhost', 'root', timeout=2)
+        chunks = list(client.exec_command_iter("test", encoding=None,
+                                               max_bytes=6))
+
+        self.assertEqual([b'0123', b'45'], chunks)
+        self.assertEqual(2, chan_mock.recv.call_count)
+        # The command may still be running, its status is not waited for
+        self.assertFalse(chan_mock.recv_exit_status.called)
+        client_mock.close.assert_called_once_with()
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_iter_failure(self):
+        chan_mock, _, _, _ = self._set_mocks_for_select([1, 0, 0])
+        chan_mock.recv_exit_status.return_value = 1
+        chan_mock.recv.side_effect = [b'out', b'']
+        chan_mock.recv_stderr.side_effect = [b'err', b'']
+
+        client = ssh.Client('localhost', 'root', timeout=2)
+        output = client.exec_command_iter("test")
+        self.assertEqual('out', next(output))
+        exc = self.assertRaises(exceptions.SSHExecCommandFailed,
+                                next, output)
+        self.assertIn('err', str(exc))
+
+    def test_exec_command_iter_no_select(self):
+        gsc_mock = self.patch('tempest.lib.common.ssh.Client.'
+                              '_get_ssh_connection')
+        csp_mock = self.patch(
+            'tempest.lib.common.ssh.Client._can_system_poll')
+        csp_mock.return_value = False
+        client_mock = mock.MagicMock()
+        chan_mock = mock.MagicMock()
+        gsc_mock.return_value = client_mock
+        client_mock.get_transport().open_session().__enter__.return_value = (
+            chan_mock)
+        chan_mock.recv_exit_status.return_value = 0
+        chan_mock.makefile().read.side_effect = [b'ab', b'c', b'']
+        chan_mock.makefile_stderr().read.return_value = b''
+
+        client = ssh.Client('localhost', 'root', timeout=2, buf_size=2)
+        self.assertEqual(['ab', 'c'], list(client.exec_command_iter("test")))
+        chan_mock.makefile().read.assert_called_with(2)
+
+
+class TestSshClientPersistent(base.TestCase):
+
+    def setUp(self):
+        super(TestSshClientPersistent, self).setUp()
+        self.gsc_mock = self.patch(
+            'tempest.lib.common.ssh.Client._get_ssh_connection')
+        self.connections = []
+        self.gsc_mock.side_effect = self._new_connection
+        self.patch('tempest.lib.common.ssh._persistent_connections', {})
+
+    def _new_connection(self):
+        connection = mock.MagicMock()
+        connection.get_transport().is_active.return_value = True
+        self.connections.append(connection)
+        return connection
+
+    def test_connection_reused(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        first, _ = client._open_session()
+        second, _ = client._open_session()
+        # Another client for the same host and user shares the connection
+        other = ssh.Client('localhost', 'root', persistent=True)
+        third, _ = other._open_session()
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertEqual(1, self.gsc_mock.call_count)
+        self.assertEqual(3, first.get_transport().open_session.call_count)
+        self.assertFalse(first.close.called)
+
+    def test_connection_keepalive(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        first, _ = client._open_session()
+        first.get_transport().set_keepalive.assert_called_once_with(
+            ssh.PERSISTENT_KEEPALIVE_INTERVAL)
+
+    def test_open_session_timeout(self):
+        client = ssh.Client('localhost', 'root', persistent=True,
+                            channel_timeout=5)
+        first, _ = client._open_session()
+        first.get_transport().open_session.assert_called_once_with(
+            timeout=5.0)
+
+    def test_connection_not_shared_between_users(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        other = ssh.Client('localhost', 'cirros', persistent=True)
+        first, _ = client._open_session()
+        second, _ = other._open_session()
+        self.assertIsNot(first, second)
+        self.assertEqual(2, self.gsc_mock.call_count)
+
+    def test_not_persistent(self):
+        client = ssh.Client('localhost', 'root')
+        first, _ = client._open_session()
+        second, _ = client._open_session()
+        self.assertIsNot(first, second)
+        self.assertEqual({}, ssh._persistent_connections)
+
+    def test_reconnect_inactive_transport(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        first, _ = client._open_session()
+        first.get_transport().is_active.return_value = False
+        second, _ = client._open_session()
+        self.assertIsNot(first, second)
+        first.close.assert_called_once_with()
+        self.assertEqual(2, self.gsc_mock.call_count)
+
+    def test_reconnect_open_session_failure(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        first, _ = client._open_session()
+        first.get_transport().open_session.side_effect = EOFError()
+        second, session = client._open_session()
+        self.assertIsNot(first, second)
+        first.close.assert_called_once_with()
+        self.assertEqual(second.get_transport().open_session.return_value,
+                         session)
+
+    def test_test_connection_auth_keeps_connection(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        client.test_connection_auth()
+        connection, _ = client._open_session()
+        self.assertEqual(1, self.gsc_mock.call_count)
+        self.assertFalse(connection.close.called)
+
+    def test_close(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        connection, _ = client._open_session()
+        client.close()
+        connection.close.assert_called_once_with()
+        self.assertEqual({}, ssh._persistent_connections)
+        # The next command reconnects
+        client._open_session()
+        self.assertEqual(2, self.gsc_mock.call_count)
+
+    def test_close_persistent_connections(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        other = ssh.Client('remotehost', 'root', persistent=True)
+        first, _ = client._open_session()
+        second, _ = other._open_session()
+        ssh.close_persistent_connections()
+        first.close.assert_called_once_with()
+        second.close.assert_called_once_with()
+        self.assertEqual({}, ssh._persistent_connections)
+
+    def test_close_persistent_connections_failure(self):
+        client = ssh.Client('localhost', 'root', persistent=True)
+        other = ssh.Client('remotehost', 'root', persistent=True)
+        first, _ = client._open_session()
+        second, _ = other._open_session()
+        first.close.side_effect = EOFError()
+        second.close.side_effect = EOFError()
+        ssh.close_persistent_connections()
+        first.close.assert_called_once_with()
+        second.close.assert_called_once_with()
+        self.assertEqual({}, ssh._persistent_connections)
@@ -0,0 +1,95 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_config import cfg
+
+from tempest import clients
+from tempest import config
+from tempest.lib.services import compute
+from tempest.lib.services import image
+from tempest.tests import base
+from tempest.tests import fake_config
+from tempest.tests.lib import fake_credentials
+from tempest.tests.lib.services import registry_fixture
+
+
+class TestManager(base.TestCase):
+
+    def setUp(self):
+        super(TestManager, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.useFixture(registry_fixture.RegistryFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+        # Loading the configuration lazily would register the tempest
+        # service clients, which the registry fixture already provides
+        self.patchobject(config.CONF, '_config', fake_config.FakePrivate())
+        self.creds = fake_credentials.FakeKeystoneV3Credentials()
+
+    def test_clients_not_built_on_init(self):
+        with mock.patch.object(compute.ServersClient, '__init__',
+                               return_value=None) as init_mock:
+            manager = clients.Manager(self.creds)
+            init_mock.assert_not_called()
+            self.assertNotIn('servers_client', vars(manager))
+            self.assertNotIn('volumes_client_latest', vars(manager))
+
+    def test_client_built_once_on_first_access(self):
+        manager = clients.Manager(self.creds)
+        servers_client = manager.servers_client
+        self.assertIsInstance(servers_client, compute.ServersClient)
+        self.assertIs(servers_client, vars(manager)['servers_client'])
+        self.assertIs(servers_client, manager.servers_client)
+        # Other clients are still not built
+        self.assertNotIn('flavors_client', vars(manager))
+
+    def test_client_kwargs(self):
+        cfg.CONF.set_default('enable_instance_password', False,
+                             'compute-feature-enabled')
+        manager = clients.Manager(self.creds)
+        self.assertFalse(manager.servers_client.enable_instance_password)
+        self.assertEqual(cfg.CONF.volume.build_timeout,
+                         manager.volumes_extensions_client.build_timeout)
+
+    def test_client_kwargs_do_not_leak(self):
+        cfg.CONF.set_default('glance', True, 'service_available')
+        cfg.CONF.set_default('alternate_image_endpoint', 'image-remote',
+                             'image')
+        manager = clients.Manager(self.creds)
+        # The remote client is built first, its service must not be used
+        # by the default images client
+        remote_client = manager.image_client_remote
+        images_client = manager.image_client_v2
+        self.assertIsInstance(images_client, image.v2.ImagesClient)
+        self.assertEqual('image-remote', remote_client.service)
+        self.assertEqual(cfg.CONF.image.catalog_type, images_client.service)
+
+    def test_client_can_be_replaced(self):
+        manager = clients.Manager(self.creds)
+        fake_client = mock.Mock()
+        manager.servers_client = fake_client
+        self.assertIs(fake_client, manager.servers_client)
+
+    def test_unknown_attribute(self):
+        manager = clients.Manager(self.creds)
+        self.assertRaises(AttributeError, getattr, manager, 'not_a_client')
+        self.assertFalse(hasattr(manager, 'not_a_client'))
+
+    def test_dir_lists_lazy_clients(self):
+        manager = clients.Manager(self.creds)
+        self.assertIn('servers_client', dir(manager))
+        self.assertIn('networks_client', dir(manager))
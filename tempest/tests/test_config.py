@@ -15,6 +15,7 @@
 import testtools
 
 from tempest import config
+from tempest.lib.common import polling
 from tempest.lib import exceptions
 from tempest.tests import base
 from tempest.tests import fake_config
@@ -26,6 +27,8 @@ class TestServiceClientConfig(base.TestCase):
                                   'ca_certs', 'trace_requests'])
     expected_extra_params = set(['service', 'endpoint_type', 'region',
                                  'build_timeout', 'build_interval'])
+    pooling_params = set(['connection_pooling', 'pool_maxsize',
+                          'pool_num_pools', 'pool_idle_timeout'])
 
     def setUp(self):
         super(TestServiceClientConfig, self).setUp()
@@ -64,6 +67,33 @@ class TestServiceClientConfig(base.TestCase):
                          params['build_timeout'])
         self.assertEqual(self.CONF.fake_service1.build_interval,
                          params['build_interval'])
+        for param_name in self.pooling_params:
+            self.assertNotIn(param_name, params)
+
+    def test_service_client_config_connection_pooling(self):
+        self.CONF.set_override('connection_pooling', True, 'service-clients')
+        self.CONF.set_override('pool_maxsize', 4, 'service-clients')
+        params = config.service_client_config(
+            service_client_name='fake-service1')
+        for param_name in self.pooling_params:
+            self.assertIn(param_name, params)
+        self.assertTrue(params['connection_pooling'])
+        self.assertEqual(4, params['pool_maxsize'])
+        self.assertNotIn('connection_pooling', config.service_client_config())
+
+    def test_service_client_config_explicit_client_signature(self):
+        # The clients of plugins may not accept **kwargs
+        class PluginClient(object):
+            def __init__(self, auth_provider, service, region,
+                         endpoint_type, build_timeout, build_interval,
+                         disable_ssl_certificate_validation, ca_certs,
+                         trace_requests, http_timeout, proxy_url):
+                self.service = service
+
+        params = config.service_client_config(
+            service_client_name='fake-service1')
+        client = PluginClient('auth_provider', **params)
+        self.assertEqual(self.CONF.fake_service1.catalog_type, client.service)
 
     def test_service_client_config_service_minimal(self):
         params = config.service_client_config(
@@ -81,6 +111,21 @@ class TestServiceClientConfig(base.TestCase):
                          params['build_timeout'])
         self.assertEqual(self.CONF.compute.build_interval,
                          params['build_interval'])
+        # The fixed policy is the default of the service clients
+        self.assertNotIn('polling_policy', params)
+
+    def test_service_client_config_polling_policy(self):
+        self.CONF.set_override('polling_policy', 'fast-first', 'compute')
+        self.CONF.set_override('polling_initial_interval', 0.1,
+                               'service-clients')
+        self.CONF.set_override('polling_fast_polls', 3, 'service-clients')
+        params = config.service_client_config(
+            service_client_name='fake-service2')
+        policy = params['polling_policy']
+        self.assertIsInstance(policy, polling.FastFirstPolicy)
+        self.assertEqual(0.1, policy.interval(2))
+        self.assertEqual(self.CONF.compute.build_interval,
+                         policy.interval(3))
 
     def test_service_client_config_service_unknown(self):
         unknown_service = 'unknown_service'
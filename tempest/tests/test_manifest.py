@@ -0,0 +1,168 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import unittest
+
+import fixtures
+import testtools
+
+from tempest.lib import decorators
+from tempest.test_discover import manifest
+from tempest.test_discover import test_discover
+from tempest.tests import base
+
+TESTS = [
+    {'id': 'tempest.api.compute.test_servers.ServersTest.test_create'
+           '[id-1,smoke]',
+     'idempotent_id': '1', 'attrs': ['smoke'], 'services': []},
+    {'id': 'tempest.api.volume.test_volumes.VolumesTest.test_create[id-2]',
+     'idempotent_id': '2', 'attrs': [], 'services': []},
+    {'id': 'tempest.scenario.test_boot.BootTest.test_boot'
+           '[compute,id-3,slow]',
+     'idempotent_id': '3', 'attrs': ['compute', 'slow'],
+     'services': ['compute']},
+]
+
+
+class FakeTest(testtools.TestCase):
+
+    @decorators.attr(type=['smoke', 'compute'])
+    @decorators.idempotent_id('fa1e5eb7-9d42-4b05-8d9c-1a0c6f6e0a42')
+    def test_fake(self):
+        pass
+
+    def test_no_attrs(self):
+        pass
+
+
+@decorators.serial
+class FakeSerialTest(testtools.TestCase):
+
+    def test_serial(self):
+        pass
+
+
+class TestManifest(base.TestCase):
+
+    def setUp(self):
+        super(TestManifest, self).setUp()
+        self.tmp_dir = self.useFixture(fixtures.TempDir()).path
+        self.test_dir = os.path.join(self.tmp_dir, 'tests')
+        os.mkdir(self.test_dir)
+        self._write('test_a.py', 'a')
+        self.config_path = os.path.join(self.tmp_dir, 'tempest.conf')
+        self._write(self.config_path, '[DEFAULT]')
+        self.path = os.path.join(self.tmp_dir, 'manifest.json')
+        self.patchobject(test_discover, 'get_test_dirs',
+                         return_value=[(self.test_dir, self.tmp_dir)])
+        self.patchobject(manifest.config.TempestConfigPrivate,
+                         'get_config_path', return_value=self.config_path)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.test_dir, name), 'w') as f:
+            f.write(content)
+
+    def test_fingerprint(self):
+        fingerprint = manifest.get_fingerprint()
+        self.assertEqual(fingerprint, manifest.get_fingerprint())
+        # Bytecode is ignored
+        os.mkdir(os.path.join(self.test_dir, '__pycache__'))
+        self._write('__pycache__/test_a.cpython.pyc', 'bytecode')
+        self.assertEqual(fingerprint, manifest.get_fingerprint())
+        # The content of the files and of the config file is covered
+        for name, content in (('test_a.py', 'b'), ('test_b.py', 'a'),
+                              (self.config_path, '[auth]')):
+            self._write(name, content)
+            self.assertNotEqual(fingerprint, manifest.get_fingerprint())
+            fingerprint = manifest.get_fingerprint()
+        # And so is the set of test directories
+        self.assertNotEqual(fingerprint, manifest.get_fingerprint(
+            [(self.test_dir, self.tmp_dir), (self.tmp_dir, self.tmp_dir)]))
+
+    def test_save_and_load(self):
+        self.assertIsNone(manifest.load_manifest('fp', self.path))
+        manifest.save_manifest('fp', TESTS, self.path)
+        self.assertEqual(TESTS, manifest.load_manifest('fp', self.path))
+        self.assertIsNone(manifest.load_manifest('other', self.path))
+        self.assertEqual(['manifest.json', 'tempest.conf', 'tests'],
+                         sorted(os.listdir(self.tmp_dir)))
+
+    def test_load_invalid(self):
+        self._write(self.path, '{"version": ')
+        self.assertIsNone(manifest.load_manifest('fp', self.path))
+
+    def test_get_tests_rebuilds_stale_manifest(self):
+        discover = self.patchobject(manifest, 'discover_tests',
+                                    return_value=TESTS)
+        self.assertEqual(TESTS, manifest.get_tests(self.path))
+        self.assertEqual(TESTS, manifest.get_tests(self.path))
+        discover.assert_called_once_with()
+        self._write('test_a.py', 'b')
+        self.assertEqual(TESTS, manifest.get_tests(self.path))
+        self.assertEqual(2, discover.call_count)
+
+    def test_discover_tests(self):
+        self.patchobject(
+            manifest.utils, 'get_service_list',
+            return_value={'compute': True, 'image': True})
+        suite = unittest.TestSuite([unittest.TestSuite(
+            [FakeTest('test_fake'), FakeTest('test_no_attrs'),
+             FakeSerialTest('test_serial')])])
+        self.patchobject(test_discover, 'load_tests', return_value=suite)
+        tests = manifest.discover_tests()
+        self.assertEqual([
+            {'id': FakeTest('test_fake').id(),
+             'idempotent_id': 'fa1e5eb7-9d42-4b05-8d9c-1a0c6f6e0a42',
+             'attrs': ['compute', 'smoke'], 'services': ['compute'],
+             'serial': False},
+            {'id': FakeTest('test_no_attrs').id(), 'idempotent_id': None,
+             'attrs': [], 'services': [], 'serial': False},
+            {'id': FakeSerialTest('test_serial').id(), 'idempotent_id': None,
+             'attrs': [], 'services': [], 'serial': True}], tests)
+
+    def test_discover_tests_import_error(self):
+        def load_tests(loader, tests, pattern):
+            loader.errors.append('Failed to import test module: test_a')
+            return unittest.TestSuite()
+
+        self.patchobject(test_discover, 'load_tests', side_effect=load_tests)
+        self.assertRaises(ImportError, manifest.discover_tests)
+
+    def test_select_tests(self):
+        self.assertEqual([test['id'] for test in TESTS],
+                         manifest.select_tests(TESTS))
+        self.assertEqual([TESTS[0]['id'], TESTS[2]['id']],
+                         manifest.select_tests(TESTS, ['smoke', 'scenario']))
+        self.assertEqual([TESTS[0]['id']],
+                         manifest.select_tests(TESTS, ['smoke', 'scenario'],
+                                               exclude_regex='slow'))
+
+    def test_select_tests_lists(self):
+        include_list = os.path.join(self.tmp_dir, 'include')
+        exclude_list = os.path.join(self.tmp_dir, 'exclude')
+        self._write(include_list, 'tempest.api # the API tests\n')
+        self._write(exclude_list, 'volume\n')
+        self.assertEqual([TESTS[0]['id']], manifest.select_tests(
+            TESTS, include_list=include_list, exclude_list=exclude_list))
+
+    def test_select_tests_does_not_modify_regexes(self):
+        include_list = os.path.join(self.tmp_dir, 'include')
+        self._write(include_list, 'scenario\n')
+        regexes = ['smoke']
+        self.assertEqual([TESTS[0]['id'], TESTS[2]['id']],
+                         manifest.select_tests(TESTS, regexes,
+                                               include_list=include_list))
+        self.assertEqual(['smoke'], regexes)
@@ -0,0 +1,156 @@
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import os
+
+import fixtures
+from stestr.repository import file as repo_file
+from stestr import selection
+import yaml
+
+from tempest.test_discover import scheduler
+from tempest.tests import base
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _record(test_id, start, stop, worker='worker-0'):
+    return {'id': test_id, 'tags': {worker}, 'status': 'success',
+            'timestamps': (T0 + datetime.timedelta(seconds=start),
+                           T0 + datetime.timedelta(seconds=stop))}
+
+
+class TestScheduler(base.TestCase):
+
+    def test_get_class_id(self):
+        self.assertEqual('tempest.api.test_a.TestA', scheduler.get_class_id(
+            'tempest.api.test_a.TestA.test_a[id-1,smoke]'))
+        self.assertEqual('tempest.api.test_a.TestA', scheduler.get_class_id(
+            'tempest.api.test_a.TestA.test_a'))
+        self.assertEqual('tempest.api.test_a.TestA', scheduler.get_class_id(
+            'setUpClass (tempest.api.test_a.TestA)'))
+
+    def test_get_run_timings(self):
+        records = [
+            _record('a.A.test_1', 0, 10),
+            # The setup of a.B took 5s, and the failing setup of a.D 2s on
+            # the other worker
+            _record('a.B.test_1', 15, 16),
+            _record('a.B.test_2', 17, 19),
+            _record('a.C.test_1', 0, 2, 'worker-1'),
+            _record('setUpClass (a.D)', 3, 4, 'worker-1'),
+            # Hung tests are ignored
+            {'id': 'a.D.test_1', 'tags': {'worker-1'}, 'status': None,
+             'timestamps': (T0, None)},
+        ]
+        durations, overheads = scheduler.get_run_timings(records)
+        self.assertEqual({'a.A.test_1': 10.0, 'a.B.test_1': 1.0,
+                          'a.B.test_2': 2.0, 'a.C.test_1': 2.0}, durations)
+        # The setup of the first class of a worker is unknown
+        self.assertEqual({'a.B': 6.0, 'a.D': 2.0}, overheads)
+
+    def test_timings(self):
+        timings = scheduler.Timings({'a.A.test_1': 1.0, 'a.A.test_2': 3.0},
+                                    {'a.A': 4.0, 'a.B': 8.0})
+        self.assertEqual(8.0, timings.get_class_cost(
+            'a.A', ['a.A.test_1', 'a.A.test_2']))
+        # Without history, the mean durations are used
+        self.assertEqual(10.0, timings.get_class_cost(
+            'a.C', ['a.C.test_1', 'a.C.test_2']))
+        timings = scheduler.Timings()
+        self.assertEqual(2 * scheduler.DEFAULT_TEST_DURATION,
+                         timings.get_class_cost('a.C', ['a.C.test_1',
+                                                        'a.C.test_2']))
+
+    def test_schedule(self):
+        timings = scheduler.Timings(
+            {'a.A.test_1': 1.0, 'a.A.test_2': 1.0, 'a.B.test_1': 1.0,
+             'a.C.test_1': 1.0, 'a.D.test_1': 1.0},
+            {'a.A': 2.0, 'a.B': 6.0, 'a.C': 2.0, 'a.D': 1.0})
+        test_ids = ['a.A.test_1', 'a.A.test_2', 'a.B.test_1', 'a.C.test_1',
+                    'a.D.test_1']
+        # The test durations alone would schedule a.B with a.D, for 9s
+        self.assertEqual([(7.0, ['a.B']), (4.0, ['a.A']),
+                          (5.0, ['a.C', 'a.D'])],
+                         scheduler.schedule(test_ids, 3, timings))
+        self.assertEqual([(9.0, ['a.B', 'a.D']), (7.0, ['a.A', 'a.C'])],
+                         scheduler.schedule(test_ids, 2, timings))
+        # Workers without classes are dropped
+        self.assertEqual([(7.0, ['a.B'])],
+                         scheduler.schedule(['a.B.test_1'], 2, timings))
+
+    def test_schedule_serial_classes(self):
+        timings = scheduler.Timings(
+            {'a.A.test_1': 1.0, 'a.B.test_1': 1.0, 'a.C.test_1': 1.0,
+             'a.D.test_1': 4.0})
+        test_ids = ['a.A.test_1', 'a.B.test_1', 'a.C.test_1', 'a.D.test_1']
+        self.assertEqual([(2.0, ['a.A', 'a.C']), (4.0, ['a.D']),
+                          (1.0, ['a.B'])],
+                         scheduler.schedule(test_ids, 3, timings,
+                                            {'a.A', 'a.C', 'x.Y'}))
+
+
+class TestSchedulerFiles(base.TestCase):
+
+    def setUp(self):
+        super(TestSchedulerFiles, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+
+    def test_save_worker_file(self):
+        path = os.path.join(self.directory, 'workers.yaml')
+        scheduler.save_worker_file(
+            [(1.0, ['tempest.api.test_a.TestA']),
+             (2.0, ['tempest.api.test_a.TestAB', 'tempest.api.test_b.Test'])],
+            path)
+        with open(path) as f:
+            workers = yaml.safe_load(f)
+        test_ids = ['tempest.api.test_a.TestA.test_a[id-1]',
+                    'tempest.api.test_a.TestAB.test_a[id-2]',
+                    'tempest.api.test_b.Test.test_b[id-3]',
+                    'tempest.api.test_bXTest.test_b[id-4]']
+        self.assertEqual(
+            [[test_ids[0]], test_ids[1:3]],
+            [selection.filter_tests(worker['worker'], test_ids)
+             for worker in workers])
+
+    def test_load_timings(self):
+        repo = repo_file.RepositoryFactory().initialise(self.directory)
+        for records in ([_record('a.A.test_1', 0, 10),
+                         _record('a.B.test_1', 12, 13)],
+                        [_record('a.A.test_1', 0, 1),
+                         _record('a.C.test_1', 3, 4)]):
+            inserter = repo.get_inserter()
+            inserter.startTestRun()
+            for record in records:
+                start, stop = record['timestamps']
+                inserter.status(test_id=record['id'],
+                                test_status='inprogress', timestamp=start,
+                                test_tags=record['tags'])
+                inserter.status(test_id=record['id'], test_status='success',
+                                timestamp=stop, test_tags=record['tags'])
+            inserter.stopTestRun()
+        timings = scheduler.load_timings(self.directory)
+        # The most recent durations are used
+        self.assertEqual({'a.A.test_1': 1.0, 'a.B.test_1': 1.0,
+                          'a.C.test_1': 1.0}, timings.test_durations)
+        self.assertEqual({'a.B': 2.0, 'a.C': 2.0}, timings.class_overheads)
+        timings = scheduler.load_timings(self.directory, runs=1)
+        self.assertEqual({'a.C': 2.0}, timings.class_overheads)
+
+    def test_load_timings_without_repository(self):
+        timings = scheduler.load_timings(self.directory)
+        self.assertEqual({}, timings.test_durations)
+        self.assertEqual({}, timings.class_overheads)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 from tempest.lib.services import clients
 from tempest.test_discover import plugins
 from tempest.tests import base
@@ -84,3 +86,25 @@ class TestPluginDiscovery(base.TestCase):
         manager._register_service_clients()
         registered_clients = registry.get_service_clients()
         self.assertNotIn(fake_obj.name, registered_clients)
+
+    def test_plugin_results_are_cached(self):
+        manager = plugins.TempestTestPluginManager()
+        fake_obj = fake_plugin.FakeStevedoreObj()
+        manager.ext_plugins = [fake_obj]
+        with mock.patch.object(fake_obj.obj, 'load_tests',
+                               wraps=fake_obj.obj.load_tests) as load_tests:
+            first = manager.get_plugin_load_tests_tuple()
+            first['other'] = None
+            self.assertEqual(
+                {fake_obj.name: fake_plugin.FakePlugin.expected_load_test},
+                manager.get_plugin_load_tests_tuple())
+            load_tests.assert_called_once_with()
+
+    def test_plugin_results_are_dropped_with_the_plugins(self):
+        manager = plugins.TempestTestPluginManager()
+        manager.ext_plugins = [fake_plugin.FakeStevedoreObj('fake01')]
+        self.assertEqual(['fake01'],
+                         list(manager.get_plugin_load_tests_tuple()))
+        manager.ext_plugins = [fake_plugin.FakeStevedoreObj('fake02')]
+        self.assertEqual(['fake02'],
+                         list(manager.get_plugin_load_tests_tuple()))
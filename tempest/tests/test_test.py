@@ -17,12 +17,15 @@ import os
 import unittest
 from unittest import mock
 
+import fixtures
 from oslo_concurrency import lockutils
 from oslo_config import cfg
 import testtools
 
 from tempest import clients
 from tempest import config
+from tempest.lib.common import metrics
+from tempest.lib.common.utils import test_utils
 from tempest.lib.common import validation_resources as vr
 from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
@@ -245,6 +248,45 @@ class TestTempestBaseTestClass(base.TestCase):
 
         self.parent_test = ParentTest
 
+    def test_add_metrics_sinks(self):
+        json_dir = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                'metrics')
+        cfg.CONF.set_default('json_dir', json_dir, 'metrics')
+        cfg.CONF.set_default('statsd_host', '127.0.0.1', 'metrics')
+        self.patch('atexit.register')
+        test.add_metrics_sinks()
+        json_sink, statsd_sink = metrics.get_sinks()
+        for sink in (json_sink, statsd_sink):
+            self.addCleanup(metrics.remove_sink, sink)
+        self.addCleanup(statsd_sink.close)
+        self.assertIsInstance(json_sink, metrics.JSONFileSink)
+        self.assertEqual(
+            os.path.join(json_dir, 'tempest-latency-%d.json' % os.getpid()),
+            json_sink.path)
+        self.assertTrue(os.path.isdir(json_dir))
+        self.assertIsInstance(statsd_sink, metrics.StatsdSink)
+        self.assertEqual(('127.0.0.1', 8125), statsd_sink.address)
+
+    def test_add_metrics_sinks_failure(self):
+        json_file = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'file')
+        open(json_file, 'w').close()
+        # A file is in the way of the directory, the host does not resolve
+        cfg.CONF.set_default('json_dir', json_file, 'metrics')
+        cfg.CONF.set_default('statsd_host', 'unresolvable.invalid',
+                             'metrics')
+        self.patch('socket.getaddrinfo', side_effect=OSError('unknown'))
+        test.add_metrics_sinks()
+        self.assertEqual([], metrics.get_sinks())
+
+    def test_add_metrics_sinks_once(self):
+        add_metrics_sinks = self.patch('tempest.test.add_metrics_sinks')
+        self.patch('tempest.test.metrics_sinks_added', False)
+        for _ in range(2):
+            self.parent_test.setUpClass()
+            self.parent_test.tearDownClass()
+        add_metrics_sinks.assert_called_once_with()
+
     def test_resource_cleanup(self):
         cfg.CONF.set_default('neutron', False, 'service_available')
         exp_args = (1, 2,)
@@ -454,6 +496,31 @@ class TestTempestBaseTestClass(base.TestCase):
             expected_creds[1][1:],
             mock_get_client_manager.mock_calls[1][2]['roles'])
 
+    def test_setup_credentials_provisioned_ahead(self):
+        class TwoCredentials(self.parent_test):
+            credentials = ['primary', 'alt', ['list', 'role1']]
+
+        cred_provider = mock.Mock(workers=2)
+        with mock.patch.object(
+                TwoCredentials, '_get_credentials_provider',
+                return_value=cred_provider), mock.patch.object(
+                TwoCredentials, 'get_client_manager'):
+            TwoCredentials().setup_credentials()
+        cred_provider.provision_credentials.assert_called_once_with(
+            ['primary', 'alt'])
+
+    def test_setup_credentials_not_provisioned_ahead(self):
+        class TwoCredentials(self.parent_test):
+            credentials = ['primary', 'alt']
+
+        cred_provider = mock.Mock(workers=1)
+        with mock.patch.object(
+                TwoCredentials, '_get_credentials_provider',
+                return_value=cred_provider), mock.patch.object(
+                TwoCredentials, 'get_client_manager'):
+            TwoCredentials().setup_credentials()
+        cred_provider.provision_credentials.assert_not_called()
+
     def test_setup_credentials_with_role_and_system_scope(self):
         expected_creds = [['system_my_role', 'role1', 'role2']]
 
@@ -578,6 +645,50 @@ class TestTempestBaseTestClass(base.TestCase):
         self.assertEqual(
             'system', mock_get_client_manager.mock_calls[3][2]['scope'])
 
+    def test_caller_name_per_phase(self):
+        cfg.CONF.set_default('neutron', False, 'service_available')
+        callers = []
+
+        def record_caller():
+            cached = test_utils.find_test_caller()
+            with test_utils.caller_context(None):
+                from_stack = test_utils.find_test_caller()
+            callers.append((cached, from_stack))
+
+        class CallerTest(self.parent_test):
+
+            @classmethod
+            def resource_setup(cls):
+                super(CallerTest, cls).resource_setup()
+                record_caller()
+                cls.addClassResourceCleanup(record_caller)
+
+            def setUp(self):
+                super(CallerTest, self).setUp()
+                record_caller()
+                self.addCleanup(record_caller)
+
+            def test_phases(self):
+                record_caller()
+
+            def tearDown(self):
+                record_caller()
+                super(CallerTest, self).tearDown()
+
+        suite = unittest.TestSuite((CallerTest('test_phases'),))
+        log = []
+        result = LoggingTestResult(log)
+        suite.run(result)
+        self.assertFalse(log)
+        self.assertEqual(
+            ['CallerTest:setUpClass', 'CallerTest:setUp',
+             'CallerTest:test_phases', 'CallerTest:tearDown',
+             'CallerTest:_run_cleanups', 'CallerTest:tearDownClass'],
+            [cached for cached, _ in callers])
+        for cached, from_stack in callers:
+            self.assertEqual(from_stack, cached)
+        self.assertIsNone(test_utils.get_test_caller())
+
     def test_setup_class_overwritten(self):
 
         class OverridesSetup(self.parent_test):
@@ -644,6 +755,25 @@ class TestTempestBaseTestClass(base.TestCase):
             mock_lock.mock_calls
         )
 
+    @mock.patch.object(test.process_lock, 'InterProcessReaderWriterLock')
+    def test_serial_lock_released_before_closing_ssh(self, mock_lock):
+
+        @decorators.serial
+        class SerialTests(self.parent_test):
+            pass
+
+        calls = mock.Mock()
+        calls.attach_mock(mock_lock.return_value.release_write_lock,
+                          'release_write_lock')
+        calls.attach_mock(
+            self.patchobject(test.ssh, 'close_persistent_connections'),
+            'close_persistent_connections')
+        suite = unittest.TestSuite((SerialTests(),))
+        suite.run(LoggingTestResult([]))
+        self.assertEqual([mock.call.release_write_lock(),
+                          mock.call.close_persistent_connections()],
+                         calls.mock_calls)
+
 
 class TestTempestBaseTestClassFixtures(base.TestCase):
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure the cost of allocating pre-provisioned accounts
+
+Several processes allocate and release accounts of the same accounts file
+concurrently, as test workers do, with the global test_accounts_io lock and
+with the atomic allocation of PreProvisionedCredentialProvider. The
+accounts file is generated, no cloud is needed.
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from oslo_concurrency import lockutils
+
+from tempest.lib.common import preprov_creds
+
+
+def make_accounts(count):
+    return [{'username': 'user%d' % i, 'project_name': 'project%d' % i,
+             'password': 'p', 'roles': ['member']} for i in range(count)]
+
+
+def allocate(args):
+    accounts, lock_dir, atomic, allocations = args
+    with mock.patch.object(preprov_creds, 'read_accounts_yaml',
+                           return_value=accounts):
+        provider = preprov_creds.PreProvisionedCredentialProvider(
+            identity_version='v3', test_accounts_file='accounts.yaml',
+            accounts_lock_dir=lock_dir, name='worker%d' % os.getpid(),
+            admin_role='admin', atomic_allocation=atomic)
+    hashes = list(provider.hash_dict['creds'])
+    for _ in range(allocations):
+        if atomic:
+            _hash = provider._get_free_hash_atomic(hashes)
+            provider._remove_hash_atomic(_hash)
+        else:
+            _hash = provider._get_free_hash(hashes)
+            provider.remove_hash(_hash)
+
+
+def run(accounts, workers, allocations, atomic):
+    work_dir = tempfile.mkdtemp()
+    lockutils.set_defaults(os.path.join(work_dir, 'locks'))
+    lock_dir = os.path.join(work_dir, 'test_accounts')
+    try:
+        start = time.monotonic()
+        with multiprocessing.Pool(workers) as pool:
+            pool.map(allocate, [(accounts, lock_dir, atomic, allocations)] *
+                     workers)
+        return time.monotonic() - start
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--accounts', type=int, default=500,
+                        help='Number of accounts in the accounts file')
+    parser.add_argument('--workers', type=int, default=32,
+                        help='Number of concurrent processes')
+    parser.add_argument('--allocations', type=int, default=200,
+                        help='Number of allocations made by each process')
+    args = parser.parse_args()
+
+    accounts = make_accounts(args.accounts)
+    total = args.workers * args.allocations
+    print('%d workers, %d accounts, %d allocations' % (
+        args.workers, args.accounts, total))
+    for name, atomic in (('global lock', False), ('atomic', True)):
+        elapsed = run(accounts, args.workers, args.allocations, atomic)
+        print('%s: %.3f s (%.1f us per allocation)' % (
+            name, elapsed, elapsed * 1e6 / total))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure the cost of building tempest.clients.Manager instances
+
+RBAC runs set up a Manager for each of 20+ credential types. This script
+builds that many managers and compares the time taken when tests only use
+a single service client with the time taken when every client is built, as
+was the case before the service clients were built lazily.
+
+The fake configuration of the unit tests is used, no cloud is needed.
+"""
+
+import argparse
+import time
+
+from tempest import clients
+from tempest import config
+from tempest.tests import fake_config
+from tempest.tests.lib import fake_credentials
+from tempest.tests.lib.services import registry_fixture
+
+
+def build_managers(count, build_all):
+    for _ in range(count):
+        manager = clients.Manager(
+            fake_credentials.FakeKeystoneV3Credentials())
+        if build_all:
+            for name in list(manager._lazy_clients):
+                getattr(manager, name)
+        else:
+            manager.servers_client
+
+
+def run(count, repeat, build_all):
+    timings = []
+    for _ in range(repeat):
+        start = time.monotonic()
+        build_managers(count, build_all)
+        timings.append(time.monotonic() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--managers', type=int, default=25,
+                        help='Number of managers (credential types) to build')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    config_fixture = fake_config.ConfigFixture()
+    config_fixture.setUp()
+    registry = registry_fixture.RegistryFixture()
+    registry.setUp()
+    config.CONF._config = fake_config.FakePrivate()
+    try:
+        lazy = run(args.managers, args.repeat, build_all=False)
+        eager = run(args.managers, args.repeat, build_all=True)
+    finally:
+        registry.cleanUp()
+        config_fixture.cleanUp()
+
+    print('Managers built: %d (best of %d runs)' % (
+        args.managers, args.repeat))
+    print('Only servers_client used: %.3f s (%.2f ms per manager)' % (
+        lazy, lazy * 1000 / args.managers))
+    print('All service clients used: %.3f s (%.2f ms per manager)' % (
+        eager, eager * 1000 / args.managers))
+
+
+if __name__ == '__main__':
+    main()
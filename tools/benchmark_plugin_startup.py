@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure the cost of loading the Tempest plugins at startup
+
+Each run is a new process, as a test worker is, which loads the installed
+plugins, registers their options and gets their options and tests the way
+the configuration and the test discovery do. The runs are made with an
+empty entry point cache, and with the cache filled by a previous run.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+STARTUP = """
+import json
+import time
+
+start = time.monotonic()
+from oslo_config import cfg
+from tempest.test_discover import plugins
+imported = time.monotonic()
+manager = plugins.TempestTestPluginManager()
+manager.register_plugin_opts(cfg.ConfigOpts())
+loaded = time.monotonic()
+for _ in range(%(calls)d):
+    manager.get_plugin_options_list()
+    manager.get_plugin_load_tests_tuple()
+done = time.monotonic()
+print(json.dumps({'plugins': len(manager.ext_plugins.extensions),
+                  'import': imported - start,
+                  'load': loaded - imported,
+                  'calls': done - loaded}))
+"""
+
+
+def run(cache_dir, calls):
+    env = dict(os.environ, XDG_CACHE_HOME=cache_dir)
+    output = subprocess.check_output(
+        [sys.executable, '-c', STARTUP % {'calls': calls}], env=env)
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Number of processes started for each case')
+    parser.add_argument('--calls', type=int, default=100,
+                        help='Number of times the options and tests of the '
+                             'plugins are requested in each process')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        warm_dir = os.path.join(work_dir, 'warm')
+        run(warm_dir, 0)
+        for name in ('cold cache', 'warm cache'):
+            results = []
+            for i in range(args.runs):
+                if name == 'cold cache':
+                    cache_dir = os.path.join(work_dir, 'cold%d' % i)
+                else:
+                    cache_dir = warm_dir
+                results.append(run(cache_dir, args.calls))
+            print('%s, %d plugins: import %.1f ms, load %.1f ms, '
+                  '%d option and test lookups %.2f ms' % (
+                      name, results[0]['plugins'],
+                      sum(r['import'] for r in results) * 1e3 / args.runs,
+                      sum(r['load'] for r in results) * 1e3 / args.runs,
+                      args.calls,
+                      sum(r['calls'] for r in results) * 1e3 / args.runs))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+# Copyright 2026 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure the cost of validating compute server responses
+
+The list servers detail and show server responses are validated against
+the compute servers.py schemas with jsonschema.validate, which checks the
+schema and builds a validator on each call as RestClient.validate_response
+used to do, and with the validators cached by
+tempest.lib.common.jsonschema_validator.
+
+The fake responses of the unit tests are used, no cloud is needed.
+"""
+
+import argparse
+import copy
+import time
+
+import jsonschema
+
+from tempest.lib.api_schema.response.compute.v2_1 import servers
+from tempest.lib.common import jsonschema_validator
+from tempest.tests.lib.services.compute import test_servers_client
+
+
+def uncached_validate(instance, schema):
+    jsonschema.validate(instance, schema,
+                        cls=jsonschema_validator.JSONSCHEMA_VALIDATOR,
+                        format_checker=jsonschema_validator.FORMAT_CHECKER)
+
+
+def run(validate, responses, count, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.monotonic()
+        for _ in range(count):
+            for schema, body in responses:
+                validate(body, schema['response_body'])
+        timings.append(time.monotonic() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--servers', type=int, default=50,
+                        help='Number of servers in the list response')
+    parser.add_argument('--count', type=int, default=50,
+                        help='Number of validations of each response per run')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    server = test_servers_client.TestServersClient.FAKE_SERVER_GET
+    responses = [
+        (servers.get_server, server),
+        (servers.list_servers_detail,
+         {'servers': [copy.deepcopy(server['server'])
+                      for _ in range(args.servers)]}),
+    ]
+
+    uncached = run(uncached_validate, responses, args.count, args.repeat)
+    cached = run(jsonschema_validator.validate, responses, args.count,
+                 args.repeat)
+
+    validations = args.count * len(responses)
+    print('Validations: %d show server and list of %d servers responses '
+          '(best of %d runs)' % (validations, args.servers, args.repeat))
+    print('jsonschema.validate: %.3f s (%.3f ms per response)' % (
+        uncached, uncached * 1000 / validations))
+    print('Cached validators: %.3f s (%.3f ms per response)' % (
+        cached, cached * 1000 / validations))
+
+
+if __name__ == '__main__':
+    main()